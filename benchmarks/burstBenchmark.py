@@ -0,0 +1,97 @@
+"""
+Benchmark for the burst engine (`burstEngine.BurstEngine`): the achieved rates of several concurrent bursts at short intervals,
+compared with repeating each one in its own thread that sends a press then sleeps for the interval (the way `simulateBurstClicks` used to).
+
+The inputs are sent to the fake backend of `platformBackend`, so the results measure the timing alone: the achieved rate of each burst
+against the requested one, the number of `SendInput` calls (batches), and the number of threads used.
+
+The extensions must be compiled first (`make compile`). Run from the repository root:
+>>> python benchmarks/burstBenchmark.py                              # 3 bursts, 1, 2, and 5 ms apart, for 2 seconds.
+>>> python benchmarks/burstBenchmark.py -i 0.001 0.001 0.01 -d 5     # 3 bursts, 1, 1, and 10 ms apart, for 5 seconds.
+"""
+
+import sys, os, threading, argparse
+from time import perf_counter, sleep
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from cythonExtensions.platformBackend import platformBackend as pfBackend
+from cythonExtensions.timelineHelper.burstEngine import BurstEngine, keyBurst
+
+
+def runSleeping(intervals: list[float], duration: float) -> tuple[list[float], int, int]:
+    """Repeats each burst in a thread that sleeps between its presses. Returns the achieved rates, the number of batches, and the thread count."""
+
+    rates = [0.0] * len(intervals)
+    batches = [0] * len(intervals)
+    stopEvent = threading.Event()
+
+    def burst(index: int, interval: float) -> None:
+        inputs = ((0x41 + index, 0, 0), (0x41 + index, 0, 2))
+        count, firstAt = 0, perf_counter()
+
+        while not stopEvent.is_set():
+            pfBackend.backend.sendInputs(inputs)
+            count += 1
+            lastAt = perf_counter()
+            sleep(interval)
+
+        rates[index] = (count - 1) / (lastAt - firstAt) if count > 1 else 0.0
+        batches[index] = count
+
+    threads = [threading.Thread(target=burst, args=(index, interval)) for index, interval in enumerate(intervals)]
+    peakThreads = threading.active_count() + len(threads)
+
+    for thread in threads:
+        thread.start()
+
+    sleep(duration)
+    stopEvent.set()
+
+    for thread in threads:
+        thread.join()
+
+    return rates, sum(batches), peakThreads
+
+
+def runEngine(intervals: list[float], duration: float) -> tuple[list[float], int, int, int]:
+    """Runs the bursts on one engine. Returns the achieved rates, the number of batches, the thread count, and the missed deadlines."""
+
+    engine = BurstEngine()
+    bursts = [engine.start(keyBurst(0x41 + index, 0, interval)) for index, interval in enumerate(intervals)]
+    sleep(duration / 2)
+    peakThreads = threading.active_count()
+    sleep(duration / 2)
+
+    rates = [burst.achievedRate() for burst in bursts]
+    missed = sum(burst.missedDeadlines for burst in bursts)
+    batches = engine.sentBatches
+    engine.stopAll()
+
+    return rates, batches, peakThreads, missed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks the achieved rates of the burst engine against sleeping threads.")
+    parser.add_argument("-i", "--intervals", type=float, nargs="+", default=[0.001, 0.002, 0.005], help="The time in seconds between the presses of each burst.")
+    parser.add_argument("-d", "--duration", type=float, default=2.0, help="How long each runner repeats the bursts, in seconds.")
+    args = parser.parse_args()
+
+    pfBackend.setBackend(pfBackend.FakeBackend())
+    print(f"Running {len(args.intervals)} bursts ({', '.join(f'{interval * 1000:g} ms' for interval in args.intervals)}) for {args.duration:g} seconds...")
+
+    sleepingRates, sleepingBatches, sleepingThreads = runSleeping(args.intervals, args.duration)
+    engineRates, engineBatches, engineThreads, missed = runEngine(args.intervals, args.duration)
+
+    print(f"\n{'Interval ms':<14}{'Requested/s':>13}{'Sleeping/s':>13}{'Engine/s':>13}")
+
+    for interval, sleepingRate, engineRate in zip(args.intervals, sleepingRates, engineRates):
+        print(f"{interval * 1000:<14g}{1 / interval:>13.1f}{sleepingRate:>13.1f}{engineRate:>13.1f}")
+
+    print(f"\nSleeping threads: {sleepingThreads} threads, {sleepingBatches:,} SendInput calls.")
+    print(f"Burst engine:     {engineThreads} threads, {engineBatches:,} SendInput calls, {missed} missed deadlines.")
+    print("(The rates are the presses per second measured from the first press to the last one of each burst.)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark for the cursor motion engine (`cursorMotion.CursorMotionEngine`): the smoothness of the cursor motion while a direction key is held,
+compared with moving the cursor a fixed distance on each auto-repeated key press, in a new thread (the way the mouse-control keys used to).
+
+The key repeats follow the default Windows typematic settings (a 0.5 second delay, then about 30 repeats per second). The cursor moves are
+recorded by the fake backend of `platformBackend`, so the results measure the motion alone: the moved distance, the number of cursor
+updates, the largest jump between two updates, the intervals between the updates, and the number of started threads.
+
+The extensions must be compiled first (`make compile`). Run from the repository root:
+>>> python benchmarks/cursorMotionBenchmark.py              # Holding a key for 2 seconds.
+>>> python benchmarks/cursorMotionBenchmark.py -d 1 -r 144  # Holding a key for 1 second, at 144 frames per second.
+"""
+
+import sys, os, threading, argparse
+from time import perf_counter, sleep
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from cythonExtensions.platformBackend import platformBackend as pfBackend
+from cythonExtensions.mouseHelper import mouseHelper as msHelper
+from cythonExtensions.mouseHelper.cursorMotion import CursorMotionEngine, RIGHT, NORMAL
+
+
+REPEAT_DELAY, REPEAT_INTERVAL = 0.5, 1 / 30
+"""The default keyboard auto-repeat delay and interval, in seconds."""
+
+
+class RecordingBackend(pfBackend.FakeBackend):
+    """A fake backend that records the time and the position of each cursor move."""
+
+    def __init__(self):
+        super().__init__()
+        self.moves = []
+
+    def setCursorPos(self, x, y):
+        super().setCursorPos(x, y)
+        self.moves.append((perf_counter(), x))
+
+
+def holdKey(duration: float, onPress) -> int:
+    """Calls `onPress` for the first press of a held key and for its auto-repeats, for `duration` seconds. Returns the number of presses."""
+
+    startedAt, presses = perf_counter(), 0
+    nextPress = startedAt
+
+    while nextPress < startedAt + duration:
+        sleep(max(nextPress - perf_counter(), 0))
+        onPress()
+        presses += 1
+        nextPress += REPEAT_DELAY if presses == 1 else REPEAT_INTERVAL
+
+    sleep(max(startedAt + duration - perf_counter(), 0))
+
+    return presses
+
+
+def summarize(moves: list[tuple[float, int]], startX: int) -> tuple[int, int, int, float, float]:
+    """Returns the moved distance, the number of updates, the largest jump, and the mean and the largest intervals (in milliseconds) between the updates."""
+
+    positions = [startX] + [x for _, x in moves]
+    jumps = [abs(b - a) for a, b in zip(positions, positions[1:])]
+    intervals = [b - a for (a, _), (b, _) in zip(moves, moves[1:])] or [0.0]
+
+    return positions[-1] - startX, len(moves), max(jumps, default=0), sum(intervals) / len(intervals) * 1000, max(intervals) * 1000
+
+
+def runStepping(backend: RecordingBackend, duration: float, distance: int) -> tuple[tuple, int]:
+    """Moves the cursor `distance` pixels on each press, in a new thread. Returns the summary and the number of started threads."""
+
+    threads = []
+
+    def onPress() -> None:
+        thread = threading.Thread(target=msHelper.moveCursor, args=(distance, 0))
+        thread.start()
+        threads.append(thread)
+
+    startX = backend.getCursorPos()[0]
+    backend.moves.clear()
+    holdKey(duration, onPress)
+
+    for thread in threads:
+        thread.join()
+
+    return summarize(backend.moves, startX), len(threads)
+
+
+def runEngine(backend: RecordingBackend, duration: float, rate: float) -> tuple[tuple, int, dict]:
+    """Moves the cursor with the motion engine while the key is held. Returns the summary, the number of started threads, and the engine statistics."""
+
+    engine = CursorMotionEngine(rate)
+    threadsBefore = threading.active_count()
+    startX = backend.getCursorPos()[0]
+    backend.moves.clear()
+
+    holdKey(duration, lambda: engine.press(0xDE, RIGHT, NORMAL))
+    threads = threading.active_count() - threadsBefore
+    engine.release(0xDE)
+    sleep(0.05)
+
+    return summarize(backend.moves, startX), threads, engine.getStats()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks the smoothness of the cursor motion engine against moving the cursor on each key repeat.")
+    parser.add_argument("-d", "--duration", type=float, default=2.0, help="How long the direction key is held, in seconds.")
+    parser.add_argument("-r", "--rate", type=float, default=60.0, help="The frame rate of the motion engine.")
+    parser.add_argument("-s", "--step", type=int, default=40, help="The distance in pixels moved on each key repeat by the stepping runner.")
+    args = parser.parse_args()
+
+    backend = RecordingBackend()
+    pfBackend.setBackend(backend)
+    print(f"Holding a direction key for {args.duration:g} seconds...")
+
+    steppingSummary, steppingThreads = runStepping(backend, args.duration, args.step)
+    engineSummary, engineThreads, stats = runEngine(backend, args.duration, args.rate)
+
+    print(f"\n{'Runner':<18}{'Threads':>9}{'Distance px':>13}{'Updates':>9}{'Max jump px':>13}{'Mean gap ms':>13}{'Max gap ms':>12}")
+
+    for name, summary, threads in (("key repeats", steppingSummary, steppingThreads), ("motion engine", engineSummary, engineThreads)):
+        distance, updates, maxJump, meanGap, maxGap = summary
+        print(f"{name:<18}{threads:>9}{distance:>13}{updates:>9}{maxJump:>13}{meanGap:>13.2f}{maxGap:>12.2f}")
+
+    print(f"\nMotion engine: {stats['frames']} frames at {stats['frameRate']:g} per second, {stats['lateFrames']} late, max lateness {stats['maxLatenessMs']:.3f} ms.")
+    print("(The gaps are the intervals between two cursor updates. The key repeats stall for the auto-repeat delay after the first press.)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Microbenchmark for the keyboard and mouse hook callbacks. Reports how many events per second are turned into `KeyboardEvent`/`MouseEvent` objects.
+
+The extensions must be compiled first (`make compile`). Run from the repository root:
+>>> python benchmarks/eventBenchmark.py [iterations]
+"""
+
+import sys, os, ctypes
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from cythonExtensions.platformBackend.platformBackend import win32con
+from cythonExtensions.hookManager import hookManager as hm
+
+
+def benchmarkKeyboardCallback(iterations: int) -> float:
+    """Returns the number of keyboard events processed per second by `KeyboardHookManager.keyboardCallback`."""
+
+    kbHook = hm.KeyboardHookManager()
+
+    # Using the US tables avoids reading the keyboard layout from the system during the measurement.
+    kbHook.translator.loadTables(*hm.buildUSTables())
+
+    # Letters, digits, and symbols; each one is pressed then released.
+    keys = [hm.KBDLLHOOKSTRUCT(vkey_code, 0, 0, 0, None) for vkey_code in (0x41, 0x53, 0x44, 0x31, 0xBA, 0x20, 0x0D)]
+    events = [(msg, ctypes.addressof(key)) for key in keys for msg in (win32con.WM_KEYDOWN, win32con.WM_KEYUP)]
+
+    start = perf_counter()
+    for _ in range(iterations // len(events)):
+        for msg, lParam in events:
+            kbHook.keyboardCallback(0, msg, lParam)
+
+    return (iterations // len(events)) * len(events) / (perf_counter() - start)
+
+
+def benchmarkMouseCallback(iterations: int) -> float:
+    """Returns the number of mouse events processed per second by `MouseHookManager.mouseCallback`."""
+
+    msHook = hm.MouseHookManager()
+
+    buttons = [hm.MSLLHOOKSTRUCT(hm.POINT(100, 200), mouseData, 0, 0, None) for mouseData in (0, 120 << 16)]
+    events = [(win32con.WM_LBUTTONDOWN, ctypes.addressof(buttons[0])), (win32con.WM_LBUTTONUP, ctypes.addressof(buttons[0])),
+              (win32con.WM_MOUSEWHEEL, ctypes.addressof(buttons[1]))]
+
+    start = perf_counter()
+    for _ in range(iterations // len(events)):
+        for msg, lParam in events:
+            msHook.mouseCallback(0, msg, lParam)
+
+    return (iterations // len(events)) * len(events) / (perf_counter() - start)
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    print(f"Keyboard events/s: {benchmarkKeyboardCallback(iterations):,.0f}")
+    print(f"Mouse events/s:    {benchmarkMouseCallback(iterations):,.0f}")
+
+
+if __name__ == "__main__":
+    main()
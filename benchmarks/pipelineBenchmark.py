@@ -0,0 +1,668 @@
+"""
+Benchmark suite for the keystroke pipeline: `keyboardCallback` → `keyDownFilter` → `textExpansion`/`keyPress` → handler lookup.
+
+Synthetic keystroke streams (plain typing, hotkeys, abbreviations, ScrollLock mode, and a mix of them) are pushed through the real
+hook manager and event listeners, at the maximum or at a controlled rate. The platform calls (hook chaining, key states, foreground window,
+key simulation) go to an in-memory `FakeBackend`, and they and the hotkey actions are replaced with recording stand-ins, so nothing is
+sent to the system and no action is executed; the stand-ins only count their calls. The suite therefore also runs without pywin32.
+
+For each workload, the suite reports the events/s, the p50/p99 latencies of the hook and of the whole pipeline (hook to listener done),
+and the allocations. The results can be stored as JSON baselines, and compared with the results of another build of the extensions.
+
+The extensions must be compiled first (`make compile`). Run from the repository root:
+>>> python benchmarks/pipelineBenchmark.py                                # Runs all the workloads.
+>>> python benchmarks/pipelineBenchmark.py -w typing hotkeys -r 200       # Runs some workloads at 200 events/s.
+>>> python benchmarks/pipelineBenchmark.py --save-baseline before         # Stores the results in `benchmarks/baselines/before.json`.
+>>> python benchmarks/pipelineBenchmark.py --compare before               # Flags the regressions against a stored baseline.
+>>> python benchmarks/pipelineBenchmark.py --journal events.journal      # Also replays a recorded event journal.
+"""
+
+import sys, os, io, json, glob, hashlib, random, ctypes, tracemalloc, argparse, contextlib
+from collections import Counter
+from datetime import datetime as dt
+from time import perf_counter, sleep
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import scriptConfigs as configs
+from cythonExtensions.platformBackend import platformBackend as pfBackend
+from cythonExtensions.platformBackend.platformBackend import win32con, importPlatformModule
+from cythonExtensions.commonUtils.commonUtils import KB_Con as kbcon, ControllerHouse as ctrlHouse, Management as mgmt
+from cythonExtensions.hookManager import hookManager as hm
+from cythonExtensions.hookManager.eventJournal import EventJournalReader
+from cythonExtensions.metricsHelper.metricsHelper import getHistogram, resetHistograms
+from cythonExtensions.eventHandlers import eventHandlers as eh, callbacks as cbs
+from cythonExtensions.keyboardHelper import keyboardHelper as kbHelper
+from cythonExtensions.explorerHelper import explorerHelper as expHelper
+from cythonExtensions.windowHelper.foregroundContext import foregroundContext
+
+
+BASELINES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+"""Where the baselines are stored."""
+
+WORKLOADS = ("typing", "hotkeys", "abbreviations", "scroll", "mixed")
+"""The names of the synthetic workloads."""
+
+# The compared metrics: `name: (higherIsBetter, minimum absolute change to be reported)`.
+# The minimum changes keep the timer resolution and the scheduling jitter from being flagged.
+COMPARED_METRICS = {
+    "eventsPerSec":          (True,  0),
+    "hookEventsPerSec":      (True,  0),
+    "hookP50Ms":             (False, 0.002),
+    "hookP99Ms":             (False, 0.01),
+    "endToEndP50Ms":         (False, 0.01),
+    "endToEndP99Ms":         (False, 0.05),
+    "retainedBytesPerEvent": (False, 16),
+    "peakAllocKiB":          (False, 64),
+}
+
+# The key states carried by the stream events, read by the `GetKeyState`/`GetAsyncKeyState` stand-ins.
+SHIFT_DOWN = 1
+SCROLL_ON  = 2
+
+win32api = importPlatformModule("win32api")
+
+TYPING_TEXT = ("The quick brown fox jumps over the lazy dog. Pack my box with five dozen liquor jugs! "
+               "How vexingly quick daft zebras jump; sphinx of black quartz, judge my vow. "
+               "We meet at 10:30 on the 2nd floor, room 42-B (bring the Q3 report).")
+
+
+# ========================================================================================================================
+#                                                  The recording stand-ins
+# ========================================================================================================================
+
+class NullWriter(io.TextIOBase):
+    """A stdout replacement that discards the written text, so printing does not dominate the measurements."""
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+
+class StandIns:
+    """Holds the call counters and the simulated system state shared by the stand-ins."""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.keyState = 0
+        self.foregroundClass = "Notepad"
+
+    def recorder(self, name: str, returnValue=None):
+        """Returns a function that counts its calls under the given name and returns `returnValue`."""
+
+        calls = self.calls
+
+        def standIn(*args, **kwargs):
+            calls[name] += 1
+            return returnValue
+
+        return standIn
+
+    def getKeyState(self, vkey: int) -> int:
+        self.calls["GetKeyState"] += 1
+        return 1 if vkey == win32con.VK_SCROLL and self.keyState & SCROLL_ON else 0
+
+    def getAsyncKeyState(self, vkey: int) -> int:
+        self.calls["GetAsyncKeyState"] += 1
+        return 0x8000 if vkey == win32con.VK_SHIFT and self.keyState & SHIFT_DOWN else 0
+
+    def getClassName(self, hwnd: int) -> str:
+        self.calls["GetClassName"] += 1
+        return self.foregroundClass
+
+    def threadClass(self):
+        """Returns a `PThread` replacement that records the started actions without running them."""
+
+        calls = self.calls
+
+        class RecordingThread:
+            def __init__(self, target=None, args=(), kwargs=None, name=None, daemon=None):
+                # The hotkeys are started as `runTimedHandler(handler, args, hookTime)`.
+                action = args[0] if target is eh.runTimedHandler else target
+                self.actionName = f"action:{getattr(action, '__qualname__', action)}"
+
+            def start(self):
+                calls[self.actionName] += 1
+
+        return RecordingThread
+
+
+@contextlib.contextmanager
+def installStandIns(standIns: StandIns):
+    """
+    Installs a fake platform backend, and replaces its calls and the actions used by the keystroke pipeline with the given stand-ins.
+    The original backend and actions are restored on exit.
+    """
+
+    backend = pfBackend.FakeBackend()
+
+    replacements = [
+        (backend, "getKeyState", standIns.getKeyState),
+        (backend, "getAsyncKeyState", standIns.getAsyncKeyState),
+        (backend, "getTickCount", standIns.recorder("GetTickCount", 0)),
+        (backend, "getForegroundWindow", standIns.recorder("GetForegroundWindow", 1)),
+        (backend, "getClassName", standIns.getClassName),
+        (backend, "findWindow", standIns.recorder("FindWindow", 0)),
+        (backend, "callNextHook", standIns.recorder("CallNextHookEx", 0)),
+        (kbHelper, "expandText", standIns.recorder("expandText")),
+        (kbHelper, "undoTextExpansion", standIns.recorder("undoTextExpansion")),
+        (kbHelper, "openLocation", standIns.recorder("openLocation")),
+        (kbHelper, "simulateBurstClicks", standIns.recorder("simulateBurstClicks")),
+        (kbHelper, "simulateKeyPress", standIns.recorder("simulateKeyPress")),
+        (expHelper, "getSelectedItemsFromActiveExplorer", standIns.recorder("getSelectedItemsFromActiveExplorer", [])),
+        (os, "system", standIns.recorder("os.system", 0)),
+        (eh, "PThread", standIns.threadClass()),
+        (mgmt, "silent", True),
+    ]
+
+    originals = [(owner, name, getattr(owner, name)) for owner, name, _ in replacements]
+    previousBackend = pfBackend.setBackend(backend)
+
+    try:
+        for owner, name, replacement in replacements:
+            setattr(owner, name, replacement)
+
+        # The foreground window is read once, then kept by the foreground hook like in the script.
+        foregroundContext.start()
+
+        with contextlib.redirect_stdout(NullWriter()):
+            yield standIns
+
+    finally:
+        foregroundContext.stop()
+
+        for owner, name, original in originals:
+            setattr(owner, name, original)
+
+        pfBackend.setBackend(previousBackend)
+
+
+# ========================================================================================================================
+#                                                  The synthetic workloads
+# ========================================================================================================================
+
+MODIFIER_KEYS = ((ctrlHouse.CTRL, win32con.VK_LCONTROL), (ctrlHouse.SHIFT, win32con.VK_LSHIFT), (ctrlHouse.ALT, win32con.VK_LMENU),
+                 (ctrlHouse.WIN, win32con.VK_LWIN), (ctrlHouse.FN, 255), (ctrlHouse.BACKTICK, kbcon.VK_BACKTICK))
+"""The modifier flags and the keys that set them, in the order they are pressed."""
+
+
+def buildCharMap() -> dict[str, tuple[int, bool]]:
+    """Maps the printable characters of the US layout to the `(vkey, shiftPressed)` that type them, using the tables of the hook."""
+
+    translator = hm.KeyTranslator()
+    translator.loadTables(*hm.buildUSTables())
+
+    charMap = {" ": (win32con.VK_SPACE, False)}
+    for shiftPressed in (False, True):
+        for vkey in range(1, 256):
+            ascii = translator.translate(vkey, shiftPressed, False)[0]
+
+            if 32 < ascii < 127:
+                charMap.setdefault(chr(ascii), (vkey, shiftPressed))
+
+    return charMap
+
+
+def pressKeys(stream: list, keys: list[int], state: int) -> None:
+    """Appends the events of pressing the given keys in order then releasing them in reverse order."""
+
+    for vkey in keys:
+        stream.append((win32con.WM_KEYDOWN, vkey, state))
+
+    for vkey in reversed(keys):
+        stream.append((win32con.WM_KEYUP, vkey, state))
+
+
+def typeText(stream: list, text: str, charMap: dict, state=0) -> None:
+    """Appends the events of typing the given text. The characters that the US layout cannot type are skipped."""
+
+    for char in text:
+        key = charMap.get(char)
+        if key is None:
+            continue
+
+        if key[1]:
+            pressKeys(stream, [win32con.VK_LSHIFT, key[0]], state | SHIFT_DOWN)
+        else:
+            pressKeys(stream, [key[0]], state)
+
+
+def pressHotkey(stream: list, trigger: tuple[int, int], state=0) -> None:
+    """Appends the events of pressing the given `(modifiers, vkey)` trigger."""
+
+    modifiers, vkey = trigger
+    keys = [modifierKey for flag, modifierKey in MODIFIER_KEYS if modifiers & flag] + [vkey]
+
+    pressKeys(stream, keys, state | (SHIFT_DOWN if modifiers & ctrlHouse.SHIFT else 0))
+
+
+def typingWorkload(rng: random.Random, eventCount: int, charMap: dict) -> list:
+    """Plain typing with some typos corrected with backspace."""
+
+    stream = []
+    words = TYPING_TEXT.split(" ")
+
+    while len(stream) < eventCount:
+        typeText(stream, rng.choice(words) + " ", charMap)
+
+        if rng.random() < 0.05:
+            pressKeys(stream, [win32con.VK_BACK], 0)
+
+    return stream
+
+
+def hotkeysWorkload(rng: random.Random, eventCount: int, charMap: dict) -> list:
+    """The hotkeys defined in `callbacks`, including the explorer ones, plus some unbound modifier combinations."""
+
+    stream = []
+    triggers = list(cbs.kbEventHandlers) + list(cbs.kbEventHandlersWithExplorerFocus)
+    triggers += [(ctrlHouse.CTRL, vkey) for vkey in range(0x41, 0x5B)]
+
+    while len(stream) < eventCount:
+        pressHotkey(stream, rng.choice(triggers))
+
+    return stream
+
+
+def abbreviationsWorkload(rng: random.Random, eventCount: int, charMap: dict) -> list:
+    """Typing where most words are abbreviations that get expanded, and some of the expansions are undone."""
+
+    stream = []
+    abbreviations = list(ctrlHouse.abbreviations) + list(ctrlHouse.non_prefixed_abbreviations) + list(ctrlHouse.locations)
+    words = TYPING_TEXT.split(" ")
+
+    while len(stream) < eventCount:
+        if abbreviations and rng.random() < 0.7:
+            typeText(stream, rng.choice(abbreviations), charMap)
+
+            if rng.random() < 0.1:
+                pressKeys(stream, [win32con.VK_BACK], 0)
+
+            pressKeys(stream, [win32con.VK_SPACE], 0)
+
+        else:
+            typeText(stream, rng.choice(words) + " ", charMap)
+
+    return stream
+
+
+def scrollWorkload(rng: random.Random, eventCount: int, charMap: dict) -> list:
+    """ScrollLock mode (mouse control from the keyboard): the hotkeys of `callbacks.kbEventHandlersWithSCROLL_On`, held and repeated."""
+
+    stream = []
+    triggers = list(cbs.kbEventHandlersWithSCROLL_On) or [(0, win32con.VK_UP)]
+
+    while len(stream) < eventCount:
+        modifiers, vkey = rng.choice(triggers)
+        keys = [modifierKey for flag, modifierKey in MODIFIER_KEYS if modifiers & flag]
+        state = SCROLL_ON | (SHIFT_DOWN if modifiers & ctrlHouse.SHIFT else 0)
+
+        # The movement keys are usually held down, which repeats their key down events.
+        for key in keys:
+            stream.append((win32con.WM_KEYDOWN, key, state))
+
+        stream.extend([(win32con.WM_KEYDOWN, vkey, state)] * rng.randint(1, 8))
+        stream.append((win32con.WM_KEYUP, vkey, state))
+
+        for key in reversed(keys):
+            stream.append((win32con.WM_KEYUP, key, state))
+
+    return stream
+
+
+def mixedWorkload(rng: random.Random, eventCount: int, charMap: dict) -> list:
+    """A realistic mix: mostly typing, with some hotkeys, abbreviations, and short ScrollLock sessions."""
+
+    stream = []
+    workloads = (typingWorkload, hotkeysWorkload, abbreviationsWorkload, scrollWorkload)
+
+    while len(stream) < eventCount:
+        stream.extend(rng.choices(workloads, weights=(70, 12, 12, 6))[0](rng, 20, charMap))
+
+    return stream
+
+
+WORKLOAD_BUILDERS = dict(zip(WORKLOADS, (typingWorkload, hotkeysWorkload, abbreviationsWorkload, scrollWorkload, mixedWorkload)))
+
+FOREGROUND_CLASSES = {"hotkeys": "CabinetWClass"}
+"""The simulated foreground window class of each workload. The explorer hotkeys only fire when an explorer window is focused."""
+
+
+# ========================================================================================================================
+#                                                  Running the workloads
+# ========================================================================================================================
+
+def createKeyboardHook(queueSize: int) -> hm.KeyboardHookManager:
+    """Creates a keyboard hook manager with the same listeners as `scriptRunner`."""
+
+    kbHook = hm.KeyboardHookManager(configs.LISTENER_WORKER_COUNT, queueSize, configs.HOOK_TIME_BUDGET_MS)
+
+    # Using the US tables avoids reading the keyboard layout from the system during the measurement.
+    kbHook.translator.loadTables(*hm.buildUSTables())
+    kbHook.translator.followLayout = False
+
+    kbHook.keyDownFilter.callback = eh.keyDownFilter
+    kbHook.keyDownListeners.extend((eh.textExpansion, eh.keyPress))
+    kbHook.keyUpListeners.append(eh.keyRelease)
+    kbHook.dispatcher.pinListener(eh.textExpansion, 0)
+    kbHook.dispatcher.pinListener(eh.keyPress, 1)
+    kbHook.dispatcher.pinListener(eh.keyRelease, 1)
+
+    return kbHook
+
+
+def resetPipelineState(kbHook: hm.KeyboardHookManager) -> None:
+    """Clears the state left by the previous workload."""
+
+    hm.markKeyboardStateStale()
+    ctrlHouse.pressed_chars = ""
+    ctrlHouse.pressed_chars_backup = ""
+    eh.compileTextMatcher()
+    ctrlHouse.burstClicksActive = False
+    mgmt.isBacktickTheOnlyModiferPressed = False
+
+    kbHook.dispatcher.resetStats()
+    resetHistograms()
+
+
+def waitForListeners(kbHook: hm.KeyboardHookManager, timeout=60.0) -> None:
+    """Waits until the listeners have handled all the dispatched events."""
+
+    completions = getHistogram(f"{kbHook.dispatcher.name}.hookToListenerDone")
+    deadline = perf_counter() + timeout
+
+    # Every delivered event records its completion after its listener returns.
+    while kbHook.dispatcher.queueDepth() or completions.count < kbHook.dispatcher.deliveredEvents:
+        if perf_counter() > deadline:
+            print("➤ Warning! Timed out waiting for the listeners to finish.")
+            return
+
+        sleep(0.0005)
+
+
+def feedStream(kbHook: hm.KeyboardHookManager, standIns: StandIns, events: list, rate: float) -> float:
+    """Pushes the events through `keyboardCallback`, at the given rate (0 = as fast as possible). Returns the feeding time."""
+
+    callback = kbHook.keyboardCallback
+    interval = 1 / rate if rate > 0 else 0.0
+
+    startedAt = nextAt = perf_counter()
+
+    for wParam, lParam, keyState in events:
+        if interval:
+            nextAt += interval
+
+            # Busy waiting, `sleep` is too coarse for the typical rates.
+            while perf_counter() < nextAt:
+                pass
+
+        # The hook tracks the lock keys from their events, so a lock state set by the stream is a change it has to read.
+        if (keyState ^ standIns.keyState) & SCROLL_ON:
+            hm.markKeyboardStateStale()
+
+        standIns.keyState = keyState
+        callback(0, wParam, lParam)
+
+    return perf_counter() - startedAt
+
+
+def toHookEvents(stream: list, structs: dict) -> list:
+    """Converts the `(wParam, vkey, keyState)` stream to `(wParam, lParam, keyState)` with pointers to `KBDLLHOOKSTRUCT`s."""
+
+    events = []
+    for wParam, vkey, keyState in stream:
+        if vkey not in structs:
+            # The time is left as 0 so the hook does not measure the (meaningless) OS to hook latency.
+            scanCode = win32api.MapVirtualKey(vkey, 0) if pfBackend.IS_WIN32_AVAILABLE and vkey < 255 else 0
+            structs[vkey] = hm.KBDLLHOOKSTRUCT(vkey, scanCode, 0, 0, None)
+
+        events.append((wParam, ctypes.addressof(structs[vkey]), keyState))
+
+    return events
+
+
+def collectLatencies(kbHook: hm.KeyboardHookManager) -> dict:
+    """Returns the latency percentiles of the hook, the suppression decision, and the whole pipeline."""
+
+    hook = getHistogram("keyboard.hook").summary()
+    decision = getHistogram("keyboard.decision").summary()
+    endToEnd = getHistogram(f"{kbHook.dispatcher.name}.hookToListenerDone").summary()
+
+    return {
+        "hookP50Ms":       hook["p50Ms"],
+        "hookP99Ms":       hook["p99Ms"],
+        "decisionP99Ms":   decision["p99Ms"],
+        "endToEndP50Ms":   endToEnd["p50Ms"],
+        "endToEndP99Ms":   endToEnd["p99Ms"],
+        "endToEndMaxMs":   endToEnd["maxMs"],
+    }
+
+
+def measureAllocations(run, eventCount: int) -> dict:
+    """Runs the given function under `tracemalloc` and returns its peak and retained allocations."""
+
+    tracemalloc.start()
+    startSize = tracemalloc.get_traced_memory()[0]
+
+    try:
+        run()
+        currentSize, peakSize = tracemalloc.get_traced_memory()
+
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "peakAllocKiB":          round((peakSize - startSize) / 1024, 1),
+        "retainedBytesPerEvent": round(max(currentSize - startSize, 0) / max(eventCount, 1), 1),
+    }
+
+
+def runWorkload(stream: list, rate: float, foregroundClass="Notepad") -> dict:
+    """Runs a synthetic workload: a timing pass followed by a shorter allocations pass. Returns its results."""
+
+    standIns = StandIns()
+    standIns.foregroundClass = foregroundClass
+    structs = {}
+    events = toHookEvents(stream, structs)
+
+    # The queues are large enough for the whole stream, so no event is dropped when feeding at the maximum rate.
+    kbHook = createKeyboardHook(max(len(events), configs.LISTENER_QUEUE_SIZE))
+
+    with installStandIns(standIns):
+        # A short warmup, to start the workers and fill the freelists.
+        feedStream(kbHook, standIns, events[:500], 0)
+        waitForListeners(kbHook)
+        resetPipelineState(kbHook)
+        standIns.calls.clear()
+
+        startedAt = perf_counter()
+        feedTime = feedStream(kbHook, standIns, events, rate)
+        waitForListeners(kbHook)
+        totalTime = perf_counter() - startedAt
+
+        latencies = collectLatencies(kbHook)
+        dispatcherStats = kbHook.dispatcher.getStats()
+        calls = dict(standIns.calls.most_common())
+
+        allocationEvents = events[:5000]
+
+        def allocationsPass():
+            feedStream(kbHook, standIns, allocationEvents, rate)
+            waitForListeners(kbHook)
+
+        resetPipelineState(kbHook)
+        allocations = measureAllocations(allocationsPass, len(allocationEvents))
+
+    kbHook.dispatcher.stop()
+
+    return {
+        "events":           len(events),
+        "rate":             rate,
+        "eventsPerSec":     round(len(events) / totalTime),
+        "hookEventsPerSec": round(len(events) / feedTime),
+        **latencies,
+        **allocations,
+        "droppedEvents":    dispatcherStats["droppedEvents"],
+        "standInCalls":     calls,
+    }
+
+
+def runJournal(filePath: str) -> dict:
+    """Replays a recorded event journal through `processKeyboardEvent` as fast as possible. Returns its results."""
+
+    standIns = StandIns()
+    reader = EventJournalReader(filePath)
+    kbHook = createKeyboardHook(max(reader.count, configs.LISTENER_QUEUE_SIZE))
+
+    try:
+        with installStandIns(standIns):
+            resetPipelineState(kbHook)
+
+            startedAt = perf_counter()
+            replayed = reader.replay(kbHook)
+            feedTime = perf_counter() - startedAt
+            waitForListeners(kbHook)
+            totalTime = perf_counter() - startedAt
+
+            latencies = collectLatencies(kbHook)
+            dispatcherStats = kbHook.dispatcher.getStats()
+
+    finally:
+        reader.close()
+        kbHook.dispatcher.stop()
+
+    return {
+        "events":           replayed,
+        "rate":             0,
+        "eventsPerSec":     round(replayed / totalTime) if replayed else 0,
+        "hookEventsPerSec": round(replayed / feedTime) if replayed else 0,
+        **latencies,
+        "droppedEvents":    dispatcherStats["droppedEvents"],
+        "standInCalls":     dict(standIns.calls.most_common()),
+    }
+
+
+# ========================================================================================================================
+#                                                  Baselines and regressions
+# ========================================================================================================================
+
+def getBuildId() -> str:
+    """Returns a short hash of the compiled extensions, identifying the build that produced the results."""
+
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "cythonExtensions")
+    digest = hashlib.sha1()
+
+    for filePath in sorted(glob.glob(os.path.join(root, "**", "*.pyd"), recursive=True) + glob.glob(os.path.join(root, "**", "*.so"), recursive=True)):
+        digest.update(os.path.basename(filePath).encode())
+
+        with open(filePath, "rb") as extension:
+            digest.update(extension.read())
+
+    return digest.hexdigest()[:12]
+
+
+def compareResults(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Returns a description of each metric that got worse than the baseline by more than `threshold` percent."""
+
+    regressions = []
+
+    for workload, metrics in results["workloads"].items():
+        baseMetrics = baseline["workloads"].get(workload)
+        if baseMetrics is None:
+            continue
+
+        if baseMetrics["events"] != metrics["events"] or baseMetrics["rate"] != metrics["rate"]:
+            print(f"➤ Warning! The '{workload}' workload was run with different parameters than the baseline; skipping it.")
+            continue
+
+        for metric, (higherIsBetter, minChange) in COMPARED_METRICS.items():
+            if metric not in metrics or metric not in baseMetrics or not baseMetrics[metric]:
+                continue
+
+            old, new = baseMetrics[metric], metrics[metric]
+            change = (new - old) / old * 100
+            worse = -change if higherIsBetter else change
+
+            if worse > threshold and abs(new - old) > minChange:
+                regressions.append(f"{workload}.{metric}: {old:,} → {new:,} ({change:+.1f}%)")
+
+    return regressions
+
+
+def printResults(results: dict) -> None:
+    """Prints the results as a table."""
+
+    print(f"Build {results['build']} | Python {results['python']} | {results['timestamp']}\n")
+    print(f"{'Workload':<15} {'Events':>8} {'Events/s':>10} {'Hook ev/s':>10} {'Hook P50':>9} {'Hook P99':>9} "
+          f"{'E2E P50':>9} {'E2E P99':>9} {'Peak KiB':>9} {'B/event':>8} {'Dropped':>8}")
+
+    for workload, metrics in results["workloads"].items():
+        print(f"{workload:<15} {metrics['events']:>8} {metrics['eventsPerSec']:>10,} {metrics['hookEventsPerSec']:>10,} "
+              f"{metrics['hookP50Ms']:>9.3f} {metrics['hookP99Ms']:>9.3f} {metrics['endToEndP50Ms']:>9.3f} {metrics['endToEndP99Ms']:>9.3f} "
+              f"{metrics.get('peakAllocKiB', 0):>9} {metrics.get('retainedBytesPerEvent', 0):>8} {metrics['droppedEvents']:>8}")
+
+    print("(The latencies are in milliseconds. E2E is from the hook receiving a key to its listener finishing.)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the keystroke pipeline of the keyboard hook.")
+    parser.add_argument("-w", "--workloads", nargs="+", choices=WORKLOADS, default=list(WORKLOADS), help="The workloads to run.")
+    parser.add_argument("-n", "--events", type=int, default=20_000, help="The number of key events of each workload.")
+    parser.add_argument("-r", "--rate", type=float, default=0, help="The feeding rate in events/s. 0 feeds as fast as possible.")
+    parser.add_argument("-s", "--seed", type=int, default=42, help="The seed of the generated streams.")
+    parser.add_argument("--journal", help="An event journal to replay as an extra workload.")
+    parser.add_argument("--save-baseline", metavar="NAME", help="Stores the results in `benchmarks/baselines/NAME.json`.")
+    parser.add_argument("--compare", metavar="NAME", help="Compares the results with a stored baseline (a name or a JSON file).")
+    parser.add_argument("--threshold", type=float, default=10.0, help="The percentage by which a metric must get worse to be flagged.")
+    parser.add_argument("-o", "--output", help="Writes the results to the given JSON file.")
+    args = parser.parse_args()
+
+    charMap = buildCharMap()
+    results = {
+        "build":     getBuildId(),
+        "python":    sys.version.split()[0],
+        "timestamp": dt.now().isoformat(timespec="seconds"),
+        "workloads": {},
+    }
+
+    for workload in args.workloads:
+        print(f"Running the '{workload}' workload...")
+        stream = WORKLOAD_BUILDERS[workload](random.Random(args.seed), args.events, charMap)[:args.events]
+        results["workloads"][workload] = runWorkload(stream, args.rate, FOREGROUND_CLASSES.get(workload, "Notepad"))
+
+    if args.journal:
+        print(f"Replaying the journal '{args.journal}'...")
+        results["workloads"]["journal"] = runJournal(args.journal)
+
+    print()
+    printResults(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as outputFile:
+            json.dump(results, outputFile, indent=4)
+
+    if args.save_baseline:
+        os.makedirs(BASELINES_DIR, exist_ok=True)
+
+        with open(os.path.join(BASELINES_DIR, f"{args.save_baseline}.json"), "w", encoding="utf-8") as baselineFile:
+            json.dump(results, baselineFile, indent=4)
+
+        print(f"\nSaved the baseline '{args.save_baseline}'.")
+
+    if args.compare:
+        baselinePath = args.compare if args.compare.endswith(".json") else os.path.join(BASELINES_DIR, f"{args.compare}.json")
+
+        with open(baselinePath, encoding="utf-8") as baselineFile:
+            baseline = json.load(baselineFile)
+
+        regressions = compareResults(results, baseline, args.threshold)
+        print(f"\nCompared with the build {baseline['build']} ({baseline['timestamp']}):")
+
+        if regressions:
+            print("\n".join(f"  ➤ Regression: {regression}" for regression in regressions))
+            sys.exit(1)
+
+        print(f"  No regressions above {args.threshold}%.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark for the snippet library (`snippetLibrary.SnippetLibrary`): the memory kept resident and the lookup latency, compared with
+keeping the same snippets in a `dict` like `ControllerHouse.abbreviations`.
+
+A synthetic library is generated (mostly short expansions, and some multi-kilobyte ones), imported into a temporary database, and
+looked up with random aliases. The lookups of the aliases that are not in the LRU cache read the database (cold), the others do not (warm).
+
+The extensions must be compiled first (`make compile`). Run from the repository root:
+>>> python benchmarks/snippetLibraryBenchmark.py                      # 50k snippets.
+>>> python benchmarks/snippetLibraryBenchmark.py -n 200000 -l 5000    # 200k snippets, 5000 lookups.
+"""
+
+import sys, os, random, tempfile, tracemalloc, argparse
+from time import perf_counter, perf_counter_ns
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from cythonExtensions.keyboardHelper.snippetLibrary import SnippetLibrary
+
+
+WORDS = "the quick brown fox jumps over lazy dog lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor".split()
+"""The words of the generated expansions."""
+
+
+def generateSnippets(count: int, longRatio: float, seed=42) -> dict[str, str]:
+    """Returns `count` aliases and their expansions. `longRatio` of them are 1-8 KiB long, and the rest are 20-120 characters long."""
+
+    rng = random.Random(seed)
+    snippets = {}
+
+    for index in range(count):
+        length = rng.randint(1024, 8192) if rng.random() < longRatio else rng.randint(20, 120)
+        words = []
+
+        while sum(map(len, words)) + len(words) < length:
+            words.append(rng.choice(WORDS))
+
+        snippets[f":s{index}"] = " ".join(words)[:length]
+
+    return snippets
+
+
+def measureAllocation(function) -> tuple[object, int]:
+    """Returns the result of `function()`, and the bytes it left allocated."""
+
+    tracemalloc.start()
+    result = function()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return result, size
+
+
+def openLibrary(filePath: str, cacheSize: int) -> SnippetLibrary:
+    """Returns the opened library."""
+
+    library = SnippetLibrary(filePath, cacheSize)
+    library.open()
+
+    return library
+
+
+def percentiles(samples: list[int]) -> tuple[float, float]:
+    """Returns the p50 and p99 of the given latencies (in ns), in microseconds."""
+
+    samples = sorted(samples)
+
+    return samples[len(samples) // 2] / 1000, samples[min(len(samples) - 1, len(samples) * 99 // 100)] / 1000
+
+
+def timeLookups(lookup, aliases: list[str]) -> list[int]:
+    """Returns the latencies of looking up each alias, in ns."""
+
+    latencies = []
+
+    for alias in aliases:
+        start = perf_counter_ns()
+        lookup(alias)
+        latencies.append(perf_counter_ns() - start)
+
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks the memory use and the lookup latency of the snippet library.")
+    parser.add_argument("-n", "--snippets", type=int, default=50_000, help="The number of generated snippets.")
+    parser.add_argument("-l", "--lookups", type=int, default=2000, help="The number of measured lookups.")
+    parser.add_argument("--long-ratio", type=float, default=0.05, help="The ratio of the multi-kilobyte expansions.")
+    parser.add_argument("--cache-size", type=int, default=256, help="The size of the LRU cache of the library.")
+    args = parser.parse_args()
+
+    print(f"Generating {args.snippets:,} snippets...")
+
+    # The memory of the `dict`, as kept by `ControllerHouse.abbreviations`.
+    snippets, tableBytes = measureAllocation(lambda: generateSnippets(args.snippets, args.long_ratio))
+    textBytes = sum(len(body.encode("utf-8")) for body in snippets.values())
+
+    with tempfile.TemporaryDirectory() as directory:
+        filePath = os.path.join(directory, "snippets.db")
+
+        start = perf_counter()
+        SnippetLibrary(filePath).importSnippets(snippets)
+        importSeconds = perf_counter() - start
+
+        library, libraryBytes = measureAllocation(lambda: openLibrary(filePath, args.cache_size))
+
+        rng = random.Random(7)
+        aliases = list(snippets)
+        coldAliases = rng.sample(aliases, min(args.lookups, len(aliases)))
+        warmAliases = [rng.choice(coldAliases[-args.cache_size:]) for _ in range(args.lookups)]
+
+        cold = timeLookups(library.get, coldAliases)
+        warm = timeLookups(library.get, warmAliases)
+        dictionary = timeLookups(snippets.get, warmAliases)
+
+        assert all(library.get(alias) == snippets[alias] for alias in coldAliases[:100]), "The library returned a wrong expansion."
+
+        databaseBytes = os.path.getsize(filePath)
+        library.close()
+
+    print(f"\nSnippets: {args.snippets:,} | Expansion text: {textBytes / 2**20:,.1f} MiB | Database: {databaseBytes / 2**20:,.1f} MiB | Import: {importSeconds:.2f} s\n")
+    print(f"{'Store':<22}{'Resident MiB':>14}{'Lookup P50 us':>16}{'Lookup P99 us':>16}")
+    print(f"{'dict':<22}{tableBytes / 2**20:>14.2f}{percentiles(dictionary)[0]:>16.2f}{percentiles(dictionary)[1]:>16.2f}")
+    print(f"{'library (cold)':<22}{libraryBytes / 2**20:>14.2f}{percentiles(cold)[0]:>16.2f}{percentiles(cold)[1]:>16.2f}")
+    print(f"{'library (warm, LRU)':<22}{'':>14}{percentiles(warm)[0]:>16.2f}{percentiles(warm)[1]:>16.2f}")
+    print("(The resident memory of the library is its aliases. The cold lookups read and decompress the expansion.)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark for the timeline scheduler (`timelineHelper.TimelineScheduler`): the timing accuracy of many concurrent timed sequences,
+compared with running each sequence in its own thread that sleeps between the steps (the way `simulateKeyPressSequence` used to).
+
+Each sequence has `steps` steps, `interval` seconds apart. The steps only record the time they run at, so the results measure the timing
+alone: the lateness of each step from its due time (jitter), the drift of the last step, and the number of threads used.
+
+The extensions must be compiled first (`make compile`). Run from the repository root:
+>>> python benchmarks/timelineBenchmark.py                          # 50 sequences of 20 steps, 20 ms apart.
+>>> python benchmarks/timelineBenchmark.py -s 200 -n 50 -i 0.005    # 200 sequences of 50 steps, 5 ms apart.
+"""
+
+import sys, os, threading, argparse
+from time import perf_counter, sleep
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from cythonExtensions.timelineHelper.timelineHelper import Timeline, TimelineScheduler
+
+
+def percentiles(samples: list[float]) -> tuple[float, float, float]:
+    """Returns the p50, p99, and maximum of the given latencies (in seconds), in milliseconds."""
+
+    samples = sorted(samples)
+
+    return samples[len(samples) // 2] * 1000, samples[min(len(samples) - 1, len(samples) * 99 // 100)] * 1000, samples[-1] * 1000
+
+
+def runSleeping(sequences: int, steps: int, interval: float) -> tuple[list[float], list[float], int]:
+    """Runs each sequence in a thread that sleeps between its steps. Returns the lateness of the steps, the drift of the last ones, and the thread count."""
+
+    lateness, drifts = [], []
+    lock = threading.Lock()
+
+    def sequence(startedAt: float) -> None:
+        times = []
+
+        for index in range(steps):
+            times.append(perf_counter())
+
+            if index < steps - 1:
+                sleep(interval)
+
+        with lock:
+            lateness.extend(time - (startedAt + index * interval) for index, time in enumerate(times))
+            drifts.append(times[-1] - (startedAt + (steps - 1) * interval))
+
+    threads = [threading.Thread(target=sequence, args=(perf_counter(),)) for _ in range(sequences)]
+    peakThreads = threading.active_count() + len(threads)
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    return lateness, drifts, peakThreads
+
+
+def runScheduled(sequences: int, steps: int, interval: float) -> tuple[list[float], list[float], int, dict]:
+    """Runs the sequences as timelines of one scheduler. Returns the lateness of the steps, the drift of the last ones, the thread count, and the scheduler statistics."""
+
+    scheduler = TimelineScheduler()
+    records = []
+    timelines = []
+
+    for _ in range(sequences):
+        times = []
+        timeline = Timeline("benchmark")
+
+        for index in range(steps):
+            timeline.at(index * interval, lambda times=times: times.append(perf_counter()))
+
+        records.append(times)
+        timelines.append(scheduler.schedule(timeline))
+
+    peakThreads = threading.active_count()
+
+    for timeline in timelines:
+        timeline.wait()
+
+    lateness, drifts = [], []
+
+    for timeline, times in zip(timelines, records):
+        lateness.extend(time - (timeline.startedAt + index * interval) for index, time in enumerate(times))
+        drifts.append(times[-1] - (timeline.startedAt + (steps - 1) * interval))
+
+    return lateness, drifts, peakThreads, scheduler.getStats()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks the timing accuracy of the timeline scheduler against sleeping threads.")
+    parser.add_argument("-s", "--sequences", type=int, default=50, help="The number of concurrent sequences.")
+    parser.add_argument("-n", "--steps", type=int, default=20, help="The number of steps of each sequence.")
+    parser.add_argument("-i", "--interval", type=float, default=0.02, help="The time in seconds between the steps of a sequence.")
+    args = parser.parse_args()
+
+    print(f"Running {args.sequences} sequences of {args.steps} steps, {args.interval * 1000:g} ms apart...")
+
+    sleepingLateness, sleepingDrifts, sleepingThreads = runSleeping(args.sequences, args.steps, args.interval)
+    scheduledLateness, scheduledDrifts, scheduledThreads, stats = runScheduled(args.sequences, args.steps, args.interval)
+
+    print(f"\n{'Runner':<20}{'Threads':>9}{'Late P50 ms':>14}{'Late P99 ms':>14}{'Late max ms':>14}{'Drift P50 ms':>15}")
+
+    for name, lateness, drifts, threads in (("sleeping threads", sleepingLateness, sleepingDrifts, sleepingThreads),
+                                            ("timeline scheduler", scheduledLateness, scheduledDrifts, scheduledThreads)):
+        print(f"{name:<20}{threads:>9}" + "".join(f"{value:>14.3f}" for value in percentiles(lateness)) + f"{percentiles(drifts)[0]:>15.3f}")
+
+    print(f"\nScheduler: {stats['executedSteps']:,} steps, {stats['failedSteps']} failed, {stats['completedTimelines']} timelines completed.")
+    print("(The lateness is the delay between the due time of a step and the time it ran. The drift is the lateness of the last step of a sequence.)")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,9 @@ def main():
     
     import sys, os
     
+    # The relative paths in the arguments are relative to where the script was started from.
+    workingDirectory = os.getcwd()
+    
     # Changing the working directory to where this script is.
     os.chdir(os.path.dirname(__file__))
     
@@ -20,7 +23,14 @@ def main():
     from cythonExtensions.systemHelper import systemHelper as sysHelper
     
     
-    if len(sys.argv) > 1 and any(arg in ("-e", "--elevated") for arg in sys.argv) and not sysHelper.isProcessElevated(-1):
+    # Importing a snippet file into the snippet library: `--import-snippets <file> [--replace]`.
+    if len(sys.argv) > 2 and sys.argv[1] == "--import-snippets":
+        from cythonExtensions.keyboardHelper.snippetLibrary import snippetLibrary
+        
+        count = snippetLibrary.importFile(os.path.abspath(os.path.join(workingDirectory, sys.argv[2])), replace="--replace" in sys.argv)
+        print(f"Imported {count} snippets into '{snippetLibrary.filePath}'. The library has {len(snippetLibrary)} snippets.")
+    
+    elif len(sys.argv) > 1 and any(arg in ("-e", "--elevated") for arg in sys.argv) and not sysHelper.isProcessElevated(-1):
         sysHelper.startWithElevatedPrivileges(terminate=False, cmder=True)
     
     elif len(sys.argv) > 1 and sys.argv[1] in ("-p", "--profile", "--prof"):
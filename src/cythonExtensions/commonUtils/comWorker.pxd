@@ -0,0 +1,14 @@
+cdef class ComWorker:
+    cdef str name
+    cdef long long completedCalls, failedCalls, createdObjects, releasedObjects
+    cdef dict objects
+    cdef long threadId
+    cdef object requests, lock, thread
+    
+    cpdef bint inWorker(self)
+    
+    cpdef void dropObject(self, key)
+    
+    cdef void dropIdleObjects(self)
+    
+    cpdef dict getStats(self)
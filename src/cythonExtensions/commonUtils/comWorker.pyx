@@ -0,0 +1,241 @@
+# cython: language_level = 3str
+
+"""
+This extension module runs the COM automation calls (the `Shell.Application` windows, the WMI queries, and the Office applications) on long-lived worker threads.
+
+Each worker initializes COM once, and owns the automation objects created on it: they are created once, reused by the next calls, and
+released in the same apartment. The other threads submit functions through a queue and get back `concurrent.futures.Future` objects,
+so the hotkey threads no longer initialize and uninitialize COM, or build new automation objects, on each call.
+"""
+
+import functools, queue, threading
+from concurrent.futures import Future
+from time import perf_counter
+from traceback import format_exc
+
+from cythonExtensions.commonUtils.commonUtils import PThread, Management as mgmt
+from cythonExtensions.platformBackend import platformBackend as pfBackend
+
+
+cdef class ComWorker:
+    """
+    Description:
+        A thread that runs the submitted functions in order, in its COM apartment. It is started with the first request, and stops
+        (cancelling the pending requests and releasing its objects) when `Management.terminateEvent` is set or `shutdown` is called.
+        
+        >>> windows = comWorker.call(lambda: shellApplication().Windows().Count)
+    ---
+    Parameters:
+        `name -> str`: The name of the worker thread.
+    ---
+    Attributes:
+        `completedCalls -> int` / `failedCalls -> int`: The number of the calls that returned and that raised an exception.
+        
+        `createdObjects -> int` / `releasedObjects -> int`: The number of the automation objects created and released by `getObject`.
+    """
+    
+    cdef public str name
+    cdef public long long completedCalls, failedCalls, createdObjects, releasedObjects
+    cdef dict objects
+    cdef long threadId
+    cdef object requests, lock, thread
+    
+    def __init__(self, str name="comWorker"):
+        self.name = name
+        self.completedCalls = self.failedCalls = self.createdObjects = self.releasedObjects = 0
+        self.objects = {}
+        self.threadId = 0
+        self.requests = queue.SimpleQueue()
+        self.lock = threading.Lock()
+        self.thread = None
+    
+    @property
+    def running(self) -> bool:
+        """Whether the worker thread is running."""
+        
+        return self.thread is not None
+    
+    cpdef bint inWorker(self):
+        """Returns whether the calling thread is the worker thread."""
+        
+        return threading.get_ident() == self.threadId
+    
+    def submit(self, function, *args, **kwargs) -> Future:
+        """Queues a call of `function(*args, **kwargs)` on the worker thread, and returns its future."""
+        
+        future = Future()
+        
+        with self.lock:
+            if self.thread is None:
+                self.thread = PThread(target=self.workerLoop, name=self.name, daemon=True)
+                self.thread.start()
+            
+            self.requests.put((future, function, args, kwargs))
+        
+        return future
+    
+    def call(self, function, *args, **kwargs):
+        """Runs `function(*args, **kwargs)` on the worker thread, waits for it, and returns its result or raises its exception. On the worker thread itself, it is called at once."""
+        
+        if self.inWorker():
+            return function(*args, **kwargs)
+        
+        return self.submit(function, *args, **kwargs).result()
+    
+    def wrap(self, function):
+        """A decorator that makes each call of `function` run on the worker thread (with `call`)."""
+        
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            return self.call(function, *args, **kwargs)
+        
+        return wrapper
+    
+    def getObject(self, key, factory, release=None, double idleTimeout=0.0):
+        """
+        Description:
+            Returns the automation object stored under `key`, after creating it with `factory()` if there is none. Must be called on the worker thread.
+        ---
+        Parameters:
+            `release -> Callable[[object], Any] | None`: Called with the object when it is dropped, e.g., to quit an Office application.
+            
+            `idleTimeout -> float`: The object is dropped after it is not used for this many seconds. `0` keeps it until the worker stops.
+        """
+        
+        if not self.inWorker():
+            raise RuntimeError(f'The automation objects of "{self.name}" can only be used on its thread.')
+        
+        cdef list entry = self.objects.get(key)
+        
+        if entry is None:
+            entry = self.objects[key] = [factory(), release, idleTimeout, 0.0]
+            self.createdObjects += 1
+        
+        entry[3] = perf_counter()
+        
+        return entry[0]
+    
+    cpdef void dropObject(self, key):
+        """Drops the automation object stored under `key` (e.g., after its server was closed), so it is created again by the next `getObject`. Must be called on the worker thread."""
+        
+        cdef list entry = self.objects.pop(key, None)
+        
+        if entry is None:
+            return
+        
+        self.releasedObjects += 1
+        
+        if entry[1] is not None:
+            try:
+                entry[1](entry[0])
+            
+            except Exception as e:
+                print(f'➤ Warning! The automation object "{key}" could not be released.\n\n→ Error message: {e}\n{"="*50}\n')
+    
+    cdef void dropIdleObjects(self):
+        """Drops the objects that were not used for their idle timeouts."""
+        
+        cdef double now = perf_counter()
+        
+        for key, entry in list(self.objects.items()):
+            if entry[2] and now - <double> entry[3] > <double> entry[2]:
+                self.dropObject(key)
+    
+    def workerLoop(self) -> None:
+        """The loop of the worker thread."""
+        
+        self.threadId = threading.get_ident()
+        pfBackend.backend.coInitialize()
+        
+        try:
+            while not mgmt.terminateEvent.is_set():
+                try:
+                    request = self.requests.get(timeout=0.5)
+                
+                except queue.Empty:
+                    self.dropIdleObjects()
+                    continue
+                
+                # The request queued by `shutdown`.
+                if request is None:
+                    break
+                
+                future, function, args, kwargs = request
+                
+                if not future.set_running_or_notify_cancel():
+                    continue
+                
+                try:
+                    future.set_result(function(*args, **kwargs))
+                    self.completedCalls += 1
+                
+                except BaseException as e:
+                    future.set_exception(e)
+                    self.failedCalls += 1
+                
+                self.dropIdleObjects()
+        
+        finally:
+            with self.lock:
+                self.thread = None
+            
+            # The requests queued after the worker stopped are cancelled, so their callers do not wait forever.
+            while True:
+                try:
+                    request = self.requests.get_nowait()
+                
+                except queue.Empty:
+                    break
+                
+                if request is not None:
+                    request[0].cancel()
+            
+            for key in list(self.objects):
+                self.dropObject(key)
+            
+            self.threadId = 0
+            
+            try:
+                pfBackend.backend.coUninitialize()
+            
+            except Exception:
+                print(f'➤ Warning! COM could not be uninitialized in the thread "{self.name}".\n\n→ {format_exc()}\n{"="*50}\n')
+    
+    def shutdown(self, double timeout=5.0) -> None:
+        """Stops the worker after the queued requests, and waits up to `timeout` seconds for it."""
+        
+        thread = self.thread
+        
+        if thread is None:
+            return
+        
+        self.requests.put(None)
+        
+        if not self.inWorker():
+            thread.join(timeout)
+    
+    cpdef dict getStats(self):
+        """Returns the call and object counters, and the keys of the automation objects kept by the worker."""
+        
+        return {
+            "running":         self.running,
+            "pendingCalls":    self.requests.qsize(),
+            "completedCalls":  self.completedCalls,
+            "failedCalls":     self.failedCalls,
+            "createdObjects":  self.createdObjects,
+            "releasedObjects": self.releasedObjects,
+            "objects":         [str(key) for key in self.objects],
+        }
+
+
+comWorker = ComWorker("comWorker")
+"""The COM worker that owns the `Shell.Application` object, the explorer window objects, and the WMI connections."""
+
+officeWorker = ComWorker("officeWorker")
+"""The COM worker that owns the Office applications, so the slow document conversions do not hold up the explorer hotkeys."""
+
+
+def shellApplication():
+    """Returns the `Shell.Application` object of `comWorker`. Must be called on its thread."""
+    
+    return comWorker.getObject("Shell.Application", pfBackend.backend.shellApplication)
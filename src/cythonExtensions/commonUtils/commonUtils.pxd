@@ -1,12 +1,16 @@
 cdef class BaseEvent:
     cdef int EventId, Flags
-    cdef EventName
+    cdef object eventName
+    cdef unsigned int Time
+    cdef double HookTime
+    cdef bint Suppressed
+    
+    cdef str defaultEventName(self)
 
 cdef class KeyboardEvent(BaseEvent):
-    cdef int KeyID, Scancode, Ascii
-    cdef bint Injected, Extended, Shift, Alt, Transition
+    cdef int KeyID, Scancode, Ascii, Modifiers, ChordNode
+    cdef bint Shift
     cdef Key
 
 cdef class MouseEvent(BaseEvent):
     cdef int X, Y, MouseData, Delta, PressedButton #, "Time"
-    cdef bint IsMouseAbsolute, IsMouseInWindow, IsWheelHorizontal
@@ -1,11 +1,11 @@
 """This module provides class definitions used in other modules."""
 
-import threading, queue, win32clipboard, multiprocessing
+import threading, multiprocessing
 from collections import deque
 from enum import IntEnum
-from win32com.client import CDispatch
 
 import scriptConfigs as configs
+from cythonExtensions.platformBackend.platformBackend import win32con
 
 
 class KB_Con(IntEnum):
@@ -109,6 +109,8 @@ class KB_Con(IntEnum):
     # Miscellaneous keys
     SC_RETURN      = 28 # Enter
     SC_BACK        = 14 # Backspace
+    SC_TAB         = 15
+    SC_CONTROL     = 29 # 'LControl' and 'RControl'
     SC_MENU        = 56 # 'LMenu' and 'RMenu'
     SC_HOME        = 71
     SC_UP          = 72
@@ -119,6 +121,13 @@ class KB_Con(IntEnum):
     SC_VOLUME_DOWN = 46
 
 
+kbMsgIdToName: dict[int, str]
+"""Maps the Windows Message Ids for keyboard events to their respective names."""
+
+msMsgIdToName: dict[int, str]
+"""Maps the Windows Message Ids for mouse events to their respective names."""
+
+
 class BaseEvent:
     """
     Description:
@@ -127,15 +136,33 @@ class BaseEvent:
     Parameters:
         `EventID -> int`: The event ID (the message code).
         
-        `EventName -> str`: The name of the event (message).
+        `EventName -> str`: The name of the event (message). If not given, it is looked up from the event ID on first access.
         
         `Flags -> int`: The flags associated with the event.
+        
+        `Time -> int`: The system time stamp of the event in milliseconds (the `time` field of the hook structure).
+        
+        `HookTime -> float`: The `perf_counter` value when the hook received the event. Used to measure the handling latency.
+        
+        `Suppressed -> bool`: Whether the hook suppressed the event. Set by the hook after its suppression filter decided, which may fall
+        back to passing the event through, so the listeners only act on the events that were actually suppressed.
     """
     
-    __slots__ = ("EventId", "Flags", "EventName")
+    __slots__ = ("EventId", "Flags", "eventName", "Time", "HookTime", "Suppressed")
+    
+    EventId: int
+    Flags: int
+    Time: int
+    HookTime: float
+    Suppressed: bool
     
-    def __init__(self, event_id: int, event_name: str, flags: int):
+    def __init__(self, event_id: int, event_name: str | None, flags: int):
         ...
+    
+    @property
+    def EventName(self) -> str:
+        ...
+    
     def __repr__(self) -> str:
         return f"EvtId={self.EventId}, EvtName='{self.EventName}', Flags={self.Flags}"
 
@@ -148,7 +175,7 @@ class KeyboardEvent(BaseEvent):
     Parameters:
         `EventID -> int`: The event ID (the message code).
         
-        `EventName -> str`: The name of the event (message).
+        `EventName -> str`: The name of the event (message). Looked up from the event ID on first access.
         
         `Key -> str`: The name of the key.
         
@@ -158,23 +185,41 @@ class KeyboardEvent(BaseEvent):
         
         `Ascii -> int`: The ASCII value of the key.
         
-        `Flags -> int`: The flags associated with the event.
-        
-        `Injected -> bool`: Whether or not the event was injected.
-        
-        `Extended -> bool`: Whether or not the event is an extended key event.
+        `Flags -> int`: The flags associated with the event. `Injected`, `Extended`, `Alt`, and `Transition` are derived from it on access.
         
         `Shift -> bool`: Whether or not the shift key is pressed.
         
-        `Alt -> bool`: Whether or not the alt key is pressed.
+        `Modifiers -> int`: A snapshot of `ControllerHouse.modifiers` taken by the hook when the event occurred. Listeners run
+        asynchronously, so they should use this value instead of the live one.
         
-        `Transition -> bool`: Whether or not the key is transitioning from up to down.
+        `ChordNode -> int`: The node of the chord sequences reached by this key (see `chordMatcher`), or `0` if the key is not part of a sequence.
+        Set by the keyboard suppression filter, and cleared by the hook if the key is passed through.
     """
     
-    __slots__ = ("KeyID", "Scancode", "Ascii", "Key", "Injected", "Extended", "Shift", "Alt", "Transition")
+    __slots__ = ("KeyID", "Scancode", "Ascii", "Modifiers", "ChordNode", "Shift", "Key")
+    
+    def __init__(self, event_id: int, event_name: str | None, vkey_code: int, scancode: int, key_ascii: int, key_name: str,
+                 flags: int, shift: bool, modifiers: int = 0):
+        ...
+    
+    @property
+    def Extended(self) -> bool:
+        """Whether or not the event is an extended key event."""
+        ...
+    
+    @property
+    def Injected(self) -> bool:
+        """Whether or not the event was injected."""
+        ...
+    
+    @property
+    def Alt(self) -> bool:
+        """Whether or not the alt key is pressed."""
+        ...
     
-    def __init__(self, event_id: int, event_name: str, vkey_code: int, scancode: int, key_ascii: int, key_name: str,
-                 flags: int, injected: bool, extended: bool, shift: bool, alt: bool, transition: bool):
+    @property
+    def Transition(self) -> bool:
+        """Whether or not the key is transitioning from up to down."""
         ...
     
     def __repr__(self) -> str:
@@ -193,9 +238,9 @@ class MouseEvent(BaseEvent):
     Parameters:
         - `EventID -> int`: The event ID (the message code).
         
-        - `EventName -> str`: The name of the event (message).
+        - `EventName -> str`: The name of the event (message). Looked up from the event ID on first access.
         
-        - `Flags -> int`: The flags associated with the event.
+        - `Flags -> int`: The flags associated with the event. `IsMouseAbsolute` and `IsMouseInWindow` are derived from it on access.
         
         - `X -> int`: The X coordinate of the mouse pointer, relative to the top-left corner of the screen.
         
@@ -221,7 +266,7 @@ class MouseEvent(BaseEvent):
             `+ve` | The wheel was rotated forward, away from the user.
             `-ve` | The wheel was rotated backward, toward the user.
         
-        - `IsWheelHorizontal -> bool`: Specifies whether the wheel was moved horizontally. True if the message is `WM_MOUSEHWHEEL`.
+        - `IsWheelHorizontal -> bool`: Specifies whether the wheel was moved horizontally. True if the message is `WM_MOUSEHWHEEL`. Derived from the event ID on access.
         
         - `PressedButton -> int`: Specifies which mouse button was pressed. Can have one of the following values:
             Value | Meaning
@@ -233,14 +278,25 @@ class MouseEvent(BaseEvent):
             1     | X2 mouse button was pressed.
     """
     
-    __slots__ = ("X", "Y", "MouseData", "ExtraInfo", # "Time",
-                 "IsMouseAbsolute", "IsMouseInWindow", "Delta",
-                 "IsWheelHorizontal", "PressedButton")
+    __slots__ = ("X", "Y", "MouseData", "Delta", "PressedButton") # "Time"
+    
+    def __init__(self, event_id: int, event_name: str | None, flags: int,
+                 x: int, y: int, mouse_data: int, wheel_delta: int, pressed_button: int):
+        ...
+    
+    @property
+    def IsMouseAbsolute(self) -> bool:
+        """Whether the coordinates are mapped to the entire desktop (`MOUSE_MOVE_ABSOLUTE`)."""
+        ...
+    
+    @property
+    def IsMouseInWindow(self) -> bool:
+        """Whether the message was sent from the application's message queue (`MOUSE_MOVE_NOCOALESCE`)."""
+        ...
     
-    def __init__(self, event_id: int, event_name: str, flags: int,
-                 x: int, y: int, mouse_data: int, is_mouse_absolute: bool,
-                 is_mouse_in_window: bool, wheel_delta: int, is_wheel_horizontal: bool,
-                 pressed_button: int):
+    @property
+    def IsWheelHorizontal(self) -> bool:
+        """Whether the wheel was moved horizontally (`WM_MOUSEHWHEEL`)."""
         ...
     
     def __repr__(self) -> str:
@@ -274,6 +330,9 @@ class ControllerHouse:
     RWIN     | 4     | 0b100
     FN       | 2     | 0b10
     BACKTICK | 1     | 0b1
+    
+    Only the generic bits (`CTRL`, `SHIFT`, `ALT`, `WIN`, `FN`, `BACKTICK`) are set. It is a mirror of the keyboard state tracked by `hookManager`,
+    updated when a modifier changes. `hookManager.getModifiers(sides=True)` also returns the left/right bits.
     """
     
     # Masks for extracting individual keys from the `modifiers` packed int.
@@ -401,11 +460,17 @@ class ControllerHouse:
     NUMLOCK_MASK = 0b1
     
     pressed_chars : str
-    """Stores the pressed character keys for the key expansion events."""
+    """Stores the alias matched by the text expansion, while it is being expanded or opened."""
     
     pressed_chars_backup : str
     """Stores a backup that lasts one keystroke to undo replacement of text if backspace is pressed immediately after expainsion."""
     
+    expanded_text : str
+    """Stores the text typed by the last expansion (with its placeholders evaluated), so it can be undone."""
+    
+    expanded_caret_offset : int
+    """Stores the number of characters after the caret in the text typed by the last expansion."""
+    
     heldMouseBtn = 0
     """Stores the mouse button that is currently being held down (by sending mouse events with keyboard shortcuts). Possible Values:
     Value | Button
@@ -421,6 +486,9 @@ class ControllerHouse:
     non_prefixed_abbreviations = configs.NON_PERFIXED_ABBREVIATIONS
     """A dictionary of aliases and their corresponding expansion that are not prefixed with one of the defined prefixes."""
     
+    application_abbreviations = configs.APPLICATION_ABBREVIATIONS
+    """Maps a window class name or a process name to the aliases that are only expanded while the application is focused."""
+    
     locations = configs.LOCATIONS
     """A dictionary of aliases and their corresponding path address expansions."""
     
@@ -544,33 +612,17 @@ class WindowHouse:
         ...
 
 
-class ShellAutomationObjectWrapper:
-    """Thread-safe wrapper class for accessing an Automation object in a multithreaded environment."""
-    
-    __slots__ = ()
-    
-    explorer: CDispatch
-    """An explorer Automation object."""
-    
-    _lock: threading.Lock
-    """A lock object used to ensure that only one thread can access the Automation object at a time."""
-
-
 # Source: https://stackoverflow.com/questions/6552097/threading-how-to-get-parent-id-name
 class PThread(threading.Thread):
     """An extension of `threading.Thread`. The class adds these features:
     - A `parent` attribute to the thread object.
     - Propagates exceptions from the created threads to the calling one and show them using error messages.
-    - Defines ways for thread communication.
     - Defines ways for controlling the frequency or timing of certain events.
     """
     
     mainThreadId = threading.main_thread().ident
     """The ID of the main thread."""
     
-    kbMsgQueue: queue.Queue[bool]
-    """A queue used for message passing between threads."""
-    
     def __init__(self, *args, **kwargs) -> None:
         ...
     
@@ -626,11 +678,11 @@ class PThread(threading.Thread):
         ...
 
 
-def readFromClipboard(CF= win32clipboard.CF_TEXT) -> str: # CF: Clipboard format.
+def readFromClipboard(CF=win32con.CF_TEXT) -> str: # CF: Clipboard format.
     """Reads the top of the clipboard if it was the same type as the specified."""
     ...
 
 
-def sendToClipboard(data, CF=win32clipboard.CF_UNICODETEXT):
+def sendToClipboard(data, CF=win32con.CF_UNICODETEXT):
     """Copies the given data to the clipboard."""
     ...
@@ -2,11 +2,10 @@
 
 """This extension module provides class definitions used in other modules."""
 
+cimport cython
 from cythonExtensions.commonUtils cimport commonUtils
 
-import win32gui, win32api, win32con, win32clipboard, pythoncom, multiprocessing
-import threading, queue, winsound
-from win32com.client import Dispatch
+import multiprocessing, threading
 from time import time
 from collections import deque
 from traceback import format_tb, format_exc
@@ -14,6 +13,8 @@ from typing import Callable
 
 import scriptConfigs as configs
 from cythonExtensions.windowHelper import windowHelper as winHelper
+from cythonExtensions.platformBackend import platformBackend as pfBackend
+from cythonExtensions.platformBackend.platformBackend import win32con
 
 
 cpdef enum KB_Con:
@@ -117,6 +118,8 @@ cpdef enum KB_Con:
     # Miscellaneous keys
     SC_RETURN      = 28 # Enter
     SC_BACK        = 14 # Backspace
+    SC_TAB         = 15
+    SC_CONTROL     = 29 # 'LControl' and 'RControl'
     SC_MENU        = 56 # 'LMenu' and 'RMenu'
     SC_HOME        = 71
     SC_UP          = 72
@@ -127,6 +130,37 @@ cpdef enum KB_Con:
     SC_VOLUME_DOWN = 46
 
 
+cdef dict kbMsgIdToName = {
+    0x0100 : "key down",      0x0101 : "key up",            # WM_KEYDOWN,    WM_KEYUP
+    0x0102 : "key char",      0x0103 : "key dead char",     # WM_CHAR,       WM_DEADCHAR
+    0x0104 : "key sys down",  0x0105 : "key sys up",        # WM_SYSKEYDOWN, WM_SYSKEYUP
+    0x0106 : "key sys char",  0x0107 : "key sys dead char", # WM_SYSCHAR,    WM_SYSDEADCHAR
+}
+"""Maps the Windows Message Ids for keyboard events to their respective names."""
+
+cdef dict msMsgIdToName = {
+    0x0200 : "MOVE",         # WM_MOUSEMOVE
+    0x0201 : "LB CLK",       # WM_LBUTTONDOWN
+    0x0202 : "LB UP",        # WM_LBUTTONUP
+    0x0203 : "LB DBL CLK",   # WM_LBUTTONDBLCLK
+    0x0204 : "RB CLK",       # WM_RBUTTONDOWN
+    0x0205 : "RB UP",        # WM_RBUTTONUP
+    0x0206 : "RB DBL CLK",   # WM_RBUTTONDBLCLK
+    0x0207 : "MB CLK",       # WM_MBUTTONDOWN
+    0x0208 : "MB UP",        # WM_MBUTTONUP
+    0x0209 : "MB DBL CLK",   # WM_MBUTTONDBLCLK
+    0x020A : "WHEEL SCRL",   # WM_MOUSEWHEEL
+    0x020B : "XB CLK",       # WM_XBUTTONDOWN
+    0x020C : "XB UP",        # WM_XBUTTONUP
+    0x020D : "XB DBL CLK",   # WM_XBUTTONDBLCLK
+    0x020E : "WHEEL H SCRL", # WM_MOUSEHWHEEL
+    0x00AB : "NC XB CLK",    # WM_NCXBUTTONDOWN
+    0x00AC : "NC XB UP",     # WM_NCXBUTTONUP
+    0x00AD : "NC XB DBL CLK" # WM_NCXBUTTONDBLCLK
+}
+"""Maps the Windows Message Ids for mouse events to their respective names."""
+
+
 cdef class BaseEvent:
     """
     Description:
@@ -135,23 +169,50 @@ cdef class BaseEvent:
     Parameters:
         `EventID -> int`: The event ID (the message code).
         
-        `EventName -> str`: The name of the event (message).
+        `EventName -> str`: The name of the event (message). If not given, it is looked up from the event ID on first access.
         
         `Flags -> int`: The flags associated with the event.
+        
+        `Time -> int`: The system time stamp of the event in milliseconds (the `time` field of the hook structure).
+        
+        `HookTime -> float`: The `perf_counter` value when the hook received the event. Used to measure the handling latency.
+        
+        `Suppressed -> bool`: Whether the hook suppressed the event. Set by the hook after its suppression filter decided, which may fall
+        back to passing the event through, so the listeners only act on the events that were actually suppressed.
     """
     
     cdef public int EventId, Flags
-    cdef public EventName
+    cdef object eventName
+    cdef public unsigned int Time
+    cdef public double HookTime
+    cdef public bint Suppressed
+    
+    def __init__(self, event_id: int, event_name, flags: int):
+        self.EventId    = event_id
+        self.eventName  = event_name
+        self.Flags      = flags
+        self.Time       = 0
+        self.HookTime   = 0.0
+        self.Suppressed = False
+    
+    cdef str defaultEventName(self):
+        """Returns the name of the event derived from its ID. Overridden by the subclasses."""
+        
+        return ""
     
-    def __init__(self, event_id: int, event_name: str, flags: int):
-        self.EventId   = event_id
-        self.EventName = event_name
-        self.Flags     = flags
+    @property
+    def EventName(self) -> str:
+        if self.eventName is None:
+            self.eventName = self.defaultEventName()
+        
+        return self.eventName
     
     def __repr__(self) -> str:
         return f"EvtId={self.EventId}, EvtName='{self.EventName}', Flags={self.Flags}"
 
 
+# Events are created for every hook call and dropped shortly after, so their memory is recycled instead of being reallocated.
+@cython.freelist(64)
 cdef class KeyboardEvent(commonUtils.BaseEvent):
     """
     Description:
@@ -160,7 +221,7 @@ cdef class KeyboardEvent(commonUtils.BaseEvent):
     Parameters:
         `EventID -> int`: The event ID (the message code).
         
-        `EventName -> str`: The name of the event (message).
+        `EventName -> str`: The name of the event (message). Looked up from the event ID on first access.
         
         `Key -> str`: The name of the key.
         
@@ -170,25 +231,23 @@ cdef class KeyboardEvent(commonUtils.BaseEvent):
         
         `Ascii -> int`: The ASCII value of the key.
         
-        `Flags -> int`: The flags associated with the event.
-        
-        `Injected -> bool`: Whether or not the event was injected.
-        
-        `Extended -> bool`: Whether or not the event is an extended key event.
+        `Flags -> int`: The flags associated with the event. `Injected`, `Extended`, `Alt`, and `Transition` are derived from it on access.
         
         `Shift -> bool`: Whether or not the shift key is pressed.
         
-        `Alt -> bool`: Whether or not the alt key is pressed.
+        `Modifiers -> int`: A snapshot of `ControllerHouse.modifiers` taken by the hook when the event occurred. Listeners run
+        asynchronously, so they should use this value instead of the live one.
         
-        `Transition -> bool`: Whether or not the key is transitioning from up to down.
+        `ChordNode -> int`: The node of the chord sequences reached by this key (see `chordMatcher`), or `0` if the key is not part of a sequence.
+        Set by the keyboard suppression filter, and cleared by the hook if the key is passed through.
     """
     
-    cdef public int KeyID, Scancode, Ascii
-    cdef public bint Injected, Extended, Shift, Alt, Transition
+    cdef public int KeyID, Scancode, Ascii, Modifiers, ChordNode
+    cdef public bint Shift
     cdef public Key
     
-    def __init__(self, event_id: int, event_name: str, vkey_code: int, scancode: int, key_ascii: int, key_name: str,
-                 flags: int, injected: bool, extended: bool, shift: bool, alt: bool, transition: bool):
+    def __init__(self, event_id: int, event_name, vkey_code: int, scancode: int, key_ascii: int, key_name: str,
+                 flags: int, shift: bool, modifiers: int = 0):
         
         super(commonUtils.KeyboardEvent, self).__init__(event_id, event_name, flags)
         
@@ -196,11 +255,36 @@ cdef class KeyboardEvent(commonUtils.BaseEvent):
         self.Scancode = scancode
         self.Ascii = key_ascii
         self.Key = key_name
-        self.Injected = injected
-        self.Extended = extended
-        self.Transition = transition
         self.Shift = shift
-        self.Alt = alt
+        self.Modifiers = modifiers
+    
+    cdef str defaultEventName(self):
+        return kbMsgIdToName.get(self.EventId, "")
+    
+    # Docs: https://learn.microsoft.com/en-us/windows/win32/api/winuser/ns-winuser-kbdllhookstruct#:~:text=The%20following%20table%20describes%20the%20layout%20of%20this%20value.
+    @property
+    def Extended(self) -> bool:
+        """Whether or not the event is an extended key event."""
+        
+        return bool(self.Flags & 0x1)
+    
+    @property
+    def Injected(self) -> bool:
+        """Whether or not the event was injected."""
+        
+        return bool(self.Flags & 0x10)
+    
+    @property
+    def Alt(self) -> bool:
+        """Whether or not the alt key is pressed."""
+        
+        return bool(self.Flags & 0x20)
+    
+    @property
+    def Transition(self) -> bool:
+        """Whether or not the key is transitioning from up to down."""
+        
+        return bool(self.Flags & 0x82)
     
     def __repr__(self) -> str:
         return f"Key={self.Key}, ID={self.KeyID}, SC={self.Scancode}, Asc={self.Ascii} | Inj={self.Injected}, Ext={self.Extended}, Shift={self.Shift}, Alt={self.Alt}, Trans={self.Transition} | EvtId={self.EventId}, EvtName='{self.EventName}', Flags={self.Flags}"
@@ -210,6 +294,7 @@ cdef dict buttonMapping = {16: "LB", 8: "RB", 4: "MB", 2: "X1", 1: "X2"}
 """Maps the mouse button id to the button name."""
 
 
+@cython.freelist(64)
 cdef class MouseEvent(commonUtils.BaseEvent):
     """
     Description:
@@ -218,9 +303,9 @@ cdef class MouseEvent(commonUtils.BaseEvent):
     Parameters:
         - `EventID -> int`: The event ID (the message code).
         
-        - `EventName -> str`: The name of the event (message).
+        - `EventName -> str`: The name of the event (message). Looked up from the event ID on first access.
         
-        - `Flags -> int`: The flags associated with the event.
+        - `Flags -> int`: The flags associated with the event. `IsMouseAbsolute` and `IsMouseInWindow` are derived from it on access.
         
         - `X -> int`: The X coordinate of the mouse pointer, relative to the top-left corner of the screen.
         
@@ -246,7 +331,7 @@ cdef class MouseEvent(commonUtils.BaseEvent):
             `+ve` | The wheel was rotated forward, away from the user.
             `-ve` | The wheel was rotated backward, toward the user.
         
-        - `IsWheelHorizontal -> bool`: Specifies whether the wheel was moved horizontally. True if the message is `WM_MOUSEHWHEEL`.
+        - `IsWheelHorizontal -> bool`: Specifies whether the wheel was moved horizontally. True if the message is `WM_MOUSEHWHEEL`. Derived from the event ID on access.
         
         - `PressedButton -> int`: Specifies which mouse button was pressed. Can have one of the following values:
             Value | Meaning
@@ -259,23 +344,38 @@ cdef class MouseEvent(commonUtils.BaseEvent):
     """
     
     cdef public int X, Y, MouseData, Delta, PressedButton # "Time"
-    cdef public bint IsMouseAbsolute, IsMouseInWindow, IsWheelHorizontal
     
-    def __init__(self, event_id: int, event_name: str, flags: int,
-                 x: int, y: int, mouse_data: int, is_mouse_absolute: bool,
-                 is_mouse_in_window: bool, wheel_delta: int, is_wheel_horizontal: bool,
-                 pressed_button: int):
+    def __init__(self, event_id: int, event_name, flags: int,
+                 x: int, y: int, mouse_data: int, wheel_delta: int, pressed_button: int):
         super(commonUtils.MouseEvent, self).__init__(event_id, event_name, flags)
         
         self.X = x
         self.Y = y
         self.MouseData = mouse_data
-        self.IsMouseAbsolute = is_mouse_absolute
-        self.IsMouseInWindow = is_mouse_in_window
         self.Delta = wheel_delta
-        self.IsWheelHorizontal = is_wheel_horizontal
         self.PressedButton = pressed_button
     
+    cdef str defaultEventName(self):
+        return msMsgIdToName.get(self.EventId, "")
+    
+    @property
+    def IsMouseAbsolute(self) -> bool:
+        """Whether the coordinates are mapped to the entire desktop (`MOUSE_MOVE_ABSOLUTE`)."""
+        
+        return bool(self.Flags & 0x01)
+    
+    @property
+    def IsMouseInWindow(self) -> bool:
+        """Whether the message was sent from the application's message queue (`MOUSE_MOVE_NOCOALESCE`)."""
+        
+        return bool(self.Flags & 0x08)
+    
+    @property
+    def IsWheelHorizontal(self) -> bool:
+        """Whether the wheel was moved horizontally (`WM_MOUSEHWHEEL`)."""
+        
+        return self.EventId == 0x020E
+    
     def __repr__(self) -> str:
         return f"X={self.X}, Y={self.Y}, MouseData={self.MouseData}, IsMouseAbsolute={self.IsMouseAbsolute}, " \
                f"IsMouseInWindow={self.IsMouseInWindow}, Delta={self.Delta}, " \
@@ -307,6 +407,9 @@ class ControllerHouse:
     RWIN     | 4     | 0b100
     FN       | 2     | 0b10
     BACKTICK | 1     | 0b1
+    
+    Only the generic bits (`CTRL`, `SHIFT`, `ALT`, `WIN`, `FN`, `BACKTICK`) are set. It is a mirror of the keyboard state tracked by `hookManager`,
+    updated when a modifier changes. `hookManager.getModifiers(sides=True)` also returns the left/right bits.
     """
     
     # Masks for extracting individual keys from the `modifiers` packed int.
@@ -348,10 +451,10 @@ class ControllerHouse:
     LWIN_RWIN       = LWIN   | RWIN              # 0b00000000001100 # 12
     FN_BACKTICK     = FN     | BACKTICK          # 0b00000000000011 # 3
     
-    # Boolean variables for storing the state of the lock keys.
-    CAPITAL = win32api.GetKeyState(win32con.VK_CAPITAL)
-    SCROLL  = win32api.GetKeyState(win32con.VK_SCROLL)
-    NUMLOCK = win32api.GetKeyState(win32con.VK_NUMLOCK)
+    # Boolean variables for storing the state of the lock keys. Mirrors of the keyboard state tracked by `hookManager` (see `hookManager.getLocks`).
+    CAPITAL = pfBackend.backend.getKeyState(win32con.VK_CAPITAL)
+    SCROLL  = pfBackend.backend.getKeyState(win32con.VK_SCROLL)
+    NUMLOCK = pfBackend.backend.getKeyState(win32con.VK_NUMLOCK)
     
     # locks = (CAPITAL << 2) | (SCROLL << 1) | NUMLOCK
     # """An int packing the states of the keyboard lock keys (on or off)."""
@@ -366,11 +469,17 @@ class ControllerHouse:
     #          win32api.GetKeyState(win32con.VK_NUMLOCK)
     
     pressed_chars = ""
-    """Stores the pressed character keys for the key expansion events."""
+    """Stores the alias matched by the text expansion, while it is being expanded or opened."""
     
     pressed_chars_backup = ""
     """Stores a backup that lasts one keystroke to undo replacement of text if backspace is pressed immediately after expainsion."""
     
+    expanded_text = ""
+    """Stores the text typed by the last expansion (with its placeholders evaluated), so it can be undone."""
+    
+    expanded_caret_offset = 0
+    """Stores the number of characters after the caret in the text typed by the last expansion."""
+    
     heldMouseBtn = 0
     """Stores the mouse button that is currently being held down (by sending mouse events with keyboard shortcuts). Possible Values:
     Value | Button
@@ -386,6 +495,9 @@ class ControllerHouse:
     non_prefixed_abbreviations = configs.NON_PERFIXED_ABBREVIATIONS
     """A dictionary of aliases and their corresponding expansion that are not prefixed with one of the defined prefixes."""
     
+    application_abbreviations = configs.APPLICATION_ABBREVIATIONS
+    """Maps a window class name or a process name to the aliases that are only expanded while the application is focused."""
+    
     locations = configs.LOCATIONS
     """A dictionary of aliases and their corresponding path address expansions."""
     
@@ -482,20 +594,20 @@ class Management:
         Management.silent ^= 1
         
         if Management.silent:
-            winsound.PlaySound(r"SFX\no-trespassing-368.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
+            pfBackend.backend.playSound(r"SFX\no-trespassing-368.wav")
         else:
-            winsound.PlaySound(r"SFX\pedantic-490.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
+            pfBackend.backend.playSound(r"SFX\pedantic-490.wav")
     
     @staticmethod
     def toggleKeyboardInputs():
         """Toggles the `suppressKbInputs` variable."""
         
         Management.suppressKbInputs ^= 1
-    
+        
         if Management.suppressKbInputs:
-            winsound.PlaySound(r"SFX\no-trespassing-368.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
+            pfBackend.backend.playSound(r"SFX\no-trespassing-368.wav")
         else:
-            winsound.PlaySound(r"SFX\pedantic-490.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
+            pfBackend.backend.playSound(r"SFX\pedantic-490.wav")
     
     @staticmethod
     def logUncaughtExceptions(exc_type, exc_value, exc_traceback) -> int:
@@ -538,9 +650,9 @@ class WindowHouse:
         """
         
         if not fg_hwnd:
-            fg_hwnd = win32gui.GetForegroundWindow()
+            fg_hwnd = pfBackend.backend.getForegroundWindow()
         
-        explorerAddress = win32gui.GetWindowText(fg_hwnd)
+        explorerAddress = pfBackend.backend.getWindowText(fg_hwnd)
         
         if not explorerAddress:
             print(f"Error: Could not get the title of the active window (id={fg_hwnd}) or the window does not have a title.")
@@ -553,36 +665,11 @@ class WindowHouse:
         WindowHouse.closedExplorers.append(explorerAddress)
 
 
-class ShellAutomationObjectWrapper:
-    """Thread-safe wrapper class for accessing an Automation object in a multithreaded environment."""
-    # The wrapper object acquires a lock before accessing the Automation object, ensuring that only one thread can access it at a time.
-    # This can help prevent problems that can occur when multiple threads try to access the Automation object concurrently.
-    # If two or more threads tried to access an automation object wrapper, only one would be able to acquire the lock to the automation object at a time.
-    # The other threads would be blocked until the lock is released by the thread that currently holds it.
-    # When a thread lock object is used in a `with` statement, the lock is released when the `with` block ends.
-    # The lock is automatically acquired at the beginning of the block and released when the block ends.
-    
-    __slots__ = ()
-    
-    explorer = Dispatch("Shell.Application")
-    """An explorer Automation object."""
-    
-    _lock = threading.Lock()
-    """A lock object used to ensure that only one thread can access the Automation object at a time."""
-    
-    @staticmethod
-    def __getattr__(name: str):
-        # Acquire lock before accessing the Automation object
-        with ShellAutomationObjectWrapper._lock:
-            return getattr(ShellAutomationObjectWrapper.explorer, name)
-
-
 # Source: https://stackoverflow.com/questions/6552097/threading-how-to-get-parent-id-name
 class PThread(threading.Thread):
     """An extension of `threading.Thread`. The class adds these features:
     - A `parent` attribute to the thread object.
     - Propagates exceptions from the created threads to the calling one and show them using error messages.
-    - Defines ways for thread communication.
     - Defines ways for controlling the frequency or timing of certain events.
     """
     
@@ -592,12 +679,6 @@ class PThread(threading.Thread):
     mainThreadId = threading.main_thread().ident
     """The ID of the main thread."""
     
-    kbMsgQueue: Queue[bool] = queue.Queue()
-    """A queue used for message passing between keyboard-related threads."""
-    
-    msMsgQueue: Queue[bool] = queue.Queue()
-    """A queue used for message passing between mouse-related threads."""
-    
     def __init__(self, *args, **kwargs) -> None:
         threading.Thread.__init__(self, *args, **kwargs)
         self.parent = threading.current_thread()
@@ -654,7 +735,7 @@ class PThread(threading.Thread):
                 print(f"CoInitialize called from: {threading.current_thread().name}")
             
             threading.current_thread().coInitializeCalled = True
-            pythoncom.CoInitialize()
+            pfBackend.backend.coInitialize()
             
             return True
         
@@ -667,7 +748,7 @@ class PThread(threading.Thread):
             if not silent:
                 print(f"CoUninitialize called from: {threading.current_thread().name}")
             
-            pythoncom.CoUninitialize()
+            pfBackend.backend.coUninitialize()
             threading.current_thread().coInitializeCalled = False
     
     # Source: https://github.com/salesforce/decorator-operations/blob/master/decoratorOperations/throttle_functions/throttle.py
@@ -740,24 +821,19 @@ class PThread(threading.Thread):
         return decorator
 
 
-def readFromClipboard(int CF=win32clipboard.CF_TEXT) -> str: # CF: Clipboard format.
+def readFromClipboard(int CF=win32con.CF_TEXT) -> str: # CF: Clipboard format.
     """Reads the top of the clipboard if it was the same type as the specified."""
     
-    win32clipboard.OpenClipboard()
-    if win32clipboard.IsClipboardFormatAvailable(CF):
-        clipboard_data = win32clipboard.GetClipboardData()
-        win32clipboard.EmptyClipboard()
-        win32clipboard.CloseClipboard()
-    else:
+    clipboard_data = pfBackend.backend.readClipboard(CF)
+    if clipboard_data is None:
         return ""
     
+    pfBackend.backend.emptyClipboard()
+    
     return clipboard_data
 
 
-def sendToClipboard(data, CF=win32clipboard.CF_UNICODETEXT) -> None:
+def sendToClipboard(data, CF=win32con.CF_UNICODETEXT) -> None:
     """Copies the given data to the clipboard."""
     
-    win32clipboard.OpenClipboard()
-    win32clipboard.EmptyClipboard()
-    win32clipboard.SetClipboardData(CF, data)
-    win32clipboard.CloseClipboard()
+    pfBackend.backend.writeClipboard(data, CF)
@@ -0,0 +1,39 @@
+cdef class PrefixIndex:
+    cdef list aliases
+    cdef int * counts
+    cdef int * lengths
+    cdef int * tree
+    cdef int size, leaves
+    
+    cdef inline int better(self, int first, int second)
+    
+    cdef int best(self, int start, int end)
+    
+    cpdef list suggest(self, str prefix, int limit, exclude=*)
+    
+    cpdef bint increment(self, str alias)
+
+
+cdef class Suggester:
+    cdef PrefixIndex index
+    cdef object popup
+    cdef list items
+    cdef int selected, limit
+    cdef bint visible
+    cdef str prefixes
+    cdef dict usage
+    cdef frozenset applicationAliases
+    
+    cpdef void setAliases(self, aliases)
+    
+    cpdef void recordUse(self, str alias)
+    
+    cpdef void update(self, str typed)
+    
+    cpdef void move(self, int step)
+    
+    cpdef str selectedAlias(self)
+    
+    cpdef void show(self)
+    
+    cpdef void hide(self)
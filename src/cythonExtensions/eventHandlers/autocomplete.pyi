@@ -0,0 +1,103 @@
+"""
+This module suggests the aliases (abbreviations, locations, and commands) that start with the text typed after a `:` or `!` prefix,
+and shows them in a popup window next to the caret, where the highlighted one can be picked with `Tab`.
+
+The aliases are kept in a sorted array, so the ones that start with a prefix are a contiguous range found with two binary searches.
+The best ones in the range (the most used, then the shortest) are found with a segment tree over the use counts, so a query costs
+`O(limit * log(n))` no matter how many aliases start with the prefix.
+"""
+
+from typing import Any, Container, Iterable
+
+
+class PrefixIndex:
+    """
+    Description:
+        The sorted aliases and their use counts, ranked by a segment tree.
+    ---
+    Parameters:
+        `aliases -> Iterable[str]`: The aliases. The duplicated ones are only added once.
+        
+        `counts -> dict[str, int]`: The use counts of the aliases. The missing ones are `0`.
+    """
+    
+    def __init__(self, aliases: Iterable[str] = (), counts: dict[str, int] | None = None) -> None:
+        ...
+    
+    def suggest(self, prefix: str, limit: int, exclude: Container[str] | None = None) -> list[str]:
+        """
+        Description:
+            Returns up to `limit` aliases that start with `prefix`, best ranked first.
+        ---
+        Parameters:
+            `exclude -> Container[str] | None`: The aliases to skip.
+        """
+        ...
+    
+    def increment(self, alias: str) -> bool:
+        """Increments the use count of the given alias, and returns whether it is in the index."""
+        ...
+    
+    def __len__(self) -> int:
+        ...
+
+
+class Suggester:
+    """
+    Description:
+        Keeps the suggestions of the alias being typed, and shows them in `popup`. Its methods are called by `eventHandlers.textExpansion`,
+        except for `visible`, which is also read by the keyboard hook to suppress the keys that control the popup (`Tab`, `Up`, and `Down`).
+    ---
+    Parameters:
+        `limit -> int`: The maximum number of suggestions.
+        
+        `prefixes -> str`: The first characters of the aliases that are suggested.
+    ---
+    Attributes:
+        `popup`: The window that shows the suggestions, with `show(lines, selected)` and `hide()` methods. Created on first use.
+        
+        `items -> list[str]`: The suggested aliases. `selected` is the index of the highlighted one.
+    """
+    
+    index: PrefixIndex
+    popup: Any
+    items: list[str]
+    selected: int
+    limit: int
+    visible: bool
+    prefixes: str
+    
+    def __init__(self, limit: int = 8, prefixes: str = ":!") -> None:
+        ...
+    
+    def setAliases(self, aliases: Iterable[str]) -> None:
+        """Rebuilds the index from the given aliases, keeping the use counts. Only the aliases that start with one of the `prefixes` are kept."""
+        ...
+    
+    def recordUse(self, alias: str) -> None:
+        """Ranks the given alias higher in the next suggestions."""
+        ...
+    
+    def update(self, typed: str) -> None:
+        """Suggests the aliases that start with the typed text, or hides the suggestions if it does not start with one of the `prefixes`."""
+        ...
+    
+    def move(self, step: int) -> None:
+        """Highlights the next (`step > 0`) or the previous (`step < 0`) suggestion."""
+        ...
+    
+    def selectedAlias(self) -> str:
+        """Returns the highlighted alias, or an empty string."""
+        ...
+    
+    def show(self) -> None:
+        """Shows the suggestions, each one followed by its expansion or its location if it is known without reading the disk."""
+        ...
+    
+    def hide(self) -> None:
+        """Hides the suggestions."""
+        ...
+
+
+suggester: Suggester
+"""The suggestions of `eventHandlers.textExpansion`."""
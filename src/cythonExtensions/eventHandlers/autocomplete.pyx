@@ -0,0 +1,303 @@
+# cython: language_level = 3str
+
+"""
+This extension module suggests the aliases (abbreviations, locations, and commands) that start with the text typed after a `:` or `!` prefix,
+and shows them in a popup window next to the caret, where the highlighted one can be picked with `Tab`.
+
+The aliases are kept in a sorted array, so the ones that start with a prefix are a contiguous range found with two binary searches.
+The best ones in the range (the most used, then the shortest) are found with a segment tree over the use counts, so a query costs
+`O(limit * log(n))` no matter how many aliases start with the prefix.
+"""
+
+from libc.stdlib cimport malloc, free
+
+import bisect, heapq
+
+import scriptConfigs as configs
+from cythonExtensions.commonUtils.commonUtils import ControllerHouse as ctrlHouse
+from cythonExtensions.windowHelper.foregroundContext import foregroundContext
+
+
+cdef str MAX_CHARACTER = "\U0010FFFF"
+
+
+cdef class PrefixIndex:
+    """
+    Description:
+        The sorted aliases and their use counts, ranked by a segment tree.
+    ---
+    Parameters:
+        `aliases -> Iterable[str]`: The aliases. The duplicated ones are only added once.
+        
+        `counts -> dict[str, int]`: The use counts of the aliases. The missing ones are `0`.
+    """
+    
+    cdef list aliases
+    cdef int * counts
+    cdef int * lengths
+    cdef int * tree
+    cdef int size, leaves
+    
+    def __cinit__(self):
+        self.counts = NULL
+        self.lengths = NULL
+        self.tree = NULL
+    
+    def __init__(self, aliases=(), dict counts=None):
+        cdef int index
+        
+        self.aliases = sorted(set(aliases))
+        self.size = len(self.aliases)
+        self.leaves = 1
+        
+        while self.leaves < self.size:
+            self.leaves *= 2
+        
+        self.counts = <int *> malloc(max(self.size, 1) * sizeof(int))
+        self.lengths = <int *> malloc(max(self.size, 1) * sizeof(int))
+        self.tree = <int *> malloc(2 * self.leaves * sizeof(int))
+        
+        if self.counts is NULL or self.lengths is NULL or self.tree is NULL:
+            raise MemoryError()
+        
+        for index in range(self.size):
+            self.counts[index] = counts.get(self.aliases[index], 0) if counts else 0
+            self.lengths[index] = len(<str> self.aliases[index])
+        
+        # Each node holds the index of the best alias under it, or -1.
+        for index in range(self.leaves):
+            self.tree[self.leaves + index] = index if index < self.size else -1
+        
+        for index in range(self.leaves - 1, 0, -1):
+            self.tree[index] = self.better(self.tree[2 * index], self.tree[2 * index + 1])
+    
+    def __dealloc__(self):
+        free(self.counts)
+        free(self.lengths)
+        free(self.tree)
+    
+    cdef inline int better(self, int first, int second):
+        """Returns the better ranked of two aliases: the most used, then the shortest, then the first in order."""
+        
+        if first < 0:
+            return second
+        
+        if second < 0:
+            return first
+        
+        if self.counts[first] != self.counts[second]:
+            return first if self.counts[first] > self.counts[second] else second
+        
+        if self.lengths[first] != self.lengths[second]:
+            return first if self.lengths[first] < self.lengths[second] else second
+        
+        return first if first < second else second
+    
+    cdef int best(self, int start, int end):
+        """Returns the index of the best ranked alias in `[start, end)`, or -1 if the range is empty."""
+        
+        cdef int result = -1
+        
+        start += self.leaves
+        end += self.leaves
+        
+        while start < end:
+            if start & 1:
+                result = self.better(result, self.tree[start])
+                start += 1
+            
+            if end & 1:
+                end -= 1
+                result = self.better(result, self.tree[end])
+            
+            start >>= 1
+            end >>= 1
+        
+        return result
+    
+    cpdef list suggest(self, str prefix, int limit, exclude=None):
+        """
+        Description:
+            Returns up to `limit` aliases that start with `prefix`, best ranked first.
+        ---
+        Parameters:
+            `exclude -> Container[str] | None`: The aliases to skip.
+        """
+        
+        cdef list result = []
+        cdef list ranges
+        cdef int start, end, index
+        
+        start = bisect.bisect_left(self.aliases, prefix)
+        end = bisect.bisect_left(self.aliases, prefix + MAX_CHARACTER, start)
+        index = self.best(start, end)
+        
+        if index < 0:
+            return result
+        
+        # The ranges are split around each taken alias, and the one with the best alias is taken next.
+        ranges = [(-self.counts[index], self.lengths[index], index, start, end)]
+        
+        while ranges and len(result) < limit:
+            _, _, index, start, end = heapq.heappop(ranges)
+            alias = self.aliases[index]
+            
+            if exclude is None or alias not in exclude:
+                result.append(alias)
+            
+            for start, end in ((start, index), (index + 1, end)):
+                index = self.best(start, end)
+                
+                if index >= 0:
+                    heapq.heappush(ranges, (-self.counts[index], self.lengths[index], index, start, end))
+        
+        return result
+    
+    cpdef bint increment(self, str alias):
+        """Increments the use count of the given alias, and returns whether it is in the index."""
+        
+        cdef int index = bisect.bisect_left(self.aliases, alias)
+        
+        if index >= self.size or self.aliases[index] != alias:
+            return False
+        
+        self.counts[index] += 1
+        index = (index + self.leaves) >> 1
+        
+        while index:
+            self.tree[index] = self.better(self.tree[2 * index], self.tree[2 * index + 1])
+            index >>= 1
+        
+        return True
+    
+    def __len__(self) -> int:
+        return self.size
+
+
+cdef class Suggester:
+    """
+    Description:
+        Keeps the suggestions of the alias being typed, and shows them in `popup`. Its methods are called by `eventHandlers.textExpansion`,
+        except for `visible`, which is also read by the keyboard hook to suppress the keys that control the popup (`Tab`, `Up`, and `Down`).
+    ---
+    Parameters:
+        `limit -> int`: The maximum number of suggestions.
+        
+        `prefixes -> str`: The first characters of the aliases that are suggested.
+    ---
+    Attributes:
+        `popup`: The window that shows the suggestions, with `show(lines, selected)` and `hide()` methods. Created on first use.
+        
+        `items -> list[str]`: The suggested aliases. `selected` is the index of the highlighted one.
+    """
+    
+    cdef public PrefixIndex index
+    cdef public object popup
+    cdef public list items
+    cdef public int selected, limit
+    cdef public bint visible
+    cdef public str prefixes
+    cdef dict usage
+    cdef frozenset applicationAliases
+    
+    def __init__(self, int limit=8, str prefixes=":!"):
+        self.index = PrefixIndex()
+        self.popup = None
+        self.items = []
+        self.selected = 0
+        self.limit = limit
+        self.visible = False
+        self.prefixes = prefixes
+        self.usage = {}
+        self.applicationAliases = frozenset()
+    
+    cpdef void setAliases(self, aliases):
+        """Rebuilds the index from the given aliases, keeping the use counts. Only the aliases that start with one of the `prefixes` are kept."""
+        
+        cdef set applicationAliases = set()
+        
+        for applicationAbbreviations in ctrlHouse.application_abbreviations.values():
+            applicationAliases.update(applicationAbbreviations)
+        
+        # The aliases of an application are only suggested while it is focused, unless they are also global.
+        self.applicationAliases = frozenset(applicationAliases.difference(ctrlHouse.abbreviations, ctrlHouse.non_prefixed_abbreviations))
+        self.index = PrefixIndex([alias for alias in aliases if alias and alias[0] in self.prefixes], self.usage)
+    
+    cpdef void recordUse(self, str alias):
+        """Ranks the given alias higher in the next suggestions."""
+        
+        self.usage[alias] = self.usage.get(alias, 0) + 1
+        self.index.increment(alias)
+    
+    cpdef void update(self, str typed):
+        """Suggests the aliases that start with the typed text, or hides the suggestions if it does not start with one of the `prefixes`."""
+        
+        if not typed or typed[0] not in self.prefixes or self.limit <= 0:
+            self.hide()
+            return
+        
+        cdef object exclude = None
+        
+        if self.applicationAliases:
+            selected = foregroundContext.current().select(ctrlHouse.application_abbreviations)
+            exclude = self.applicationAliases.difference(selected) if selected else self.applicationAliases
+        
+        self.items = self.index.suggest(typed, self.limit, exclude)
+        self.selected = 0
+        
+        # The typed text is an alias itself, so there is nothing to complete.
+        if not self.items or self.items == [typed]:
+            self.hide()
+            return
+        
+        self.show()
+    
+    cpdef void move(self, int step):
+        """Highlights the next (`step > 0`) or the previous (`step < 0`) suggestion."""
+        
+        if self.items:
+            self.selected = (self.selected + step) % len(self.items)
+            self.show()
+    
+    cpdef str selectedAlias(self):
+        """Returns the highlighted alias, or an empty string."""
+        
+        return self.items[self.selected] if self.visible and self.items else ""
+    
+    cpdef void show(self):
+        """Shows the suggestions, each one followed by its expansion or its location if it is known without reading the disk."""
+        
+        cdef list lines = []
+        
+        for alias in self.items:
+            detail = ctrlHouse.abbreviations.get(alias) or ctrlHouse.locations.get(alias) or ""
+            lines.append(f"{alias}    {detail[:40]}" if detail else alias)
+        
+        self.visible = True
+        
+        try:
+            if self.popup is None:
+                # Imported here as the popup window is only available on Windows.
+                from cythonExtensions.guiHelper.suggestionWindow import SuggestionWindow
+                self.popup = SuggestionWindow()
+            
+            self.popup.show(lines, self.selected)
+        
+        except Exception as error:
+            print(f"➤ Warning! The suggestions can not be shown, so they are disabled: {error}")
+            self.limit = 0
+            self.visible = False
+    
+    cpdef void hide(self):
+        """Hides the suggestions."""
+        
+        if self.visible:
+            self.visible = False
+            self.items = []
+            
+            if self.popup is not None:
+                self.popup.hide()
+
+
+suggester = Suggester(configs.SUGGESTION_POPUP_LIMIT)
+"""The suggestions of `eventHandlers.textExpansion`."""
@@ -2,7 +2,8 @@
 
 from cythonExtensions.commonUtils.commonUtils import KB_Con as kbcon, ControllerHouse as ctrlHouse, WindowHouse as winHouse, PThread, Management as mgmt
 
-import win32con, os, subprocess, winsound
+import os, subprocess
+from time import perf_counter, sleep
 from collections import defaultdict
 from typing import Callable, Tuple
 
@@ -11,6 +12,10 @@ from cythonExtensions.systemHelper   import systemHelper   as sysHelper
 from cythonExtensions.windowHelper   import windowHelper   as winHelper
 from cythonExtensions.keyboardHelper import keyboardHelper as kbHelper
 from cythonExtensions.mouseHelper    import mouseHelper    as msHelper
+from cythonExtensions.mouseHelper.cursorMotion import cursorMotion, UP, RIGHT, DOWN, LEFT, PRECISE, NORMAL, FAST
+from cythonExtensions.platformBackend import platformBackend as pfBackend
+from cythonExtensions.platformBackend.platformBackend import win32con
+from cythonExtensions.hookManager.macroRecorder import macroRecorder
 import scriptConfigs as configs
 
 
@@ -21,11 +26,6 @@ SCROLL_DISTANCE_MULTIPLIER = 3
 ZOOMING_DISTANCE = 20
 ZOOMING_DISTANCE_MULTIPLIER = 1
 
-MOUSE_MOVEMENT_DISTANCE_SMALL  = 5
-MOUSE_MOVEMENT_DISTANCE_BASE   = 20
-MOUSE_MOVEMENT_DISTANCE_MEDIUM = 40
-MOUSE_MOVEMENT_DISTANCE_LARGE  = 80
-
 WINDOW_MOVEMENT_DISTANCE_SMALL  = 2
 WINDOW_MOVEMENT_DISTANCE_MEDIUM = 10
 WINDOW_MOVEMENT_DISTANCE_LARGE  = WINDOW_MOVEMENT_DISTANCE_MEDIUM * 2
@@ -42,7 +42,7 @@ def openClosedExplorer() -> bool:
 
 def callImageUtilsScript(withGUI=True) -> bool:
     if withGUI and not winHelper.getHandleByTitle("Image Window"):
-        winsound.PlaySound(r"C:\Windows\Media\Windows Proximity Notification.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
+        pfBackend.backend.playSound(r"C:\Windows\Media\Windows Proximity Notification.wav")
         
         PThread(target=subprocess.call, args=(("python", "-c", "from cythonExtensions.imageUtils.imageEditor import ImageEditor; ImageEditor(save_near_module=False).runEditor()"),)).start()
     
@@ -96,6 +96,63 @@ def callUndoRedo(undo=True) -> bool:
     return True
 
 
+macroPlayback = None
+"""The timeline of the macro being played, so the playback hotkey can stop it."""
+
+MACRO_TRIGGER_RELEASE_TIMEOUT = 2.0
+"""How long in seconds a macro waits for the keys of its playback hotkey to be released, before they are released by injected key ups."""
+
+
+def toggleMacroRecording() -> bool:
+    """Starts recording a macro, or stops the recording and saves the recorded macro to `configs.MACRO_FILE_PATH`."""
+    
+    if not macroRecorder.recording:
+        macroRecorder.start()
+        pfBackend.backend.playSound(r"SFX\knob-458.wav")
+        print("Recording a macro...")
+        
+        return True
+    
+    macro = macroRecorder.stop()
+    pfBackend.backend.playSound(r"SFX\coins-497.wav")
+    print(f"Recorded {macro}.")
+    
+    if configs.MACRO_FILE_PATH:
+        macro.save(configs.MACRO_FILE_PATH)
+    
+    return True
+
+
+def playLastMacro(speed=1.0) -> bool:
+    """Plays the last recorded macro at the given speed (`0` for the maximum speed), or stops it if it is still playing."""
+    
+    global macroPlayback
+    
+    if macroPlayback is not None and not macroPlayback.done:
+        macroPlayback.cancel()
+        macroPlayback = None
+        
+        return True
+    
+    if macroRecorder.recording or macroRecorder.lastMacro is None:
+        pfBackend.backend.playSound(r"SFX\denied.wav")
+        
+        return False
+    
+    # The macro keys would be combined with the held `Alt`/`Shift` and backtick of the playback hotkey (e.g., as `Alt` accelerators).
+    deadline = perf_counter() + MACRO_TRIGGER_RELEASE_TIMEOUT
+    
+    while ctrlHouse.modifiers and perf_counter() < deadline:
+        sleep(0.01)
+    
+    if ctrlHouse.modifiers:
+        kbHelper.resetModifierKeys()
+    
+    macroPlayback = macroRecorder.lastMacro.play(speed)
+    
+    return True
+
+
 def groupEntries(kbEventHandlers: dict[Tuple[int, int], Tuple[Callable, Tuple]]) -> dict[str, Tuple[Tuple[str, Tuple]]]:
     grouped_entries = defaultdict(list)
     
@@ -138,6 +195,11 @@ def printHotkeysAndTextExpansionTriggers():
     printWrappedDict(groupEntries(kbEventHandlers))
     printWrappedDict(groupEntries(kbEventHandlersWithSCROLL_On))
     printWrappedDict(groupEntries(kbEventHandlersWithExplorerFocus))
+    
+    for application, layer in kbEventHandlersPerApplication.items():
+        print(f"{application}:")
+        printWrappedDict(groupEntries(layer))
+    
     printWrappedDict(configs.LOCATIONS, 1)
     printWrappedDict(configs.ABBREVIATIONS, 1)
 
@@ -249,9 +311,16 @@ kbEventHandlers: dict[tuple[int, int], tuple[Callable, tuple]] = {
     #+ Playing/Pausing the top MPC-HC window: '`' + Space:
     (ctrlHouse.BACKTICK, win32con.VK_SPACE): (kbHelper.findAndSendKeyToWindow, ("MediaPlayerClassicW", win32con.VK_SPACE)),
     
+    #+ Starting/Stopping the recording of a macro: '`' + 'R'*
+    (ctrlHouse.BACKTICK, kbcon.VK_R): (toggleMacroRecording, ()),
+    
+    #+ Playing/Stopping the last recorded macro: '`' + 'R'* + {Shift (at `configs.MACRO_PLAYBACK_SPEED`) | Alt (at the maximum speed)}
+    (ctrlHouse.SHIFT_BACKTICK, kbcon.VK_R): (playLastMacro, (configs.MACRO_PLAYBACK_SPEED,)),
+    (ctrlHouse.ALT_BACKTICK, kbcon.VK_R):   (playLastMacro, (0,)),
+    
     #+ Toggling ScrollLock (useful when the keyboard doesn't have the ScrLck key): [Fn | Win] + CapsLock
-    (ctrlHouse.FN, win32con.VK_CAPITAL):  (lambda: (winsound.PlaySound(r"SFX\pedantic-490.wav" if not ctrlHouse.SCROLL else r"SFX\no-trespassing-368.wav", winsound.SND_FILENAME|winsound.SND_ASYNC), kbHelper.simulateKeyPress(win32con.VK_SCROLL, 0x46)), ()),
-    (ctrlHouse.WIN, win32con.VK_CAPITAL): (lambda: (winsound.PlaySound(r"SFX\pedantic-490.wav" if not ctrlHouse.SCROLL else r"SFX\no-trespassing-368.wav", winsound.SND_FILENAME|winsound.SND_ASYNC), kbHelper.simulateKeyPress(win32con.VK_SCROLL, 0x46)), ()),
+    (ctrlHouse.FN, win32con.VK_CAPITAL):  (lambda: (pfBackend.backend.playSound(r"SFX\pedantic-490.wav" if not ctrlHouse.SCROLL else r"SFX\no-trespassing-368.wav"), kbHelper.simulateKeyPress(win32con.VK_SCROLL, 0x46)), ()),
+    (ctrlHouse.WIN, win32con.VK_CAPITAL): (lambda: (pfBackend.backend.playSound(r"SFX\pedantic-490.wav" if not ctrlHouse.SCROLL else r"SFX\no-trespassing-368.wav"), kbHelper.simulateKeyPress(win32con.VK_SCROLL, 0x46)), ()),
 }
 """Dictionary of keyboard event handlers that ignore the state of the lock keys."""
 
@@ -288,26 +357,21 @@ kbEventHandlersWithSCROLL_On: dict[tuple[int, int], tuple[Callable, tuple]] = {
     (ctrlHouse.BACKTICK, kbcon.VK_E): (callSendMouseHoldingClick, (1,)),
     (ctrlHouse.BACKTICK, kbcon.VK_2): (callSendMouseHoldingClick, (2,)),
     
-    #+ Moving the mouse cursor: (";", "'", "/", ".") + {Alt | Shift}
-    (0, kbcon.VK_SEMICOLON):     (msHelper.moveCursor, (0, -MOUSE_MOVEMENT_DISTANCE_BASE)),
-    (0, kbcon.VK_SINGLE_QUOTES): (msHelper.moveCursor, (MOUSE_MOVEMENT_DISTANCE_BASE, 0)),
-    (0, kbcon.VK_SLASH):         (msHelper.moveCursor, (0, MOUSE_MOVEMENT_DISTANCE_BASE)),
-    (0, kbcon.VK_PERIOD):        (msHelper.moveCursor, (-MOUSE_MOVEMENT_DISTANCE_BASE, 0)),
+    #+ Moving the mouse cursor while the keys are held: (";", "'", "/", ".") + {Alt | Shift}. Two held keys move it diagonally.
+    (ctrlHouse.ALT, kbcon.VK_SEMICOLON):     (cursorMotion.press, (kbcon.VK_SEMICOLON, UP, FAST)),
+    (ctrlHouse.ALT, kbcon.VK_SINGLE_QUOTES): (cursorMotion.press, (kbcon.VK_SINGLE_QUOTES, RIGHT, FAST)),
+    (ctrlHouse.ALT, kbcon.VK_SLASH):         (cursorMotion.press, (kbcon.VK_SLASH, DOWN, FAST)),
+    (ctrlHouse.ALT, kbcon.VK_PERIOD):        (cursorMotion.press, (kbcon.VK_PERIOD, LEFT, FAST)),
     
-    (ctrlHouse.ALT, kbcon.VK_SEMICOLON):     (msHelper.moveCursor, (0, -MOUSE_MOVEMENT_DISTANCE_LARGE)),
-    (ctrlHouse.ALT, kbcon.VK_SINGLE_QUOTES): (msHelper.moveCursor, (MOUSE_MOVEMENT_DISTANCE_LARGE, 0)),
-    (ctrlHouse.ALT, kbcon.VK_SLASH):         (msHelper.moveCursor, (0, MOUSE_MOVEMENT_DISTANCE_LARGE)),
-    (ctrlHouse.ALT, kbcon.VK_PERIOD):        (msHelper.moveCursor, (-MOUSE_MOVEMENT_DISTANCE_LARGE, 0)),
+    (ctrlHouse.SHIFT, kbcon.VK_SEMICOLON):     (cursorMotion.press, (kbcon.VK_SEMICOLON, UP, PRECISE)),
+    (ctrlHouse.SHIFT, kbcon.VK_SINGLE_QUOTES): (cursorMotion.press, (kbcon.VK_SINGLE_QUOTES, RIGHT, PRECISE)),
+    (ctrlHouse.SHIFT, kbcon.VK_SLASH):         (cursorMotion.press, (kbcon.VK_SLASH, DOWN, PRECISE)),
+    (ctrlHouse.SHIFT, kbcon.VK_PERIOD):        (cursorMotion.press, (kbcon.VK_PERIOD, LEFT, PRECISE)),
     
-    (ctrlHouse.SHIFT, kbcon.VK_SEMICOLON):     (msHelper.moveCursor, (0, -MOUSE_MOVEMENT_DISTANCE_SMALL)),
-    (ctrlHouse.SHIFT, kbcon.VK_SINGLE_QUOTES): (msHelper.moveCursor, (MOUSE_MOVEMENT_DISTANCE_SMALL, 0)),
-    (ctrlHouse.SHIFT, kbcon.VK_SLASH):         (msHelper.moveCursor, (0, MOUSE_MOVEMENT_DISTANCE_SMALL)),
-    (ctrlHouse.SHIFT, kbcon.VK_PERIOD):        (msHelper.moveCursor, (-MOUSE_MOVEMENT_DISTANCE_SMALL, 0)),
-    
-    (0, kbcon.VK_SEMICOLON):     (msHelper.moveCursor, (0, -MOUSE_MOVEMENT_DISTANCE_MEDIUM)),
-    (0, kbcon.VK_SINGLE_QUOTES): (msHelper.moveCursor, (MOUSE_MOVEMENT_DISTANCE_MEDIUM, 0)),
-    (0, kbcon.VK_SLASH):         (msHelper.moveCursor, (0, MOUSE_MOVEMENT_DISTANCE_MEDIUM)),
-    (0, kbcon.VK_PERIOD):        (msHelper.moveCursor, (-MOUSE_MOVEMENT_DISTANCE_MEDIUM, 0)),
+    (0, kbcon.VK_SEMICOLON):     (cursorMotion.press, (kbcon.VK_SEMICOLON, UP, NORMAL)),
+    (0, kbcon.VK_SINGLE_QUOTES): (cursorMotion.press, (kbcon.VK_SINGLE_QUOTES, RIGHT, NORMAL)),
+    (0, kbcon.VK_SLASH):         (cursorMotion.press, (kbcon.VK_SLASH, DOWN, NORMAL)),
+    (0, kbcon.VK_PERIOD):        (cursorMotion.press, (kbcon.VK_PERIOD, LEFT, NORMAL)),
     
     #+ Simulating the keyboard hotkey `Ctrl + C`: ScrollLock + BACKTICK
     (ctrlHouse.BACKTICK, kbcon.VK_BACKTICK): (kbHelper.simulateHotKeyPress, ({win32con.VK_CONTROL: 29, kbcon.VK_C: kbcon.SC_C},)),
@@ -352,3 +416,50 @@ The value tuple of the handlers dictionary must contain four items and the last
     - Whether to check (`True`) or pass (`False`) if the desktop window is in focus.
     - Whether to suppress (`True`) or pass (`False`) the pressed keys.
 """
+
+kbEventHandlersPerApplication: dict[str, dict[tuple[int, int], tuple[Callable, tuple]]] = {
+    "MediaPlayerClassicW": {
+        #+ Toggling the full screen mode of Media Player Classic: '`' + 'F'*
+        (ctrlHouse.BACKTICK, kbcon.VK_F): (kbHelper.simulateHotKeyPress, ({win32con.VK_MENU: kbcon.SC_MENU, win32con.VK_RETURN: kbcon.SC_RETURN},)),
+    },
+}
+"""
+A dictionary of the keyboard event handler layers that are only active while a specific application is focused.
+
+The key is the window class name (e.g., `CabinetWClass`) or the lowercase process name (e.g., `vlc.exe`) of the application, and the value
+is a dictionary of handlers like `kbEventHandlers`. The hotkeys of a layer take priority over the other ones, and their keys are suppressed.
+The focused application is read from `foregroundContext`, which is updated by a foreground hook, so the layers add no per-keystroke window queries.
+"""
+
+kbChordSequences: dict[tuple[tuple[int, int], ...], tuple] = {
+    #+ Printing the defined hotkeys and text expansion triggers: '`' + 'G'*, then 'H'*
+    ((ctrlHouse.BACKTICK, kbcon.VK_G), (0, kbcon.VK_H)): (printHotkeysAndTextExpansionTriggers, ()),
+    
+    #+ Reopening the last closed explorer window: '`' + 'G'*, then 'E'*
+    ((ctrlHouse.BACKTICK, kbcon.VK_G), (0, kbcon.VK_E)): (openClosedExplorer, ()),
+}
+"""
+A dictionary of the keyboard event handlers that are triggered by a sequence of keys, pressed one after the other.
+
+The key is a tuple of `(modifiers, vkey)` steps. The first step must have modifiers, and it can not be a trigger of the other
+dictionaries. The value is a `(function, args)` tuple, with an optional third item: the time in milliseconds allowed between
+two steps of the sequence (`scriptConfigs.CHORD_STEP_TIMEOUT_MS` by default). The keys of a sequence are suppressed.
+"""
+
+
+def createHotZones() -> list:
+    """
+    Returns the hot zones registered when `configs.ENABLE_HOT_ZONES` is set.
+    
+    Each action is a `(function, arguments)` tuple, similar to the keyboard handlers.
+    """
+    
+    from cythonExtensions.hotZoneHelper import hotZoneHelper as hzHelper
+    
+    return [
+        #+ Opening the task view when the cursor dwells at the top-left corner of the primary screen: Win + Tab
+        hzHelper.cornerZone("taskView", "top-left", onDwell=(kbHelper.simulateHotKeyPress, ({win32con.VK_LWIN: 91, win32con.VK_TAB: 15},))),
+        
+        #+ Showing the desktop when the cursor dwells at the bottom-right corner of the primary screen: Win + D
+        hzHelper.cornerZone("showDesktop", "bottom-right", onDwell=(kbHelper.simulateHotKeyPress, ({win32con.VK_LWIN: 91, kbcon.VK_D: kbcon.SC_D},))),
+    ]
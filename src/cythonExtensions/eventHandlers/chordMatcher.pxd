@@ -0,0 +1,24 @@
+cdef class ChordMatcher:
+    cdef unsigned long long * keys
+    cdef int * children
+    cdef size_t tableMask
+    cdef double * timeouts
+    cdef list handlers
+    cdef int nodeCount, sequenceCount
+    cdef int state, lastModifiers, lastVkey
+    cdef double deadline
+    cdef long long completedSequences, timedOutSequences, brokenSequences
+    
+    cdef inline int findChild(self, int node, int modifiers, int vkey)
+    
+    cpdef int feed(self, int modifiers, int vkey, double eventTime)
+    
+    cpdef object handlerOf(self, int node)
+    
+    cpdef bint isPending(self)
+    
+    cpdef void reset(self)
+    
+    cpdef dict getStats(self)
+    
+    cpdef void resetStats(self)
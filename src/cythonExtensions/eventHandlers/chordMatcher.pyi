@@ -0,0 +1,82 @@
+"""
+This module compiles the multi-key chord sequences (e.g., `` ` `` + `G`, then `H`) into a trie, and matches the pressed keys against it.
+
+The transitions of the trie are stored in a C open addressing hash table keyed by `(node, modifiers, vkey)`, so matching
+a key is a single table lookup no matter how many sequences are defined, and it does not create any Python objects.
+"""
+
+
+def formatSequence(steps: tuple[tuple[int, int], ...]) -> str:
+    """Returns a readable form of the given chord sequence steps, e.g., `(BACKTICK, 71) → (0, 72)`."""
+    ...
+
+
+class ChordMatcher:
+    """
+    Description:
+        Matches the pressed keys against multi-key chord sequences. A sequence is a tuple of `(modifiers, vkey)` steps, like the
+        triggers of `callbacks.kbEventHandlers`, e.g., `((ctrlHouse.BACKTICK, kbcon.VK_G), (0, kbcon.VK_H))` for `` ` `` + `G`, then `H`.
+
+        - Each key is one transition of the trie. The keys that advance a sequence are consumed (suppressed and not handled as normal keys).
+        - A sequence is broken when the next step is not pressed within its timeout, or when another key is pressed. The breaking
+        key is then matched from the start, and the consumed keys are not replayed. Pressing a modifier key alone does not break a sequence.
+        - `feed` must only be called from one thread (the hook thread).
+    ---
+    Parameters:
+        `sequences -> dict[tuple[tuple[int, int], ...], tuple]`: Maps the sequences to their `(function, args)` handlers. A handler
+        can have a third item, the timeout in milliseconds of each step of its sequence.
+
+        `timeoutMs -> float`: The default time allowed between two steps of a sequence.
+
+        `reservedTriggers -> set | frozenset`: The triggers of the single key hotkeys. Sequences that start with one of them are skipped.
+    ---
+    Notes:
+        - The first step of a sequence must have modifiers, so that normal typing never starts a sequence.
+        - A sequence can not be the prefix of another sequence. The conflicting sequences are skipped with a warning.
+    """
+
+    nodeCount: int
+    sequenceCount: int
+    completedSequences: int
+    timedOutSequences: int
+    brokenSequences: int
+
+    def __init__(self, sequences: dict[tuple[tuple[int, int], ...], tuple] | None=None, timeoutMs=1500.0, reservedTriggers: set | frozenset=frozenset()) -> None:
+        ...
+
+    def feed(self, modifiers: int, vkey: int, eventTime: float) -> int:
+        """
+        Description:
+            Advances the sequences with a pressed key.
+        ---
+        Parameters:
+            `modifiers, vkey -> int`: The `Modifiers` and `KeyID` of the key down event.
+
+            `eventTime -> float`: The time of the event in seconds (e.g., its `HookTime`).
+        ---
+        Returns:
+            `int`: The node reached by the key, or `0` if the key is not part of a sequence. Pass it to `handlerOf` to get
+            the handler of the completed sequence, if any.
+            The auto-repeated presses of a pending step return the pending node, so they are consumed too.
+        """
+        ...
+
+    def handlerOf(self, node: int) -> tuple | None:
+        """Returns the `(function, args)` handler of the sequence completed at the given node, or `None` if it does not complete a sequence."""
+        ...
+
+    def isPending(self) -> bool:
+        """Returns whether a sequence has been started and is waiting for its next step."""
+        ...
+
+    def reset(self) -> None:
+        """Cancels the started sequence, if any."""
+        ...
+
+    def getStats(self) -> dict[str, int]:
+        """Returns a snapshot of the matcher statistics."""
+        ...
+
+    def resetStats(self) -> None:
+        """Resets the collected statistics."""
+        ...
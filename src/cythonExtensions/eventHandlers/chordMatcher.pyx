@@ -0,0 +1,272 @@
+# cython: language_level = 3str
+
+"""
+This extension module compiles the multi-key chord sequences (e.g., `` ` `` + `G`, then `H`) into a trie, and matches the pressed keys against it.
+
+The transitions of the trie are stored in a C open addressing hash table keyed by `(node, modifiers, vkey)`, so matching
+a key is a single table lookup no matter how many sequences are defined, and it does not create any Python objects.
+"""
+
+from libc.stdlib cimport malloc, calloc, free
+
+from cythonExtensions.commonUtils.commonUtils import ControllerHouse as ctrlHouse
+
+
+cdef int MIN_TABLE_SIZE = 16
+
+cdef frozenset modifierKeys = frozenset((0x10, 0x11, 0x12, 0x5B, 0x5C, 0xA0, 0xA1, 0xA2, 0xA3, 0xA4, 0xA5, 0xC0, 255))
+"""The virtual keys of the modifiers (`Shift`, `Ctrl`, `Alt`, `Win`, backtick, and `FN`). Pressing them does not break a sequence."""
+
+
+cdef inline unsigned long long transitionKey(int node, int modifiers, int vkey):
+    return (<unsigned long long> node) << 24 | (<unsigned long long> (modifiers & 0xFFFF)) << 8 | (vkey & 0xFF)
+
+
+cdef inline size_t hashKey(unsigned long long key):
+    # The finalizer of `splitmix64`, which spreads the nearby keys over the whole table.
+    key = (key ^ (key >> 30)) * 0xBF58476D1CE4E5B9ULL
+    key = (key ^ (key >> 27)) * 0x94D049BB133111EBULL
+    
+    return <size_t> (key ^ (key >> 31))
+
+
+def formatSequence(tuple steps) -> str:
+    """Returns a readable form of the given chord sequence steps, e.g., `(BACKTICK, 71) → (0, 72)`."""
+    
+    names = {ctrlHouse.CTRL: "CTRL", ctrlHouse.SHIFT: "SHIFT", ctrlHouse.ALT: "ALT", ctrlHouse.WIN: "WIN", ctrlHouse.FN: "FN", ctrlHouse.BACKTICK: "BACKTICK"}
+    
+    return " → ".join(f"({'+'.join(name for mask, name in names.items() if modifiers & mask) or 0}, {vkey})" for modifiers, vkey in steps)
+
+
+cdef class ChordMatcher:
+    """
+    Description:
+        Matches the pressed keys against multi-key chord sequences. A sequence is a tuple of `(modifiers, vkey)` steps, like the
+        triggers of `callbacks.kbEventHandlers`, e.g., `((ctrlHouse.BACKTICK, kbcon.VK_G), (0, kbcon.VK_H))` for `` ` `` + `G`, then `H`.
+        
+        - Each key is one transition of the trie. The keys that advance a sequence are consumed (suppressed and not handled as normal keys).
+        - A sequence is broken when the next step is not pressed within its timeout, or when another key is pressed. The breaking
+        key is then matched from the start, and the consumed keys are not replayed. Pressing a modifier key alone does not break a sequence.
+        - `feed` must only be called from one thread (the hook thread).
+    ---
+    Parameters:
+        `sequences -> dict[tuple[tuple[int, int], ...], tuple]`: Maps the sequences to their `(function, args)` handlers. A handler
+        can have a third item, the timeout in milliseconds of each step of its sequence.
+        
+        `timeoutMs -> float`: The default time allowed between two steps of a sequence.
+        
+        `reservedTriggers -> set | frozenset`: The triggers of the single key hotkeys. Sequences that start with one of them are skipped.
+    ---
+    Notes:
+        - The first step of a sequence must have modifiers, so that normal typing never starts a sequence.
+        - A sequence can not be the prefix of another sequence. The conflicting sequences are skipped with a warning.
+    """
+    
+    cdef unsigned long long * keys
+    cdef int * children
+    cdef size_t tableMask
+    cdef double * timeouts
+    cdef list handlers
+    cdef public int nodeCount, sequenceCount
+    cdef int state, lastModifiers, lastVkey
+    cdef double deadline
+    cdef public long long completedSequences, timedOutSequences, brokenSequences
+    
+    def __cinit__(self):
+        self.keys = NULL
+        self.children = NULL
+        self.timeouts = NULL
+    
+    def __init__(self, dict sequences=None, double timeoutMs=1500.0, reservedTriggers=frozenset()):
+        cdef dict transitions = {}
+        cdef list nodeTimeouts = [0.0]
+        cdef size_t tableSize = MIN_TABLE_SIZE, slot
+        cdef unsigned long long key
+        cdef int node, child, index
+        
+        self.handlers = [None]
+        self.sequenceCount = 0
+        
+        for steps, handler in (sequences or {}).items():
+            if not steps or not steps[0][0]:
+                print(f"➤ Warning! The chord sequence {formatSequence(steps)} is skipped. Its first step must have modifiers.")
+                continue
+            
+            if steps[0] in reservedTriggers:
+                print(f"➤ Warning! The chord sequence {formatSequence(steps)} is skipped. Its first step is already a hotkey.")
+                continue
+            
+            stepTimeout = (handler[2] if len(handler) > 2 else timeoutMs) / 1000
+            
+            # Checking for prefix conflicts before adding any node of the sequence.
+            node = 0
+            for modifiers, vkey in steps:
+                node = transitions.get((node, modifiers, vkey), -1)
+                if node < 0 or self.handlers[node] is not None:
+                    break
+            
+            if node >= 0:
+                print(f"➤ Warning! The chord sequence {formatSequence(steps)} is skipped. It conflicts with another sequence (one of them is a prefix of the other).")
+                continue
+            
+            node = 0
+            for modifiers, vkey in steps:
+                child = transitions.get((node, modifiers, vkey), -1)
+                
+                if child < 0:
+                    child = len(self.handlers)
+                    transitions[(node, modifiers, vkey)] = child
+                    self.handlers.append(None)
+                    nodeTimeouts.append(0.0)
+                
+                # The time allowed after reaching a node for pressing the next step.
+                nodeTimeouts[child] = max(nodeTimeouts[child], stepTimeout)
+                node = child
+            
+            self.handlers[node] = tuple(handler[:2])
+            self.sequenceCount += 1
+        
+        self.nodeCount = len(self.handlers)
+        
+        # Keeping the load factor at or below 0.5, so the probe sequences stay short.
+        while tableSize < 2 * len(transitions):
+            tableSize *= 2
+        
+        self.tableMask = tableSize - 1
+        self.keys = <unsigned long long *> calloc(tableSize, sizeof(unsigned long long))
+        self.children = <int *> calloc(tableSize, sizeof(int))
+        self.timeouts = <double *> malloc(self.nodeCount * sizeof(double))
+        
+        if self.keys is NULL or self.children is NULL or self.timeouts is NULL:
+            raise MemoryError()
+        
+        for index in range(self.nodeCount):
+            self.timeouts[index] = nodeTimeouts[index]
+        
+        # A child index is never 0 (the root), so 0 marks the empty slots.
+        for (node, modifiers, vkey), child in transitions.items():
+            key = transitionKey(node, modifiers, vkey)
+            slot = hashKey(key) & self.tableMask
+            
+            while self.children[slot]:
+                slot = (slot + 1) & self.tableMask
+            
+            self.keys[slot] = key
+            self.children[slot] = child
+        
+        self.reset()
+        self.resetStats()
+    
+    def __dealloc__(self):
+        free(self.keys)
+        free(self.children)
+        free(self.timeouts)
+    
+    cdef inline int findChild(self, int node, int modifiers, int vkey):
+        """Returns the child of the node reached with the given key, or 0 if there is none."""
+        
+        cdef unsigned long long key = transitionKey(node, modifiers, vkey)
+        cdef size_t slot = hashKey(key) & self.tableMask
+        
+        while self.children[slot]:
+            if self.keys[slot] == key:
+                return self.children[slot]
+            
+            slot = (slot + 1) & self.tableMask
+        
+        return 0
+    
+    cpdef int feed(self, int modifiers, int vkey, double eventTime):
+        """
+        Description:
+            Advances the sequences with a pressed key.
+        ---
+        Parameters:
+            `modifiers, vkey -> int`: The `Modifiers` and `KeyID` of the key down event.
+            
+            `eventTime -> float`: The time of the event in seconds (e.g., its `HookTime`).
+        ---
+        Returns:
+            `int`: The node reached by the key, or `0` if the key is not part of a sequence. Pass it to `handlerOf` to get
+            the handler of the completed sequence, if any.
+            The auto-repeated presses of a pending step return the pending node, so they are consumed too.
+        """
+        
+        cdef int child
+        
+        if self.state:
+            if eventTime > self.deadline:
+                self.timedOutSequences += 1
+                self.state = 0
+            
+            else:
+                child = self.findChild(self.state, modifiers, vkey)
+                
+                if not child:
+                    # The modifiers pressed for the next step are passed through.
+                    if vkey in modifierKeys:
+                        return 0
+                    
+                    # The auto-repeated key downs of the last step keep the sequence pending, and are consumed like the first press.
+                    if vkey == self.lastVkey and modifiers == self.lastModifiers:
+                        return self.state
+                    
+                    self.brokenSequences += 1
+                    self.state = 0
+        
+        if not self.state:
+            child = self.findChild(0, modifiers, vkey)
+            
+            if not child:
+                return 0
+        
+        self.lastModifiers = modifiers
+        self.lastVkey = vkey
+        
+        if self.handlers[child] is not None:
+            self.completedSequences += 1
+            self.state = 0
+        
+        else:
+            self.state = child
+            self.deadline = eventTime + self.timeouts[child]
+        
+        return child
+    
+    cpdef object handlerOf(self, int node):
+        """Returns the `(function, args)` handler of the sequence completed at the given node, or `None` if it does not complete a sequence."""
+        
+        if 0 < node < self.nodeCount:
+            return self.handlers[node]
+        
+        return None
+    
+    cpdef bint isPending(self):
+        """Returns whether a sequence has been started and is waiting for its next step."""
+        
+        return self.state != 0
+    
+    cpdef void reset(self):
+        """Cancels the started sequence, if any."""
+        
+        self.state = 0
+        self.lastModifiers = self.lastVkey = -1
+        self.deadline = 0.0
+    
+    cpdef dict getStats(self):
+        """Returns a snapshot of the matcher statistics."""
+        
+        return {
+            "sequences":          self.sequenceCount,
+            "nodes":              self.nodeCount,
+            "completedSequences": self.completedSequences,
+            "timedOutSequences":  self.timedOutSequences,
+            "brokenSequences":    self.brokenSequences,
+        }
+    
+    cpdef void resetStats(self):
+        """Resets the collected statistics."""
+        
+        self.completedSequences = 0
+        self.timedOutSequences = 0
+        self.brokenSequences = 0
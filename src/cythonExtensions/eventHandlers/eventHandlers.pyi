@@ -1,22 +1,70 @@
 """This module contains the event listeners responsible for handling keyboard keyPress & keyRelease, and mouse events."""
+from typing import Callable
 from cythonExtensions.commonUtils.commonUtils import KeyboardEvent, MouseEvent
 
 
+def compileHotkeyTables() -> None:
+    """Builds the lookup tables used by `keyDownFilter` and `keyPress` from the hotkeys defined in the `callbacks` module and the declarative hotkey file."""
+    ...
+
+def compileTextMatcher() -> None:
+    """
+    Builds the automaton used by `textExpansion` from the aliases of the `ControllerHouse` tables, and compiles their expansions into
+    snippet templates and the prefixed aliases into the autocomplete index. Called each time the tables are replaced.
+    """
+    ...
+
+def applyHotkeyConfig() -> int:
+    """
+    Description:
+        Reloads the declarative hotkey file, then swaps only its changed hotkeys and aliases into the live tables.
+        Called by the file watcher each time the file changes.
+    ---
+    Returns:
+        `int`: The number of changed hotkey triggers and aliases, or `-1` if the file is invalid (the live tables are kept).
+    """
+    ...
+
 def reloadHotkeys() -> None:
-    """Reloads the defined hotkeys in the `callbacks` module."""
+    """Reloads the defined hotkeys in the `callbacks` module and the declarative hotkey file."""
+    ...
+
+def runTimedHandler(handler: Callable, args: tuple, hookTime: float) -> None:
+    """Runs a hotkey handler and records its run time in the `handler.<name>` histogram."""
+    ...
+
+def openImageViewer() -> None:
+    """Opens the selected image of the active explorer window in the image viewer, or closes the viewer if it shows that image. Runs in its own thread, as it reads the selection over COM."""
+    ...
+
+def keyDownFilter(event: KeyboardEvent) -> bool:
+    """
+    Description:
+        Decides whether the pressed key should be suppressed. This is called synchronously by the keyboard hook,
+        so it only does table lookups; the hotkey actions themselves are executed asynchronously by `keyPress`.
+    ---
+    Parameters:
+        `event -> KeyboardEvent`:
+            A keyboard event object.
+    ---
+    Return:
+        `suppressKeyPress -> bool`: Whether to suppress the pressed key or return it.
+    """
     ...
 
 def keyPress(event: KeyboardEvent) -> bool:
     """
     Description:
         The callback function responsible for handling hotkey press events.
+        Whether the pressed key is suppressed or not is decided beforehand by `keyDownFilter`. The actions of the suppressing
+        hotkeys only run if the key was actually suppressed (see `KeyboardEvent.Suppressed`).
     ---
     Parameters:
         `event -> KeyboardEvent`:
             A keyboard event object.
     ---
     Return:
-        `suppressKeyPress -> bool`: Whether to suppress the pressed key or return it.
+        `bool`: Whether an action was executed for the pressed key.
     """
     ...
 
@@ -50,6 +98,11 @@ def textExpansion(event: KeyboardEvent) -> bool:
     ...
 
 
+def buttonDownFilter(event: MouseEvent) -> bool:
+    """Decides whether the mouse input should be suppressed. This is called synchronously by the mouse hook, while the actions are executed by `buttonPress`."""
+    ...
+
+
 def buttonPress(event: MouseEvent) -> bool:
     """The callback function responsible for handling the `buttonPress` events."""
     ...
@@ -4,122 +4,305 @@
 
 cimport cython
 from cythonExtensions.commonUtils.commonUtils cimport KeyboardEvent, MouseEvent
+from cythonExtensions.metricsHelper.metricsHelper cimport LatencyHistogram
+from cythonExtensions.eventHandlers.chordMatcher cimport ChordMatcher
+from cythonExtensions.eventHandlers.hotkeyIndex cimport HotkeyIndex, HotkeyEntry
+from cythonExtensions.eventHandlers.hotkeyConfig cimport HotkeyConfig
+from cythonExtensions.eventHandlers.textMatcher cimport TextMatcher
+from cythonExtensions.eventHandlers.autocomplete cimport Suggester
+from cythonExtensions.mouseHelper.cursorMotion cimport CursorMotionEngine
 
-import win32gui, win32con, importlib, winsound, os, subprocess
+import importlib, os, subprocess, threading
+from time import perf_counter
 
 from cythonExtensions.commonUtils.commonUtils import  KB_Con as kbcon, ControllerHouse as ctrlHouse, MouseHouse as msHouse, PThread, Management as mgmt
 from cythonExtensions.eventHandlers import callbacks as cbs
+from cythonExtensions.eventHandlers import autocomplete
+from cythonExtensions.eventHandlers.hotkeyIndex import CONFIG_LAYER
+from cythonExtensions.eventHandlers.hotkeyConfig import hotkeyConfig
 from cythonExtensions.keyboardHelper import keyboardHelper as kbHelper
+from cythonExtensions.keyboardHelper.snippetTemplate import compileTemplates
+from cythonExtensions.keyboardHelper.snippetLibrary import snippetLibrary
+from cythonExtensions.timelineHelper.burstEngine import burstEngine
+from cythonExtensions.mouseHelper import cursorMotion
 from cythonExtensions.windowHelper import windowHelper as winHelper
+from cythonExtensions.windowHelper.foregroundContext import foregroundContext
 from cythonExtensions.explorerHelper import explorerHelper as expHelper
+from cythonExtensions.metricsHelper.metricsHelper import getHistogram
+from cythonExtensions.platformBackend import platformBackend as pfBackend
+from cythonExtensions.platformBackend.platformBackend import win32con
+import scriptConfigs as configs
 
-cdef void reloadHotkeys():
-    """Reloads the defined hotkeys in the `callbacks` module."""
+cdef HotkeyIndex hotkeyIndex = None
+"""The compiled hotkeys of `callbacks.kbEventHandlers`, `kbEventHandlersWithSCROLL_On`, `kbEventHandlersWithExplorerFocus`, and the declarative hotkey file."""
+
+cdef ChordMatcher chordMatcher = ChordMatcher()
+"""The compiled `callbacks.kbChordSequences`."""
+
+cdef KeyboardEvent lastChordEvent = None
+"""The last key consumed by `chordMatcher`, whose final suppression decision is checked by `keyDownFilter` before the next key."""
+
+cdef TextMatcher textMatcher = TextMatcher()
+"""The compiled aliases of `ctrlHouse.abbreviations`, `non_prefixed_abbreviations`, `application_abbreviations`, `locations`, `textCommands`, and the snippet library."""
+
+cdef Suggester suggester = autocomplete.suggester
+"""The autocomplete suggestions of the prefixed aliases being typed."""
+
+cdef bint textResetPending = False
+"""Set by `buttonPress` when a button is clicked, so `textExpansion` discards the typed alias before its next key."""
+
+cdef CursorMotionEngine motionEngine = cursorMotion.cursorMotion
+"""Moves the cursor while the mouse-control direction keys are held."""
+
+cdef set inlineHandlers = {(<object> motionEngine).press}
+"""The handlers that only update some state and return at once. They run on the hook worker, instead of a new thread for each (auto-repeated) key press."""
+
+cdef tuple textCommands = (">cls", "!bst")
+"""The aliases that run a command instead of being expanded."""
+
+cdef object hotkeyTablesLock = threading.Lock()
+"""Serializes the compilations and the reloads of the hotkey tables, which may be requested from the hotkeys, the tray icon, and the file watcher."""
+
+cpdef void compileHotkeyTables():
+    """Builds the lookup tables used by `keyDownFilter` and `keyPress` from the hotkeys defined in the `callbacks` module and the declarative hotkey file."""
+    
+    global hotkeyIndex, chordMatcher
+    
+    with hotkeyTablesLock:
+        (<HotkeyConfig> hotkeyConfig).load(cbs)
+        
+        # The tables are replaced as a whole, so the hook never sees partially compiled ones.
+        hotkeyIndex = HotkeyIndex(cbs, foregroundContext, (<HotkeyConfig> hotkeyConfig).hotkeys)
+        chordMatcher = ChordMatcher(cbs.kbChordSequences, configs.CHORD_STEP_TIMEOUT_MS, hotkeyIndex.triggers())
+        (<HotkeyConfig> hotkeyConfig).applyTexts(True)
+        compileTextMatcher()
+
+cpdef void compileTextMatcher():
+    """
+    Builds the automaton used by `textExpansion` from the aliases of the `ControllerHouse` tables, and compiles their expansions into
+    snippet templates and the prefixed aliases into the autocomplete index. Called each time the tables are replaced.
+    """
+    
+    global textMatcher
+    
+    # The expansions of the snippet library stay on the disk, only its aliases are matched.
+    cdef set aliases = {*ctrlHouse.abbreviations, *ctrlHouse.non_prefixed_abbreviations, *ctrlHouse.locations, *textCommands, *snippetLibrary.aliases}
+    cdef list expansions = [*ctrlHouse.abbreviations.values(), *ctrlHouse.non_prefixed_abbreviations.values()]
+    
+    for applicationAbbreviations in ctrlHouse.application_abbreviations.values():
+        aliases.update(applicationAbbreviations)
+        expansions.extend(applicationAbbreviations.values())
+    
+    # Replaced as a whole, so the listener never sees a partially built automaton.
+    textMatcher = TextMatcher(aliases, configs.TEXT_EXPANSION_WORD_BOUNDARY, ctrlHouse.max_alias_length)
+    
+    compileTemplates(expansions)
+    suggester.setAliases(aliases)
+
+compileHotkeyTables()
+
+cpdef int applyHotkeyConfig():
+    """
+    Description:
+        Reloads the declarative hotkey file, then swaps only its changed hotkeys and aliases into the live tables.
+        Called by the file watcher each time the file changes.
+    ---
+    Returns:
+        `int`: The number of changed hotkey triggers and aliases, or `-1` if the file is invalid (the live tables are kept).
+    """
+    
+    global chordMatcher
+    
+    cdef HotkeyConfig config = hotkeyConfig
+    cdef double startTime = perf_counter()
+    cdef int changed, textsChanged
+    
+    with hotkeyTablesLock:
+        if not config.load(cbs):
+            return -1
+        
+        triggers = hotkeyIndex.triggers()
+        changed = hotkeyIndex.updateLayer(CONFIG_LAYER, config.hotkeys)
+        textsChanged = config.applyTexts()
+        
+        if textsChanged:
+            compileTextMatcher()
+        
+        changed += textsChanged
+        
+        # The chord prefixes must not shadow the hotkeys, so the matcher is only rebuilt if the set of triggers changed.
+        if hotkeyIndex.triggers() != triggers:
+            chordMatcher = ChordMatcher(cbs.kbChordSequences, configs.CHORD_STEP_TIMEOUT_MS, hotkeyIndex.triggers())
+    
+    print(f"Reloaded '{os.path.basename(config.filePath)}': {changed} changed entries in {(perf_counter() - startTime) * 1000:.1f} ms.")
+    
+    return changed
+
+cpdef void reloadHotkeys():
+    """Reloads the defined hotkeys in the `callbacks` module and the declarative hotkey file."""
     
     importlib.reload(cbs)
+    compileHotkeyTables()
     
-    winsound.PlaySound(r"SFX\completed-voice-ringtone.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
+    pfBackend.backend.playSound(r"SFX\completed-voice-ringtone.wav")
+
+cdef LatencyHistogram hookToActionTimes = getHistogram("keyboard.hookToActionDone")
+"""The time from the hook receiving a hotkey to its handler finishing."""
 
-cdef bint executeExplorerRelatedCallbacks(eventHandler):
-    suppressKeyPress = False
+def runTimedHandler(handler, tuple args, double hookTime) -> None:
+    """Runs a hotkey handler and records its run time in the `handler.<name>` histogram."""
     
-    # In some rare cases, after getting foreground window handle, if the window is destroyed before calling the
-    # GetClassName function, then it raises an exception.
-    try:
-        classNames = ("CabinetWClass", "WorkerW", "Progman") if eventHandler[2] else ("CabinetWClass",)
-        if win32gui.GetClassName(win32gui.GetForegroundWindow()) in classNames:
-            PThread(target=eventHandler[0], args=eventHandler[1]).start()
-            
-            suppressKeyPress = eventHandler[3]
+    cdef double startedAt = perf_counter()
     
-    except Exception as e:
-        print(f"Error: {e}\nA problem occurred while retrieving the className of the foreground window.\n")
+    try:
+        handler(*args)
     
-    return suppressKeyPress
+    finally:
+        finishedAt = perf_counter()
+        getHistogram(f"handler.{getattr(handler, '__qualname__', handler)}").record(finishedAt - startedAt)
+        
+        if hookTime:
+            hookToActionTimes.record(finishedAt - hookTime)
 
-cdef bint openImageViewer():
-    if win32gui.GetClassName(win32gui.GetForegroundWindow()) not in ("CabinetWClass", "WorkerW", "Progman"):
-        return False
+def openImageViewer() -> None:
+    """Opens the selected image of the active explorer window in the image viewer, or closes the viewer if it shows that image. Runs in its own thread, as it reads the selection over COM."""
     
     selectedImage = expHelper.getSelectedItemsFromActiveExplorer(None, ("jpg", "png", "jpeg", "ico", "bmp", "gif", "webp"))
     if not selectedImage:
-        return False
+        return
     
-    hwnd = win32gui.FindWindow("ImageViewerClass", None) # winHelper.findHandleByClassName("ImageViewerClass", False)
+    hwnd = pfBackend.backend.findWindow("ImageViewerClass", None) # winHelper.findHandleByClassName("ImageViewerClass", False)
     
     if hwnd:
         # If the window title (which is the image path) is the same as the selected image, then close the window.
-        if win32gui.GetWindowText(hwnd) == selectedImage[0]:
-            win32gui.SendMessage(hwnd, win32con.WM_CLOSE, 0, 0)
-            return False
+        if pfBackend.backend.getWindowText(hwnd) == selectedImage[0]:
+            pfBackend.backend.sendMessage(hwnd, win32con.WM_CLOSE, 0, 0)
+            return
         
         WM_SETIMAGE = win32con.WM_USER + 1
         PThread(target=subprocess.call, args=(("python", "-c", f"from cythonExtensions.guiHelper.imageViewer import BuildString; BuildString({hwnd}, {WM_SETIMAGE}).sendString(r\"{selectedImage[0]}\")"),)).start()
-        
-        return False
     
     else:
         # If the image viewer is not already running, then start it.
         PThread(target=subprocess.call, args=(("python", "-c", f"from cythonExtensions.guiHelper.imageViewer import ImageViewer; ImageViewer(r\"{selectedImage[0]}\", r\"{selectedImage[0]}\")"),)).start()
-        
-        return False
 
-def keyPress(KeyboardEvent event) -> bool:
+def keyDownFilter(KeyboardEvent event) -> bool:
     """
     Description:
-        The callback function that maps the pressed keys to their corresponding functions and executes them.
+        Decides whether the pressed key should be suppressed. This is called synchronously by the keyboard hook,
+        so it only does table lookups; the hotkey actions themselves are executed asynchronously by `keyPress`.
     ---
     Parameters:
         `event -> KeyboardEvent`:
             A keyboard event object.
     ---
     Return:
-        `suppressKeyPress -> bool`: Whether to suppress the last pressed key or return it.
+        `suppressKeyPress -> bool`: Whether to suppress the pressed key or return it.
     """
     
+    global lastChordEvent
+    
+    # The step of a sequence that was passed through (the filter overran its budget) reached the focused window, so the sequence is cancelled.
+    # This is done here, before the next key, as `chordMatcher` must only be used by the hook thread.
+    if lastChordEvent is not None:
+        if not lastChordEvent.Suppressed:
+            chordMatcher.reset()
+        
+        lastChordEvent = None
+    
     # This is used to prevent the `backtick` key from being sent when trying to trigger an internal hotkey.
     # We also need to check if a modifier is pressed to prevent blocking any external hotkeys from other applications that use the `backtick` key.
     if event.KeyID == kbcon.VK_BACKTICK:
-        mgmt.isBacktickTheOnlyModiferPressed = ctrlHouse.modifiers == ctrlHouse.BACKTICK
-    # elif ctrlHouse.modifiers & ctrlHouse.BACKTICK: # A key is pressed while the backtick is pressed, so don't send backtick when it is released.
+        mgmt.isBacktickTheOnlyModiferPressed = event.Modifiers == ctrlHouse.BACKTICK
     else: # A key is pressed while the backtick is pressed, so don't send backtick when it is released.
         mgmt.isBacktickTheOnlyModiferPressed = False
     
+    if mgmt.suppressKbInputs or mgmt.isBacktickTheOnlyModiferPressed:
+        return True
+    
+    # The keys of the chord sequences are suppressed, and handled by `keyPress` when a sequence is completed.
+    event.ChordNode = chordMatcher.feed(event.Modifiers, event.KeyID, event.HookTime)
+    if event.ChordNode:
+        lastChordEvent = event
+        
+        return True
+    
+    if hotkeyIndex.shouldSuppress(event.Modifiers, event.KeyID, ctrlHouse.SCROLL):
+        return True
+    
+    #+ Reload the hotkeys: Ctrl + Alt + Win + 'R'*
+    if (event.Modifiers & ctrlHouse.CTRL_ALT_WIN) == ctrlHouse.CTRL_ALT_WIN and event.KeyID == kbcon.VK_R:
+        return True
+    
+    # The keys that control the autocomplete popup are not typed while it is shown, unless it is about to be hidden after a click.
+    if suggester.visible and not textResetPending and not event.Modifiers and event.KeyID in (win32con.VK_TAB, win32con.VK_UP, win32con.VK_DOWN):
+        return True
+    
+    return ctrlHouse.burstClicksActive and event.KeyID == win32con.VK_ESCAPE
+
+def keyPress(KeyboardEvent event) -> bool:
+    """
+    Description:
+        The callback function that maps the pressed keys to their corresponding functions and executes them.
+        Whether the pressed key is suppressed or not is decided beforehand by `keyDownFilter`. The actions of the suppressing
+        hotkeys only run if the key was actually suppressed (see `KeyboardEvent.Suppressed`).
+    ---
+    Parameters:
+        `event -> KeyboardEvent`:
+            A keyboard event object.
+    ---
+    Return:
+        `bool`: Whether an action was executed for the pressed key.
+    """
+    
     # # Setting the shared variable to indicate that the mouse volume control hotkey (Ctrl + Shift) is pressed.
-    # if ctrlHouse.modifiers & ctrlHouse.CTRL_SHIFT:
+    # if event.Modifiers & ctrlHouse.CTRL_SHIFT:
     #     mgmt.mouseVolumeControlSVar.value = True
     
-    cdef bint suppressKeyPress = mgmt.suppressKbInputs or mgmt.isBacktickTheOnlyModiferPressed # and not (ctrlHouse.modifiers & ctrlHouse.FN) and
+    # A key of a chord sequence. The handler is only executed by the last key of the sequence.
+    if event.ChordNode and event.Suppressed:
+        eventHandler = chordMatcher.handlerOf(event.ChordNode)
+        
+        if eventHandler is not None:
+            PThread(target=runTimedHandler, args=(eventHandler[0], eventHandler[1], event.HookTime)).start()
+            
+            return True
+        
+        return False
     
-    eventHandler = cbs.kbEventHandlers.get((ctrlHouse.modifiers, event.KeyID)) or \
-        (ctrlHouse.SCROLL and cbs.kbEventHandlersWithSCROLL_On.get((ctrlHouse.modifiers, event.KeyID))) or \
-        cbs.kbEventHandlersWithExplorerFocus.get((ctrlHouse.modifiers, event.KeyID))
+    cdef HotkeyEntry hotkey = hotkeyIndex.resolve(event.Modifiers, event.KeyID, ctrlHouse.SCROLL)
     
-    if eventHandler:
-        if len(eventHandler) == 2:
-            PThread(target=eventHandler[0], args=eventHandler[1]).start()
-            suppressKeyPress = True
+    # A suppressing hotkey whose key was passed through (the filter failed or overran its budget) is not executed, as the key already reached the focused window.
+    if hotkey is not None and (event.Suppressed or not hotkey.suppress):
+        if hotkey.function in inlineHandlers:
+            hotkey.function(*hotkey.args)
+        
+        else:
+            PThread(target=runTimedHandler, args=(hotkey.function, hotkey.args, event.HookTime)).start()
         
-        elif len(eventHandler) == 4:
-            executeExplorerRelatedCallbacks(eventHandler)
+        return True
     
     #+ Opening the selected image file from the active explorer window: 'Space'
-    elif not ctrlHouse.modifiers and event.KeyID == win32con.VK_SPACE:
-        suppressKeyPress |= openImageViewer()
+    elif not event.Modifiers and event.KeyID == win32con.VK_SPACE:
+        # The selection is read over COM, so it is not done in the listener lane, which would hold up the next keys.
+        if foregroundContext.current().isIn(("CabinetWClass", "WorkerW", "Progman")):
+            PThread(target=openImageViewer).start()
+        
+        return False
     
     #+ Reload the hotkeys: Ctrl + Alt + Win + 'R'*
-    elif (ctrlHouse.modifiers & ctrlHouse.CTRL_ALT_WIN) == ctrlHouse.CTRL_ALT_WIN and event.KeyID == kbcon.VK_R:
+    elif event.Suppressed and (event.Modifiers & ctrlHouse.CTRL_ALT_WIN) == ctrlHouse.CTRL_ALT_WIN and event.KeyID == kbcon.VK_R:
         PThread(target=reloadHotkeys).start()
         
-        suppressKeyPress = True
+        return True
     
-    elif ctrlHouse.burstClicksActive and event.KeyID == win32con.VK_ESCAPE:
+    elif event.Suppressed and ctrlHouse.burstClicksActive and event.KeyID == win32con.VK_ESCAPE:
         ctrlHouse.burstClicksActive = False
+        burstEngine.stopAll()
         
-        suppressKeyPress = True
+        return True
     
-    PThread.kbMsgQueue.put(suppressKeyPress)
-    return suppressKeyPress
+    return False
 
 def keyRelease(KeyboardEvent event) -> bool:
     """
@@ -134,6 +317,9 @@ def keyRelease(KeyboardEvent event) -> bool:
         Always returns False.
     """
     
+    # The cursor keeps moving until its direction keys are released, even if the ScrollLock was turned off meanwhile.
+    motionEngine.release(event.KeyID)
+    
     if not ctrlHouse.SCROLL and event.KeyID == kbcon.VK_BACKTICK and mgmt.isBacktickTheOnlyModiferPressed:
         mgmt.isBacktickTheOnlyModiferPressed = False
         PThread(target=kbHelper.simulateKeyPress, args=((kbcon.VK_BACKTICK,))).start()
@@ -155,11 +341,18 @@ def textExpansion(KeyboardEvent event) -> bool:
         `bool`: Always return True.
     """
     
-    if len(ctrlHouse.pressed_chars) > ctrlHouse.max_alias_length:
-        print(" " * len(ctrlHouse.pressed_chars), end="\r")
-        
+    global textResetPending
+    
+    # A click may have moved the caret, so the alias being typed is discarded. This is done here, as the typed text is only used by the keyboard lane.
+    if textResetPending:
+        textResetPending = False
+        textMatcher.reset()
+        suggester.hide()
         ctrlHouse.pressed_chars = ""
-        
+        ctrlHouse.pressed_chars_backup = ""
+    
+    # The keys consumed by a chord sequence are not typed.
+    if event.ChordNode:
         return True
     
     #+ Printing some relevant information about the pressed key and hardware metrics.
@@ -188,34 +381,48 @@ def textExpansion(KeyboardEvent event) -> bool:
     # if not ctrlHouse.pressed_chars.startswith((":", "!")):
     #     if event.Ascii == kbcon.AS_COLON:
     #         ctrlHouse.pressed_chars = ":"
-        
+    
     #     elif event.Ascii == kbcon.AS_EXCLAM:
     #         ctrlHouse.pressed_chars = "!"
-        
+    
     #     # If all keys are suppressed, the prefixes ":" and "!" cannot be pressed because shift is suppressed, along with the ";" and "1" keys, preventing the prefixes
     #     # that require shift from being pressed. Thus, we need to check if shift is pressed. Any new prefixes that require shift to be pressed should be added here.
     #     elif (ctrlHouse.modifiers & ctrlHouse.SHIFT):
     #         if event.KeyID == kbcon.VK_SEMICOLON:
     #             ctrlHouse.pressed_chars = ":"
-            
+    
     #         elif event.KeyID == kbcon.VK_1:
     #             ctrlHouse.pressed_chars = "!"
-        
+    
     #     else:
     #         return True
-        
+    
     #     print(ctrlHouse.pressed_chars, end="\r")
     #     return True
     
+    #+ Picking or highlighting a suggestion of the autocomplete popup. These keys are suppressed by `keyDownFilter` while it is shown.
+    if suggester.visible and not event.Modifiers and event.Suppressed:
+        if event.KeyID == win32con.VK_TAB:
+            acceptSuggestion()
+            
+            return True
+        
+        elif event.KeyID in (win32con.VK_UP, win32con.VK_DOWN):
+            suggester.move(1 if event.KeyID == win32con.VK_DOWN else -1)
+            
+            return True
+    
     #- Most of the function and modifier keys (ctrl, shift, end, home, etc...) have zero Ascii values.
     #- Also, there are some other keys with non-zero Ascii values. These keys are [Space, Enter, Tab, ESC].
     #? If one of the above is true, then return the key without checking anything else. Note that the `Enter` key is returned as `\r`.
     if event.Ascii == 0 or event.KeyID in (win32con.VK_SPACE, win32con.VK_RETURN, win32con.VK_TAB, win32con.VK_ESCAPE):
         # Clear the displayed pressed character keys.
-        print(" " * len(ctrlHouse.pressed_chars), end="\r")
+        if not mgmt.silent:
+            print(" " * textMatcher.typedCount, end="\r")
         
         # To allow for `ctrl` + character keys, you need to check here for them individually. The same `event.Key` value is returned but `event.Ascii` is 0.
-        ctrlHouse.pressed_chars = "" # Resetting the stored pressed keys.
+        textMatcher.reset() # Resetting the stored pressed keys.
+        suggester.hide()
         
         return True
     
@@ -223,11 +430,13 @@ def textExpansion(KeyboardEvent event) -> bool:
     # elif len(event.Key) > 1:
         # print("A symbol was pressed: {}".format(chr(event.Ascii))
     
-    #+ Pop characters if `backspace` is pressed.
+    #+ Return to the previous state if `backspace` is pressed.
     if event.KeyID == win32con.VK_BACK:
-        if len(ctrlHouse.pressed_chars):
-            ctrlHouse.pressed_chars = ctrlHouse.pressed_chars[:-1] # Remove the last character
-            print(ctrlHouse.pressed_chars + " ", end="\r")
+        if textMatcher.typedCount:
+            textMatcher.back()
+            
+            if not mgmt.silent:
+                print(textMatcher.typedText() + " ", end="\r")
         
         elif ctrlHouse.pressed_chars_backup:
             ctrlHouse.pressed_chars = ctrlHouse.pressed_chars_backup
@@ -235,41 +444,78 @@ def textExpansion(KeyboardEvent event) -> bool:
             
             kbHelper.undoTextExpansion()
             
-            print(ctrlHouse.pressed_chars, end="\r")
+            # The alias is typed again, so it can be followed by more characters.
+            textMatcher.feedText(ctrlHouse.pressed_chars)
+            
+            if not mgmt.silent:
+                print(ctrlHouse.pressed_chars, end="\r")
+        
+        suggester.update(textMatcher.typedText())
         
         return True
     
-    #+ If the key is not filtered above, then it is a valid character key.
-    ctrlHouse.pressed_chars += event.Key.lower() # chr(event.Ascii).lower()
-    print(ctrlHouse.pressed_chars, end="\r")
-    
-    #+ Check if the pressed characters match any of the defined abbreviations, and replace them accordingly.
-    if ctrlHouse.pressed_chars in ctrlHouse.abbreviations or ctrlHouse.pressed_chars in ctrlHouse.non_prefixed_abbreviations:
-        print(" " * len(ctrlHouse.pressed_chars), end="\r")
+    #+ If the key is not filtered above, then it is a valid character key. The typed text is only built for displaying it.
+    if not textMatcher.feed(<Py_UCS4> event.Ascii):
+        if not mgmt.silent:
+            print(textMatcher.typedText(), end="\r")
         
-        ctrlHouse.pressed_chars_backup = ctrlHouse.pressed_chars
-        kbHelper.expandText()
+        ctrlHouse.pressed_chars_backup = ""
+        suggester.update(textMatcher.typedText())
         
         return True
     
-    ### Executing some operations based on the pressed characters. ###
-    #+ Opening a file or a directory.
-    if ctrlHouse.pressed_chars in ctrlHouse.locations:
-        print(" " * len(ctrlHouse.pressed_chars), end="\r")
-        
-        kbHelper.openLocation()
+    if not mgmt.silent:
+        print(" " * textMatcher.typedCount, end="\r")
+    
+    suggester.hide()
+    handleMatches()
+    
+    return True
+
+cdef void handleMatches():
+    """Expands the alias that ends at the last typed character, or runs its operation."""
     
-    elif ctrlHouse.pressed_chars == ">cls":
-        print("    ", end="\r")
+    #+ The longest alias that ends at the typed character wins. The abbreviations of another application are skipped.
+    for alias in textMatcher.matches():
+        ctrlHouse.pressed_chars = alias
         
-        ctrlHouse.pressed_chars = ""
+        #+ Check if the alias matches any of the defined abbreviations (or the ones of the focused application), and replace it accordingly.
+        if kbHelper.findExpansion(alias) is not None:
+            ctrlHouse.pressed_chars_backup = alias
+            ctrlHouse.pressed_chars = ""
+            
+            # The placeholders of the expansion may take a while to evaluate (e.g., the explorer path), so the expansion does not run in the listener lane.
+            PThread(target=kbHelper.expandText, args=(alias,)).start()
+            textMatcher.reset()
+            suggester.recordUse(alias)
+            
+            return
         
-        os.system("cls")
+        ### Executing some operations based on the typed alias. ###
+        #+ Opening a file or a directory.
+        if alias in ctrlHouse.locations:
+            ctrlHouse.pressed_chars = ""
+            PThread(target=kbHelper.openLocation, args=(alias,)).start()
+            textMatcher.reset()
+            suggester.recordUse(alias)
+            
+            break
         
-    
-    elif ctrlHouse.pressed_chars == "!bst":
-        ctrlHouse.burstClicksActive = True
-        kbHelper.simulateBurstClicks()
+        elif alias == ">cls":
+            ctrlHouse.pressed_chars = ""
+            textMatcher.reset()
+            
+            os.system("cls")
+            
+            break
+        
+        elif alias == "!bst":
+            ctrlHouse.burstClicksActive = True
+            
+            # The burst input window is modal, so it is shown from its own thread.
+            PThread(target=kbHelper.simulateBurstClicks).start()
+            
+            break
     
     #+ This is a crude way of opening a file using a specific program (open with).
     # elif ctrlHouse.pressed_chars == ":\\\\":
@@ -278,16 +524,39 @@ def textExpansion(KeyboardEvent event) -> bool:
     #     kbHelper.crudeOpenWith(4, 2)
     
     ctrlHouse.pressed_chars_backup = ""
+
+cdef void acceptSuggestion():
+    """Types the rest of the highlighted suggestion, then handles it like a typed alias."""
     
-    return True
+    cdef str alias = suggester.selectedAlias()
+    cdef str typed = textMatcher.typedText()
+    
+    suggester.hide()
+    
+    if not alias or not alias.startswith(typed):
+        return
+    
+    # The injected keys are not seen by the listeners, so they are fed to the matcher directly.
+    cdef str suffix = alias[len(typed):]
+    
+    kbHelper.KeyInputBatch().text(suffix).send()
+    textMatcher.feedText(suffix)
+    
+    handleMatches()
+
+def buttonDownFilter(MouseEvent event) -> bool:
+    """Decides whether the mouse input should be suppressed. This is called synchronously by the mouse hook, while the actions are executed by `buttonPress`."""
+    
+    return bool(event.Delta and mgmt.mouseVolumeControlSVar)
 
 @cython.wraparound(False)
 def buttonPress(MouseEvent event) -> bool:
     """The callback function responsible for handling the button press and wheel movement events."""
     
+    global textResetPending
+    
     #TODO: Handle when a mouse button is pressed in multiprocess mode.
-    ctrlHouse.pressed_chars = ""
-    ctrlHouse.pressed_chars_backup = ""
+    textResetPending = True
     
     #TODO: Handle when the terminal logging option is changed in multiprocess mode.
     if not mgmt.silent and not event.Delta:
@@ -302,14 +571,10 @@ def buttonPress(MouseEvent event) -> bool:
         
         # print(event)
     
-    cdef bint suppressInput = False
-    
     # if event.Delta and (ctrlHouse.modifiers & ctrlHouse.CTRL_SHIFT) == ctrlHouse.CTRL_SHIFT:
-    if event.Delta and mgmt.mouseVolumeControlSVar:
+    if event.Delta and event.Suppressed and mgmt.mouseVolumeControlSVar:
         PThread(target=kbHelper.simulateKeyPress, args=((win32con.VK_VOLUME_DOWN, win32con.VK_VOLUME_UP)[event.Delta > 0],)).start()
         
-        suppressInput = True
-    
-    PThread.msMsgQueue.put(suppressInput)
+        return True
     
-    return suppressInput
+    return False
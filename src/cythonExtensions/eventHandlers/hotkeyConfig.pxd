@@ -0,0 +1,16 @@
+cpdef tuple parseTrigger(str keys)
+
+cdef class HotkeyConfig:
+    cdef str filePath
+    cdef double pollInterval
+    cdef dict hotkeys, texts
+    cdef dict appliedTexts
+    cdef tuple fileStamp
+    
+    cpdef tuple getFileStamp(self)
+    
+    cpdef bint hasChanged(self)
+    
+    cpdef bint load(self, namespace)
+    
+    cpdef int applyTexts(self, bint rebuild=*)
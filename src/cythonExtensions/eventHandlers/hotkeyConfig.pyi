@@ -0,0 +1,90 @@
+"""
+This module loads hotkeys, abbreviations, and locations from a declarative JSON file (`scriptConfigs.HOTKEYS_CONFIG_PATH`),
+and watches it for changes.
+
+The file is parsed and validated as a whole before anything is applied, so an invalid edit leaves the live tables untouched. Applying it
+only rebuilds the entries that differ from the previously applied version (see `HotkeyIndex.updateLayer`), and each table is swapped with
+a single assignment, so a reload takes milliseconds and the hook never sees a half-built table.
+"""
+
+from types import ModuleType
+from typing import Any, Callable
+
+from cythonExtensions.eventHandlers.hotkeyIndex import HotkeyEntry
+
+
+def parseTrigger(keys: str) -> tuple[int, int]:
+    """Parses a trigger like `CTRL+SHIFT+M`, `BACKTICK+F2`, or `WIN+0x91` into a `(modifiers, vkey)` tuple. Raises `ValueError` if it is invalid."""
+    ...
+
+
+def resolveAction(name: str, namespace: Any) -> Callable:
+    """Returns the function with the given dotted name (e.g., `expHelper.createNewFile`) from the attributes of `namespace`. Raises `ValueError` if it is not found."""
+    ...
+
+
+class HotkeyConfig:
+    """
+    Description:
+        The declarative hotkey file. `load` reads it, `applyTexts` merges its text tables into the live ones, and `watch` polls it for changes.
+        The hotkeys are applied by `eventHandlers.applyHotkeyConfig`, which owns the live dispatch index.
+    ---
+    Parameters:
+        `filePath -> str`: The path of the JSON file. A missing file is the same as an empty one.
+        
+        `pollInterval -> float`: The time in seconds between two checks of the file for changes.
+    ---
+    Attributes:
+        `hotkeys -> dict[tuple[int, int], list[HotkeyEntry]]`: The hotkeys of the last valid version of the file.
+        
+        `texts -> dict[str, dict]`: The text tables of the last valid version of the file, by section.
+    """
+    
+    filePath: str
+    pollInterval: float
+    hotkeys: dict[tuple[int, int], list[HotkeyEntry]]
+    texts: dict[str, dict]
+    
+    def __init__(self, filePath: str, pollInterval: float = 1.0) -> None:
+        ...
+    
+    def getFileStamp(self) -> tuple[int, int] | None:
+        """Returns the `(modification time, size)` of the file, or `None` if it does not exist."""
+        ...
+    
+    def hasChanged(self) -> bool:
+        """Returns whether the file has changed since it was last loaded."""
+        ...
+    
+    def load(self, namespace: ModuleType) -> bool:
+        """
+        Description:
+            Reads and validates the file. On success, replaces `hotkeys` and `texts` and returns `True`. Otherwise, prints the errors
+            and returns `False`, keeping the previous ones.
+        ---
+        Parameters:
+            `namespace -> module`: The module that the actions are resolved from (the `callbacks` module).
+        """
+        ...
+    
+    def applyTexts(self, rebuild: bool = False) -> int:
+        """
+        Description:
+            Merges the text tables of the file into the `ControllerHouse` ones, on top of the `scriptConfigs` ones. Only the aliases
+            that changed since the last call are updated, and each table is replaced at once.
+        ---
+        Parameters:
+            `rebuild -> bool`: Whether to rebuild the tables from the `scriptConfigs` ones (e.g., after they are reloaded).
+        ---
+        Returns:
+            `int`: The number of changed aliases.
+        """
+        ...
+    
+    def watch(self, onChange: Callable[[], Any]) -> None:
+        """Checks the file every `pollInterval` seconds until the script terminates, and calls `onChange()` each time it changes."""
+        ...
+
+
+hotkeyConfig: HotkeyConfig
+"""The declarative hotkey file of the script."""
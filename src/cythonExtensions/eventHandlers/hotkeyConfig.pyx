@@ -0,0 +1,313 @@
+# cython: language_level = 3str
+
+"""
+This extension module loads hotkeys, abbreviations, and locations from a declarative JSON file (`scriptConfigs.HOTKEYS_CONFIG_PATH`),
+and watches it for changes.
+
+The file is parsed and validated as a whole before anything is applied, so an invalid edit leaves the live tables untouched. Applying it
+only rebuilds the entries that differ from the previously applied version (see `HotkeyIndex.updateLayer`), and each table is swapped with
+a single assignment, so a reload takes milliseconds and the hook never sees a half-built table.
+
+The format of the file:
+```json
+{
+    "hotkeys": [
+        {"keys": "BACKTICK+C", "action": "sysHelper.displayCPU_Usage"},
+        {"keys": "SHIFT+F3", "action": "expHelper.copySelectedFileNames", "context": "explorerOrDesktop"},
+        {"keys": "BACKTICK+F", "action": "kbHelper.simulateHotKeyPress", "args": [{"18": 56, "13": 28}], "application": "vlc.exe"}
+    ],
+    "abbreviations": {":repo": "https://github.com/Ryen-042/Macropy"},
+    "nonPrefixedAbbreviations": {},
+    "applicationAbbreviations": {"code.exe": {":todo": "# TODO: "}},
+    "locations": {"!docs": "C:\\\\Users\\\\Public\\\\Documents"}
+}
+```
+- `keys`: the modifiers (`CTRL`, `SHIFT`, `ALT`, `WIN`, `FN`, `BACKTICK`) and the key (a `VK_*` name without the prefix, or a number) joined by `+`.
+- `action`: a function reachable from the `callbacks` module namespace, e.g., `expHelper.createNewFile` or `openClosedExplorer`.
+- `args`: the arguments passed to the action (JSON objects with digit keys are passed as dictionaries with int keys). Defaults to none.
+- `context`: `any` (the default), `scroll`, `explorer`, or `explorerOrDesktop`. `application` (a window class or process name) replaces it.
+- `suppress`: whether the keys are suppressed. Defaults to `true`.
+"""
+
+import os, json
+
+import scriptConfigs as configs
+from cythonExtensions.eventHandlers.hotkeyIndex cimport HotkeyEntry, CONTEXT_ANY, CONTEXT_SCROLL, CONTEXT_EXPLORER, CONTEXT_DESKTOP, CONTEXT_APPLICATION
+from cythonExtensions.commonUtils.commonUtils import KB_Con as kbcon, ControllerHouse as ctrlHouse, Management as mgmt
+from cythonExtensions.platformBackend.platformBackend import win32con
+
+
+cdef dict modifierNames = {"CTRL": ctrlHouse.CTRL, "SHIFT": ctrlHouse.SHIFT, "ALT": ctrlHouse.ALT, "WIN": ctrlHouse.WIN, "FN": ctrlHouse.FN, "BACKTICK": ctrlHouse.BACKTICK}
+
+cdef dict contextNames = {"any": CONTEXT_ANY, "scroll": CONTEXT_SCROLL, "explorer": CONTEXT_EXPLORER, "explorerOrDesktop": CONTEXT_EXPLORER | CONTEXT_DESKTOP}
+
+cdef tuple textTables = (
+    ("abbreviations",            "abbreviations",              "ABBREVIATIONS"),
+    ("nonPrefixedAbbreviations", "non_prefixed_abbreviations", "NON_PERFIXED_ABBREVIATIONS"),
+    ("applicationAbbreviations", "application_abbreviations",  "APPLICATION_ABBREVIATIONS"),
+    ("locations",                "locations",                  "LOCATIONS"),
+)
+"""The `(file section, ctrlHouse attribute, scriptConfigs attribute)` of the text tables that the file extends."""
+
+cdef object MISSING = object()
+
+
+cpdef tuple parseTrigger(str keys):
+    """Parses a trigger like `CTRL+SHIFT+M`, `BACKTICK+F2`, or `WIN+0x91` into a `(modifiers, vkey)` tuple. Raises `ValueError` if it is invalid."""
+    
+    cdef list parts = [part.strip() for part in keys.split("+")]
+    cdef int modifiers = 0
+    
+    for name in parts[:-1]:
+        if name.upper() not in modifierNames:
+            raise ValueError(f"Unknown modifier '{name}' in '{keys}'.")
+        
+        modifiers |= modifierNames[name.upper()]
+    
+    name = parts[-1].upper()
+    vkey = getattr(kbcon, f"VK_{name}", None) or getattr(win32con, f"VK_{name}", None)
+    
+    if vkey is None:
+        try:
+            vkey = int(name, 0)
+        
+        except ValueError:
+            raise ValueError(f"Unknown key '{parts[-1]}' in '{keys}'.") from None
+    
+    if not 0 < int(vkey) < 256:
+        raise ValueError(f"The key code of '{keys}' is out of range.")
+    
+    return (modifiers, int(vkey))
+
+
+def resolveAction(str name, namespace):
+    """Returns the function with the given dotted name (e.g., `expHelper.createNewFile`) from the attributes of `namespace`. Raises `ValueError` if it is not found."""
+    
+    action = namespace
+    
+    for part in name.split("."):
+        if not part or part.startswith("_") or not hasattr(action, part):
+            raise ValueError(f"Unknown action '{name}'.")
+        
+        action = getattr(action, part)
+    
+    if not callable(action):
+        raise ValueError(f"The action '{name}' is not callable.")
+    
+    return action
+
+
+cdef object toArgument(value):
+    """Converts a JSON value into an action argument. The objects with digit keys become dictionaries with int keys, e.g., the key maps of `simulateHotKeyPress`."""
+    
+    if isinstance(value, dict):
+        return {int(key) if key.isdigit() else key: toArgument(item) for key, item in value.items()}
+    
+    if isinstance(value, list):
+        return tuple(toArgument(item) for item in value)
+    
+    return value
+
+
+cdef class HotkeyConfig:
+    """
+    Description:
+        The declarative hotkey file. `load` reads it, `applyTexts` merges its text tables into the live ones, and `watch` polls it for changes.
+        The hotkeys are applied by `eventHandlers.applyHotkeyConfig`, which owns the live dispatch index.
+    ---
+    Parameters:
+        `filePath -> str`: The path of the JSON file. A missing file is the same as an empty one.
+        
+        `pollInterval -> float`: The time in seconds between two checks of the file for changes.
+    ---
+    Attributes:
+        `hotkeys -> dict[tuple[int, int], list[HotkeyEntry]]`: The hotkeys of the last valid version of the file.
+        
+        `texts -> dict[str, dict]`: The text tables of the last valid version of the file, by section.
+    """
+    
+    cdef public str filePath
+    cdef public double pollInterval
+    cdef public dict hotkeys, texts
+    cdef dict appliedTexts
+    cdef tuple fileStamp
+    
+    def __init__(self, str filePath, double pollInterval=1.0):
+        self.filePath = filePath
+        self.pollInterval = pollInterval
+        self.hotkeys = {}
+        self.texts = {}
+        self.appliedTexts = {}
+        self.fileStamp = None
+    
+    cpdef tuple getFileStamp(self):
+        """Returns the `(modification time, size)` of the file, or `None` if it does not exist."""
+        
+        try:
+            stat = os.stat(self.filePath)
+        
+        except (OSError, ValueError):
+            return None
+        
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    cpdef bint hasChanged(self):
+        """Returns whether the file has changed since it was last loaded."""
+        
+        return bool(self.filePath) and self.getFileStamp() != self.fileStamp
+    
+    cpdef bint load(self, namespace):
+        """
+        Description:
+            Reads and validates the file. On success, replaces `hotkeys` and `texts` and returns `True`. Otherwise, prints the errors
+            and returns `False`, keeping the previous ones.
+        ---
+        Parameters:
+            `namespace -> module`: The module that the actions are resolved from (the `callbacks` module).
+        """
+        
+        cdef tuple stamp = self.getFileStamp()
+        cdef dict hotkeys = {}, texts = {}, definedAt = {}
+        cdef list errors = []
+        
+        if stamp is None:
+            self.hotkeys, self.texts, self.fileStamp = {}, {}, None
+            return True
+        
+        # The stamp is recorded even if the file is invalid, so the same errors are only reported once.
+        self.fileStamp = stamp
+        fileName = os.path.basename(self.filePath)
+        
+        try:
+            with open(self.filePath, encoding="utf-8") as configFile:
+                data = json.load(configFile)
+            
+            if not isinstance(data, dict):
+                raise ValueError("The file must contain a JSON object.")
+        
+        except (OSError, ValueError) as e:
+            print(f"➤ Warning! The hotkey file '{fileName}' is not applied. {e}")
+            return False
+        
+        for index, spec in enumerate(data.get("hotkeys", [])):
+            try:
+                trigger = parseTrigger(spec["keys"])
+                function = resolveAction(spec["action"], namespace)
+                args = toArgument(spec.get("args", []))
+                application = spec.get("application", "")
+                
+                if spec.get("context", "any") not in contextNames:
+                    raise ValueError(f"Unknown context '{spec['context']}'.")
+                
+                context = CONTEXT_APPLICATION if application else contextNames[spec.get("context", "any")]
+                
+                if not isinstance(args, tuple):
+                    raise ValueError("The 'args' must be a list.")
+            
+            except KeyError as e:
+                errors.append(f"hotkeys[{index}]: The {e} field is missing.")
+                continue
+            
+            except (TypeError, ValueError, AttributeError) as e:
+                errors.append(f"hotkeys[{index}]: {e}")
+                continue
+            
+            identity = (trigger, context, application)
+            
+            if identity in definedAt:
+                errors.append(f"hotkeys[{index}]: '{spec['keys']}' is already defined for the same context by hotkeys[{definedAt[identity]}].")
+                continue
+            
+            definedAt[identity] = index
+            hotkeys.setdefault(trigger, []).append(HotkeyEntry(function, args, context, bool(spec.get("suppress", True)), fileName, application))
+        
+        for section, _, _ in textTables:
+            table = data.get(section, {})
+            
+            if not isinstance(table, dict):
+                errors.append(f"{section}: Must be a JSON object.")
+                continue
+            
+            # The aliases are matched against the lowercase typed characters.
+            if section == "applicationAbbreviations":
+                texts[section] = {application: {str(alias).lower(): text for alias, text in aliases.items()} for application, aliases in table.items() if isinstance(aliases, dict)}
+            
+            else:
+                texts[section] = {str(alias).lower(): text for alias, text in table.items()}
+        
+        if errors:
+            for error in errors:
+                print(f"➤ Warning! {fileName}: {error}")
+            
+            print(f"➤ Warning! The hotkey file '{fileName}' is not applied.")
+            
+            return False
+        
+        self.hotkeys, self.texts = hotkeys, texts
+        
+        return True
+    
+    cpdef int applyTexts(self, bint rebuild=False):
+        """
+        Description:
+            Merges the text tables of the file into the `ControllerHouse` ones, on top of the `scriptConfigs` ones. Only the aliases
+            that changed since the last call are updated, and each table is replaced at once.
+        ---
+        Parameters:
+            `rebuild -> bool`: Whether to rebuild the tables from the `scriptConfigs` ones (e.g., after they are reloaded).
+        ---
+        Returns:
+            `int`: The number of changed aliases.
+        """
+        
+        cdef int changed = 0
+        cdef dict base, newTexts, oldTexts, table
+        
+        for section, attribute, configName in textTables:
+            base = getattr(configs, configName, {})
+            newTexts = self.texts.get(section, {})
+            
+            # The aliases of an application extend its aliases in `scriptConfigs`.
+            if section == "applicationAbbreviations":
+                newTexts = {application: {**base.get(application, {}), **aliases} for application, aliases in newTexts.items()}
+            
+            if rebuild:
+                table = {**base, **newTexts}
+                changed += len(newTexts)
+            
+            else:
+                oldTexts = self.appliedTexts.get(section, {})
+                changedAliases = [alias for alias in oldTexts.keys() | newTexts.keys() if oldTexts.get(alias, MISSING) != newTexts.get(alias, MISSING)]
+                
+                if not changedAliases:
+                    continue
+                
+                table = dict(getattr(ctrlHouse, attribute))
+                
+                for alias in changedAliases:
+                    if alias in newTexts:
+                        table[alias] = newTexts[alias]
+                    
+                    elif alias in base:
+                        table[alias] = base[alias]
+                    
+                    else:
+                        table.pop(alias, None)
+                
+                changed += len(changedAliases)
+            
+            setattr(ctrlHouse, attribute, table)
+            self.appliedTexts[section] = newTexts
+        
+        return changed
+    
+    def watch(self, onChange) -> None:
+        """Checks the file every `pollInterval` seconds until the script terminates, and calls `onChange()` each time it changes."""
+        
+        while not mgmt.terminateEvent.wait(self.pollInterval):
+            if self.hasChanged():
+                onChange()
+
+
+hotkeyConfig = HotkeyConfig(configs.HOTKEYS_CONFIG_PATH, configs.HOTKEYS_CONFIG_POLL_INTERVAL)
+"""The declarative hotkey file of the script."""
@@ -0,0 +1,45 @@
+from cythonExtensions.windowHelper.foregroundContext cimport ForegroundContext
+
+
+cdef enum HotkeyContexts:
+    CONTEXT_ANY      = 0 # Always active.
+    CONTEXT_SCROLL   = 1 # Active when the ScrollLock is on.
+    CONTEXT_EXPLORER = 2 # Active when an explorer window is focused.
+    CONTEXT_DESKTOP  = 4 # Active when an explorer window or the desktop is focused. Combined with `CONTEXT_EXPLORER`.
+    CONTEXT_APPLICATION = 8 # Active when the window class or the process name of the foreground window is the entry `application`.
+
+
+cdef class HotkeyEntry:
+    cdef object function
+    cdef tuple args
+    cdef int context
+    cdef bint suppress
+    cdef str table
+    cdef str application
+    cdef HotkeyEntry next
+    
+    cpdef HotkeyEntry copy(self)
+    
+    cpdef tuple signature(self)
+
+
+cdef class HotkeyIndex:
+    cdef dict entries
+    cdef dict layers
+    cdef ForegroundContext foreground
+    cdef list conflicts
+    cdef int entryCount
+    
+    cdef void add(self, str layerName, tuple trigger, HotkeyEntry entry)
+    
+    cdef HotkeyEntry link(self, long long key, list conflicts)
+    
+    cpdef int updateLayer(self, str layerName, dict hotkeys)
+    
+    cdef inline bint isActive(self, HotkeyEntry entry, bint scrollOn)
+    
+    cpdef HotkeyEntry resolve(self, int modifiers, int vkey, bint scrollOn)
+    
+    cpdef bint shouldSuppress(self, int modifiers, int vkey, bint scrollOn)
+    
+    cpdef set triggers(self)
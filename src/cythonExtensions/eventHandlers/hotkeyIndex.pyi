@@ -0,0 +1,131 @@
+"""
+This module compiles the hotkey tables of the `callbacks` module into a single dispatch index keyed by `(modifiers, vkey)`.
+
+Each entry of the index carries the context it requires (e.g., the ScrollLock being on, or an explorer window or a specific application
+being focused) and whether its key is suppressed. The entries of a trigger are chained by priority, and their context predicates are
+only evaluated when they are reached, against the cached `ForegroundContext`.
+"""
+
+from types import ModuleType
+from typing import Callable
+
+from cythonExtensions.windowHelper.foregroundContext import ForegroundContext
+
+
+CONFIG_LAYER: str
+"""The name of the layer of the hotkeys loaded from the declarative hotkey file (`hotkeyConfig`)."""
+
+class HotkeyEntry:
+    """
+    Description:
+        A hotkey of the dispatch index.
+    ---
+    Parameters:
+        `function -> Callable`, `args -> tuple`: The handler of the hotkey.
+        
+        `context -> int`: The `HotkeyContexts` flags the hotkey requires.
+        
+        `suppress -> bool`: Whether the key is suppressed when the hotkey is active.
+        
+        `table -> str`: The name of the table that defined the hotkey, used in the reports.
+        
+        `application -> str`: The window class or process name of the application, for the `CONTEXT_APPLICATION` entries.
+    """
+    
+    function: Callable
+    args: tuple
+    context: int
+    suppress: bool
+    table: str
+    application: str
+    next: "HotkeyEntry | None"
+    
+    def __init__(self, function: Callable, args: tuple, context: int, suppress: bool, table: str, application="") -> None:
+        ...
+    
+    def copy(self) -> "HotkeyEntry":
+        """Returns an unlinked copy of the entry."""
+        ...
+    
+    def signature(self) -> tuple:
+        """Returns the fields that define the behavior of the entry, used to find the changed entries."""
+        ...
+
+
+class HotkeyIndex:
+    """
+    Description:
+        A single dispatch index for the hotkeys of `callbacks.kbEventHandlersPerApplication`, the declarative hotkey file, `kbEventHandlers`,
+        `kbEventHandlersWithSCROLL_On`, and `kbEventHandlersWithExplorerFocus`, in this order of priority (the first active entry of a trigger
+        is used). The hotkeys of an application layer take priority over the other ones while the application is focused.
+        
+        - The entries of each source are kept in a layer. The live table maps each trigger to a chain linking copies of its entries from all the layers.
+        - `updateLayer` relinks only the triggers whose entries changed, then swaps the live table as a whole, so the hook never sees a partially
+        updated chain or table.
+    ---
+    Parameters:
+        `callbacksModule -> module`: The module that defines the hotkey tables.
+        
+        `foreground -> ForegroundContext`: The context of the foreground window, only read when an explorer or application hotkey is reached.
+        
+        `configHotkeys -> dict[tuple[int, int], list[HotkeyEntry]]`: The hotkeys of the declarative hotkey file, if any.
+    ---
+    Attributes:
+        `conflicts -> list[str]`: The duplicated and shadowed hotkeys found while compiling the tables.
+    """
+    
+    foreground: ForegroundContext
+    conflicts: list[str]
+    entryCount: int
+    
+    def __init__(self, callbacksModule: ModuleType, foreground: ForegroundContext, configHotkeys: dict[tuple[int, int], list[HotkeyEntry]] | None = None) -> None:
+        ...
+    
+    def updateLayer(self, layerName: str, hotkeys: dict[tuple[int, int], list[HotkeyEntry]]) -> int:
+        """
+        Description:
+            Replaces the entries of a layer, e.g., after the declarative hotkey file is edited. Only the triggers whose entries changed
+            are relinked, then the live table is swapped at once.
+        ---
+        Parameters:
+            `layerName -> str`: The name of the layer, e.g., `CONFIG_LAYER`.
+            
+            `hotkeys -> dict[tuple[int, int], list[HotkeyEntry]]`: The new entries of the layer.
+        ---
+        Returns:
+            `int`: The number of changed triggers.
+        """
+        ...
+    
+    def resolve(self, modifiers: int, vkey: int, scrollOn: bool) -> HotkeyEntry | None:
+        """Returns the first active entry of the given trigger, or `None` if there is none."""
+        ...
+    
+    def shouldSuppress(self, modifiers: int, vkey: int, scrollOn: bool) -> bool:
+        """
+        Description:
+            Returns whether the key of the given trigger should be suppressed. Called by the hook, so the foreground context
+            is only read if the suppression depends on it.
+        """
+        ...
+    
+    def triggers(self) -> set[tuple[int, int]]:
+        """Returns the `(modifiers, vkey)` triggers of all the entries."""
+        ...
+
+
+def findDuplicateTriggers(module: ModuleType, tableNames: tuple[str, ...]) -> list[str]:
+    """
+    Description:
+        Finds the triggers that are defined more than once in the same hotkey table, either twice in its dictionary literal or
+        assigned again later. Only the last definition is kept by Python, so the others are silently dropped.
+    ---
+    Parameters:
+        `module -> module`: The module that defines the tables. Its source code is parsed.
+        
+        `tableNames -> tuple[str, ...]`: The names of the tables.
+    ---
+    Returns:
+        `list[str]`: A description of each duplicated trigger.
+    """
+    ...
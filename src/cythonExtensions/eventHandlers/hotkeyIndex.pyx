@@ -0,0 +1,331 @@
+# cython: language_level = 3str
+
+"""
+This extension module compiles the hotkey tables of the `callbacks` module into a single dispatch index keyed by `(modifiers, vkey)`.
+
+Each entry of the index carries the context it requires (e.g., the ScrollLock being on, or an explorer window or a specific application
+being focused) and whether its key is suppressed. The entries of a trigger are chained by priority, and their context predicates are
+only evaluated when they are reached, against the cached `ForegroundContext`.
+"""
+
+import ast, inspect
+
+from cythonExtensions.eventHandlers.chordMatcher import formatSequence
+from cythonExtensions.windowHelper.foregroundContext cimport ForegroundContext
+from cythonExtensions.eventHandlers.hotkeyIndex cimport CONTEXT_ANY, CONTEXT_SCROLL, CONTEXT_EXPLORER, CONTEXT_DESKTOP, CONTEXT_APPLICATION
+
+
+cdef tuple explorerClassNames = ("CabinetWClass",)
+cdef tuple explorerOrDesktopClassNames = ("CabinetWClass", "WorkerW", "Progman")
+
+CONFIG_LAYER = "hotkeyConfig"
+"""The name of the layer of the hotkeys loaded from the declarative hotkey file (`hotkeyConfig`)."""
+
+
+cdef inline long long triggerKey(int modifiers, int vkey):
+    return (<long long> modifiers) << 8 | (vkey & 0xFF)
+
+
+cdef class HotkeyEntry:
+    """
+    Description:
+        A hotkey of the dispatch index.
+    ---
+    Parameters:
+        `function -> Callable`, `args -> tuple`: The handler of the hotkey.
+        
+        `context -> int`: The `HotkeyContexts` flags the hotkey requires.
+        
+        `suppress -> bool`: Whether the key is suppressed when the hotkey is active.
+        
+        `table -> str`: The name of the table that defined the hotkey, used in the reports.
+        
+        `application -> str`: The window class or process name of the application, for the `CONTEXT_APPLICATION` entries.
+    """
+    
+    cdef public object function
+    cdef public tuple args
+    cdef public int context
+    cdef public bint suppress
+    cdef public str table
+    cdef public str application
+    cdef public HotkeyEntry next
+    
+    def __init__(self, function, tuple args, int context, bint suppress, str table, str application=""):
+        self.function = function
+        self.args = args
+        self.context = context
+        self.suppress = suppress
+        self.table = table
+        self.application = application
+        self.next = None
+    
+    cpdef HotkeyEntry copy(self):
+        """Returns an unlinked copy of the entry."""
+        
+        return HotkeyEntry(self.function, self.args, self.context, self.suppress, self.table, self.application)
+    
+    cpdef tuple signature(self):
+        """Returns the fields that define the behavior of the entry, used to find the changed entries."""
+        
+        return (self.function, self.args, self.context, self.suppress, self.application)
+    
+    def __repr__(self) -> str:
+        return f"HotkeyEntry({getattr(self.function, '__qualname__', self.function)}, {self.args}, context={self.context}, suppress={self.suppress}, table='{self.table}'" + \
+            (f", application='{self.application}')" if self.application else ")")
+
+
+cdef class HotkeyIndex:
+    """
+    Description:
+        A single dispatch index for the hotkeys of `callbacks.kbEventHandlersPerApplication`, the declarative hotkey file, `kbEventHandlers`,
+        `kbEventHandlersWithSCROLL_On`, and `kbEventHandlersWithExplorerFocus`, in this order of priority (the first active entry of a trigger
+        is used). The hotkeys of an application layer take priority over the other ones while the application is focused.
+        
+        - The entries of each source are kept in a layer. The live table maps each trigger to a chain linking copies of its entries from all the layers.
+        - `updateLayer` relinks only the triggers whose entries changed, then swaps the live table as a whole, so the hook never sees a partially
+        updated chain or table.
+    ---
+    Parameters:
+        `callbacksModule -> module`: The module that defines the hotkey tables.
+        
+        `foreground -> ForegroundContext`: The context of the foreground window, only read when an explorer or application hotkey is reached.
+        
+        `configHotkeys -> dict[tuple[int, int], list[HotkeyEntry]]`: The hotkeys of the declarative hotkey file, if any.
+    ---
+    Attributes:
+        `conflicts -> list[str]`: The duplicated and shadowed hotkeys found while compiling the tables.
+    """
+    
+    cdef dict entries
+    cdef dict layers
+    cdef public ForegroundContext foreground
+    cdef public list conflicts
+    cdef public int entryCount
+    
+    def __init__(self, callbacksModule, ForegroundContext foreground, dict configHotkeys=None):
+        self.entries = {}
+        self.foreground = foreground
+        self.conflicts = findDuplicateTriggers(callbacksModule, ("kbEventHandlers", "kbEventHandlersWithSCROLL_On", "kbEventHandlersWithExplorerFocus"))
+        self.entryCount = 0
+        
+        # The layers in order of priority.
+        self.layers = {name: {} for name in ("kbEventHandlersPerApplication", CONFIG_LAYER, "kbEventHandlers", "kbEventHandlersWithSCROLL_On", "kbEventHandlersWithExplorerFocus")}
+        
+        for application, layer in getattr(callbacksModule, "kbEventHandlersPerApplication", {}).items():
+            for trigger, eventHandler in layer.items():
+                self.add("kbEventHandlersPerApplication", trigger, HotkeyEntry(eventHandler[0], eventHandler[1], CONTEXT_APPLICATION, True, "kbEventHandlersPerApplication", application))
+        
+        for trigger, entries in (configHotkeys or {}).items():
+            for entry in entries:
+                self.add(CONFIG_LAYER, trigger, entry)
+        
+        for trigger, eventHandler in callbacksModule.kbEventHandlers.items():
+            self.add("kbEventHandlers", trigger, HotkeyEntry(eventHandler[0], eventHandler[1], CONTEXT_ANY, True, "kbEventHandlers"))
+        
+        for trigger, eventHandler in callbacksModule.kbEventHandlersWithSCROLL_On.items():
+            self.add("kbEventHandlersWithSCROLL_On", trigger, HotkeyEntry(eventHandler[0], eventHandler[1], CONTEXT_SCROLL, True, "kbEventHandlersWithSCROLL_On"))
+        
+        for trigger, eventHandler in callbacksModule.kbEventHandlersWithExplorerFocus.items():
+            # The explorer hotkeys defined without the `(checkDesktop, suppress)` flags are executed regardless of the focused window, like the normal hotkeys.
+            if len(eventHandler) == 4:
+                self.add("kbEventHandlersWithExplorerFocus", trigger, HotkeyEntry(eventHandler[0], eventHandler[1], CONTEXT_EXPLORER | (CONTEXT_DESKTOP if eventHandler[2] else 0),
+                                                                                   eventHandler[3], "kbEventHandlersWithExplorerFocus"))
+            
+            else:
+                self.add("kbEventHandlersWithExplorerFocus", trigger, HotkeyEntry(eventHandler[0], eventHandler[1], CONTEXT_ANY, True, "kbEventHandlersWithExplorerFocus"))
+        
+        cdef long long key
+        for key in {key for layer in self.layers.values() for key in layer}:
+            self.entries[key] = self.link(key, self.conflicts)
+        
+        for conflict in self.conflicts:
+            print(f"➤ Warning! {conflict}")
+    
+    cdef void add(self, str layerName, tuple trigger, HotkeyEntry entry):
+        """Appends the entry to the given layer."""
+        
+        self.layers[layerName].setdefault(triggerKey(trigger[0], trigger[1]), []).append(entry)
+        self.entryCount += 1
+    
+    cdef HotkeyEntry link(self, long long key, list conflicts):
+        """Chains copies of the entries of the trigger from all the layers, in order of priority. Reports the entries shadowed by an earlier one."""
+        
+        cdef HotkeyEntry head = None, last = None, shadowing = None, entry
+        
+        for layer in self.layers.values():
+            for layerEntry in layer.get(key, ()):
+                if shadowing is not None:
+                    conflicts.append(f"The hotkey {formatSequence(((key >> 8, key & 0xFF),))} of '{layerEntry.table}' is never used. It is shadowed by the one of '{shadowing.table}'.")
+                
+                # The linked entries are copies, so relinking a trigger never changes a chain that the hook may be walking.
+                entry = layerEntry.copy()
+                
+                if last is None:
+                    head = entry
+                else:
+                    last.next = entry
+                
+                last = entry
+                
+                if entry.context == CONTEXT_ANY and shadowing is None:
+                    shadowing = entry
+        
+        return head
+    
+    cpdef int updateLayer(self, str layerName, dict hotkeys):
+        """
+        Description:
+            Replaces the entries of a layer, e.g., after the declarative hotkey file is edited. Only the triggers whose entries changed
+            are relinked, then the live table is swapped at once.
+        ---
+        Parameters:
+            `layerName -> str`: The name of the layer, e.g., `CONFIG_LAYER`.
+            
+            `hotkeys -> dict[tuple[int, int], list[HotkeyEntry]]`: The new entries of the layer.
+        ---
+        Returns:
+            `int`: The number of changed triggers.
+        """
+        
+        cdef dict oldLayer = self.layers[layerName], newLayer = {}
+        cdef list conflicts = []
+        cdef long long key
+        
+        for trigger, triggerEntries in hotkeys.items():
+            newLayer[triggerKey(trigger[0], trigger[1])] = list(triggerEntries)
+        
+        cdef list changedKeys = [key for key in oldLayer.keys() | newLayer.keys()
+                                 if [entry.signature() for entry in oldLayer.get(key, ())] != [entry.signature() for entry in newLayer.get(key, ())]]
+        
+        if not changedKeys:
+            return 0
+        
+        self.layers[layerName] = newLayer
+        self.entryCount += sum(map(len, newLayer.values())) - sum(map(len, oldLayer.values()))
+        
+        cdef dict entries = dict(self.entries)
+        
+        for key in changedKeys:
+            head = self.link(key, conflicts)
+            
+            if head is None:
+                entries.pop(key, None)
+            else:
+                entries[key] = head
+        
+        # A single reference assignment, so a lookup sees either the old or the new table.
+        self.entries = entries
+        
+        for conflict in conflicts:
+            print(f"➤ Warning! {conflict}")
+        
+        return len(changedKeys)
+    
+    cdef inline bint isActive(self, HotkeyEntry entry, bint scrollOn):
+        """Evaluates the context of the entry."""
+        
+        if entry.context == CONTEXT_ANY:
+            return True
+        
+        if entry.context == CONTEXT_SCROLL:
+            return scrollOn
+        
+        cdef ForegroundContext foreground = self.foreground.current()
+        
+        if entry.context == CONTEXT_APPLICATION:
+            return foreground.className == entry.application or foreground.processName == entry.application
+        
+        return foreground.className in (explorerOrDesktopClassNames if entry.context & CONTEXT_DESKTOP else explorerClassNames)
+    
+    cpdef HotkeyEntry resolve(self, int modifiers, int vkey, bint scrollOn):
+        """Returns the first active entry of the given trigger, or `None` if there is none."""
+        
+        cdef HotkeyEntry entry = self.entries.get(triggerKey(modifiers, vkey))
+        
+        while entry is not None:
+            if self.isActive(entry, scrollOn):
+                return entry
+            
+            entry = entry.next
+        
+        return None
+    
+    cpdef bint shouldSuppress(self, int modifiers, int vkey, bint scrollOn):
+        """
+        Description:
+            Returns whether the key of the given trigger should be suppressed. Called by the hook, so the foreground context
+            is only read if the suppression depends on it.
+        """
+        
+        cdef HotkeyEntry entry = self.entries.get(triggerKey(modifiers, vkey))
+        
+        while entry is not None:
+            if entry.context & CONTEXT_EXPLORER and not entry.suppress:
+                return False
+            
+            if self.isActive(entry, scrollOn):
+                return entry.suppress
+            
+            entry = entry.next
+        
+        return False
+    
+    cpdef set triggers(self):
+        """Returns the `(modifiers, vkey)` triggers of all the entries."""
+        
+        return {(key >> 8, key & 0xFF) for key in self.entries}
+
+
+def findDuplicateTriggers(module, tableNames: tuple[str, ...]) -> list[str]:
+    """
+    Description:
+        Finds the triggers that are defined more than once in the same hotkey table, either twice in its dictionary literal or
+        assigned again later. Only the last definition is kept by Python, so the others are silently dropped.
+    ---
+    Parameters:
+        `module -> module`: The module that defines the tables. Its source code is parsed.
+        
+        `tableNames -> tuple[str, ...]`: The names of the tables.
+    ---
+    Returns:
+        `list[str]`: A description of each duplicated trigger.
+    """
+    
+    try:
+        tree = ast.parse(inspect.getsource(module))
+    
+    except (OSError, TypeError, SyntaxError):
+        return []
+    
+    namespace = vars(module)
+    definitions = {name: {} for name in tableNames}
+    duplicates = []
+    
+    def record(str table, keyNode):
+        try:
+            trigger = eval(compile(ast.Expression(keyNode), "<trigger>", "eval"), namespace)
+        
+        except Exception:
+            trigger = ast.unparse(keyNode)
+        
+        if trigger in definitions[table]:
+            duplicates.append(f"The hotkey {formatSequence((trigger,)) if isinstance(trigger, tuple) else trigger} is defined twice in '{table}' "
+                              f"(lines {definitions[table][trigger]} and {keyNode.lineno}). Only the last definition is used.")
+        
+        definitions[table][trigger] = keyNode.lineno
+    
+    for node in tree.body:
+        if isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            
+            for target in targets:
+                if isinstance(target, ast.Name) and target.id in definitions and isinstance(node.value, ast.Dict):
+                    for keyNode in node.value.keys:
+                        if keyNode is not None:
+                            record(target.id, keyNode)
+                
+                elif isinstance(target, ast.Subscript) and isinstance(target.value, ast.Name) and target.value.id in definitions:
+                    record(target.value.id, target.slice)
+    
+    return duplicates
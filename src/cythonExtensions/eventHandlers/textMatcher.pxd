@@ -0,0 +1,31 @@
+cdef class TextMatcher:
+    cdef unsigned long long * keys
+    cdef int * children
+    cdef size_t tableMask
+    cdef int * failures
+    cdef int * outputs
+    cdef int * outputLinks
+    cdef list aliases
+    cdef int nodeCount, aliasCount
+    cdef bint wordBoundary
+    cdef int state
+    cdef int * stateRing
+    cdef Py_UCS4 * charRing
+    cdef int ringMask, ringHead, ringDepth
+    cdef int typedCount
+    
+    cdef inline int findChild(self, int node, Py_UCS4 char)
+    
+    cdef inline bint isAtBoundary(self, int length)
+    
+    cpdef bint feed(self, Py_UCS4 char)
+    
+    cpdef list matches(self)
+    
+    cpdef void back(self)
+    
+    cpdef void feedText(self, str text)
+    
+    cpdef void reset(self)
+    
+    cpdef str typedText(self)
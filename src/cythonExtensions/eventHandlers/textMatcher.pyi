@@ -0,0 +1,71 @@
+"""
+This module compiles the text expansion aliases (abbreviations, locations, and commands) into an Aho-Corasick automaton,
+and matches the typed characters against all of them at once.
+
+Each typed character advances the automaton by one state (following the failure links when needed), so the cost of a keystroke does not
+depend on the number of aliases, and no string is built while typing. The transitions are stored in a C open addressing hash table keyed
+by `(node, character)`, like the ones of `ChordMatcher`.
+"""
+
+from typing import Iterable
+
+
+class TextMatcher:
+    """
+    Description:
+        Matches the typed characters against a set of aliases, e.g., the keys of `ctrlHouse.abbreviations`, `non_prefixed_abbreviations`,
+        and `locations`. The aliases are matched case-insensitively, and can end anywhere in the typed text, not only at its start.
+        
+        - `feed` advances the automaton with a typed character, and returns whether an alias ends at it. `matches` then lists them.
+        - The states of the last typed characters are kept in a ring buffer, so `back` (backspace) returns to the previous state without rescanning.
+        - `feed` must only be called from one thread (the text expansion listener).
+    ---
+    Parameters:
+        `aliases -> Iterable[str]`: The aliases to match. The duplicated ones are only added once.
+        
+        `wordBoundary -> bool`: Whether an alias only matches at the start of a word, i.e., when the character before it is not a letter or a
+        digit (or when it is the first character typed since the last `reset`). Keeps the non-prefixed aliases like `nt` from matching inside words.
+        
+        `maxAliasLength -> int`: The aliases longer than this are skipped with a warning.
+    """
+    
+    nodeCount: int
+    aliasCount: int
+    wordBoundary: bool
+    typedCount: int
+    
+    def __init__(self, aliases: Iterable[str] = (), wordBoundary: bool = True, maxAliasLength: int = 40) -> None:
+        ...
+    
+    def feed(self, char: str) -> bool:
+        """
+        Description:
+            Advances the automaton with a typed character.
+        ---
+        Returns:
+            `bool`: Whether at least one alias ends at the character. Call `matches` to get them.
+        """
+        ...
+    
+    def matches(self) -> list[str]:
+        """Returns the aliases that end at the last typed character (and start a word, in the word boundary mode), longest first."""
+        ...
+    
+    def back(self) -> None:
+        """Removes the last typed character (backspace), returning to the state before it."""
+        ...
+    
+    def feedText(self, text: str) -> None:
+        """Feeds the characters of the given text, e.g., to restore an alias after undoing its expansion."""
+        ...
+    
+    def reset(self) -> None:
+        """Forgets the typed characters, e.g., after a space or a non-character key."""
+        ...
+    
+    def typedText(self) -> str:
+        """Returns the last typed characters that are still in the ring buffer, e.g., to display them."""
+        ...
+    
+    def __len__(self) -> int:
+        ...
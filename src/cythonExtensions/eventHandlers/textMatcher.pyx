@@ -0,0 +1,300 @@
+# cython: language_level = 3str
+
+"""
+This extension module compiles the text expansion aliases (abbreviations, locations, and commands) into an Aho-Corasick automaton,
+and matches the typed characters against all of them at once.
+
+Each typed character advances the automaton by one state (following the failure links when needed), so the cost of a keystroke does not
+depend on the number of aliases, and no string is built while typing. The transitions are stored in a C open addressing hash table keyed
+by `(node, character)`, like the ones of `ChordMatcher`.
+"""
+
+from libc.stdlib cimport malloc, calloc, free
+from cpython.unicode cimport Py_UNICODE_ISALNUM, Py_UNICODE_TOLOWER
+
+
+cdef int MIN_TABLE_SIZE = 16
+
+
+cdef inline unsigned long long transitionKey(int node, Py_UCS4 char):
+    # The code points fit in 21 bits.
+    return (<unsigned long long> node) << 21 | <unsigned int> char
+
+
+cdef inline size_t hashKey(unsigned long long key):
+    # The finalizer of `splitmix64`, which spreads the nearby keys over the whole table.
+    key = (key ^ (key >> 30)) * 0xBF58476D1CE4E5B9ULL
+    key = (key ^ (key >> 27)) * 0x94D049BB133111EBULL
+    
+    return <size_t> (key ^ (key >> 31))
+
+
+cdef class TextMatcher:
+    """
+    Description:
+        Matches the typed characters against a set of aliases, e.g., the keys of `ctrlHouse.abbreviations`, `non_prefixed_abbreviations`,
+        and `locations`. The aliases are matched case-insensitively, and can end anywhere in the typed text, not only at its start.
+        
+        - `feed` advances the automaton with a typed character, and returns whether an alias ends at it. `matches` then lists them.
+        - The states of the last typed characters are kept in a ring buffer, so `back` (backspace) returns to the previous state without rescanning.
+        - `feed` must only be called from one thread (the text expansion listener).
+    ---
+    Parameters:
+        `aliases -> Iterable[str]`: The aliases to match. The duplicated ones are only added once.
+        
+        `wordBoundary -> bool`: Whether an alias only matches at the start of a word, i.e., when the character before it is not a letter or a
+        digit (or when it is the first character typed since the last `reset`). Keeps the non-prefixed aliases like `nt` from matching inside words.
+        
+        `maxAliasLength -> int`: The aliases longer than this are skipped with a warning.
+    """
+    
+    cdef unsigned long long * keys
+    cdef int * children
+    cdef size_t tableMask
+    cdef int * failures
+    cdef int * outputs
+    cdef int * outputLinks
+    cdef list aliases
+    cdef public int nodeCount, aliasCount
+    cdef public bint wordBoundary
+    cdef int state
+    cdef int * stateRing
+    cdef Py_UCS4 * charRing
+    cdef int ringMask, ringHead, ringDepth
+    cdef public int typedCount
+    
+    def __cinit__(self):
+        self.keys = NULL
+        self.children = NULL
+        self.failures = NULL
+        self.outputs = NULL
+        self.outputLinks = NULL
+        self.stateRing = NULL
+        self.charRing = NULL
+    
+    def __init__(self, aliases=(), bint wordBoundary=True, int maxAliasLength=40):
+        cdef list transitions = [{}]
+        cdef list nodeOutputs = [-1]
+        cdef size_t tableSize = MIN_TABLE_SIZE, slot
+        cdef unsigned long long key
+        cdef int node, child, failure, ringSize = 1, longestAlias = 0
+        cdef Py_UCS4 char
+        
+        self.aliases = []
+        self.wordBoundary = wordBoundary
+        
+        for alias in aliases:
+            alias = alias.lower()
+            
+            if not alias:
+                continue
+            
+            if len(alias) > maxAliasLength:
+                print(f"➤ Warning! The alias '{alias}' is skipped. It is longer than {maxAliasLength} characters.")
+                continue
+            
+            node = 0
+            for char in alias:
+                child = transitions[node].get(char, 0)
+                
+                if not child:
+                    child = len(transitions)
+                    transitions[node][char] = child
+                    transitions.append({})
+                    nodeOutputs.append(-1)
+                
+                node = child
+            
+            if nodeOutputs[node] < 0:
+                nodeOutputs[node] = len(self.aliases)
+                self.aliases.append(alias)
+                longestAlias = max(longestAlias, len(alias))
+        
+        self.nodeCount = len(transitions)
+        self.aliasCount = len(self.aliases)
+        
+        # Keeping the load factor at or below 0.5, so the probe sequences stay short.
+        while tableSize < 2 * self.nodeCount:
+            tableSize *= 2
+        
+        # The ring must hold the character before the longest alias, for the word boundary check.
+        while ringSize < longestAlias + 2:
+            ringSize *= 2
+        
+        self.tableMask = tableSize - 1
+        self.ringMask = ringSize - 1
+        self.keys = <unsigned long long *> calloc(tableSize, sizeof(unsigned long long))
+        self.children = <int *> calloc(tableSize, sizeof(int))
+        self.failures = <int *> calloc(self.nodeCount, sizeof(int))
+        self.outputs = <int *> malloc(self.nodeCount * sizeof(int))
+        self.outputLinks = <int *> malloc(self.nodeCount * sizeof(int))
+        self.stateRing = <int *> calloc(ringSize, sizeof(int))
+        self.charRing = <Py_UCS4 *> calloc(ringSize, sizeof(Py_UCS4))
+        
+        if self.keys is NULL or self.children is NULL or self.failures is NULL or self.outputs is NULL or self.outputLinks is NULL \
+            or self.stateRing is NULL or self.charRing is NULL:
+            raise MemoryError()
+        
+        # A child index is never 0 (the root), so 0 marks the empty slots.
+        for node in range(self.nodeCount):
+            self.outputs[node] = nodeOutputs[node]
+            self.outputLinks[node] = -1
+            
+            for char, child in transitions[node].items():
+                key = transitionKey(node, char)
+                slot = hashKey(key) & self.tableMask
+                
+                while self.children[slot]:
+                    slot = (slot + 1) & self.tableMask
+                
+                self.keys[slot] = key
+                self.children[slot] = child
+        
+        # The failure link of a node is the node of its longest proper suffix that is also a prefix of an alias. Setting them in
+        # breadth-first order, so the links of the shallower nodes are ready. The output link is the nearest suffix that is an alias.
+        cdef list queue = list(transitions[0].values())
+        
+        for node in queue:
+            for char, child in transitions[node].items():
+                failure = self.failures[node]
+                
+                while failure and not self.findChild(failure, char):
+                    failure = self.failures[failure]
+                
+                failure = self.findChild(failure, char)
+                self.failures[child] = failure
+                self.outputLinks[child] = failure if self.outputs[failure] >= 0 else self.outputLinks[failure]
+                queue.append(child)
+        
+        self.reset()
+    
+    def __dealloc__(self):
+        free(self.keys)
+        free(self.children)
+        free(self.failures)
+        free(self.outputs)
+        free(self.outputLinks)
+        free(self.stateRing)
+        free(self.charRing)
+    
+    cdef inline int findChild(self, int node, Py_UCS4 char):
+        """Returns the child of the node reached with the given character, or 0 if there is none."""
+        
+        cdef unsigned long long key = transitionKey(node, char)
+        cdef size_t slot = hashKey(key) & self.tableMask
+        
+        while self.children[slot]:
+            if self.keys[slot] == key:
+                return self.children[slot]
+            
+            slot = (slot + 1) & self.tableMask
+        
+        return 0
+    
+    cdef inline bint isAtBoundary(self, int length):
+        """Returns whether the alias of the given length that ends at the last typed character starts a word."""
+        
+        if not self.wordBoundary or self.typedCount == length:
+            return True
+        
+        # The ring is larger than the longest alias, so the character before the alias is in it unless the ring was emptied by `back`.
+        if length >= self.ringDepth:
+            return False
+        
+        return not Py_UNICODE_ISALNUM(self.charRing[(self.ringHead - length) & self.ringMask])
+    
+    cpdef bint feed(self, Py_UCS4 char):
+        """
+        Description:
+            Advances the automaton with a typed character.
+        ---
+        Returns:
+            `bool`: Whether at least one alias ends at the character. Call `matches` to get them.
+        """
+        
+        cdef int node = self.state, child, output
+        
+        char = Py_UNICODE_TOLOWER(char)
+        
+        while True:
+            child = self.findChild(node, char)
+            
+            if child or not node:
+                break
+            
+            node = self.failures[node]
+        
+        self.state = child
+        self.ringHead = (self.ringHead + 1) & self.ringMask
+        self.stateRing[self.ringHead] = child
+        self.charRing[self.ringHead] = char
+        self.ringDepth = min(self.ringDepth + 1, self.ringMask + 1)
+        self.typedCount += 1
+        
+        output = child if self.outputs[child] >= 0 else self.outputLinks[child]
+        
+        while output > 0:
+            if self.isAtBoundary(len(<str> self.aliases[self.outputs[output]])):
+                return True
+            
+            output = self.outputLinks[output]
+        
+        return False
+    
+    cpdef list matches(self):
+        """Returns the aliases that end at the last typed character (and start a word, in the word boundary mode), longest first."""
+        
+        cdef list result = []
+        cdef int output = self.state if self.outputs[self.state] >= 0 else self.outputLinks[self.state]
+        
+        while output > 0:
+            alias = self.aliases[self.outputs[output]]
+            
+            if self.isAtBoundary(len(<str> alias)):
+                result.append(alias)
+            
+            output = self.outputLinks[output]
+        
+        return result
+    
+    cpdef void back(self):
+        """Removes the last typed character (backspace), returning to the state before it."""
+        
+        if not self.ringDepth:
+            self.reset()
+            return
+        
+        self.ringDepth -= 1
+        self.typedCount -= 1
+        self.ringHead = (self.ringHead - 1) & self.ringMask
+        
+        if self.ringDepth:
+            self.state = self.stateRing[self.ringHead]
+        
+        # The states before the ring are forgotten, so the matching starts over.
+        else:
+            self.reset()
+    
+    cpdef void feedText(self, str text):
+        """Feeds the characters of the given text, e.g., to restore an alias after undoing its expansion."""
+        
+        cdef Py_UCS4 char
+        
+        for char in text:
+            self.feed(char)
+    
+    cpdef void reset(self):
+        """Forgets the typed characters, e.g., after a space or a non-character key."""
+        
+        self.state = 0
+        self.ringHead = 0
+        self.ringDepth = 0
+        self.typedCount = 0
+    
+    cpdef str typedText(self):
+        """Returns the last typed characters that are still in the ring buffer, e.g., to display them."""
+        
+        return "".join([self.charRing[(self.ringHead - index) & self.ringMask] for index in range(self.ringDepth - 1, -1, -1)])
+    
+    def __len__(self) -> int:
+        return self.aliasCount
@@ -4,6 +4,10 @@ from win32com.client import CDispatch
 from typing import Callable, Optional
 
 
+OFFICE_IDLE_TIMEOUT: float
+"""The seconds an office application is kept open by `officeWorker` after its last conversion."""
+
+
 # Source: https://stackoverflow.com/questions/17984809/how-do-i-create-an-incrementing-filename-in-python
 def getUniqueName(directory: str, filename="New File", sequence_pattern=" (%s)", extension=".txt") -> str:
     """
@@ -27,7 +31,7 @@ def getUniqueName(directory: str, filename="New File", sequence_pattern=" (%s)",
 
 
 def getActiveExplorer(explorer_windows: Optional[CDispatch], check_desktop=True) -> CDispatch:
-    """Returns the active (focused) explorer/desktop window object."""
+    """Returns the active (focused) explorer/desktop window object. Must be called on `comWorker`, which owns the window objects."""
     ...
 
 
@@ -36,7 +40,12 @@ def getExplorerAddress(active_explorer: Optional[CDispatch]) -> str:
     ...
 
 
-def getSelectedItemsFromActiveExplorer(active_explorer: Optional[CDispatch], patterns: Optional[tuple[str]]) -> list[str]:
+def getActiveExplorerPath() -> str:
+    """Returns the address of the active explorer window, or an empty string. Can be called from any thread (it runs on `comWorker`)."""
+    ...
+
+
+def getSelectedItemsFromActiveExplorer(active_explorer: Optional[CDispatch], patterns: Optional[tuple[str]], check_desktop=True) -> list[str]:
     """
     Description:
         Returns the absolute paths of the selected items in the active explorer window.
@@ -47,6 +56,9 @@ def getSelectedItemsFromActiveExplorer(active_explorer: Optional[CDispatch], pat
         
         `patterns -> tuple[str]`:
             A tuple containing the file extensions to filter the selected items by.
+        
+        `check_desktop=True`:
+            Whether to allow checking desktop items or not.
     ---
     Returns:
         `list[str]`: A list containing the paths to the selected items in the active explorer window.
@@ -132,10 +144,16 @@ def createNewFile(active_explorer: Optional[CDispatch]) -> int:
     ...
 
 
+def selectExplorerItem(path: str, active_explorer: Optional[CDispatch] = None, hwnd=0) -> None:
+    """Selects the given item in the given explorer window object, or else in the explorer window with the given handle (the active one if it is `0`)."""
+    ...
+
+
 def officeFileToPDF(active_explorer: Optional[CDispatch], office_application="Powerpoint") -> None:
     """
     Description:
         Converts the selected files from the active explorer window that are associated with the specified office application into a PDF format.
+        The files are converted on `officeWorker`, which keeps the office application open for the next conversions (see `OFFICE_IDLE_TIMEOUT`).
     ---
     Parameters:
         `active_explorer -> CDispatch`:
@@ -149,10 +167,16 @@ def officeFileToPDF(active_explorer: Optional[CDispatch], office_application="Po
     ...
 
 
+def convertOfficeFiles(office_application: str, file_paths: list[str]) -> str:
+    """Converts the given files into PDF files with the office application kept by `officeWorker`, and returns the path of the last one. Must be called on `officeWorker`."""
+    ...
+
+
 def genericFileConverter(active_explorer: Optional[CDispatch], patterns: Optional[tuple[str]], convert_func: Optional[Callable[[str, str], None]], new_loc="", new_extension="") -> None:
     """
     Description:
         Converts the selected files from the active explorer window using the specified filter and convert functions.
+        The selected files are read on `comWorker`, and converted on the calling thread.
     ---
     Parameters:
         `active_explorer -> CDispatch`:
@@ -4,12 +4,23 @@
 
 cimport cython
 
-import win32gui, win32ui, win32con, os, win32clipboard, winsound
-from win32com.client import Dispatch
-from win32com.shell import shell
+import os
 
-from cythonExtensions.commonUtils.commonUtils import ShellAutomationObjectWrapper as ShellWrapper, PThread, sendToClipboard
+from cythonExtensions.commonUtils.commonUtils import sendToClipboard
+from cythonExtensions.commonUtils.comWorker import comWorker, officeWorker, shellApplication
 from cythonExtensions.windowHelper import windowHelper as winHelper
+from cythonExtensions.windowHelper.foregroundContext import foregroundContext
+from cythonExtensions.explorerHelper.explorerWindows import explorerWindows, EXPLORER_CLASS_NAMES
+from cythonExtensions.platformBackend import platformBackend as pfBackend
+from cythonExtensions.platformBackend.platformBackend import win32con, importPlatformModule
+
+# The functions of this module need Windows, but it can still be imported without these modules (e.g., with the fake platform backend).
+win32ui = importPlatformModule("win32ui")
+Dispatch = importPlatformModule("win32com.client").Dispatch
+shell = importPlatformModule("win32com.shell.shell")
+
+OFFICE_IDLE_TIMEOUT = 60.0
+"""The seconds an office application is kept open by `officeWorker` after its last conversion."""
 
 
 # Source: https://stackoverflow.com/questions/17984809/how-do-i-create-an-incrementing-filename-in-python
@@ -56,43 +67,39 @@ cpdef getUniqueName(directory, filename="New File", sequence_pattern=" (%s)", ex
 
 
 cdef getActiveExplorer(explorer_windows=None, bint check_desktop=True):
-    """Returns the active (focused) explorer/desktop window object."""
-    
-    cdef bint initializer_called = PThread.coInitialize()
-    
-    # No automation object was passed; create one.
-    if not explorer_windows:
-        explorer_windows = ShellWrapper.explorer.Windows()
+    """Returns the active (focused) explorer/desktop window object. Must be called on `comWorker`, which owns the window objects."""
     
     output = None
     
-    cdef int fg_hwnd = win32gui.GetForegroundWindow()
+    # The foreground window and its class name are cached by the foreground hook.
+    fgContext = foregroundContext.current()
+    
+    cdef int fg_hwnd = fgContext.hwnd
     
     if not fg_hwnd:
         return None
     
-    try:
-        curr_className = win32gui.GetClassName(fg_hwnd)
-    
-    except Exception as e:
-        print(f"Error: {e}\nA problem occurred while retrieving the className of the foreground window.\n")
-        
-        return None
+    curr_className = fgContext.className
     
     # Check if the active window has one of the Desktop window class names. This check is necessary because
     # `GetForegroundWindow()` and `explorer_windows.Item().HWND` might not be the same even when the Desktop is the active window.
     if check_desktop and curr_className in ("WorkerW", "Progman"):
+        # No automation object was passed; create one.
+        if not explorer_windows:
+            explorer_windows = shellApplication().Windows()
+        
         output = explorer_windows.Item() # Not passing a number to `Item()` returns the desktop window object.
     
-    else:
+    elif explorer_windows:
         # Check other explorer windows if any.
         for explorer_window in explorer_windows:
             if explorer_window.HWND == fg_hwnd:
                 output = explorer_window
                 break
     
-    if initializer_called:
-        PThread.coUninitialize()
+    else:
+        # The window objects are cached by their handles, so the open windows are only enumerated when a new window is looked up.
+        output = explorerWindows.window(fg_hwnd)
     
     return output
 
@@ -101,16 +108,21 @@ cdef getExplorerAddress(active_explorer=None):
     """Returns the address of the active explorer window."""
     
     if not active_explorer:
-        active_explorer = getActiveExplorer(explorer_windows=None, check_desktop=False)
+        return explorerWindows.path(foregroundContext.current().hwnd)
     
-    if not active_explorer:
-        return ""
+    # The path is cached with the window title, and read from the title when it is a full path (`GetWindowText` is about 10 times faster).
+    return explorerWindows.path(active_explorer.HWND, active_explorer)
+
+
+@comWorker.wrap
+def getActiveExplorerPath() -> str:
+    """Returns the address of the active explorer window, or an empty string. Can be called from any thread (it runs on `comWorker`)."""
     
-    # return win32gui.GetWindowText(active_explorer.HWND) # About 10 times faster but sometimes fails to return the full path.
-    return active_explorer.Document.Folder.Self.Path
+    return getExplorerAddress()
 
 
-def getSelectedItemsFromActiveExplorer(active_explorer=None, patterns: tuple[str, ...]=None) -> list[str]:
+@comWorker.wrap
+def getSelectedItemsFromActiveExplorer(active_explorer=None, patterns: tuple[str, ...]=None, check_desktop=True) -> list[str]:
     """
     Description:
         Returns the absolute paths of the selected items in the active explorer window.
@@ -121,15 +133,16 @@ def getSelectedItemsFromActiveExplorer(active_explorer=None, patterns: tuple[str
         
         `patterns -> tuple[str]`:
             A tuple containing the file extensions to filter the selected items by.
+        
+        `check_desktop=True`:
+            Whether to allow checking desktop items or not.
     ---
     Returns:
         `list[str]`: A list containing the paths to the selected items in the active explorer window.
     """
     
-    cdef bint initializer_called = PThread.coInitialize(True)
-    
     if not active_explorer:
-        active_explorer = getActiveExplorer(explorer_windows=None, check_desktop=True)
+        active_explorer = getActiveExplorer(explorer_windows=None, check_desktop=check_desktop)
     
     cdef list output = []
     
@@ -138,21 +151,19 @@ def getSelectedItemsFromActiveExplorer(active_explorer=None, patterns: tuple[str
             if not patterns or selected_item.Path.endswith(patterns):
                 output.append(selected_item.Path)
     
-    if initializer_called:
-        PThread.coUninitialize(True)
-    
     return output
 
 
 def executeOnSelectedItems(patterns, function, check_desktop=False):
     classNames = ("CabinetWClass", "WorkerW") if check_desktop else ("CabinetWClass",)
-    if win32gui.GetClassName(win32gui.GetForegroundWindow()) in classNames:
+    if foregroundContext.current().className in classNames:
         selectedFiles = getSelectedItemsFromActiveExplorer(None, patterns)
     
     if selectedFiles:
         return function(selectedFiles)
 
 
+@comWorker.wrap
 def copySelectedFileNames(active_explorer=None, check_desktop=True) -> list[str]:
     """
     Description:
@@ -169,8 +180,6 @@ def copySelectedFileNames(active_explorer=None, check_desktop=True) -> list[str]
         `list[str]`: A list containing the paths to the selected items in the active explorer/desktop window.
     """
     
-    cdef bint initializer_called = PThread.coInitialize()
-    
     # If no automation object was passed (i.e., `None` was passed), create one.
     if not active_explorer:
         active_explorer = getActiveExplorer(explorer_windows=None, check_desktop=check_desktop)
@@ -184,12 +193,9 @@ def copySelectedFileNames(active_explorer=None, check_desktop=True) -> list[str]
         if selected_files_paths:
             concatenated_file_paths = '"' + '" "'.join(selected_files_paths) + '"'
             
-            sendToClipboard(concatenated_file_paths, win32clipboard.CF_UNICODETEXT)
+            sendToClipboard(concatenated_file_paths, win32con.CF_UNICODETEXT)
         
-        winsound.PlaySound(r"SFX\coins-497.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
-    
-    if initializer_called:
-        PThread.coUninitialize()
+        pfBackend.backend.playSound(r"SFX\coins-497.wav")
     
     return selected_files_paths
 
@@ -273,6 +279,7 @@ def selectFilesFromDirectory(directory, file_names: list[str]) -> None:
     shell.SHOpenFolderAndSelectItems(folder_pidl, to_show, 0)
 
 
+@comWorker.wrap
 def createNewFile(active_explorer=None) -> int:
     """
     Description:
@@ -285,8 +292,6 @@ def createNewFile(active_explorer=None) -> int:
             - `1`: `A file was created successfully`
     """
     
-    cdef bint initializer_called = PThread.coInitialize()
-    
     if not active_explorer:
         active_explorer = getActiveExplorer(explorer_windows=None, check_desktop=True)
     
@@ -301,21 +306,30 @@ def createNewFile(active_explorer=None) -> int:
         # Selects the file and put it in edit mode: https://learn.microsoft.com/en-us/windows/win32/shell/shellfolderview-selectitem
         active_explorer.Document.SelectItem(file_fullpath, 0x1F) # 0x1F = 31 # 1|4|8|16 = 29
         
-        winsound.PlaySound(r"SFX\coins-497.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
+        pfBackend.backend.playSound(r"SFX\coins-497.wav")
         
         output = 1
     
-    if initializer_called:
-        PThread.coUninitialize()
-    
     return output
 
 
+@comWorker.wrap
+def selectExplorerItem(path, active_explorer=None, int hwnd=0) -> None:
+    """Selects the given item in the given explorer window object, or else in the explorer window with the given handle (the active one if it is `0`)."""
+    
+    if not active_explorer:
+        active_explorer = explorerWindows.window(hwnd) if hwnd else getActiveExplorer(explorer_windows=None, check_desktop=False)
+    
+    if active_explorer:
+        active_explorer.Document.SelectItem(path, 0x1F)
+
+
 @cython.wraparound(False)
 def officeFileToPDF(active_explorer=None, office_application="Powerpoint"):
     """
     Description:
         Converts the selected files from the active explorer window that are associated with the specified office application into a PDF format.
+        The files are converted on `officeWorker`, which keeps the office application open for the next conversions (see `OFFICE_IDLE_TIMEOUT`).
     ---
     Parameters:
         `active_explorer -> CDispatch`:
@@ -327,20 +341,14 @@ def officeFileToPDF(active_explorer=None, office_application="Powerpoint"):
             Ex => `"Powerpoint": (".pptx", ".ppt")` | `"Word": (".docx", ".doc")`
     """
     
-    cdef bint initializer_called = PThread.coInitialize()
+    fgContext = foregroundContext.current()
     
-    if not active_explorer:
-        active_explorer = getActiveExplorer(explorer_windows=None, check_desktop=False)
-    
-    if not active_explorer:
-        if initializer_called:
-            PThread.coUninitialize()
-        
+    if not active_explorer and fgContext.className not in EXPLORER_CLASS_NAMES:
         return
     
     office_application_char0 = office_application[0].lower()
     cdef list selected_files_paths = getSelectedItemsFromActiveExplorer(active_explorer,
-                patterns={"p": (".pptx", ".ppt"), "w": (".docx", ".doc")}.get(office_application_char0))
+                patterns={"p": (".pptx", ".ppt"), "w": (".docx", ".doc")}.get(office_application_char0), check_desktop=False)
     
     # Check if any file exists to pop it from the selected files list before starting any office application.
     cdef int file_path_counter = 0
@@ -362,52 +370,65 @@ def officeFileToPDF(active_explorer=None, office_application="Powerpoint"):
         selected_files_paths = selected_files_paths[:file_path_counter]
         
         if file_path_counter == 0 or file_path_counter < len_selected_files:
-            winsound.PlaySound(r"SFX\wrong.swf.wav", winsound.SND_FILENAME)
+            pfBackend.backend.playSound(r"SFX\wrong.swf.wav", wait=True)
     
     if not selected_files_paths:
-        if initializer_called:
-            PThread.coUninitialize()
-        
         return
     
-    winsound.PlaySound(r"SFX\connection-sound.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
+    pfBackend.backend.playSound(r"SFX\connection-sound.wav")
+    
+    new_filepath = officeWorker.call(convertOfficeFiles, office_application, selected_files_paths)
+    
+    selectExplorerItem(new_filepath, active_explorer, fgContext.hwnd)
+    
+    pfBackend.backend.playSound(r"SFX\coins-497.wav")
+
+
+@cython.wraparound(False)
+def convertOfficeFiles(str office_application, list file_paths) -> str:
+    """Converts the given files into PDF files with the office application kept by `officeWorker`, and returns the path of the last one. Must be called on `officeWorker`."""
+    
+    office_application_char0 = office_application[0].lower()
     
-    cdef office_dispatch = Dispatch(f"{office_application}.Application")
+    cdef office_dispatch = officeWorker.getObject(office_application, lambda: Dispatch(f"{office_application}.Application"),
+                                                  lambda application: application.Quit(), OFFICE_IDLE_TIMEOUT)
     
     # office_dispatch.Visible = 1 # Uncomment this if an error happened
     
     # office_dispatch.ActiveWindow.WindowState = 2 # (ppWindowNormal, ppWindowMinimized, ppWindowMaximized) = 1, 2, 3
     
-    for file_path in selected_files_paths:
-        new_filepath = os.path.splitext(file_path)[0] + ".pdf"
-        
-        # office_window = office_dispatch.Presentations.Open(file_path) if office_application_char0 == "p" else \
-        #                 office_dispatch.Documents.Open(file_path)     if office_application_char0 == "w" else None
-        
-        office_window = (office_application_char0 == "p" and office_dispatch.Presentations.Open(file_path)) or \
-                        (office_application_char0 == "w"and office_dispatch.Documents.Open(file_path))
-        
-        # WdSaveFormat enumeration (Word): https://learn.microsoft.com/en-us/office/vba/api/word.wdsaveformat
-        office_window.SaveAs(new_filepath, {"p": 32, "w": 17}.get(office_application_char0))
-        
-        print("Success: %s" % new_filepath)
-        
-        office_window.Close()
+    new_filepath = ""
     
-    office_dispatch.Quit()
-    
-    active_explorer.Document.SelectItem(new_filepath, 0x1F)
+    try:
+        for file_path in file_paths:
+            new_filepath = os.path.splitext(file_path)[0] + ".pdf"
+            
+            # office_window = office_dispatch.Presentations.Open(file_path) if office_application_char0 == "p" else \
+            #                 office_dispatch.Documents.Open(file_path)     if office_application_char0 == "w" else None
+            
+            office_window = (office_application_char0 == "p" and office_dispatch.Presentations.Open(file_path)) or \
+                            (office_application_char0 == "w"and office_dispatch.Documents.Open(file_path))
+            
+            # WdSaveFormat enumeration (Word): https://learn.microsoft.com/en-us/office/vba/api/word.wdsaveformat
+            office_window.SaveAs(new_filepath, {"p": 32, "w": 17}.get(office_application_char0))
+            
+            print("Success: %s" % new_filepath)
+            
+            office_window.Close()
     
-    if initializer_called:
-        PThread.coUninitialize()
+    # The application may have been closed by the user. A new one is started by the next conversion.
+    except Exception:
+        officeWorker.dropObject(office_application)
+        raise
     
-    winsound.PlaySound(r"SFX\coins-497.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
+    return new_filepath
 
 
 def genericFileConverter(active_explorer=None, tuple patterns=None, convert_func=None, new_loc="", str new_extension="") -> None:
     """
     Description:
         Converts the selected files from the active explorer window using the specified filter and convert functions.
+        The selected files are read on `comWorker`, and converted on the calling thread.
     ---
     Parameters:
         `active_explorer -> CDispatch`:
@@ -436,26 +457,14 @@ def genericFileConverter(active_explorer=None, tuple patterns=None, convert_func
     if winHelper.showMessageBox("Are you sure you want to convert the selected files?", "Confirmation", 2, win32con.MB_ICONQUESTION) == 7:
         return
     
-    cdef bint initializer_called = PThread.coInitialize()
-    
-    if not active_explorer:
-        active_explorer = getActiveExplorer(explorer_windows=None, check_desktop=False)
-    
-    if not active_explorer:
-        if initializer_called:
-            PThread.coUninitialize()
-        
-        return
+    cdef int fg_hwnd = foregroundContext.current().hwnd
     
-    cdef list selected_files_paths = getSelectedItemsFromActiveExplorer(active_explorer, patterns=patterns)
+    cdef list selected_files_paths = getSelectedItemsFromActiveExplorer(active_explorer, patterns=patterns, check_desktop=False)
     
     if not selected_files_paths:
-        if initializer_called:
-            PThread.coUninitialize()
-        
         return
     
-    winsound.PlaySound(r"SFX\connection-sound.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
+    pfBackend.backend.playSound(r"SFX\connection-sound.wav")
     
     for file_path in selected_files_paths:
         new_filepath = os.path.splitext(file_path)[0] + new_extension
@@ -470,35 +479,25 @@ def genericFileConverter(active_explorer=None, tuple patterns=None, convert_func
         convert_func(file_path, new_filepath)
         print(f"File converted: {new_filepath}")
     
-    winsound.PlaySound(r"SFX\coins-497.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
-    
-    active_explorer.Document.SelectItem(new_filepath, 0x1F)
+    pfBackend.backend.playSound(r"SFX\coins-497.wav")
     
-    if initializer_called:
-        PThread.coUninitialize()
+    selectExplorerItem(new_filepath, active_explorer, fg_hwnd)
 
 
+@comWorker.wrap
 def flattenDirectories(active_explorer=None) -> None:
     """Flattens the selected folders from the active explorer window to the explorer current location."""
     
-    cdef bint initializer_called = PThread.coInitialize()
-    
     # If no automation object was passed (i.e., `None` was passed), create one.
     if not active_explorer:
         active_explorer = getActiveExplorer(explorer_windows=None, check_desktop=False)
     
     if not active_explorer:
-        if initializer_called:
-            PThread.coUninitialize()
-        
         return
     
     cdef list selected_files_paths = getSelectedItemsFromActiveExplorer(active_explorer)
     
     if not selected_files_paths:
-        if initializer_called:
-            PThread.coUninitialize()
-        
         return
     
     src = getExplorerAddress(active_explorer)
@@ -515,6 +514,3 @@ def flattenDirectories(active_explorer=None) -> None:
             
             if os.path.isfile(target_src):
                 os.rename(target_src, target_dst)
-    
-    if initializer_called:
-        PThread.coUninitialize()
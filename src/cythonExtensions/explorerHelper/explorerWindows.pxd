@@ -0,0 +1,24 @@
+cdef class ExplorerWindowCache:
+    cdef long long hits, misses, titleHits, enumerations, invalidations
+    cdef dict windows, paths
+    cdef set staleWindows
+    cdef int hookId
+    cdef object lock
+    
+    cpdef bint start(self)
+    
+    cpdef void stop(self)
+    
+    cpdef void clear(self)
+    
+    cdef void dropStaleWindows(self)
+    
+    cdef bint isExplorer(self, int hwnd)
+    
+    cdef void enumerate(self)
+    
+    cpdef object window(self, int hwnd)
+    
+    cpdef str path(self, int hwnd, window=*)
+    
+    cpdef dict getStats(self)
@@ -0,0 +1,91 @@
+"""
+This module keeps the open explorer windows in memory: their `Shell.Application` window objects and their folder paths, by window handle.
+
+Finding the window object of an explorer window enumerates all the open windows over COM, and reading its folder path takes three more COM
+calls. The window objects are enumerated once, on the lookup of a window that is not cached, and dropped when their windows are destroyed.
+The paths are cached with the titles of their windows, and dropped when the titles change (the explorer windows change their titles when
+they navigate). A title that is the full path of a folder (the "Display the full path in the title bar" option) is used without COM.
+
+The notifications come from a window event hook (`EVENT_OBJECT_CREATE`, `EVENT_OBJECT_DESTROY`, and `EVENT_OBJECT_NAMECHANGE`).
+"""
+
+from typing import Any
+
+
+EXPLORER_CLASS_NAMES: tuple[str, ...]
+"""The class names of the explorer windows."""
+
+
+class ExplorerWindowCache:
+    """
+    Description:
+        The window objects and the folder paths of the open explorer windows, by window handle.
+        
+        - `start` must be called from the thread that runs the message loop (the hook thread), as the notifications are delivered by it.
+        - Until `start` succeeds, the cached paths are not trusted (a navigation to a folder with the same name would not be noticed), so only the window objects are cached.
+        - The lookups must be made on `comWorker`, which owns the window objects. The objects of the destroyed windows are only marked
+          by the hook, and dropped by the next lookup, so they are released in the apartment that created them.
+    ---
+    Attributes:
+        `hits -> int`: The lookups answered from the cache.
+        
+        `misses -> int`: The lookups that queried the windows over COM.
+        
+        `titleHits -> int`: The paths read from the window titles.
+        
+        `enumerations -> int`: The number of times the open windows were enumerated.
+        
+        `invalidations -> int`: The cached windows and paths dropped by the window notifications.
+    """
+    
+    hits: int
+    misses: int
+    titleHits: int
+    enumerations: int
+    invalidations: int
+    
+    def __init__(self) -> None:
+        ...
+    
+    @property
+    def live(self) -> bool:
+        """Whether the cache is kept current by the window event hook."""
+        ...
+    
+    def start(self) -> bool:
+        """Installs the window event hook. Returns whether it was installed."""
+        ...
+    
+    def stop(self) -> None:
+        """Removes the window event hook, and empties the cache."""
+        ...
+    
+    def clear(self) -> None:
+        """Empties the cache. The windows are enumerated again on the next lookup. The window objects are dropped by the next lookup (on `comWorker`)."""
+        ...
+    
+    def onWindowEvent(self, event: int, hwnd: int) -> None:
+        """The callback of the window event hook. It is called in the hook thread for each window of the system, so it only drops the cached entries."""
+        ...
+    
+    def window(self, hwnd: int) -> Any | None:
+        """Returns the `Shell.Application` window object of the given explorer window, or `None` if it is not one."""
+        ...
+    
+    def path(self, hwnd: int, window: Any | None = None) -> str:
+        """
+        Description:
+            Returns the folder path of the given explorer window, or an empty string if it is not an explorer window.
+        ---
+        Parameters:
+            `window -> object | None`: The window object of the window, if the caller has it. It is looked up otherwise, only if the path is not cached.
+        """
+        ...
+    
+    def getStats(self) -> dict:
+        """Returns the number of the cached windows and paths, and the lookup counters."""
+        ...
+
+
+explorerWindows: ExplorerWindowCache
+"""The explorer windows cache of the script."""
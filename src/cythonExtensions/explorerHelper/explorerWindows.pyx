@@ -0,0 +1,248 @@
+# cython: language_level = 3str
+
+"""
+This extension module keeps the open explorer windows in memory: their `Shell.Application` window objects and their folder paths, by window handle.
+
+Finding the window object of an explorer window enumerates all the open windows over COM, and reading its folder path takes three more COM
+calls. The window objects are enumerated once, on the lookup of a window that is not cached, and dropped when their windows are destroyed.
+The paths are cached with the titles of their windows, and dropped when the titles change (the explorer windows change their titles when
+they navigate). A title that is the full path of a folder (the "Display the full path in the title bar" option) is used without COM.
+
+The notifications come from a window event hook (`EVENT_OBJECT_CREATE`, `EVENT_OBJECT_DESTROY`, and `EVENT_OBJECT_NAMECHANGE`).
+"""
+
+import os, threading
+
+from cythonExtensions.commonUtils.comWorker import comWorker, shellApplication
+from cythonExtensions.platformBackend import platformBackend as pfBackend
+from cythonExtensions.platformBackend.platformBackend import win32con
+
+
+EXPLORER_CLASS_NAMES = ("CabinetWClass", "ExploreWClass")
+"""The class names of the explorer windows."""
+
+
+cdef class ExplorerWindowCache:
+    """
+    Description:
+        The window objects and the folder paths of the open explorer windows, by window handle.
+        
+        - `start` must be called from the thread that runs the message loop (the hook thread), as the notifications are delivered by it.
+        - Until `start` succeeds, the cached paths are not trusted (a navigation to a folder with the same name would not be noticed), so only the window objects are cached.
+        - The lookups must be made on `comWorker`, which owns the window objects. The objects of the destroyed windows are only marked
+          by the hook, and dropped by the next lookup, so they are released in the apartment that created them.
+    ---
+    Attributes:
+        `hits -> int`: The lookups answered from the cache.
+        
+        `misses -> int`: The lookups that queried the windows over COM.
+        
+        `titleHits -> int`: The paths read from the window titles.
+        
+        `enumerations -> int`: The number of times the open windows were enumerated.
+        
+        `invalidations -> int`: The cached windows and paths dropped by the window notifications.
+    """
+    
+    cdef public long long hits, misses, titleHits, enumerations, invalidations
+    cdef dict windows, paths
+    cdef set staleWindows
+    cdef int hookId
+    cdef object lock
+    
+    def __init__(self):
+        self.hits = self.misses = self.titleHits = self.enumerations = self.invalidations = 0
+        self.windows = {}
+        self.paths = {}
+        self.staleWindows = set()
+        self.hookId = 0
+        self.lock = threading.Lock()
+    
+    @property
+    def live(self) -> bool:
+        """Whether the cache is kept current by the window event hook."""
+        
+        return self.hookId != 0
+    
+    cpdef bint start(self):
+        """Installs the window event hook. Returns whether it was installed."""
+        
+        if not self.hookId:
+            self.hookId = pfBackend.backend.installWindowEventHook(self.onWindowEvent)
+        
+        return self.hookId != 0
+    
+    cpdef void stop(self):
+        """Removes the window event hook, and empties the cache."""
+        
+        if self.hookId:
+            pfBackend.backend.uninstallWindowEventHook(self.hookId)
+            self.hookId = 0
+        
+        self.clear()
+    
+    cpdef void clear(self):
+        """Empties the cache. The windows are enumerated again on the next lookup. The window objects are dropped by the next lookup (on `comWorker`)."""
+        
+        with self.lock:
+            self.staleWindows.update(self.windows)
+            self.paths = {}
+    
+    def onWindowEvent(self, int event, int hwnd) -> None:
+        """The callback of the window event hook. It is called in the hook thread for each window of the system, so it only drops the cached entries."""
+        
+        if event == win32con.EVENT_OBJECT_NAMECHANGE:
+            if self.paths.pop(hwnd, None) is not None:
+                self.invalidations += 1
+            
+            return
+        
+        # A destroyed window, or a new one reusing the handle of a destroyed window.
+        if hwnd in self.windows or hwnd in self.paths:
+            with self.lock:
+                if hwnd in self.windows:
+                    self.staleWindows.add(hwnd)
+                
+                self.paths.pop(hwnd, None)
+            
+            self.invalidations += 1
+    
+    cdef void dropStaleWindows(self):
+        """Drops the window objects of the destroyed windows."""
+        
+        if not self.staleWindows:
+            return
+        
+        with self.lock:
+            for hwnd in self.staleWindows:
+                self.windows.pop(hwnd, None)
+            
+            self.staleWindows.clear()
+    
+    cdef bint isExplorer(self, int hwnd):
+        """Returns whether the given window is an explorer window, without COM."""
+        
+        if hwnd in self.windows:
+            return True
+        
+        try:
+            return pfBackend.backend.getClassName(hwnd) in EXPLORER_CLASS_NAMES
+        
+        # The window may be destroyed before it is queried.
+        except Exception:
+            return False
+    
+    cdef void enumerate(self):
+        """Replaces the cached window objects with the ones of the open explorer windows."""
+        
+        cdef dict windows = {}
+        
+        try:
+            shellWindows = shellApplication().Windows()
+        
+        # The `Shell.Application` object is disconnected when the explorer is restarted. A new one is created once.
+        except Exception:
+            comWorker.dropObject("Shell.Application")
+            shellWindows = shellApplication().Windows()
+        
+        for window in shellWindows:
+            # The explorer tabs share the handle of their window, and the first one is kept, as when looking the windows up one by one.
+            try:
+                windows.setdefault(int(window.HWND), window)
+            
+            # A window closed during the enumeration.
+            except Exception:
+                continue
+        
+        with self.lock:
+            self.windows = windows
+            self.staleWindows.clear()
+            self.paths = {hwnd: entry for hwnd, entry in self.paths.items() if hwnd in windows}
+        
+        self.enumerations += 1
+    
+    cpdef object window(self, int hwnd):
+        """Returns the `Shell.Application` window object of the given explorer window, or `None` if it is not one."""
+        
+        self.dropStaleWindows()
+        
+        window = self.windows.get(hwnd)
+        
+        if window is not None:
+            self.hits += 1
+            return window
+        
+        if not hwnd or not self.isExplorer(hwnd):
+            return None
+        
+        self.misses += 1
+        self.enumerate()
+        
+        return self.windows.get(hwnd)
+    
+    cpdef str path(self, int hwnd, window=None):
+        """
+        Description:
+            Returns the folder path of the given explorer window, or an empty string if it is not an explorer window.
+        ---
+        Parameters:
+            `window -> object | None`: The window object of the window, if the caller has it. It is looked up otherwise, only if the path is not cached.
+        """
+        
+        self.dropStaleWindows()
+        
+        if not hwnd or window is None and not self.isExplorer(hwnd):
+            return ""
+        
+        cdef str title = pfBackend.backend.getWindowText(hwnd), path
+        cdef tuple entry = self.paths.get(hwnd)
+        
+        # The title changes when the window navigates, so a cached path with the same title is still current.
+        if entry is not None and self.hookId and entry[0] == title:
+            self.hits += 1
+            return entry[1]
+        
+        if os.path.isabs(title) and os.path.isdir(title):
+            self.titleHits += 1
+            path = title
+        
+        else:
+            if window is None:
+                window = self.window(hwnd)
+                
+                if window is None:
+                    return ""
+            
+            self.misses += 1
+            
+            try:
+                path = window.Document.Folder.Self.Path
+            
+            # The cached window object belongs to a closed window (e.g., when the explorer was restarted). It is enumerated again on the next lookup.
+            except Exception:
+                with self.lock:
+                    self.windows.pop(hwnd, None)
+                
+                raise
+        
+        with self.lock:
+            self.paths[hwnd] = (title, path)
+        
+        return path
+    
+    cpdef dict getStats(self):
+        """Returns the number of the cached windows and paths, and the lookup counters."""
+        
+        return {
+            "windows":       len(self.windows) - len(self.staleWindows),
+            "paths":         len(self.paths),
+            "hits":          self.hits,
+            "misses":        self.misses,
+            "titleHits":     self.titleHits,
+            "enumerations":  self.enumerations,
+            "invalidations": self.invalidations,
+        }
+
+
+explorerWindows = ExplorerWindowCache()
+"""The explorer windows cache of the script."""
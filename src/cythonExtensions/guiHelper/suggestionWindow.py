@@ -0,0 +1,249 @@
+"""A topmost popup that lists the autocomplete suggestions next to the caret without taking the focus (see `autocomplete.Suggester`)."""
+
+import ctypes, threading
+from ctypes import wintypes
+import win32con
+
+try:
+    from cythonExtensions.guiHelper.guiBase import *
+except ImportError:
+    from guiBase import *
+
+
+WM_SHOWSUGGESTIONS = win32con.WM_APP + 1  # Custom message to show the stored lines.
+WM_HIDESUGGESTIONS = win32con.WM_APP + 2  # Custom message to hide the window.
+CS_DROPSHADOW = 0x00020000                # Not defined in `win32con`.
+
+PADDING = 4
+"""The space around the lines, in pixels."""
+
+
+class GUITHREADINFO(ctypes.Structure):
+    """Information about the active window of a GUI thread, including its caret."""
+    
+    _fields_ = [
+        ('cbSize', wintypes.DWORD),
+        ('flags', wintypes.DWORD),
+        ('hwndActive', wintypes.HWND),
+        ('hwndFocus', wintypes.HWND),
+        ('hwndCapture', wintypes.HWND),
+        ('hwndMenuOwner', wintypes.HWND),
+        ('hwndMoveSize', wintypes.HWND),
+        ('hwndCaret', wintypes.HWND),
+        ('rcCaret', wintypes.RECT),
+    ]
+
+
+user32.GetGUIThreadInfo.argtypes = wintypes.DWORD, ctypes.POINTER(GUITHREADINFO)
+user32.GetGUIThreadInfo.restype = wintypes.BOOL
+user32.ClientToScreen.argtypes = wintypes.HWND, ctypes.POINTER(wintypes.POINT)
+user32.ClientToScreen.restype = wintypes.BOOL
+user32.GetCursorPos.argtypes = ctypes.POINTER(wintypes.POINT),
+user32.GetCursorPos.restype = wintypes.BOOL
+user32.SetWindowPos.argtypes = wintypes.HWND, wintypes.HWND, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, wintypes.UINT
+user32.SetWindowPos.restype = wintypes.BOOL
+user32.PostMessageW.argtypes = wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM
+user32.PostMessageW.restype = wintypes.BOOL
+user32.InvalidateRect.argtypes = wintypes.HWND, ctypes.POINTER(wintypes.RECT), wintypes.BOOL
+user32.InvalidateRect.restype = wintypes.BOOL
+user32.BeginPaint.argtypes = wintypes.HWND, ctypes.POINTER(PAINTSTRUCT)
+user32.BeginPaint.restype = wintypes.HDC
+user32.EndPaint.argtypes = wintypes.HWND, ctypes.POINTER(PAINTSTRUCT)
+user32.EndPaint.restype = wintypes.BOOL
+user32.GetDC.argtypes = wintypes.HWND,
+user32.GetDC.restype = wintypes.HDC
+user32.ReleaseDC.argtypes = wintypes.HWND, wintypes.HDC
+user32.ReleaseDC.restype = ctypes.c_int
+user32.FillRect.argtypes = wintypes.HDC, ctypes.POINTER(wintypes.RECT), wintypes.HBRUSH
+user32.FillRect.restype = ctypes.c_int
+user32.GetSysColorBrush.argtypes = ctypes.c_int,
+user32.GetSysColorBrush.restype = wintypes.HBRUSH
+user32.GetSysColor.argtypes = ctypes.c_int,
+user32.GetSysColor.restype = wintypes.DWORD
+gdi32.SelectObject.argtypes = wintypes.HDC, wintypes.HGDIOBJ
+gdi32.SelectObject.restype = wintypes.HGDIOBJ
+gdi32.SetBkMode.argtypes = wintypes.HDC, ctypes.c_int
+gdi32.SetBkMode.restype = ctypes.c_int
+gdi32.SetTextColor.argtypes = wintypes.HDC, wintypes.COLORREF
+gdi32.SetTextColor.restype = wintypes.COLORREF
+
+
+class SuggestionWindow:
+    """
+    Description:
+        A borderless topmost window that does not activate, so the typing continues in the focused window while it is shown.
+        The window lives in its own thread with its own message loop. `show` and `hide` only store the lines and post a message to it,
+        so they return immediately and can be called from the keyboard listeners.
+    """
+    
+    def __init__(self):
+        self.classname = "MacropySuggestionWindow"
+        self.hwnd: int = None
+        self.lines: list[str] = []
+        self.selected = 0
+        self.lineHeight = 16
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        
+        # The window procedure must be kept referenced as long as the window exists.
+        self.wndProc = WNDPROC(self.WndProc)
+        
+        threading.Thread(target=self.run, name="SuggestionWindow", daemon=True).start()
+        
+        if not self.ready.wait(2) or not self.hwnd:
+            raise OSError("The suggestion window could not be created.")
+    
+    def show(self, lines: list[str], selected=0) -> None:
+        """Shows the given lines next to the caret (or the mouse cursor), with the `selected` one highlighted."""
+        
+        with self.lock:
+            self.lines = list(lines)
+            self.selected = selected
+        
+        user32.PostMessageW(self.hwnd, WM_SHOWSUGGESTIONS, 0, 0)
+    
+    def hide(self) -> None:
+        """Hides the window."""
+        
+        user32.PostMessageW(self.hwnd, WM_HIDESUGGESTIONS, 0, 0)
+    
+    def getAnchor(self) -> tuple[int, int]:
+        """Returns the screen position below the caret of the focused window, or below the mouse cursor if the caret is unknown."""
+        
+        info = GUITHREADINFO(cbSize=ctypes.sizeof(GUITHREADINFO))
+        point = wintypes.POINT()
+        
+        if user32.GetGUIThreadInfo(0, ctypes.byref(info)) and info.hwndCaret:
+            point.x, point.y = info.rcCaret.left, info.rcCaret.bottom + 2
+            user32.ClientToScreen(info.hwndCaret, ctypes.byref(point))
+            
+            return point.x, point.y
+        
+        user32.GetCursorPos(ctypes.byref(point))
+        
+        return point.x + 16, point.y + 20
+    
+    def measure(self, lines: list[str]) -> tuple[int, int]:
+        """Returns the width of the widest line and the height of a line, in pixels."""
+        
+        hdc = user32.GetDC(self.hwnd)
+        previousFont = gdi32.SelectObject(hdc, gdi32.GetStockObject(win32con.DEFAULT_GUI_FONT))
+        width = height = 0
+        
+        for line in lines:
+            rect = wintypes.RECT()
+            user32.DrawTextW(hdc, line, -1, ctypes.byref(rect), win32con.DT_CALCRECT | win32con.DT_SINGLELINE | win32con.DT_NOPREFIX)
+            width = max(width, rect.right - rect.left)
+            height = max(height, rect.bottom - rect.top)
+        
+        gdi32.SelectObject(hdc, previousFont)
+        user32.ReleaseDC(self.hwnd, hdc)
+        
+        return width, height
+    
+    def paint(self, hwnd) -> None:
+        """Draws the lines, and highlights the selected one."""
+        
+        ps = PAINTSTRUCT()
+        hdc = user32.BeginPaint(hwnd, ctypes.byref(ps))
+        previousFont = gdi32.SelectObject(hdc, gdi32.GetStockObject(win32con.DEFAULT_GUI_FONT))
+        gdi32.SetBkMode(hdc, win32con.TRANSPARENT)
+        
+        with self.lock:
+            lines, selected = self.lines, self.selected
+        
+        user32.FillRect(hdc, ctypes.byref(ps.rcPaint), user32.GetSysColorBrush(win32con.COLOR_WINDOW))
+        
+        for index, line in enumerate(lines):
+            top = PADDING + index * self.lineHeight
+            rect = wintypes.RECT(0, top, ps.rcPaint.right, top + self.lineHeight)
+            
+            if index == selected:
+                user32.FillRect(hdc, ctypes.byref(rect), user32.GetSysColorBrush(win32con.COLOR_HIGHLIGHT))
+                gdi32.SetTextColor(hdc, user32.GetSysColor(win32con.COLOR_HIGHLIGHTTEXT))
+            
+            else:
+                gdi32.SetTextColor(hdc, user32.GetSysColor(win32con.COLOR_WINDOWTEXT))
+            
+            rect.left = PADDING
+            user32.DrawTextW(hdc, line, -1, ctypes.byref(rect), win32con.DT_SINGLELINE | win32con.DT_VCENTER | win32con.DT_NOPREFIX)
+        
+        gdi32.SelectObject(hdc, previousFont)
+        user32.EndPaint(hwnd, ctypes.byref(ps))
+    
+    def WndProc(self, hwnd, message, wParam, lParam):
+        if message == WM_SHOWSUGGESTIONS:
+            with self.lock:
+                lines = self.lines
+            
+            width, self.lineHeight = self.measure(lines)
+            self.lineHeight = max(self.lineHeight, 1) + 2
+            x, y = self.getAnchor()
+            
+            user32.SetWindowPos(hwnd, win32con.HWND_TOPMOST, x, y, width + 2 * PADDING + 2, len(lines) * self.lineHeight + 2 * PADDING + 2,
+                                win32con.SWP_NOACTIVATE | win32con.SWP_SHOWWINDOW)
+            user32.InvalidateRect(hwnd, None, True)
+            
+            return 0
+        
+        elif message == WM_HIDESUGGESTIONS:
+            user32.ShowWindow(hwnd, win32con.SW_HIDE)
+            
+            return 0
+        
+        elif message == win32con.WM_MOUSEACTIVATE:
+            # Clicking the window must not take the focus from the window being typed in.
+            return win32con.MA_NOACTIVATE
+        
+        elif message == win32con.WM_PAINT:
+            self.paint(hwnd)
+            
+            return 0
+        
+        elif message == win32con.WM_DESTROY:
+            user32.PostQuitMessage(0)
+            
+            return 0
+        
+        return user32.DefWindowProcW(hwnd, message, wParam, lParam)
+    
+    def run(self) -> None:
+        """Creates the window, and runs its message loop."""
+        
+        try:
+            wndclass = WNDCLASSW()
+            wndclass.style = win32con.CS_HREDRAW | win32con.CS_VREDRAW | CS_DROPSHADOW
+            wndclass.lpfnWndProc = self.wndProc
+            wndclass.cbClsExtra = wndclass.cbWndExtra = 0
+            wndclass.hInstance = kernel32.GetModuleHandleW(None)
+            wndclass.hIcon = None
+            wndclass.hCursor = user32.LoadCursorW(None, IDC_ARROW)
+            wndclass.hbrBackground = None
+            wndclass.lpszMenuName = None
+            wndclass.lpszClassName = self.classname
+            
+            try:
+                user32.RegisterClassW(ctypes.byref(wndclass))
+            except OSError:
+                pass # The class is already registered.
+            
+            self.hwnd = user32.CreateWindowExW(
+                win32con.WS_EX_TOPMOST | win32con.WS_EX_TOOLWINDOW | win32con.WS_EX_NOACTIVATE,
+                self.classname,
+                "Suggestions",
+                win32con.WS_POPUP | win32con.WS_BORDER,
+                0, 0, 1, 1,
+                None,
+                None,
+                wndclass.hInstance,
+                None
+            )
+        
+        finally:
+            self.ready.set()
+        
+        msg = wintypes.MSG()
+        
+        while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) != 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
@@ -0,0 +1,43 @@
+cdef enum RecordKinds:
+    KEYBOARD_RECORD = 1
+    MOUSE_RECORD    = 2
+
+
+ctypedef packed struct JournalRecord:
+    unsigned char kind, keyState
+    unsigned short reserved
+    unsigned int wParam, time, flags
+    int value1, value2
+    unsigned int mouseData, reserved2
+
+
+cdef class EventJournalWriter:
+    cdef str filePath
+    cdef long long recordedEvents
+    cdef object file
+    cdef JournalRecord record
+    
+    cdef inline void write(self)
+    
+    cdef void recordKeyboard(self, unsigned int wParam, int vkCode, int scanCode, unsigned int flags, unsigned int time, int keyState)
+    
+    cdef void recordMouse(self, unsigned int wParam, int x, int y, unsigned int mouseData, unsigned int flags, unsigned int time)
+    
+    cpdef void flush(self)
+    
+    cpdef void close(self)
+
+
+cdef class EventJournalReader:
+    cdef str filePath
+    cdef long long count
+    cdef object file, map
+    cdef const unsigned char[:] view
+    
+    cdef inline const JournalRecord * recordPointer(self, long long index)
+    
+    cpdef tuple recordAt(self, long long index)
+    
+    cpdef long long replay(self, kbHook=*, msHook=*, double speed=*, long long start=*, long long stop=*)
+    
+    cpdef void close(self)
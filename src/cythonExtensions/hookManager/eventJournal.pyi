@@ -0,0 +1,110 @@
+"""
+This module records the raw keyboard and mouse hook input into an append-only binary journal, and replays it into the hook managers.
+
+A journal starts with a 16-byte header (`JOURNAL_MAGIC`, the format version, and the record size), followed by
+fixed-size 32-byte little-endian records. Journals are read through `mmap`, so a journal of any length
+can be replayed without loading it into memory or creating a Python object per record.
+
+Warning: a journal contains every recorded keystroke, including typed passwords.
+"""
+
+from typing import Any
+
+
+JOURNAL_MAGIC: bytes
+"""The first 8 bytes of every journal file."""
+
+JOURNAL_VERSION: int
+"""The version of the journal format."""
+
+
+class EventJournalWriter:
+    """
+    Description:
+        Appends the raw hook events to a journal file. The writes are buffered, so recording an event costs a memory copy in most cases.
+        
+        Assign it to the `journal` attribute of `KeyboardHookManager`/`MouseHookManager` to start recording.
+    ---
+    Parameters:
+        `filePath -> str`: The journal file. A new one is created if it does not exist, otherwise the records are appended to it.
+        
+        `bufferSize -> int`: The size of the write buffer in bytes.
+    """
+    
+    filePath: str
+    recordedEvents: int
+    
+    def __init__(self, filePath: str, bufferSize=65536):
+        ...
+    
+    def flush(self) -> None:
+        """Writes the buffered records to the file."""
+        ...
+    
+    def close(self) -> None:
+        """Flushes and closes the journal file. Later events are ignored."""
+        ...
+
+
+def validateHeader(header: bytes, filePath: str) -> None:
+    """Raises a `ValueError` if the given bytes are not a valid journal header."""
+    ...
+
+
+class EventJournalReader:
+    """
+    Description:
+        Reads a journal through a read-only memory map. Records are decoded on access, one at a time.
+    ---
+    Parameters:
+        `filePath -> str`: The journal file.
+    """
+    
+    filePath: str
+    count: int
+    
+    def __init__(self, filePath: str):
+        ...
+    
+    def __len__(self) -> int:
+        ...
+    
+    def recordAt(self, index: int) -> tuple:
+        """
+        Description:
+            Decodes the record at the given index.
+        ---
+        Returns:
+            - `("keyboard", wParam, vkCode, scanCode, flags, time, keyState)` for keyboard records.
+            - `("mouse", wParam, x, y, mouseData, flags, time)` for mouse records.
+        """
+        ...
+    
+    def replay(self, kbHook: Any=None, msHook: Any=None, speed=0.0, start=0, stop=-1) -> int:
+        """
+        Description:
+            Feeds the records to `kbHook.processKeyboardEvent` and `msHook.processMouseEvent`, exactly as the hook callbacks would,
+            but without installing any hook. The recorded shift and lock key states are used instead of the live ones.
+        ---
+        Parameters:
+            `kbHook -> KeyboardHookManager | None`: Receives the keyboard records. They are skipped if `None`.
+            
+            `msHook -> MouseHookManager | None`: Receives the mouse records. They are skipped if `None`.
+            
+            `speed -> float`: `0` replays as fast as possible, `1` keeps the recorded timing, `2` is twice as fast, and so on.
+            
+            `start, stop -> int`: The range of the records to replay. A negative `stop` means the end of the journal.
+        ---
+        Returns:
+            `int`: The number of replayed records.
+        """
+        ...
+    
+    def close(self) -> None:
+        """Releases the memory map and closes the journal file."""
+        ...
+
+
+def replayJournal(filePath: str, kbHook: Any=None, msHook: Any=None, speed=0.0) -> int:
+    """Replays the journal at the given path into the given hook managers. See `EventJournalReader.replay`."""
+    ...
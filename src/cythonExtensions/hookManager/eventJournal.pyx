@@ -0,0 +1,269 @@
+# cython: language_level = 3str
+
+"""
+This extension module records the raw keyboard and mouse hook input into an append-only binary journal, and replays it into the hook managers.
+
+A journal starts with a 16-byte header (`JOURNAL_MAGIC`, the format version, and the record size), followed by
+fixed-size 32-byte little-endian records (`JournalRecord`). Journals are read through `mmap`, so a journal of any length
+can be replayed without loading it into memory or creating a Python object per record.
+
+Warning: a journal contains every recorded keystroke, including typed passwords.
+"""
+
+from cpython.bytes cimport PyBytes_FromStringAndSize
+
+import os, mmap, struct
+from time import perf_counter, sleep
+
+
+JOURNAL_MAGIC = b"MACROPYJ"
+"""The first 8 bytes of every journal file."""
+
+JOURNAL_VERSION = 1
+"""The version of the journal format."""
+
+cdef enum RecordKinds:
+    KEYBOARD_RECORD = 1
+    MOUSE_RECORD    = 2
+
+
+# `value1` and `value2` hold the `vkCode` and `scanCode` of the keyboard events, and the `x` and `y` of the mouse events.
+ctypedef packed struct JournalRecord:
+    unsigned char kind, keyState
+    unsigned short reserved
+    unsigned int wParam, time, flags
+    int value1, value2
+    unsigned int mouseData, reserved2
+
+
+cdef int HEADER_SIZE = 16
+cdef int RECORD_SIZE = sizeof(JournalRecord)
+
+
+cdef class EventJournalWriter:
+    """
+    Description:
+        Appends the raw hook events to a journal file. The writes are buffered, so recording an event costs a memory copy in most cases.
+        
+        Assign it to the `journal` attribute of `KeyboardHookManager`/`MouseHookManager` to start recording.
+    ---
+    Parameters:
+        `filePath -> str`: The journal file. A new one is created if it does not exist, otherwise the records are appended to it.
+        
+        `bufferSize -> int`: The size of the write buffer in bytes.
+    """
+    
+    cdef public str filePath
+    cdef public long long recordedEvents
+    cdef object file
+    cdef JournalRecord record
+    
+    def __init__(self, str filePath, int bufferSize=65536):
+        self.filePath = filePath
+        self.recordedEvents = 0
+        
+        if os.path.exists(filePath) and os.path.getsize(filePath):
+            with open(filePath, "rb") as journalFile:
+                validateHeader(journalFile.read(HEADER_SIZE), filePath)
+            
+            self.file = open(filePath, "ab", buffering=bufferSize)
+        
+        else:
+            self.file = open(filePath, "wb", buffering=bufferSize)
+            self.file.write(JOURNAL_MAGIC + struct.pack("<II", JOURNAL_VERSION, RECORD_SIZE))
+    
+    cdef inline void write(self):
+        self.file.write(PyBytes_FromStringAndSize(<char *> &self.record, RECORD_SIZE))
+        self.recordedEvents += 1
+    
+    cdef void recordKeyboard(self, unsigned int wParam, int vkCode, int scanCode, unsigned int flags, unsigned int time, int keyState):
+        """Records a keyboard event. `keyState` holds the shift (bit 0) and the caps/scroll/num lock (bits 1-3) states."""
+        
+        if self.file is None:
+            return
+        
+        self.record.kind      = KEYBOARD_RECORD
+        self.record.keyState  = keyState
+        self.record.wParam    = wParam
+        self.record.time      = time
+        self.record.flags     = flags
+        self.record.value1    = vkCode
+        self.record.value2    = scanCode
+        self.record.mouseData = 0
+        
+        self.write()
+    
+    cdef void recordMouse(self, unsigned int wParam, int x, int y, unsigned int mouseData, unsigned int flags, unsigned int time):
+        """Records a mouse event."""
+        
+        if self.file is None:
+            return
+        
+        self.record.kind      = MOUSE_RECORD
+        self.record.keyState  = 0
+        self.record.wParam    = wParam
+        self.record.time      = time
+        self.record.flags     = flags
+        self.record.value1    = x
+        self.record.value2    = y
+        self.record.mouseData = mouseData
+        
+        self.write()
+    
+    cpdef void flush(self):
+        """Writes the buffered records to the file."""
+        
+        if self.file is not None:
+            self.file.flush()
+    
+    cpdef void close(self):
+        """Flushes and closes the journal file. Later events are ignored."""
+        
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def validateHeader(header: bytes, filePath: str) -> None:
+    """Raises a `ValueError` if the given bytes are not a valid journal header."""
+    
+    if len(header) < HEADER_SIZE or header[:8] != JOURNAL_MAGIC:
+        raise ValueError(f"'{filePath}' is not an event journal.")
+    
+    version, recordSize = struct.unpack("<II", header[8:HEADER_SIZE])
+    
+    if version != JOURNAL_VERSION or recordSize != RECORD_SIZE:
+        raise ValueError(f"'{filePath}' uses an unsupported journal format (version {version}, record size {recordSize}).")
+
+
+cdef class EventJournalReader:
+    """
+    Description:
+        Reads a journal through a read-only memory map. Records are decoded on access, one at a time.
+    ---
+    Parameters:
+        `filePath -> str`: The journal file.
+    """
+    
+    cdef public str filePath
+    cdef public long long count
+    cdef object file, map
+    cdef const unsigned char[:] view
+    
+    def __init__(self, str filePath):
+        self.filePath = filePath
+        self.file = open(filePath, "rb")
+        validateHeader(self.file.read(HEADER_SIZE), filePath)
+        
+        # A partially written last record (e.g., after a crash) is ignored.
+        self.count = (os.path.getsize(filePath) - HEADER_SIZE) // RECORD_SIZE
+        
+        if self.count:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.view = self.map
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    cdef inline const JournalRecord * recordPointer(self, long long index):
+        return <const JournalRecord *> &self.view[HEADER_SIZE + index * RECORD_SIZE]
+    
+    cpdef tuple recordAt(self, long long index):
+        """
+        Description:
+            Decodes the record at the given index.
+        ---
+        Returns:
+            - `("keyboard", wParam, vkCode, scanCode, flags, time, keyState)` for keyboard records.
+            - `("mouse", wParam, x, y, mouseData, flags, time)` for mouse records.
+        """
+        
+        if not 0 <= index < self.count:
+            raise IndexError("Journal record index out of range.")
+        
+        cdef const JournalRecord * record = self.recordPointer(index)
+        
+        if record.kind == KEYBOARD_RECORD:
+            return ("keyboard", record.wParam, record.value1, record.value2, record.flags, record.time, record.keyState)
+        
+        return ("mouse", record.wParam, record.value1, record.value2, record.mouseData, record.flags, record.time)
+    
+    cpdef long long replay(self, kbHook=None, msHook=None, double speed=0.0, long long start=0, long long stop=-1):
+        """
+        Description:
+            Feeds the records to `kbHook.processKeyboardEvent` and `msHook.processMouseEvent`, exactly as the hook callbacks would,
+            but without installing any hook. The recorded shift and lock key states are used instead of the live ones.
+        ---
+        Parameters:
+            `kbHook -> KeyboardHookManager | None`: Receives the keyboard records. They are skipped if `None`.
+            
+            `msHook -> MouseHookManager | None`: Receives the mouse records. They are skipped if `None`.
+            
+            `speed -> float`: `0` replays as fast as possible, `1` keeps the recorded timing, `2` is twice as fast, and so on.
+            
+            `start, stop -> int`: The range of the records to replay. A negative `stop` means the end of the journal.
+        ---
+        Returns:
+            `int`: The number of replayed records.
+        """
+        
+        cdef const JournalRecord * record
+        cdef long long index, replayed = 0
+        cdef unsigned int firstTime = 0
+        cdef double startedAt = perf_counter(), delay
+        
+        if stop < 0 or stop > self.count:
+            stop = self.count
+        
+        # Looking the methods up once instead of for every record.
+        processKeyboardEvent = kbHook.processKeyboardEvent if kbHook is not None else None
+        processMouseEvent = msHook.processMouseEvent if msHook is not None else None
+        
+        for index in range(start, stop):
+            record = self.recordPointer(index)
+            
+            if speed > 0:
+                if index == start:
+                    firstTime = record.time
+                
+                # The signed difference handles the wrap around of the tick count, and the slightly out of order
+                # timestamps of the keyboard and mouse events (recorded by different threads).
+                delay = <int> (record.time - firstTime) / 1000.0 / speed - (perf_counter() - startedAt)
+                if delay > 0:
+                    sleep(delay)
+            
+            if record.kind == KEYBOARD_RECORD:
+                if processKeyboardEvent is not None:
+                    processKeyboardEvent(record.wParam, record.value1, record.value2, record.flags, record.time, perf_counter(), record.keyState)
+                    replayed += 1
+            
+            elif processMouseEvent is not None:
+                processMouseEvent(record.wParam, record.value1, record.value2, record.mouseData, record.flags, record.time, perf_counter())
+                replayed += 1
+        
+        return replayed
+    
+    cpdef void close(self):
+        """Releases the memory map and closes the journal file."""
+        
+        self.view = None
+        
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def replayJournal(filePath: str, kbHook=None, msHook=None, speed=0.0) -> int:
+    """Replays the journal at the given path into the given hook managers. See `EventJournalReader.replay`."""
+    
+    reader = EventJournalReader(filePath)
+    
+    try:
+        return reader.replay(kbHook, msHook, speed)
+    
+    finally:
+        reader.close()
@@ -1,3 +1,8 @@
+from cythonExtensions.metricsHelper.metricsHelper cimport LatencyHistogram
+from cythonExtensions.hookManager.eventJournal cimport EventJournalWriter
+from cythonExtensions.hookManager.macroRecorder cimport MacroRecorder
+
+
 # https://learn.microsoft.com/en-us/windows/win32/winmsg/about-hooks
 cdef enum HookTypes:
     # Constants that represent different types of Windows hooks that can be set using the SetWindowsHookEx function.
@@ -40,7 +45,29 @@ cdef enum KbMsgIds:
     WM_KEYLAST     = 0x0108   # Defines the maximum value for the range of keyboard-related messages.
 
 
-cdef tuple getKeyAsciiAndName(int vkey_code, bint shiftPressed=*)
+cdef str fallbackKeyName(int vkey_code)
+
+
+cdef class KeyTranslator:
+    cdef int asciiTable[1024]
+    cdef list nameTable
+    cdef object layout
+    cdef bint followLayout
+    cdef double layoutCheckInterval
+    cdef long long rebuilds
+    cdef double lastLayoutCheck
+    
+    cpdef void loadTables(self, list asciiValues, list names, layout=*)
+    
+    cpdef void buildFromLayout(self, layout)
+    
+    cdef void refreshLayout(self)
+    
+    cdef inline int tableIndex(self, int vkey_code, bint shiftPressed, bint capsOn)
+    
+    cdef int lookup(self, int vkey_code, bint shiftPressed, bint capsOn)
+    
+    cpdef tuple translate(self, int vkey_code, bint shiftPressed, bint capsOn)
 
 
 cdef class HookManager:
@@ -54,11 +81,64 @@ cdef class HookManager:
     cdef bint uninstallHook(self, int hookType=*)
 
 
+cdef class ListenerDispatcher:
+    cdef str name
+    cdef int workerCount, maxQueueSize, maxQueueDepth
+    cdef long long dispatchedEvents, droppedEvents, deliveredEvents
+    cdef double totalLatency, maxLatency
+    cdef list queues, workers
+    cdef dict listenerLanes, listenerTimes
+    cdef int nextLane
+    cdef bint running
+    cdef LatencyHistogram queueWaits, completionTimes
+    
+    cpdef void start(self)
+    
+    cpdef void stop(self)
+    
+    cpdef int pinListener(self, listener, int lane)
+    
+    cdef int laneOf(self, listener)
+    
+    cpdef bint dispatch(self, list listeners, event)
+    
+    cdef LatencyHistogram listenerHistogram(self, listener)
+    
+    cpdef int queueDepth(self)
+    
+    cpdef dict getStats(self)
+    
+    cpdef void resetStats(self)
+
+
+cdef class SuppressionFilter:
+    cdef str name
+    cdef object callback
+    cdef double timeBudget
+    cdef long long decisions, suppressedEvents, budgetOverruns, failedDecisions
+    cdef double maxDecisionTime
+    cdef LatencyHistogram decisionTimes
+    
+    cpdef bint decide(self, event)
+    
+    cpdef dict getStats(self)
+    
+    cpdef void resetStats(self)
+
+
 cdef class KeyboardHookManager:
     cdef list keyDownListeners, keyUpListeners
     cdef int hookId
+    cdef ListenerDispatcher dispatcher
+    cdef SuppressionFilter keyDownFilter
+    cdef KeyTranslator translator
+    cdef LatencyHistogram osToHookTimes, hookTimes
+    cdef EventJournalWriter journal
+    cdef MacroRecorder recorder
     
     cdef bint keyboardCallback(self, int nCode, int wParam, void * lParam)
+    
+    cpdef bint processKeyboardEvent(self, int wParam, int vkey_code, int scancode, int flags, unsigned int eventTime, double hookTime, int keyState=*)
 
 
 # Docs: https://learn.microsoft.com/en-us/windows/win32/inputdev/about-mouse-input
@@ -97,11 +177,43 @@ cdef enum RawMouse:
     MOUSE_MOVE_NOCOALESCE    = 0x08 # Mouse movement event was not coalesced. Mouse movement events can be coalesced by default. This value is not supported for `Windows XP`/`2000`.
 
 
+ctypedef struct MouseHookData:
+    int x
+    int y
+    unsigned int mouseData
+    unsigned int flags
+    unsigned int time
+    size_t dwExtraInfo
+
+
+cdef class MoveRingBuffer:
+    cdef int xs[64]
+    cdef int ys[64]
+    cdef unsigned int times[64]
+    cdef long long writeIndex, readIndex, coalescedMoves
+    
+    cdef inline void push(self, int x, int y, unsigned int time)
+    
+    cpdef int pending(self)
+    
+    cpdef list drain(self)
+    
+    cpdef tuple latest(self)
+
+
 cdef class MouseHookManager:
     """A class for managing mouse hooks and their event listeners."""
     
     cdef list mouseButtonDownListeners, mouseButtonUpListeners
     cdef int hookId
+    cdef ListenerDispatcher dispatcher
+    cdef SuppressionFilter buttonDownFilter
+    cdef MoveRingBuffer moveBuffer
+    cdef LatencyHistogram osToHookTimes, hookTimes
+    cdef EventJournalWriter journal
+    cdef MacroRecorder recorder
+    
     
+    cdef bint mouseCallback(self, int nCode, int wParam, void * lParam)
     
-    cdef bint mouseCallback(self, int nCode, int wParam, void * lParam)
\ No newline at end of file
+    cpdef bint processMouseEvent(self, int wParam, int x, int y, unsigned int mouseData, int flags, unsigned int eventTime, double hookTime)
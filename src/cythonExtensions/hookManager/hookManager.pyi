@@ -1,10 +1,12 @@
 """This module contains functions and classes for managing Windows hooks."""
 
 import ctypes
-import ctypes.wintypes
 from typing import Callable, Any
 from enum import IntEnum
 from cythonExtensions.commonUtils.commonUtils import KeyboardEvent, MouseEvent
+from cythonExtensions.metricsHelper.metricsHelper import LatencyHistogram
+from cythonExtensions.hookManager.eventJournal import EventJournalWriter
+from cythonExtensions.hookManager.macroRecorder import MacroRecorder
 
 
 # https://learn.microsoft.com/en-us/windows/win32/winmsg/about-hooks
@@ -151,28 +153,80 @@ numPadCodeToName = {
 }
 """Mapping of number pad key codes to their names."""
 
-kbMsgIdToName = {
-    KbMsgIds.WM_KEYDOWN    : "key down",      KbMsgIds.WM_KEYUP       : "key up",
-    KbMsgIds.WM_CHAR       : "key char",      KbMsgIds.WM_DEADCHAR    : "key dead char",
-    KbMsgIds.WM_SYSKEYDOWN : "key sys down",  KbMsgIds.WM_SYSKEYUP    : "key sys up",
-    KbMsgIds.WM_SYSCHAR    : "key sys char",  KbMsgIds.WM_SYSDEADCHAR : "key sys dead char"}
-"""Maps the Windows Message Ids for keyboard events to their respective names."""
+usControlKeyAscii = {0x08: 8, 0x09: 9, 0x0D: 13, 0x1B: 27, 0x20: 32}
+"""The ascii values of the function or utility keys that produce a character (Backspace, Tab, Enter, Esc, and Space)."""
 
-def getKeyAsciiAndName(vkey_code: int, shiftPressed=False) -> tuple[int, str]:
+def fallbackKeyName(vkey_code: int) -> str:
+    """Returns the name of a function or utility key (e.g., `VK_RETURN` -> `Return`)."""
+    ...
+
+def buildUSTables() -> tuple[list[int], list[str]]:
     """
     Description:
-        Returns the ascii value and key name for the given key code.
+        Builds the key translation tables of the US keyboard layout from the mappings defined in this module.
+        Used when the tables cannot be filled from the system, and for feeding `KeyTranslator.loadTables` without Win32.
     ---
-    Parameters:
-        `vkey_code -> int`: A virtual key code.
-        
-        `scancode -> int`: The key scancode.
+    Returns:
+        `tuple[list[int], list[str]]`: The ascii values and key names, indexed by `(shift | caps << 1) << 8 | vkey_code`.
+    """
+    ...
+
+
+class KeyTranslator:
+    """
+    Description:
+        Translates virtual key codes to their ascii values and names using precomputed tables, making each translation a single indexed load.
         
-        `shiftPressed -> bool`: Whether or not the shift key is pressed.
+        - The tables hold 256 entries for each (shift, caps lock) combination and are filled from `ToUnicodeEx` for the keyboard layout of the
+        foreground window, so non-US layouts produce the correct characters.
+        - The layout is checked at most once every `layoutCheckInterval` seconds, and the tables are only rebuilt when it changes.
+        - Tables can be injected with `loadTables`, which also stops following the system layout (useful for tests and benchmarks).
+    ---
+    Parameters:
+        `layoutCheckInterval -> float`: The minimum number of seconds between two checks of the active keyboard layout.
+    """
+    
+    layout: int | None
+    followLayout: bool
+    layoutCheckInterval: float
+    rebuilds: int
+    
+    def __init__(self, layoutCheckInterval=0.5):
+        ...
+    
+    def loadTables(self, asciiValues: list[int], names: list[str], layout: int | None=None) -> None:
+        """Loads the given tables (indexed by `(shift | caps << 1) << 8 | vkey_code`) and stops following the system keyboard layout."""
+        ...
     
+    def buildFromLayout(self, layout: int) -> None:
+        """Fills the tables from `ToUnicodeEx` for the given keyboard layout handle. Falls back to the US tables if that fails."""
+        ...
+    
+    def translate(self, vkey_code: int, shiftPressed: bool, capsOn: bool) -> tuple[int, str]:
+        """
+        Description:
+            Returns the ascii value and key name for the given key code.
+        ---
+        Parameters:
+            `vkey_code -> int`: A virtual key code.
+            
+            `shiftPressed -> bool`: Whether or not the shift key is pressed.
+            
+            `capsOn -> bool`: Whether or not caps lock is toggled on.
+        ---
+        Returns:
+            `tuple[int, str]`: The ascii and name of the virtual key.
+        """
+        ...
+
+
+def readLayoutTables(layout: int) -> tuple[list[int], list[str]]:
+    """
+    Description:
+        Builds the key translation tables of the given keyboard layout handle using `ToUnicodeEx`.
     ---
     Returns:
-        `tuple[int, str]`: The ascii and name of the virtual key.
+        `tuple[list[int], list[str]]`: The ascii values and key names, indexed by `(shift | caps << 1) << 8 | vkey_code`.
     """
     ...
 
@@ -182,10 +236,10 @@ class KBDLLHOOKSTRUCT(ctypes.Structure):
     """A structure that contains information about a low-level keyboard input event."""
     
     _fields_ = [
-        ("vkCode", ctypes.c_ulong),
-        ("scanCode", ctypes.c_ulong),
-        ("flags", ctypes.c_ulong),
-        ("time", ctypes.c_ulong),
+        ("vkCode", ctypes.c_uint32),
+        ("scanCode", ctypes.c_uint32),
+        ("flags", ctypes.c_uint32),
+        ("time", ctypes.c_uint32),
         ("dwExtraInfo", ctypes.POINTER(ctypes.c_ulong))
     ]
 
@@ -220,12 +274,164 @@ class HookManager:
         """
 
 
+class ListenerDispatcher:
+    """
+    Description:
+        Delivers hook events to their listeners using a fixed set of long-lived worker threads.
+        
+        - Each listener is pinned to a single worker (lane) so that it receives the events in the same order they were dispatched.
+        - Each lane has a bounded queue. If a queue is full, the event is dropped for the listeners of that lane only, instead of blocking the hook thread.
+        - The worker threads are started lazily on the first dispatched event.
+    ---
+    Parameters:
+        `name -> str`: A name used for the worker threads and when reporting the statistics.
+        
+        `workerCount -> int`: The number of worker threads (lanes).
+        
+        `maxQueueSize -> int`: The maximum number of pending events for each lane.
+    """
+    
+    name: str
+    workerCount: int
+    maxQueueSize: int
+    maxQueueDepth: int
+    dispatchedEvents: int
+    droppedEvents: int
+    deliveredEvents: int
+    totalLatency: float
+    maxLatency: float
+    queueWaits: LatencyHistogram
+    completionTimes: LatencyHistogram
+    
+    def __init__(self, name: str, workerCount=2, maxQueueSize=256):
+        ...
+    
+    def start(self) -> None:
+        """Starts the worker threads if they are not already running."""
+        ...
+    
+    def stop(self) -> None:
+        """Signals the worker threads to exit after processing the pending events."""
+        ...
+    
+    def pinListener(self, listener: Callable[[Any], Any], lane: int) -> int:
+        """Pins the given listener to the specified lane. Listeners pinned to the same lane are called in the order of the dispatched events."""
+        ...
+    
+    def dispatch(self, listeners: list[Callable[[Any], Any]], event: Any) -> bool:
+        """
+        Description:
+            Queues the given event for each of the specified listeners. Never blocks.
+        ---
+        Returns:
+            `bool`: `True` if the event was queued for all the listeners, `False` if it was dropped for the listeners of a full lane.
+        """
+        ...
+    
+    def workerLoop(self, lane: int) -> None:
+        """The main loop of a worker thread. Calls the listeners of the events queued in the specified lane."""
+        ...
+    
+    def queueDepth(self) -> int:
+        """Returns the total number of events waiting in the lane queues."""
+        ...
+    
+    def getStats(self) -> dict[str, int | float]:
+        """Returns a snapshot of the dispatcher statistics. Latencies are the time between queuing an event and calling its listener."""
+        ...
+    
+    def resetStats(self) -> None:
+        """Resets the collected statistics."""
+        ...
+
+
+def getDispatchersStats() -> dict[str, dict]:
+    """Returns the statistics of all the created dispatchers keyed by their names."""
+    ...
+
+
+class SuppressionFilter:
+    """
+    Description:
+        Decides synchronously (in the hook thread) whether an event should be suppressed or passed to the other applications.
+        
+        - The decision is made by calling `callback(event) -> bool`, which must only do cheap lookups; the actual actions are left to the listeners.
+        - If the decision takes longer than `timeBudgetMs`, or if the callback raises an exception, the event is passed through and the overrun is counted.
+        This keeps the hook well below the system `LowLevelHooksTimeout`, after which Windows silently removes the hook.
+    ---
+    Parameters:
+        `name -> str`: A name used when reporting the statistics.
+        
+        `callback -> Callable[[BaseEvent], bool] | None`: The function that makes the decision. If `None`, all events are passed through.
+        
+        `timeBudgetMs -> float`: The maximum time in milliseconds a decision is allowed to take.
+    """
+    
+    name: str
+    callback: Callable[[Any], bool] | None
+    timeBudget: float
+    decisions: int
+    suppressedEvents: int
+    budgetOverruns: int
+    failedDecisions: int
+    maxDecisionTime: float
+    decisionTimes: LatencyHistogram
+    
+    def __init__(self, name: str, callback: Callable[[Any], bool] | None=None, timeBudgetMs=20.0):
+        ...
+    
+    def decide(self, event: Any) -> bool:
+        """Returns whether the given event should be suppressed. Falls back to `False` (pass-through) when the time budget is exceeded."""
+        ...
+    
+    def getStats(self) -> dict[str, int | float]:
+        """Returns a snapshot of the filter statistics."""
+        ...
+    
+    def resetStats(self) -> None:
+        """Resets the collected statistics."""
+        ...
+
+
+def getFiltersStats() -> dict[str, dict]:
+    """Returns the statistics of all the created suppression filters keyed by their names."""
+    ...
+
+
+def syncKeyboardState() -> None:
+    """Reads the states of the modifier and lock keys from the system. The `FN` key is kept as is, as the system does not track it."""
+    ...
+
+
+def markKeyboardStateStale() -> None:
+    """Makes the next keyboard event read the states of the modifier and lock keys from the system, e.g., after they were changed while the hook was not running."""
+    ...
+
+
+def getModifiers(sides=False) -> int:
+    """Returns the pressed modifiers as `ControllerHouse` bits. The left/right bits (e.g., `LCTRL`) are included only if `sides` is `True`."""
+    ...
+
+
+def getLocks() -> int:
+    """Returns the lock keys that are on as `ControllerHouse.CAPITAL_MASK | SCROLL_MASK | NUMLOCK_MASK` bits."""
+    ...
+
+
 class KeyboardHookManager:
     """A class for managing keyboard hooks and their event listeners."""
     
-    __slots__ = ("keyDownListeners", "keyUpListeners", "hookId")
+    __slots__ = ("keyDownListeners", "keyUpListeners", "hookId", "dispatcher", "keyDownFilter", "translator", "osToHookTimes", "hookTimes", "journal", "recorder")
     
-    def __init__(self):
+    dispatcher: ListenerDispatcher
+    keyDownFilter: SuppressionFilter
+    translator: KeyTranslator
+    osToHookTimes: LatencyHistogram
+    hookTimes: LatencyHistogram
+    journal: EventJournalWriter | None
+    recorder: MacroRecorder | None
+    
+    def __init__(self, workerCount=2, maxQueueSize=256, timeBudgetMs=20.0, translator: KeyTranslator | None=None):
         ...
 
     def addKeyDownListener(self, listener: Callable[[KeyboardEvent], bool]) -> None:
@@ -252,6 +458,23 @@ class KeyboardHookManager:
         """
         ...
 
+    def processKeyboardEvent(self, wParam: int, vkey_code: int, scancode: int, flags: int, eventTime: int, hookTime: float, keyState=-1) -> bool:
+        """
+        Description:
+            Updates the keyboard state, decides whether the key is suppressed, and dispatches the event to the listeners.
+            Called by `keyboardCallback` with the fields of the `KBDLLHOOKSTRUCT`, and by the event journal to replay recorded events.
+        ---
+        Parameters:
+            - `wParam`: The identifier of the keyboard message (event id).
+            - `vkey_code`, `scancode`, `flags`, `eventTime`: The `vkCode`, `scanCode`, `flags`, and `time` fields of the `KBDLLHOOKSTRUCT`.
+            - `hookTime`: The `perf_counter` value when the event was received.
+            - `keyState`: The shift (bit 0) and the caps/scroll/num lock (bits 1-3) states. If negative, the tracked keyboard state is used.
+        ---
+        Returns:
+            `bool`: Whether the key should be suppressed.
+        """
+        ...
+
 
 # ======================================================================================================================
 
@@ -315,29 +538,6 @@ class MsMsgIds(IntEnum):
     "Non-client area extended button double-click event."
 
 
-msMsgIdToName = {
-    MsMsgIds.WM_MOUSEMOVE       : "MOVE",
-    MsMsgIds.WM_LBUTTONDOWN     : "LB CLK",
-    MsMsgIds.WM_LBUTTONUP       : "LB UP",
-    MsMsgIds.WM_LBUTTONDBLCLK   : "LB DBL CLK",
-    MsMsgIds.WM_RBUTTONDOWN     : "RB CLK",
-    MsMsgIds.WM_RBUTTONUP       : "RB UP",
-    MsMsgIds.WM_RBUTTONDBLCLK   : "RB DBL CLK",
-    MsMsgIds.WM_MBUTTONDOWN     : "MB CLK",
-    MsMsgIds.WM_MBUTTONUP       : "MB UP",
-    MsMsgIds.WM_MBUTTONDBLCLK   : "MB DBL CLK",
-    MsMsgIds.WM_MOUSEWHEEL      : "WHEEL SCRL",
-    MsMsgIds.WM_XBUTTONDOWN     : "XB CLK",
-    MsMsgIds.WM_XBUTTONUP       : "XB UP",
-    MsMsgIds.WM_XBUTTONDBLCLK   : "XB DBL CLK",
-    MsMsgIds.WM_MOUSEHWHEEL     : "WHEEL H SCRL",
-    MsMsgIds.WM_NCXBUTTONDOWN   : "NC XB CLK",
-    MsMsgIds.WM_NCXBUTTONUP     : "NC XB UP",
-    MsMsgIds.WM_NCXBUTTONDBLCLK : "NC XB DBL CLK",
-}
-"""Maps the Windows Message Ids for mouse events to their respective names."""
-
-
 class RawMouse(IntEnum):
     """Contains information about the state of the mouse."""
     
@@ -361,6 +561,13 @@ buttonMapping: dict[int, str] = {1: "LB", 2: "RB", 3: "MB", 4: "X1", 5: "X2"}
 """Maps the mouse button id to the button name."""
 
 
+class POINT(ctypes.Structure):
+    """The x- and y-coordinates of a point."""
+    
+    x: int
+    y: int
+
+
 # Docs: https://learn.microsoft.com/en-us/windows/win32/api/winuser/ns-winuser-msllhookstruct
 class MSLLHOOKSTRUCT(ctypes.Structure):
     """
@@ -397,18 +604,60 @@ class MSLLHOOKSTRUCT(ctypes.Structure):
     """
     
     _fields_ = [
-        ("pt", ctypes.wintypes.POINT),
-        ("mouseData", ctypes.c_ulong),
-        ("flags", ctypes.c_ulong),
-        ("time", ctypes.c_ulong),
+        ("pt", POINT),
+        ("mouseData", ctypes.c_uint32),
+        ("flags", ctypes.c_uint32),
+        ("time", ctypes.c_uint32),
         ("dwExtraInfo", ctypes.POINTER(ctypes.c_ulong))
     ]
 
 
+class MoveRingBuffer:
+    """
+    Description:
+        A fixed size ring buffer that the mouse hook writes the cursor positions of the `WM_MOUSEMOVE` events into.
+        
+        - Writing a position is a few C assignments, so the hook can record every move event without slowing down the cursor.
+        - A reader (e.g., the hot-zones sampler) periodically drains the unread positions. If the reader falls behind, the oldest
+        positions are overwritten and counted as coalesced instead of growing the buffer.
+        - The buffer is only written and read while holding the GIL, so no additional locking is needed.
+    """
+    
+    writeIndex: int
+    readIndex: int
+    coalescedMoves: int
+    
+    def __init__(self):
+        ...
+    
+    def pending(self) -> int:
+        """Returns the number of positions that have not been drained yet."""
+        ...
+    
+    def drain(self) -> list[tuple[int, int, int]]:
+        """Returns the unread positions as `(x, y, time)` tuples, oldest first, and marks them as read."""
+        ...
+    
+    def latest(self) -> tuple[int, int, int] | None:
+        """Returns the last recorded position as `(x, y, time)`, or `None` if nothing was recorded yet. Does not mark anything as read."""
+        ...
+
+
 class MouseHookManager:
     """A class for managing mouse hooks and their event listeners."""
     
-    __slots__ = ("mouseButtonDownListeners", "mouseButtonUpListeners", "hookId")
+    __slots__ = ("mouseButtonDownListeners", "mouseButtonUpListeners", "hookId", "dispatcher", "buttonDownFilter", "moveBuffer", "osToHookTimes", "hookTimes", "journal", "recorder")
+    
+    dispatcher: ListenerDispatcher
+    buttonDownFilter: SuppressionFilter
+    moveBuffer: MoveRingBuffer | None
+    osToHookTimes: LatencyHistogram
+    hookTimes: LatencyHistogram
+    journal: EventJournalWriter | None
+    recorder: MacroRecorder | None
+    
+    def __init__(self, workerCount=1, maxQueueSize=256, timeBudgetMs=20.0, trackMoves=False):
+        ...
     
     def addButtonDownListener(self, listener: Callable[[MouseEvent], bool]) -> None:
         ...
@@ -433,3 +682,20 @@ class MouseHookManager:
             - `lParam`: A pointer to a `MSLLHOOKSTRUCT` structure.
         """
         ...
+
+    def processMouseEvent(self, wParam: int, x: int, y: int, mouseData: int, flags: int, eventTime: int, hookTime: float) -> bool:
+        """
+        Description:
+            Updates the mouse state, decides whether the input is suppressed, and dispatches the event to the listeners.
+            Called by `mouseCallback` with the fields of the `MSLLHOOKSTRUCT`, and by the event journal to replay recorded events.
+            Mouse move events are only recorded in the move buffer and the macro recorder.
+        ---
+        Parameters:
+            - `wParam`: The identifier of the mouse message (event id).
+            - `x`, `y`, `mouseData`, `flags`, `eventTime`: The `pt`, `mouseData`, `flags`, and `time` fields of the `MSLLHOOKSTRUCT`.
+            - `hookTime`: The `perf_counter` value when the event was received.
+        ---
+        Returns:
+            `bool`: Whether the mouse input should be suppressed.
+        """
+        ...
@@ -5,10 +5,17 @@
 cimport cython
 from cythonExtensions.commonUtils.commonUtils cimport KeyboardEvent, MouseEvent
 from cythonExtensions.hookManager.hookManager cimport HookTypes, KbMsgIds, MsMsgIds, RawMouse
+from cythonExtensions.metricsHelper.metricsHelper cimport LatencyHistogram
+from cythonExtensions.hookManager.eventJournal cimport EventJournalWriter
+from cythonExtensions.hookManager.macroRecorder cimport MacroRecorder
 
-import ctypes, win32gui, win32api, win32con, atexit
-import ctypes.wintypes
+import ctypes, atexit, queue
+from time import perf_counter
+from traceback import format_exc
 from cythonExtensions.commonUtils.commonUtils import KB_Con as kbcon, ControllerHouse as ctrlHouse, MouseHouse as msHouse, PThread
+from cythonExtensions.metricsHelper.metricsHelper import getHistogram
+from cythonExtensions.platformBackend import platformBackend as pfBackend
+from cythonExtensions.platformBackend.platformBackend import win32con
 
 
 cdef dict vKeyNameToId = {
@@ -66,80 +73,230 @@ cdef dict numPadCodeToName = {
 }
 """Mapping of number pad key codes to their names."""
 
-cdef dict kbMsgIdToName = {
-    KbMsgIds.WM_KEYDOWN    : "key down",      KbMsgIds.WM_KEYUP       : "key up",
-    KbMsgIds.WM_CHAR       : "key char",      KbMsgIds.WM_DEADCHAR    : "key dead char",
-    KbMsgIds.WM_SYSKEYDOWN : "key sys down",  KbMsgIds.WM_SYSKEYUP    : "key sys up",
-    KbMsgIds.WM_SYSCHAR    : "key sys char",  KbMsgIds.WM_SYSDEADCHAR : "key sys dead char"
-}
-"""Maps the Windows Message Ids for keyboard events to their respective names."""
+cdef dict usControlKeyAscii = {0x08: 8, 0x09: 9, 0x0D: 13, 0x1B: 27, 0x20: 32}
+"""The ascii values of the function or utility keys that produce a character (Backspace, Tab, Enter, Esc, and Space)."""
+
+
+cdef str fallbackKeyName(int vkey_code):
+    """Returns the name of a function or utility key (e.g., `VK_RETURN` -> `Return`)."""
+    
+    return vKeyCodeToName.get(vkey_code, f"VK_{vkey_code:02X}")[3:].title()
+
 
-@cython.wraparound(False)
-cdef tuple[int, object] getKeyAsciiAndName(int vkey_code, bint shiftPressed=False):
+def buildUSTables() -> tuple[list[int], list[str]]:
     """
     Description:
-        Returns the ascii value and key name for the given key code.
+        Builds the key translation tables of the US keyboard layout from the mappings defined in this module.
+        Used when the tables cannot be filled from the system, and for feeding `KeyTranslator.loadTables` without Win32.
     ---
-    Parameters:
-        `vkey_code -> int`: A virtual key code.
-        
-        `scancode -> int`: The key scancode.
+    Returns:
+        `tuple[list[int], list[str]]`: The ascii values and key names, indexed by `(shift | caps << 1) << 8 | vkey_code`.
+    """
+    
+    asciiValues = [0] * 1024
+    names = [""] * 1024
+    
+    for state in range(4):
+        shiftPressed, capsOn = state & 1, state & 2
         
-        `shiftPressed -> bool`: Whether or not the shift key is pressed.
+        for vkey_code in range(256):
+            # VK_0 : VK_9 have the same code as the ASCII of "0" : "9" (0x30 : 0x39).
+            if 0x30 <= vkey_code <= 0x39:
+                text = numRowCodeToSymbol[vkey_code] if shiftPressed else chr(vkey_code)
+            
+            elif 0x60 <= vkey_code <= 0x6F:
+                asciiValues[state << 8 | vkey_code], names[state << 8 | vkey_code] = vkey_code, numPadCodeToName[vkey_code]
+                continue
+            
+            # VK_A : VK_Z have the same code as the ASCII of "A" : "Z", and the lowercase letters are 32 codes after them.
+            elif 0x41 <= vkey_code <= 0x5A:
+                text = chr(vkey_code) if bool(shiftPressed) != bool(capsOn) else chr(vkey_code + 32)
+            
+            elif vkey_code in oemCodeToCharName:
+                text = oemCodeToCharNameWithShift[vkey_code] if shiftPressed else oemCodeToCharName[vkey_code]
+            
+            # A function or utility key.
+            else:
+                asciiValues[state << 8 | vkey_code], names[state << 8 | vkey_code] = usControlKeyAscii.get(vkey_code, 0), fallbackKeyName(vkey_code)
+                continue
+            
+            asciiValues[state << 8 | vkey_code], names[state << 8 | vkey_code] = ord(text), text
     
+    return asciiValues, names
+
+
+cdef class KeyTranslator:
+    """
+    Description:
+        Translates virtual key codes to their ascii values and names using precomputed tables, making each translation a single indexed load.
+        
+        - The tables hold 256 entries for each (shift, caps lock) combination and are filled from `ToUnicodeEx` for the keyboard layout of the
+        foreground window, so non-US layouts produce the correct characters.
+        - The layout is checked at most once every `layoutCheckInterval` seconds, and the tables are only rebuilt when it changes.
+        - Tables can be injected with `loadTables`, which also stops following the system layout (useful for tests and benchmarks).
     ---
-    Returns:
-        `tuple[int, str]`: The ascii and name of the virtual key.
+    Parameters:
+        `layoutCheckInterval -> float`: The minimum number of seconds between two checks of the active keyboard layout.
     """
     
-    # If the key is a number, return its ascii and string representation with respect to `shiftPressed`.
-    if (0x30 <= vkey_code <= 0x39):
-        if shiftPressed:
-            text = numRowCodeToSymbol[vkey_code]
-            return (ord(text), text)
+    cdef int asciiTable[1024]
+    cdef list nameTable
+    cdef public object layout
+    cdef public bint followLayout
+    cdef public double layoutCheckInterval
+    cdef public long long rebuilds
+    cdef double lastLayoutCheck
+    
+    def __init__(self, double layoutCheckInterval=0.5):
+        self.nameTable = []
+        self.layout = None
+        self.followLayout = True
+        self.layoutCheckInterval = layoutCheckInterval
+        self.rebuilds = 0
+        self.lastLayoutCheck = -layoutCheckInterval
+    
+    cpdef void loadTables(self, list asciiValues, list names, layout=None):
+        """Loads the given tables (indexed by `(shift | caps << 1) << 8 | vkey_code`) and stops following the system keyboard layout."""
+        
+        if len(asciiValues) != 1024 or len(names) != 1024:
+            raise ValueError("The translation tables must have exactly 1024 entries (256 keys x 4 shift/caps states).")
         
-        # VK_0 : VK_9 have the same code as the ASCII of "0" : "9" (0x30 : 0x39).
-        return (vkey_code, chr(vkey_code))
+        cdef int i
+        for i in range(1024):
+            self.asciiTable[i] = asciiValues[i]
+        
+        self.nameTable = list(names)
+        self.layout = layout
+        self.followLayout = False
+        self.rebuilds += 1
     
-    # A number pad key.
-    elif 0x60 <= vkey_code <= 0x6F:
-        return (vkey_code, numPadCodeToName[vkey_code])
+    cpdef void buildFromLayout(self, layout):
+        """
+        Fills the tables from `ToUnicodeEx` for the given keyboard layout handle. Falls back to the US tables if that fails,
+        or if the layout is `None` (i.e., the platform backend does not report the keyboard layouts).
+        """
+        
+        if layout is None:
+            asciiValues, names = buildUSTables()
+        
+        else:
+            try:
+                asciiValues, names = readLayoutTables(layout)
+            
+            except Exception as e:
+                print(f"Warning! Failed to read the keyboard layout tables, using the US layout instead.\n→ Error message: {e}\n")
+                asciiValues, names = buildUSTables()
+        
+        self.loadTables(asciiValues, names, layout)
+        self.followLayout = True
     
-    # The key is letter.
-    elif 0x41 <= vkey_code <= 0x5A:
-        if shiftPressed or win32api.GetKeyState(win32con.VK_CAPITAL): # A capital letter.
-            # VK_A : VK_Z have the same code as the ASCII of "A" : "Z" (0x41 : 0x5A).
-            return (vkey_code, chr(vkey_code))
+    cdef void refreshLayout(self):
+        """Rebuilds the tables if the keyboard layout of the foreground window has changed since the last check."""
+        
+        cdef double now = perf_counter()
+        if now - self.lastLayoutCheck < self.layoutCheckInterval:
+            return
         
-        # VK_a : VK_z have an ASCII value equal to the virtual code + 32.
-        return (vkey_code + 32, chr(vkey_code + 32))
+        self.lastLayoutCheck = now
+        
+        try:
+            layout = pfBackend.backend.getKeyboardLayout()
+        
+        except Exception:
+            layout = 0
+        
+        if layout != self.layout or not self.nameTable:
+            self.buildFromLayout(layout)
     
-    # The key is not a letter or number. It must be one of the other VK_ keys.
-    else:
-        text = vKeyCodeToName[vkey_code]
+    cdef inline int tableIndex(self, int vkey_code, bint shiftPressed, bint capsOn):
+        return (shiftPressed | capsOn << 1) << 8 | (vkey_code & 0xFF)
+    
+    cdef int lookup(self, int vkey_code, bint shiftPressed, bint capsOn):
+        """Returns the index of the given key state in the tables, rebuilding them first if the keyboard layout has changed."""
+        
+        if self.followLayout:
+            self.refreshLayout()
         
-        if text.startswith("VK_OEM_"):
-            if shiftPressed:
-                text = oemCodeToCharNameWithShift[vkey_code]
-                return (ord(text), text)
+        return self.tableIndex(vkey_code, shiftPressed, capsOn)
+    
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef tuple translate(self, int vkey_code, bint shiftPressed, bint capsOn):
+        """
+        Description:
+            Returns the ascii value and key name for the given key code.
+        ---
+        Parameters:
+            `vkey_code -> int`: A virtual key code.
+            
+            `shiftPressed -> bool`: Whether or not the shift key is pressed.
             
-            text = oemCodeToCharName[vkey_code]
-            return (ord(text), text)
+            `capsOn -> bool`: Whether or not caps lock is toggled on.
+        ---
+        Returns:
+            `tuple[int, str]`: The ascii and name of the virtual key.
+        """
+        
+        cdef int index = self.lookup(vkey_code, shiftPressed, capsOn)
+        
+        return (self.asciiTable[index], self.nameTable[index])
+
+
+def readLayoutTables(layout) -> tuple[list[int], list[str]]:
+    """
+    Description:
+        Builds the key translation tables of the given keyboard layout handle using `ToUnicodeEx`.
+    ---
+    Returns:
+        `tuple[list[int], list[str]]`: The ascii values and key names, indexed by `(shift | caps << 1) << 8 | vkey_code`.
+    """
+    
+    user32 = ctypes.windll.user32
+    user32.GetKeyboardLayout.restype = ctypes.c_void_p
+    user32.MapVirtualKeyExW.argtypes = (ctypes.c_uint, ctypes.c_uint, ctypes.c_void_p)
+    user32.ToUnicodeEx.argtypes = (ctypes.c_uint, ctypes.c_uint, ctypes.c_char_p, ctypes.c_wchar_p, ctypes.c_int, ctypes.c_uint, ctypes.c_void_p)
+    
+    asciiValues = [0] * 1024
+    names = [""] * 1024
+    keyState = ctypes.create_string_buffer(256)
+    buffer = ctypes.create_unicode_buffer(8)
+    
+    for state in range(4):
+        # The high bit marks a pressed key, and the low bit marks a toggled key.
+        keyState[win32con.VK_SHIFT]   = b"\x80" if state & 1 else b"\x00"
+        keyState[win32con.VK_CAPITAL] = b"\x01" if state & 2 else b"\x00"
         
-        # A function or utility key.
-        else: # text.startswith("VK_"):
-            return (win32api.MapVirtualKey(vkey_code, 2), text[3:].title())
+        for vkey_code in range(256):
+            scancode = user32.MapVirtualKeyExW(vkey_code, 0, layout)
+            
+            # Flag 0x4 keeps the keyboard state (e.g., pending dead keys) unchanged. Dead keys return -1 with their spacing character in the buffer.
+            count = user32.ToUnicodeEx(vkey_code, scancode, keyState, buffer, 8, 0x4, layout)
+            text = buffer.value[:1] if count else ""
+            
+            # Control characters and space are reported by their names like the other function and utility keys.
+            if text and ord(text) > 0x20 and text != "\x7f":
+                asciiValues[state << 8 | vkey_code], names[state << 8 | vkey_code] = ord(text), text
+            
+            elif 0x60 <= vkey_code <= 0x6F:
+                asciiValues[state << 8 | vkey_code], names[state << 8 | vkey_code] = vkey_code, numPadCodeToName[vkey_code]
+            
+            else:
+                asciiValues[state << 8 | vkey_code], names[state << 8 | vkey_code] = usControlKeyAscii.get(vkey_code, 0), fallbackKeyName(vkey_code)
+    
+    return asciiValues, names
 
 
 # Define the KBDLLHOOKSTRUCT structure. Docs: https://learn.microsoft.com/en-us/windows/win32/api/winuser/ns-winuser-kbdllhookstruct.
+# The hook structures use fixed width types (`DWORD` and `LONG` are 32-bit on Windows), so they keep their layout
+# when the hook events are generated by `platformBackend.FakeBackend` on other platforms.
 class KBDLLHOOKSTRUCT(ctypes.Structure):
     """A structure that contains information about a low-level keyboard input event."""
     
     _fields_ = [
-        ("vkCode", ctypes.c_ulong),
-        ("scanCode", ctypes.c_ulong),
-        ("flags", ctypes.c_ulong),
-        ("time", ctypes.c_ulong),
+        ("vkCode", ctypes.c_uint32),
+        ("scanCode", ctypes.c_uint32),
+        ("flags", ctypes.c_uint32),
+        ("time", ctypes.c_uint32),
         ("dwExtraInfo", ctypes.POINTER(ctypes.c_ulong))
     ]
 
@@ -170,31 +327,13 @@ cdef class HookManager:
             
             return False
         
-        # Defining a type signature for the given low level hook/handler.
-        CMPFUNC = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.POINTER(ctypes.c_void_p))
-        
-        # Configuring the windows hook argtypes for 64-bit Python compatibility.
-        ctypes.windll.user32.SetWindowsHookExW.argtypes = (
-            ctypes.c_int,
-            ctypes.c_void_p,
-            ctypes.c_void_p,
-            ctypes.c_uint
-        )
-        
         if (hookType == HookTypes.WH_KEYBOARD_LL and self.kbHookId) or (hookType == HookTypes.WH_MOUSE_LL and self.msHookId):
             print(f"Warning: A {'keyboard' if hookType == HookTypes.WH_KEYBOARD_LL else 'mouse'} hook is already installed.")
             
             return False
         
-        # Converting the Python hook into a C pointer.
-        cdef callbackPtr = CMPFUNC(callBack)
-        
-        # Setting a windows hook with the given hook type.
-        cdef int callbackHookId = ctypes.windll.user32.SetWindowsHookExW( # SetWindowsHookExA
-            hookType,                       # Hook type.
-            callbackPtr,                    # Callback pointer.
-            win32gui.GetModuleHandle(None), # Handle to the current process.
-            0)                              # Thread id (0 = current/main thread).
+        # Setting a hook with the given hook type. The backend keeps the C pointer of the callback alive while the hook is installed.
+        cdef int callbackHookId = pfBackend.backend.installHook(hookType, callBack)
         
         # Check if the hook was installed successfully.
         if not callbackHookId:
@@ -206,15 +345,15 @@ cdef class HookManager:
         # Note that methods registered using atexit will be called in reverse order of registration.
         # Also, the registered functions are not called if the interpreter is terminated by a signal not handled by Python,
         # a Python fatal internal error is detected, or when os._exit() is called.
-        atexit.register(ctypes.windll.user32.UnhookWindowsHookEx, callbackHookId)
+        atexit.register(pfBackend.backend.uninstallHook, callbackHookId)
         
         if hookType == HookTypes.WH_KEYBOARD_LL:
             self.kbHookId = callbackHookId
-            self.kbHookPtr = callbackPtr
+            self.kbHookPtr = callBack
         
         else:
             self.msHookId = callbackHookId
-            self.msHookPtr = callbackPtr
+            self.msHookPtr = callBack
         
         return True
     
@@ -229,16 +368,9 @@ cdef class HookManager:
             
             return False
         
-        # Creating a message loop to keep the hook alive.
-        msg = ctypes.wintypes.MSG()
+        # Running the message loop keeps the hooks alive, and calls them for each event. The Windows hook callbacks are only called from this thread.
+        pfBackend.backend.runMessageLoop()
         
-        # If wMsgFilterMin and wMsgFilterMax are both zero, GetMessage returns all available messages (that is, no range filtering is performed).
-        # Keep in mind that any application that wishes to receive notifications of windows events must have a message queue.
-        # Also, each thread has its own message queue, and, as far as I know, the GetMessage can only receive System messages from the main thread.
-        # Docs: https://learn.microsoft.com/en-us/windows/win32/api/winuser/nf-winuser-getmessagew#:~:text=the%20WM_INPUT%20messages.-,If%20wMsgFilterMin%20and%20wMsgFilterMax%20are%20both%20zero%2C%20GetMessage%20returns%20all%20available%20messages%20(that%20is%2C%20no%20range%20filtering%20is%20performed).,-%5Bin%5D%20wMsgFilterMax
-        while ctypes.windll.user32.GetMessageW(ctypes.byref(msg), None, 0, 0) != 0:
-            ctypes.windll.user32.TranslateMessage(ctypes.byref(msg))
-            ctypes.windll.user32.DispatchMessageW(ctypes.byref(msg))
         return True
     
     cdef bint uninstallHook(self, int hookType=HookTypes.WH_KEYBOARD_LL):
@@ -260,24 +392,501 @@ cdef class HookManager:
             return False
         
         if hookType == HookTypes.WH_KEYBOARD_LL:
-            ctypes.windll.user32.UnhookWindowsHookEx(self.kbHookId)
+            pfBackend.backend.uninstallHook(self.kbHookId)
             self.kbHookId = 0
             
             # Unregister the function that was registered using atexit.
             # Note that if the function given to `atexit.unregister` has been registered more than once, every occurrence
             # of that function in the atexit call stack will be removed, as equality comparison (==) is used internally.
             if not self.msHookId:
-                atexit.unregister(ctypes.windll.user32.UnhookWindowsHookEx)
+                atexit.unregister(pfBackend.backend.uninstallHook)
         
         else:
-            ctypes.windll.user32.UnhookWindowsHookEx(self.msHookId)
+            pfBackend.backend.uninstallHook(self.msHookId)
             self.msHookId = 0
             
             if not self.kbHookId:
-                atexit.unregister(ctypes.windll.user32.UnhookWindowsHookEx)
+                atexit.unregister(pfBackend.backend.uninstallHook)
         
         return True
 
+cdef list activeDispatchers = []
+"""Holds all the dispatchers that have been created. Used for reporting their statistics."""
+
+
+cdef class ListenerDispatcher:
+    """
+    Description:
+        Delivers hook events to their listeners using a fixed set of long-lived worker threads.
+        
+        - Each listener is pinned to a single worker (lane) so that it receives the events in the same order they were dispatched.
+        - Each lane has a bounded queue. If a queue is full, the event is dropped for the listeners of that lane only, instead of blocking the hook thread.
+        - The worker threads are started lazily on the first dispatched event.
+    ---
+    Parameters:
+        `name -> str`: A name used for the worker threads and when reporting the statistics.
+        
+        `workerCount -> int`: The number of worker threads (lanes).
+        
+        `maxQueueSize -> int`: The maximum number of pending events for each lane.
+    """
+    
+    cdef public str name
+    cdef public int workerCount, maxQueueSize, maxQueueDepth
+    cdef public long long dispatchedEvents, droppedEvents, deliveredEvents
+    cdef public double totalLatency, maxLatency
+    cdef list queues, workers
+    cdef dict listenerLanes, listenerTimes
+    cdef int nextLane
+    cdef bint running
+    cdef public LatencyHistogram queueWaits, completionTimes
+    
+    def __init__(self, str name, int workerCount=2, int maxQueueSize=256):
+        self.name = name
+        self.workerCount = max(workerCount, 1)
+        self.maxQueueSize = max(maxQueueSize, 1)
+        self.queues = [queue.Queue(self.maxQueueSize) for _ in range(self.workerCount)]
+        self.workers = []
+        self.listenerLanes = {}
+        self.listenerTimes = {}
+        self.nextLane = 0
+        self.running = False
+        self.queueWaits = getHistogram(f"{name}.queueWait")
+        self.completionTimes = getHistogram(f"{name}.hookToListenerDone")
+        self.resetStats()
+        
+        activeDispatchers.append(self)
+    
+    cpdef void start(self):
+        """Starts the worker threads if they are not already running."""
+        
+        if self.running:
+            return
+        
+        self.running = True
+        
+        cdef int lane
+        for lane in range(self.workerCount):
+            worker = PThread(target=self.workerLoop, args=(lane,), name=f"{self.name}-worker-{lane}", daemon=True)
+            self.workers.append(worker)
+            worker.start()
+    
+    cpdef void stop(self):
+        """Signals the worker threads to exit after processing the pending events."""
+        
+        if not self.running:
+            return
+        
+        self.running = False
+        
+        for lane_queue in self.queues:
+            lane_queue.put(None)
+        
+        self.workers.clear()
+    
+    cpdef int pinListener(self, listener, int lane):
+        """Pins the given listener to the specified lane. Listeners pinned to the same lane are called in the order of the dispatched events."""
+        
+        lane %= self.workerCount
+        self.listenerLanes[listener] = lane
+        
+        return lane
+    
+    cdef int laneOf(self, listener):
+        """Returns the lane of the given listener, assigning a new one in a round-robin fashion if it has none."""
+        
+        lane = self.listenerLanes.get(listener)
+        
+        if lane is None:
+            lane = self.nextLane
+            self.listenerLanes[listener] = lane
+            self.nextLane = (self.nextLane + 1) % self.workerCount
+        
+        return lane
+    
+    cpdef bint dispatch(self, list listeners, event):
+        """
+        Description:
+            Queues the given event for each of the specified listeners. Never blocks.
+        ---
+        Returns:
+            `bool`: `True` if the event was queued for all the listeners, `False` if it was dropped for the listeners of a full lane.
+        """
+        
+        if not listeners:
+            return True
+        
+        if not self.running:
+            self.start()
+        
+        cdef int depth = 0
+        cdef bint dropped = False
+        cdef double enqueued_at = perf_counter()
+        
+        # A busy lane only loses the events of its own listeners. Besides the hook thread, `replayJournal` may dispatch events from another
+        # thread, so a lane can still become full between the check and the `put`.
+        for listener in listeners:
+            lane_queue = self.queues[self.laneOf(listener)]
+            
+            if lane_queue.full():
+                dropped = True
+                continue
+            
+            depth += lane_queue.qsize()
+            
+            try:
+                lane_queue.put_nowait((listener, event, enqueued_at))
+            
+            except queue.Full:
+                dropped = True
+        
+        if depth > self.maxQueueDepth:
+            self.maxQueueDepth = depth
+        
+        if dropped:
+            self.droppedEvents += 1
+        
+        self.dispatchedEvents += 1
+        
+        return not dropped
+    
+    cdef LatencyHistogram listenerHistogram(self, listener):
+        """Returns the histogram of the run times of the given listener."""
+        
+        cdef LatencyHistogram histogram = self.listenerTimes.get(listener)
+        
+        if histogram is None:
+            histogram = getHistogram(f"{self.name}.listener.{getattr(listener, '__name__', listener)}")
+            self.listenerTimes[listener] = histogram
+        
+        return histogram
+    
+    def workerLoop(self, int lane):
+        """The main loop of a worker thread. Calls the listeners of the events queued in the specified lane."""
+        
+        cdef double latency, started_at, hook_time
+        lane_queue = self.queues[lane]
+        
+        while True:
+            item = lane_queue.get()
+            
+            if item is None:
+                return
+            
+            listener, event, enqueued_at = item
+            
+            started_at = perf_counter()
+            latency = started_at - enqueued_at
+            self.totalLatency += latency
+            self.deliveredEvents += 1
+            self.queueWaits.record(latency)
+            
+            if latency > self.maxLatency:
+                self.maxLatency = latency
+            
+            # An exception in a listener must not kill the worker thread.
+            try:
+                listener(event)
+            
+            except Exception as e:
+                print(f'➤ Warning! An error occurred in the "{getattr(listener, "__name__", listener)}" listener of the {self.name} dispatcher.\n\n→ Error message: {e}\n\n→ {format_exc()}\n{"="*50}\n')
+            
+            self.listenerHistogram(listener).record(perf_counter() - started_at)
+            
+            # Events created by the hooks carry the time they were received at.
+            hook_time = getattr(event, "HookTime", 0.0)
+            if hook_time:
+                self.completionTimes.record(perf_counter() - hook_time)
+    
+    cpdef int queueDepth(self):
+        """Returns the total number of events waiting in the lane queues."""
+        
+        return sum([lane_queue.qsize() for lane_queue in self.queues])
+    
+    cpdef dict getStats(self):
+        """Returns a snapshot of the dispatcher statistics. Latencies are the time between queuing an event and calling its listener."""
+        
+        return {
+            "queueDepth":      self.queueDepth(),
+            "maxQueueDepth":   self.maxQueueDepth,
+            "dispatchedEvents": self.dispatchedEvents,
+            "droppedEvents":   self.droppedEvents,
+            "avgLatencyMs":    (self.totalLatency / self.deliveredEvents * 1000) if self.deliveredEvents else 0.0,
+            "maxLatencyMs":    self.maxLatency * 1000,
+        }
+    
+    cpdef void resetStats(self):
+        """Resets the collected statistics."""
+        
+        self.maxQueueDepth = 0
+        self.dispatchedEvents = 0
+        self.droppedEvents = 0
+        self.deliveredEvents = 0
+        self.totalLatency = 0.0
+        self.maxLatency = 0.0
+
+
+def getDispatchersStats() -> dict[str, dict]:
+    """Returns the statistics of all the created dispatchers keyed by their names."""
+    
+    return {dispatcher.name: dispatcher.getStats() for dispatcher in activeDispatchers}
+
+
+cdef list activeFilters = []
+"""Holds all the suppression filters that have been created. Used for reporting their statistics."""
+
+
+cdef class SuppressionFilter:
+    """
+    Description:
+        Decides synchronously (in the hook thread) whether an event should be suppressed or passed to the other applications.
+        
+        - The decision is made by calling `callback(event) -> bool`, which must only do cheap lookups; the actual actions are left to the listeners.
+        - If the decision takes longer than `timeBudgetMs`, or if the callback raises an exception, the event is passed through and the overrun is counted.
+        This keeps the hook well below the system `LowLevelHooksTimeout`, after which Windows silently removes the hook.
+    ---
+    Parameters:
+        `name -> str`: A name used when reporting the statistics.
+        
+        `callback -> Callable[[BaseEvent], bool] | None`: The function that makes the decision. If `None`, all events are passed through.
+        
+        `timeBudgetMs -> float`: The maximum time in milliseconds a decision is allowed to take.
+    """
+    
+    cdef public str name
+    cdef public object callback
+    cdef public double timeBudget
+    cdef public long long decisions, suppressedEvents, budgetOverruns, failedDecisions
+    cdef public double maxDecisionTime
+    cdef public LatencyHistogram decisionTimes
+    
+    def __init__(self, str name, callback=None, double timeBudgetMs=20.0):
+        self.name = name
+        self.callback = callback
+        self.timeBudget = timeBudgetMs / 1000
+        self.decisionTimes = getHistogram(f"{name}.decision")
+        self.resetStats()
+        
+        activeFilters.append(self)
+    
+    cpdef bint decide(self, event):
+        """Returns whether the given event should be suppressed. Falls back to `False` (pass-through) when the time budget is exceeded."""
+        
+        if self.callback is None:
+            return False
+        
+        cdef bint suppress
+        cdef double elapsed, started_at = perf_counter()
+        
+        try:
+            suppress = self.callback(event)
+        
+        except Exception as e:
+            self.failedDecisions += 1
+            print(f'➤ Warning! An error occurred in the {self.name} suppression filter. The event is passed through.\n\n→ Error message: {e}\n\n→ {format_exc()}\n{"="*50}\n')
+            
+            return False
+        
+        elapsed = perf_counter() - started_at
+        self.decisions += 1
+        self.decisionTimes.record(elapsed)
+        
+        if elapsed > self.maxDecisionTime:
+            self.maxDecisionTime = elapsed
+        
+        if elapsed > self.timeBudget:
+            self.budgetOverruns += 1
+            
+            return False
+        
+        self.suppressedEvents += suppress
+        
+        return suppress
+    
+    cpdef dict getStats(self):
+        """Returns a snapshot of the filter statistics."""
+        
+        return {
+            "decisions":         self.decisions,
+            "suppressedEvents":  self.suppressedEvents,
+            "budgetOverruns":    self.budgetOverruns,
+            "failedDecisions":   self.failedDecisions,
+            "maxDecisionTimeMs": self.maxDecisionTime * 1000,
+        }
+    
+    cpdef void resetStats(self):
+        """Resets the collected statistics."""
+        
+        self.decisions = 0
+        self.suppressedEvents = 0
+        self.budgetOverruns = 0
+        self.failedDecisions = 0
+        self.maxDecisionTime = 0.0
+
+
+def getFiltersStats() -> dict[str, dict]:
+    """Returns the statistics of all the created suppression filters keyed by their names."""
+    
+    return {suppressionFilter.name: suppressionFilter.getStats() for suppressionFilter in activeFilters}
+
+
+# ======================================================================================================================
+
+# The state of the modifier and lock keys. It is updated from the keyboard events themselves, so handling a key does not
+# query the system, and it is read from the system again only when it may be stale (see `syncKeyboardState`).
+ctypedef struct KeyboardState:
+    unsigned int modifiers      # The `ControllerHouse` modifier bits, including the left/right ones (e.g., `LCTRL`).
+    unsigned int locks          # The lock keys that are on: `ControllerHouse.CAPITAL_MASK | SCROLL_MASK | NUMLOCK_MASK`.
+    unsigned int heldLocks      # The lock keys that are pressed, so their auto-repeated key downs do not toggle them again.
+    unsigned int shiftKeys      # The pressed shift keys, including the injected ones. Used for translating the keys.
+    unsigned int lastEventTime  # The time stamp of the last keyboard event.
+    bint stale                  # Whether the state must be read from the system before handling the next event.
+
+
+cdef KeyboardState kbState
+kbState.stale = True
+
+cdef unsigned int modifierMasks[256]
+"""The modifier bit of each virtual key, or 0 if the key is not a modifier."""
+
+cdef unsigned int lockMasks[256]
+"""The lock bit of each virtual key, or 0 if the key is not a lock key."""
+
+# The generic modifiers set by either of their left/right keys.
+cdef unsigned int PAIRED_MODIFIERS = ctrlHouse.CTRL | ctrlHouse.SHIFT | ctrlHouse.ALT | ctrlHouse.WIN
+
+# The modifiers reported by the keyboard events. The hotkeys are defined with these.
+cdef unsigned int EVENT_MODIFIERS = PAIRED_MODIFIERS | ctrlHouse.FN | ctrlHouse.BACKTICK
+
+cdef unsigned int SHIFT_KEYS = ctrlHouse.LSHIFT | ctrlHouse.RSHIFT
+
+cdef int KEYBOARD_STATE_MAX_IDLE_MS = 5000
+"""The state is read from the system again after this many milliseconds without keyboard events. The events that happen while
+the hook does not receive them (e.g., while an elevated window is focused, or the session is locked) are missed."""
+
+cdef tuple resyncedModifierKeys = (win32con.VK_LCONTROL, win32con.VK_RCONTROL, win32con.VK_LSHIFT, win32con.VK_RSHIFT,
+                                   win32con.VK_LMENU, win32con.VK_RMENU, win32con.VK_LWIN, win32con.VK_RWIN, kbcon.VK_BACKTICK)
+
+
+cdef void fillKeyboardStateTables():
+    cdef int vkey
+    
+    for vkey, mask in ((win32con.VK_LCONTROL, ctrlHouse.LCTRL),  (win32con.VK_RCONTROL, ctrlHouse.RCTRL), (win32con.VK_CONTROL, ctrlHouse.LCTRL),
+                       (win32con.VK_LSHIFT,   ctrlHouse.LSHIFT), (win32con.VK_RSHIFT,   ctrlHouse.RSHIFT), (win32con.VK_SHIFT,   ctrlHouse.LSHIFT),
+                       (win32con.VK_LMENU,    ctrlHouse.LALT),   (win32con.VK_RMENU,    ctrlHouse.RALT),   (win32con.VK_MENU,    ctrlHouse.LALT),
+                       (win32con.VK_LWIN,     ctrlHouse.LWIN),   (win32con.VK_RWIN,     ctrlHouse.RWIN),
+                       (255, ctrlHouse.FN), (kbcon.VK_BACKTICK, ctrlHouse.BACKTICK)):
+        modifierMasks[vkey] = mask
+    
+    lockMasks[win32con.VK_CAPITAL] = ctrlHouse.CAPITAL_MASK
+    lockMasks[win32con.VK_SCROLL]  = ctrlHouse.SCROLL_MASK
+    lockMasks[win32con.VK_NUMLOCK] = ctrlHouse.NUMLOCK_MASK
+
+fillKeyboardStateTables()
+
+
+cdef inline unsigned int withPairedModifiers(unsigned int modifiers):
+    """Sets each generic modifier bit if one of its left/right bits is set. The left/right bits are 1 and 2 bits below their generic bit."""
+    
+    return (modifiers & ~PAIRED_MODIFIERS) | ((modifiers << 1 | modifiers << 2) & PAIRED_MODIFIERS)
+
+
+cdef inline void publishModifiers():
+    """Mirrors the modifiers to `ControllerHouse.modifiers`. Called only when they change."""
+    
+    ctrlHouse.modifiers = kbState.modifiers & EVENT_MODIFIERS
+
+
+cdef inline void publishLocks():
+    """Mirrors the lock states to `ControllerHouse.CAPITAL`, `SCROLL`, and `NUMLOCK`. Called only when they change."""
+    
+    ctrlHouse.CAPITAL = int(kbState.locks & ctrlHouse.CAPITAL_MASK != 0)
+    ctrlHouse.SCROLL  = int(kbState.locks & ctrlHouse.SCROLL_MASK  != 0)
+    ctrlHouse.NUMLOCK = int(kbState.locks & ctrlHouse.NUMLOCK_MASK != 0)
+
+
+cpdef void syncKeyboardState():
+    """Reads the states of the modifier and lock keys from the system. The `FN` key is kept as is, as the system does not track it."""
+    
+    cdef int vkey
+    cdef unsigned int modifiers = kbState.modifiers & ctrlHouse.FN
+    
+    backend = pfBackend.backend
+    
+    for vkey in resyncedModifierKeys:
+        if backend.getAsyncKeyState(vkey) & 0x8000:
+            modifiers |= modifierMasks[vkey]
+    
+    kbState.modifiers = withPairedModifiers(modifiers)
+    kbState.shiftKeys = modifiers & SHIFT_KEYS
+    kbState.heldLocks = 0
+    kbState.locks = ((backend.getKeyState(win32con.VK_CAPITAL) & 1) * ctrlHouse.CAPITAL_MASK |
+                     (backend.getKeyState(win32con.VK_SCROLL)  & 1) * ctrlHouse.SCROLL_MASK  |
+                     (backend.getKeyState(win32con.VK_NUMLOCK) & 1) * ctrlHouse.NUMLOCK_MASK)
+    kbState.stale = False
+    
+    publishModifiers()
+    publishLocks()
+
+
+cpdef void markKeyboardStateStale():
+    """Makes the next keyboard event read the states of the modifier and lock keys from the system, e.g., after they were changed while the hook was not running."""
+    
+    kbState.stale = True
+
+
+cpdef unsigned int getModifiers(bint sides=False):
+    """Returns the pressed modifiers as `ControllerHouse` bits. The left/right bits (e.g., `LCTRL`) are included only if `sides` is `True`."""
+    
+    return kbState.modifiers if sides else kbState.modifiers & EVENT_MODIFIERS
+
+
+cpdef unsigned int getLocks():
+    """Returns the lock keys that are on as `ControllerHouse.CAPITAL_MASK | SCROLL_MASK | NUMLOCK_MASK` bits."""
+    
+    return kbState.locks
+
+# ======================================================================================================================
+
+
+cdef inline KeyboardEvent newKeyboardEvent(int event_id, int vkey_code, int scancode, int key_ascii, key_name, int flags, bint shift,
+                                           unsigned int time, double hook_time):
+    """Creates a keyboard event without going through `__init__`. The instances are recycled through the freelist of `KeyboardEvent`."""
+    
+    cdef KeyboardEvent event = KeyboardEvent.__new__(KeyboardEvent)
+    
+    event.EventId  = event_id
+    event.Flags    = flags
+    event.KeyID    = vkey_code
+    event.Scancode = scancode
+    event.Ascii    = key_ascii
+    event.Key      = key_name
+    event.Shift    = shift
+    event.Time     = time
+    event.HookTime = hook_time
+    
+    return event
+
+
+cdef inline MouseEvent newMouseEvent(int event_id, int flags, int x, int y, int mouse_data, int wheel_delta, int pressed_button,
+                                     unsigned int time, double hook_time):
+    """Creates a mouse event without going through `__init__`. The instances are recycled through the freelist of `MouseEvent`."""
+    
+    cdef MouseEvent event = MouseEvent.__new__(MouseEvent)
+    
+    event.EventId       = event_id
+    event.Flags         = flags
+    event.X             = x
+    event.Y             = y
+    event.MouseData     = mouse_data
+    event.Delta         = wheel_delta
+    event.PressedButton = pressed_button
+    event.Time          = time
+    event.HookTime      = hook_time
+    
+    return event
+
+
 # ctypedef bint (*keyboardCallbackPtr)(KeyboardEvent)
 
 cdef class KeyboardHookManager:
@@ -285,11 +894,31 @@ cdef class KeyboardHookManager:
     
     cdef public list keyDownListeners, keyUpListeners
     cdef public int hookId
+    cdef public ListenerDispatcher dispatcher
+    cdef public SuppressionFilter keyDownFilter
+    cdef public KeyTranslator translator
+    cdef public LatencyHistogram osToHookTimes, hookTimes
+    cdef public EventJournalWriter journal
+    cdef public MacroRecorder recorder
     
-    def __init__(self):
+    def __init__(self, int workerCount=2, int maxQueueSize=256, double timeBudgetMs=20.0, KeyTranslator translator=None):
         self.keyDownListeners = []
         self.keyUpListeners = []
         self.hookId = 0
+        self.dispatcher = ListenerDispatcher("keyboard", workerCount, maxQueueSize)
+        self.keyDownFilter = SuppressionFilter("keyboard", None, timeBudgetMs)
+        
+        # The translation tables are built lazily on the first translated key.
+        self.translator = translator if translator is not None else KeyTranslator()
+        
+        self.osToHookTimes = getHistogram("keyboard.osToHook")
+        self.hookTimes = getHistogram("keyboard.hook")
+        
+        # Set to an `EventJournalWriter` to record the raw keyboard events.
+        self.journal = None
+        
+        # Set to a `MacroRecorder` to record the keys typed by the user into macros.
+        self.recorder = None
     
     cpdef bint keyboardCallback(self, int nCode, int wParam, lParam):
         """
@@ -302,9 +931,10 @@ cdef class KeyboardHookManager:
             - `lParam`: A pointer to a `KBDLLHOOKSTRUCT` structure.
         """
         
-        cdef int vkey_code, scancode, flags
-        cdef bint injected, extended, transition, shiftPressed, altPressed, suppressKeyPress
-        cdef KeyboardEvent keyboardEvent
+        cdef int vkey_code
+        cdef unsigned int eventTime
+        cdef bint suppressKeyPress
+        cdef double hookTime = perf_counter()
         
         suppressKeyPress = False
         
@@ -321,124 +951,160 @@ cdef class KeyboardHookManager:
             if not vkey_code:
                 # Note that, if you returned a boolean value instead of calling CallNextHookEx, you are
                 # effectively preventing any further processing of the keystroke by other hooks in the chain.
-                return ctypes.windll.user32.CallNextHookEx(None, nCode, wParam, lParam)
-            
-            scancode = lParamStruct.scanCode
-            
-            # eventTime = lParamStruct.time
-            flags = lParamStruct.flags
-            
-            # Extracting key state flags from the packed int `flags'.
-            # Docs: https://learn.microsoft.com/en-us/windows/win32/api/winuser/ns-winuser-kbdllhookstruct#:~:text=The%20following%20table%20describes%20the%20layout%20of%20this%20value.
-            extended   = bool(flags & 0x1)
-            injected   = bool(flags & 0x10)
-            altPressed = bool(flags & 0x20)
-            transition = bool(flags & 0x82)
-            
-            # To get the correct key ascii value, we need first to check if the shift is pressed.
-            shiftPressed = ((win32api.GetAsyncKeyState(win32con.VK_SHIFT) & 0x8000) >> 15) | (vkey_code in (win32con.VK_LSHIFT, win32con.VK_RSHIFT))
-            keyAscii, keyName= getKeyAsciiAndName(vkey_code, shiftPressed)
-            
-            eventName = kbMsgIdToName[wParam]
-            
-            # Creating a keyboard event object.
-            keyboardEvent = KeyboardEvent(event_id=wParam, event_name=eventName, vkey_code=vkey_code,
-                                          scancode=scancode, key_ascii=keyAscii, key_name=keyName,
-                                          flags=flags, injected=injected, extended=extended,
-                                          shift=shiftPressed, alt=altPressed, transition=transition)
-            
-            # Key down/press event.
-            if wParam in (win32con.WM_KEYDOWN, win32con.WM_SYSKEYDOWN):
-                # Update the state of the lock keys to reflect their current state.
-                ctrlHouse.CAPITAL = win32api.GetKeyState(win32con.VK_CAPITAL)
-                ctrlHouse.SCROLL  = win32api.GetKeyState(win32con.VK_SCROLL)
-                ctrlHouse.NUMLOCK = win32api.GetKeyState(win32con.VK_NUMLOCK)
-                
-                #! Distinguish between real user input and keyboard input generated by programs/scripts.
-                if not injected:
-                    # Update the state of the modifier keys to reflect the current state of being pressed.
-                    ctrlHouse.modifiers |= (
-                        ((keyboardEvent.KeyID == win32con.VK_LCONTROL) | (keyboardEvent.KeyID == win32con.VK_RCONTROL)) << 13 | # CTRL
-                        ((keyboardEvent.KeyID == win32con.VK_LSHIFT)   | (keyboardEvent.KeyID == win32con.VK_RSHIFT))   << 10 | # SHIFT
-                        ((keyboardEvent.KeyID == win32con.VK_LMENU)    | (keyboardEvent.KeyID == win32con.VK_RMENU))    << 7  | # ALT
-                        ((keyboardEvent.KeyID == win32con.VK_LWIN)     | (keyboardEvent.KeyID == win32con.VK_RWIN))     << 4  | # WIM
-                        
-                        # (keyboardEvent.KeyID == win32con.VK_LCONTROL) << 12 | # LCTRL
-                        # (keyboardEvent.KeyID == win32con.VK_RCONTROL) << 11 | # RCTRL
-                        # (keyboardEvent.KeyID == win32con.VK_LSHIFT)   << 9  | # LSHIFT
-                        # (keyboardEvent.KeyID == win32con.VK_RSHIFT)   << 8  | # RSHIFT
-                        # (keyboardEvent.KeyID == win32con.VK_LMENU)    << 6  | # LALT
-                        # (keyboardEvent.KeyID == win32con.VK_RMENU)    << 5  | # RALT
-                        # (keyboardEvent.KeyID == win32con.VK_LWIN)     << 3  | # LWIN
-                        # (keyboardEvent.KeyID == win32con.VK_RWIN)     << 2  | # RWIN
-                        
-                        (keyboardEvent.KeyID == 255)                    << 1  | # FN
-                        (keyboardEvent.KeyID == kbcon.VK_BACKTICK)              # BACKTICK
-                    )
-                    
-                    # Propagate the event to the registered keyDown listeners.
-                    for listener in self.keyDownListeners:
-                        PThread(target=listener, args=(keyboardEvent,)).start()
-                    
-                    # One of the keyDown listeners must put a signal in the PThread.kbMsgQueue to specify whether to return or suppress the pressed key.
-                    if self.keyDownListeners and PThread.kbMsgQueue.get():
-                        suppressKeyPress = True
+                return pfBackend.backend.callNextHook(nCode, wParam, lParam)
             
-            # Key up event.
-            else:
-                if not injected:
-                    # Update the state of the modifier keys to reflect their current state of being released.
-                    ctrlHouse.modifiers &= ~(
-                        ((keyboardEvent.KeyID == win32con.VK_LCONTROL) | (keyboardEvent.KeyID == win32con.VK_RCONTROL)) << 13 | # CTRL
-                        ((keyboardEvent.KeyID == win32con.VK_LSHIFT)   | (keyboardEvent.KeyID == win32con.VK_RSHIFT))   << 10 | # SHIFT
-                        ((keyboardEvent.KeyID == win32con.VK_LMENU)    | (keyboardEvent.KeyID == win32con.VK_RMENU))    << 7  | # ALT
-                        ((keyboardEvent.KeyID == win32con.VK_LWIN)     | (keyboardEvent.KeyID == win32con.VK_RWIN))     << 4  | # WIN
-                        
-                        # (1 << 13) | (1 << 10) | (1 << 7) | (1 << 4) | # Reseting CTRL, SHIFT, ALT, WIN
-                        # (keyboardEvent.KeyID == win32con.VK_LCONTROL) << 12 | # LCTRL
-                        # (keyboardEvent.KeyID == win32con.VK_RCONTROL) << 11 | # RCTRL
-                        # (keyboardEvent.KeyID == win32con.VK_LSHIFT)   << 9  | # LSHIFT
-                        # (keyboardEvent.KeyID == win32con.VK_RSHIFT)   << 8  | # RSHIFT
-                        # (keyboardEvent.KeyID == win32con.VK_LMENU)    << 6  | # LALT
-                        # (keyboardEvent.KeyID == win32con.VK_RMENU)    << 5  | # RALT
-                        # (keyboardEvent.KeyID == win32con.VK_LWIN)     << 3  | # LWIN
-                        # (keyboardEvent.KeyID == win32con.VK_RWIN)     << 2  | # RWIN
-                        
-                        (keyboardEvent.KeyID == 255)                    << 1  | # FN
-                        (keyboardEvent.KeyID == kbcon.VK_BACKTICK)              # BACKTICK
-                    )
-                    
-                    # Propagate the event to the registered keyUp listeners.
-                    for listener in self.keyUpListeners:
-                        PThread(target=listener, args=(keyboardEvent,)).start()
+            # The event time stamp comes from the same millisecond tick count as `GetTickCount`. The unsigned subtraction handles the wrap around.
+            eventTime = lParamStruct.time
+            if eventTime:
+                self.osToHookTimes.recordMicros(<unsigned int> (<unsigned int> pfBackend.backend.getTickCount() - eventTime) * 1000LL)
+            
+            suppressKeyPress = self.processKeyboardEvent(wParam, vkey_code, lParamStruct.scanCode, lParamStruct.flags, eventTime, hookTime)
             
-            ctypes.windll.user32.CallNextHookEx(None, nCode, wParam, lParam)
+            pfBackend.backend.callNextHook(nCode, wParam, lParam)
+            
+            self.hookTimes.record(perf_counter() - hookTime)
             
             return suppressKeyPress
+    
+    cpdef bint processKeyboardEvent(self, int wParam, int vkey_code, int scancode, int flags, unsigned int eventTime, double hookTime, int keyState=-1):
+        """
+        Description:
+            Updates the keyboard state, decides whether the key is suppressed, and dispatches the event to the listeners.
+            Called by `keyboardCallback` with the fields of the `KBDLLHOOKSTRUCT`, and by the event journal to replay recorded events.
+        ---
+        Parameters:
+            - `wParam`: The identifier of the keyboard message (event id).
+            - `vkey_code`, `scancode`, `flags`, `eventTime`: The `vkCode`, `scanCode`, `flags`, and `time` fields of the `KBDLLHOOKSTRUCT`.
+            - `hookTime`: The `perf_counter` value when the event was received.
+            - `keyState`: The shift (bit 0) and the caps/scroll/num lock (bits 1-3) states. If negative, the tracked keyboard state is used.
+        ---
+        Returns:
+            `bool`: Whether the key should be suppressed.
+        """
+        
+        cdef int tableIndex
+        cdef unsigned int modifierMask = 0, lockMask = 0, previousModifiers
+        cdef bint injected, shiftPressed, suppressKeyPress, isKeyDown
+        cdef KeyboardEvent keyboardEvent
+        
+        suppressKeyPress = False
+        
+        # The other key state flags (extended, alt, transition) are extracted from the packed int `flags` by the event when they are accessed.
+        # Docs: https://learn.microsoft.com/en-us/windows/win32/api/winuser/ns-winuser-kbdllhookstruct#:~:text=The%20following%20table%20describes%20the%20layout%20of%20this%20value.
+        injected = flags & 0x10
+        
+        isKeyDown = wParam in (win32con.WM_KEYDOWN, win32con.WM_SYSKEYDOWN)
+        
+        if 0 <= vkey_code < 256:
+            modifierMask = modifierMasks[vkey_code]
+            lockMask = lockMasks[vkey_code]
+        
+        if keyState < 0:
+            # The signed difference ignores the slightly out of order time stamps of the injected events.
+            if kbState.stale or (eventTime and kbState.lastEventTime and <int> (eventTime - kbState.lastEventTime) > KEYBOARD_STATE_MAX_IDLE_MS):
+                syncKeyboardState()
+            
+            if eventTime:
+                kbState.lastEventTime = eventTime
+        
+        # A replayed event carries the system state recorded with it.
+        else:
+            if isKeyDown:
+                kbState.locks = (((keyState >> 1) & 1) * ctrlHouse.CAPITAL_MASK | ((keyState >> 2) & 1) * ctrlHouse.SCROLL_MASK |
+                                 ((keyState >> 3) & 1) * ctrlHouse.NUMLOCK_MASK)
+                publishLocks()
+            
+            # The live events read the state from the system after a replay.
+            kbState.stale = True
+        
+        # The shift keys are tracked for the translation even when injected (e.g., by `keyboard.write`).
+        if isKeyDown:
+            kbState.shiftKeys |= modifierMask & SHIFT_KEYS
+        
+        # To get the correct key ascii value, we need first to check if the shift is pressed. A released shift key still counts.
+        shiftPressed = keyState & 1 if keyState >= 0 else kbState.shiftKeys != 0 or modifierMask & SHIFT_KEYS
+        
+        if not isKeyDown:
+            kbState.shiftKeys &= ~modifierMask
+        
+        if keyState < 0:
+            keyState = shiftPressed | ((kbState.locks & ctrlHouse.CAPITAL_MASK) != 0) << 1 | ((kbState.locks & ctrlHouse.SCROLL_MASK) != 0) << 2 | \
+                       ((kbState.locks & ctrlHouse.NUMLOCK_MASK) != 0) << 3
+        
+        if self.journal is not None:
+            self.journal.recordKeyboard(wParam, vkey_code, scancode, flags, eventTime, keyState)
+        
+        tableIndex = self.translator.lookup(vkey_code, shiftPressed, kbState.locks & ctrlHouse.CAPITAL_MASK)
+        
+        # Creating a keyboard event object.
+        keyboardEvent = newKeyboardEvent(wParam, vkey_code, scancode, self.translator.asciiTable[tableIndex],
+                                         self.translator.nameTable[tableIndex], flags, shiftPressed, eventTime, hookTime)
+        
+        # Key down/press event.
+        if isKeyDown:
+            #! Distinguish between real user input and keyboard input generated by programs/scripts.
+            if not injected:
+                # Update the state of the modifier keys to reflect the current state of being pressed.
+                if modifierMask:
+                    previousModifiers = kbState.modifiers
+                    kbState.modifiers = withPairedModifiers(previousModifiers | modifierMask)
+                    
+                    if kbState.modifiers != previousModifiers:
+                        publishModifiers()
+                
+                keyboardEvent.Modifiers = kbState.modifiers & EVENT_MODIFIERS
+                
+                # Deciding whether to suppress the pressed key before handing the event to the listeners, which run asynchronously.
+                suppressKeyPress = self.keyDownFilter.decide(keyboardEvent)
+                
+                # The decision falls back to pass-through when the filter fails or overruns its budget, so the listeners are told the final one.
+                keyboardEvent.Suppressed = suppressKeyPress
+                
+                # A key that was passed through did not advance a chord sequence, so it is handled as a normal key.
+                if not suppressKeyPress:
+                    keyboardEvent.ChordNode = 0
+                
+                # Propagate the event to the registered keyDown listeners.
+                self.dispatcher.dispatch(self.keyDownListeners, keyboardEvent)
+            
+            # A lock key toggles on its first key down, unless it is suppressed.
+            if lockMask and not kbState.heldLocks & lockMask:
+                kbState.heldLocks |= lockMask
+                
+                if not suppressKeyPress:
+                    kbState.locks ^= lockMask
+                    publishLocks()
+        
+        # Key up event.
+        else:
+            kbState.heldLocks &= ~lockMask
+            
+            if not injected:
+                # Update the state of the modifier keys to reflect their current state of being released.
+                if modifierMask:
+                    previousModifiers = kbState.modifiers
+                    kbState.modifiers = withPairedModifiers(previousModifiers & ~modifierMask)
+                    
+                    if kbState.modifiers != previousModifiers:
+                        publishModifiers()
+                
+                keyboardEvent.Modifiers = kbState.modifiers & EVENT_MODIFIERS
+                
+                # Propagate the event to the registered keyUp listeners.
+                self.dispatcher.dispatch(self.keyUpListeners, keyboardEvent)
+        
+        # Only the keys typed by the user that reach the applications are recorded, so the keys of the hotkeys are not.
+        if self.recorder is not None and self.recorder.recording and not injected and not suppressKeyPress:
+            self.recorder.recordKeyboard(wParam, vkey_code, scancode, flags)
+        
+        return suppressKeyPress
 
 # ======================================================================================================================
 
-cdef dict msMsgIdToName = {
-    MsMsgIds.WM_MOUSEMOVE       : "MOVE",
-    MsMsgIds.WM_LBUTTONDOWN     : "LB CLK",
-    MsMsgIds.WM_LBUTTONUP       : "LB UP",
-    MsMsgIds.WM_LBUTTONDBLCLK   : "LB DBL CLK",
-    MsMsgIds.WM_RBUTTONDOWN     : "RB CLK",
-    MsMsgIds.WM_RBUTTONUP       : "RB UP",
-    MsMsgIds.WM_RBUTTONDBLCLK   : "RB DBL CLK",
-    MsMsgIds.WM_MBUTTONDOWN     : "MB CLK",
-    MsMsgIds.WM_MBUTTONUP       : "MB UP",
-    MsMsgIds.WM_MBUTTONDBLCLK   : "MB DBL CLK",
-    MsMsgIds.WM_MOUSEWHEEL      : "WHEEL SCRL",
-    MsMsgIds.WM_XBUTTONDOWN     : "XB CLK",
-    MsMsgIds.WM_XBUTTONUP       : "XB UP",
-    MsMsgIds.WM_XBUTTONDBLCLK   : "XB DBL CLK",
-    MsMsgIds.WM_MOUSEHWHEEL     : "WHEEL H SCRL",
-    MsMsgIds.WM_NCXBUTTONDOWN   : "NC XB CLK",
-    MsMsgIds.WM_NCXBUTTONUP     : "NC XB UP",
-    MsMsgIds.WM_NCXBUTTONDBLCLK : "NC XB DBL CLK",
-}
-"""Maps the Windows Message Ids for mouse events to their respective names."""
+class POINT(ctypes.Structure):
+    """The x- and y-coordinates of a point."""
+    
+    _fields_ = [("x", ctypes.c_int32), ("y", ctypes.c_int32)]
 
 
 # Docs: https://learn.microsoft.com/en-us/windows/win32/api/winuser/ns-winuser-msllhookstruct
@@ -477,24 +1143,122 @@ class MSLLHOOKSTRUCT(ctypes.Structure):
     """
     
     _fields_ = [
-        ("pt", ctypes.wintypes.POINT),
-        ("mouseData", ctypes.c_ulong),
-        ("flags", ctypes.c_ulong),
-        ("time", ctypes.c_ulong),
+        ("pt", POINT),
+        ("mouseData", ctypes.c_uint32),
+        ("flags", ctypes.c_uint32),
+        ("time", ctypes.c_uint32),
         ("dwExtraInfo", ctypes.POINTER(ctypes.c_ulong))
     ]
 
 
+# The C layout of `MSLLHOOKSTRUCT`, used to read the mouse move events without creating ctypes objects.
+ctypedef struct MouseHookData:
+    int x
+    int y
+    unsigned int mouseData
+    unsigned int flags
+    unsigned int time
+    size_t dwExtraInfo
+
+
+cdef class MoveRingBuffer:
+    """
+    Description:
+        A fixed size ring buffer that the mouse hook writes the cursor positions of the `WM_MOUSEMOVE` events into.
+        
+        - Writing a position is a few C assignments, so the hook can record every move event without slowing down the cursor.
+        - A reader (e.g., the hot-zones sampler) periodically drains the unread positions. If the reader falls behind, the oldest
+        positions are overwritten and counted as coalesced instead of growing the buffer.
+        - The buffer is only written and read while holding the GIL, so no additional locking is needed.
+    """
+    
+    cdef int xs[64]
+    cdef int ys[64]
+    cdef unsigned int times[64]
+    cdef public long long writeIndex, readIndex, coalescedMoves
+    
+    def __init__(self):
+        self.writeIndex = 0
+        self.readIndex = 0
+        self.coalescedMoves = 0
+    
+    cdef inline void push(self, int x, int y, unsigned int time):
+        """Records a cursor position. Overwrites the oldest unread position if the buffer is full."""
+        
+        cdef int slot = self.writeIndex & 63
+        
+        self.xs[slot] = x
+        self.ys[slot] = y
+        self.times[slot] = time
+        self.writeIndex += 1
+        
+        if self.writeIndex - self.readIndex > 64:
+            self.readIndex = self.writeIndex - 64
+            self.coalescedMoves += 1
+    
+    cpdef int pending(self):
+        """Returns the number of positions that have not been drained yet."""
+        
+        return self.writeIndex - self.readIndex
+    
+    cpdef list drain(self):
+        """Returns the unread positions as `(x, y, time)` tuples, oldest first, and marks them as read."""
+        
+        cdef list positions = []
+        cdef int slot
+        
+        while self.readIndex < self.writeIndex:
+            slot = self.readIndex & 63
+            positions.append((self.xs[slot], self.ys[slot], self.times[slot]))
+            self.readIndex += 1
+        
+        return positions
+    
+    cpdef tuple latest(self):
+        """Returns the last recorded position as `(x, y, time)`, or `None` if nothing was recorded yet. Does not mark anything as read."""
+        
+        if not self.writeIndex:
+            return None
+        
+        cdef int slot = (self.writeIndex - 1) & 63
+        
+        return (self.xs[slot], self.ys[slot], self.times[slot])
+
+
+# The `MSLLHOOKSTRUCT` flag of the injected mouse events (e.g., by `SendInput`).
+cdef unsigned int LLMHF_INJECTED = 0x01
+
+
 cdef class MouseHookManager:
     """A class for managing mouse hooks and their event listeners."""
     
     cdef public list mouseButtonDownListeners, mouseButtonUpListeners
     cdef public int hookId
+    cdef public ListenerDispatcher dispatcher
+    cdef public SuppressionFilter buttonDownFilter
+    cdef public MoveRingBuffer moveBuffer
+    cdef public LatencyHistogram osToHookTimes, hookTimes
+    cdef public EventJournalWriter journal
+    cdef public MacroRecorder recorder
     
-    def __init__(self):
+    def __init__(self, int workerCount=1, int maxQueueSize=256, double timeBudgetMs=20.0, bint trackMoves=False):
         self.mouseButtonDownListeners = []
         self.mouseButtonUpListeners = []
         self.hookId = 0
+        self.dispatcher = ListenerDispatcher("mouse", workerCount, maxQueueSize)
+        self.buttonDownFilter = SuppressionFilter("mouse", None, timeBudgetMs)
+        
+        # The mouse move events are only recorded when something (e.g., the hot-zones engine) needs them.
+        self.moveBuffer = MoveRingBuffer() if trackMoves else None
+        
+        self.osToHookTimes = getHistogram("mouse.osToHook")
+        self.hookTimes = getHistogram("mouse.hook")
+        
+        # Set to an `EventJournalWriter` to record the raw mouse events.
+        self.journal = None
+        
+        # Set to a `MacroRecorder` to record the mouse input of the user into macros.
+        self.recorder = None
     
     cpdef mouseCallback(self, int nCode, int wParam, lParam):
         """
@@ -507,105 +1271,138 @@ cdef class MouseHookManager:
             - `lParam`: A pointer to a `MSLLHOOKSTRUCT` structure.
         """
         
-        # Filter out mouse move events.
+        cdef MouseHookData * moveData
+        
+        # Mouse move events are too frequent to be handled by the listeners. They are only recorded in the move buffer, the journal, and the macro, if enabled.
         if wParam == MsMsgIds.WM_MOUSEMOVE:
-            return ctypes.windll.user32.CallNextHookEx(None, nCode, wParam, lParam)
+            if (self.moveBuffer is not None or self.journal is not None or self.recorder is not None and self.recorder.recording) and nCode == win32con.HC_ACTION:
+                moveData = <MouseHookData *> <size_t> ctypes.cast(lParam, ctypes.c_void_p).value
+                self.processMouseEvent(wParam, moveData.x, moveData.y, moveData.mouseData, moveData.flags, moveData.time, 0.0)
+            
+            return pfBackend.backend.callNextHook(nCode, wParam, lParam)
         
-        cdef int x, y, flags, pressedButton, wheelDelta # time, dwExtraInfo,
-        cdef bint isMouseAbsolute, isMouseInWindow, isWheelHorizontal, suppressInput
-        cdef MouseEvent mouseEvent
+        cdef unsigned int eventTime
+        cdef bint suppressInput
+        cdef double hookTime = perf_counter()
         
         suppressInput = False
         if nCode == win32con.HC_ACTION:
             lParamStruct_ptr = ctypes.cast(lParam, ctypes.POINTER(MSLLHOOKSTRUCT))
             lParamStruct = lParamStruct_ptr.contents
             
-            x = lParamStruct.pt.x
-            y = lParamStruct.pt.y
-            mouseData = lParamStruct.mouseData
-            flags = lParamStruct.flags
-            # time = datetime.datetime.fromtimestamp(ctypes.c_long(lParamStruct.time).value).astimezone()
+            eventTime = lParamStruct.time
             # dwExtraInfo = lParamStruct.dwExtraInfo
             
-            isMouseAbsolute = bool(flags & RawMouse.MOUSE_MOVE_ABSOLUTE)
-            isMouseInWindow = bool(flags & RawMouse.MOUSE_MOVE_NOCOALESCE)
-            isWheelHorizontal = wParam == MsMsgIds.WM_MOUSEHWHEEL
+            if eventTime:
+                self.osToHookTimes.recordMicros(<unsigned int> (<unsigned int> pfBackend.backend.getTickCount() - eventTime) * 1000LL)
+            
+            suppressInput = self.processMouseEvent(wParam, lParamStruct.pt.x, lParamStruct.pt.y, lParamStruct.mouseData, lParamStruct.flags, eventTime, hookTime)
+        
+        pfBackend.backend.callNextHook(nCode, wParam, lParam)
+        
+        self.hookTimes.record(perf_counter() - hookTime)
+        
+        return suppressInput
+    
+    cpdef bint processMouseEvent(self, int wParam, int x, int y, unsigned int mouseData, int flags, unsigned int eventTime, double hookTime):
+        """
+        Description:
+            Updates the mouse state, decides whether the input is suppressed, and dispatches the event to the listeners.
+            Called by `mouseCallback` with the fields of the `MSLLHOOKSTRUCT`, and by the event journal to replay recorded events.
+            Mouse move events are only recorded in the move buffer and the macro recorder.
+        ---
+        Parameters:
+            - `wParam`: The identifier of the mouse message (event id).
+            - `x`, `y`, `mouseData`, `flags`, `eventTime`: The `pt`, `mouseData`, `flags`, and `time` fields of the `MSLLHOOKSTRUCT`.
+            - `hookTime`: The `perf_counter` value when the event was received.
+        ---
+        Returns:
+            `bool`: Whether the mouse input should be suppressed.
+        """
+        
+        cdef int pressedButton, wheelDelta
+        cdef bint isWheelHorizontal, suppressInput
+        cdef MouseEvent mouseEvent
+        
+        if self.journal is not None:
+            self.journal.recordMouse(wParam, x, y, mouseData, flags, eventTime)
+        
+        if wParam == MsMsgIds.WM_MOUSEMOVE:
+            if self.moveBuffer is not None:
+                self.moveBuffer.push(x, y, eventTime)
             
-            # isLeftButtonPressed   = wParam == win32con.WM_LBUTTONDOWN    # wParam == win32con.WM_LBUTTONUP
-            # isRightButtonPressed  = wParam == win32con.WM_RBUTTONDOWN    # wParam == win32con.WM_RBUTTONUP
-            # isMiddleButtonPressed = wParam == win32con.WM_MBUTTONDOWN    # wParam == win32con.WM_MBUTTONUP
-            # isXButton1Pressed, isXButton2Pressed = (wParam == MsMsgIds.WM_XBUTTONDOWN, False) if (mouseData >> 16 == 1) else (False, wParam == MsMsgIds.WM_XBUTTONDOWN)# wParam == WM_XBUTTONUP
+            if self.recorder is not None and self.recorder.recording and not flags & LLMHF_INJECTED:
+                self.recorder.recordMouse(wParam, x, y, mouseData)
             
-            pressedButton = (
-                (wParam in (MsMsgIds.WM_LBUTTONDOWN, MsMsgIds.WM_LBUTTONUP)) << 4 |
-                (wParam in (MsMsgIds.WM_RBUTTONDOWN, MsMsgIds.WM_RBUTTONUP)) << 3 |
-                (wParam in (MsMsgIds.WM_MBUTTONDOWN, MsMsgIds.WM_MBUTTONUP)) << 2 |
-                (wParam in (MsMsgIds.WM_XBUTTONDOWN, MsMsgIds.WM_XBUTTONUP)) << (1 if (mouseData >> 16 == 1) else 0) # (mouseData >> 17 == 1)
-            )
+            return False
+        
+        suppressInput = False
+        
+        # `IsMouseAbsolute` (RawMouse.MOUSE_MOVE_ABSOLUTE) and `IsMouseInWindow` (RawMouse.MOUSE_MOVE_NOCOALESCE) are extracted from `flags` by the event when they are accessed.
+        isWheelHorizontal = wParam == MsMsgIds.WM_MOUSEHWHEEL
+        
+        # isLeftButtonPressed   = wParam == win32con.WM_LBUTTONDOWN    # wParam == win32con.WM_LBUTTONUP
+        # isRightButtonPressed  = wParam == win32con.WM_RBUTTONDOWN    # wParam == win32con.WM_RBUTTONUP
+        # isMiddleButtonPressed = wParam == win32con.WM_MBUTTONDOWN    # wParam == win32con.WM_MBUTTONUP
+        # isXButton1Pressed, isXButton2Pressed = (wParam == MsMsgIds.WM_XBUTTONDOWN, False) if (mouseData >> 16 == 1) else (False, wParam == MsMsgIds.WM_XBUTTONDOWN)# wParam == WM_XBUTTONUP
+        
+        pressedButton = (
+            (wParam in (MsMsgIds.WM_LBUTTONDOWN, MsMsgIds.WM_LBUTTONUP)) << 4 |
+            (wParam in (MsMsgIds.WM_RBUTTONDOWN, MsMsgIds.WM_RBUTTONUP)) << 3 |
+            (wParam in (MsMsgIds.WM_MBUTTONDOWN, MsMsgIds.WM_MBUTTONUP)) << 2 |
+            (wParam in (MsMsgIds.WM_XBUTTONDOWN, MsMsgIds.WM_XBUTTONUP)) << (1 if (mouseData >> 16 == 1) else 0) # (mouseData >> 17 == 1)
+        )
+        
+        wheelDelta = 0
+        if wParam in (MsMsgIds.WM_MOUSEWHEEL, MsMsgIds.WM_MOUSEHWHEEL):
+            wheelDelta = <short> ((mouseData >> 16) & 0xFFFF)
+        
+        mouseEvent = newMouseEvent(wParam, flags, x, y, <int> mouseData, wheelDelta, pressedButton, eventTime, hookTime)
+        
+        # Button down/press event.
+        if wParam in (MsMsgIds.WM_LBUTTONDOWN, MsMsgIds.WM_RBUTTONDOWN, MsMsgIds.WM_MBUTTONDOWN, MsMsgIds.WM_XBUTTONDOWN, MsMsgIds.WM_NCXBUTTONDOWN, MsMsgIds.WM_MOUSEWHEEL, MsMsgIds.WM_MOUSEHWHEEL):
+            # Updating the state of the mouse for the button down and wheel movement events.
+            msHouse.delta = mouseEvent.Delta
+            
+            msHouse.horizontal = isWheelHorizontal
             
-            wheelDelta = 0
-            if wParam in (MsMsgIds.WM_MOUSEWHEEL, MsMsgIds.WM_MOUSEHWHEEL):
-                wheelDelta = ctypes.c_short((mouseData >> 16) & 0xFFFF).value
-            
-            mouseEvent = MouseEvent(
-                event_id=wParam,
-                event_name=msMsgIdToName[wParam],
-                flags=flags,
-                x=x,
-                y=y,
-                mouse_data=ctypes.c_int(mouseData).value,
-                is_mouse_absolute=isMouseAbsolute,
-                is_mouse_in_window=isMouseInWindow,
-                wheel_delta=wheelDelta,
-                is_wheel_horizontal=isWheelHorizontal,
-                pressed_button=pressedButton
+            msHouse.buttons |= (
+                (mouseEvent.PressedButton == msHouse.LButton)  << 4 |
+                (mouseEvent.PressedButton == msHouse.RButton)  << 3 |
+                (mouseEvent.PressedButton == msHouse.MButton)  << 2 |
+                (mouseEvent.PressedButton == msHouse.X1Button) << 1 |
+                (mouseEvent.PressedButton == msHouse.X2Button)
             )
             
-            # Button down/press event.
-            if wParam in (MsMsgIds.WM_LBUTTONDOWN, MsMsgIds.WM_RBUTTONDOWN, MsMsgIds.WM_MBUTTONDOWN, MsMsgIds.WM_XBUTTONDOWN, MsMsgIds.WM_NCXBUTTONDOWN, MsMsgIds.WM_MOUSEWHEEL, MsMsgIds.WM_MOUSEHWHEEL):
-                # Updating the state of the mouse for the button down and wheel movement events.
-                msHouse.delta = mouseEvent.Delta
-                
-                msHouse.horizontal = mouseEvent.IsWheelHorizontal
-                
-                msHouse.buttons |= (
-                    (mouseEvent.PressedButton == msHouse.LButton)  << 4 |
-                    (mouseEvent.PressedButton == msHouse.RButton)  << 3 |
-                    (mouseEvent.PressedButton == msHouse.MButton)  << 2 |
-                    (mouseEvent.PressedButton == msHouse.X1Button) << 1 |
-                    (mouseEvent.PressedButton == msHouse.X2Button)
-                )
-                
-                
-                # Propagateing the event to the registered butDown listeners.
-                for listener in self.mouseButtonDownListeners:
-                    PThread(target=listener, args=(mouseEvent,)).start()
-                
-                # One of the buttonDown listeners must put a signal in the PThread.msMsgQueue to specify whether to return or suppress the mouse input.
-                if self.mouseButtonDownListeners and PThread.msMsgQueue.get():
-                    suppressInput = True
             
-            # Button up event.
-            else:
-                # Updating the state of the mouse for the button up, mouse movement, and other events.
-                msHouse.x, msHouse.y = mouseEvent.X, mouseEvent.Y
-                
-                msHouse.delta = mouseEvent.Delta
-                
-                msHouse.horizontal = mouseEvent.IsWheelHorizontal
-                
-                msHouse.buttons &= ~(
-                    (mouseEvent.PressedButton == msHouse.LButton)  << 4 |
-                    (mouseEvent.PressedButton == msHouse.RButton)  << 3 |
-                    (mouseEvent.PressedButton == msHouse.MButton)  << 2 |
-                    (mouseEvent.PressedButton == msHouse.X1Button) << 1 |
-                    (mouseEvent.PressedButton == msHouse.X2Button)
-                )
-                
-                # Propagating the event to the registered buttonUp listeners.
-                for listener in self.mouseButtonUpListeners:
-                    PThread(target=listener, args=(mouseEvent,)).start()
+            # Deciding whether to suppress the mouse input before handing the event to the listeners, which run asynchronously.
+            suppressInput = self.buttonDownFilter.decide(mouseEvent)
+            mouseEvent.Suppressed = suppressInput
+            
+            # Propagateing the event to the registered butDown listeners.
+            self.dispatcher.dispatch(self.mouseButtonDownListeners, mouseEvent)
+        
+        # Button up event.
+        else:
+            # Updating the state of the mouse for the button up, mouse movement, and other events.
+            msHouse.x, msHouse.y = mouseEvent.X, mouseEvent.Y
+            
+            msHouse.delta = mouseEvent.Delta
+            
+            msHouse.horizontal = isWheelHorizontal
+            
+            msHouse.buttons &= ~(
+                (mouseEvent.PressedButton == msHouse.LButton)  << 4 |
+                (mouseEvent.PressedButton == msHouse.RButton)  << 3 |
+                (mouseEvent.PressedButton == msHouse.MButton)  << 2 |
+                (mouseEvent.PressedButton == msHouse.X1Button) << 1 |
+                (mouseEvent.PressedButton == msHouse.X2Button)
+            )
+            
+            # Propagating the event to the registered buttonUp listeners.
+            self.dispatcher.dispatch(self.mouseButtonUpListeners, mouseEvent)
         
-        ctypes.windll.user32.CallNextHookEx(None, nCode, wParam, lParam)
+        if self.recorder is not None and self.recorder.recording and not flags & LLMHF_INJECTED and not suppressInput:
+            self.recorder.recordMouse(wParam, x, y, mouseData)
         
         return suppressInput
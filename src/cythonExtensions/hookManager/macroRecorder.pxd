@@ -0,0 +1,66 @@
+cdef enum StepKinds:
+    KEY_DOWN     = 1
+    KEY_UP       = 2
+    MOUSE_MOVE   = 3
+    MOUSE_BUTTON = 4
+    MOUSE_WHEEL  = 5
+
+
+ctypedef packed struct MacroStep:
+    unsigned char kind, extended
+    unsigned short code
+    unsigned short repeats, repeatInterval
+    int x, y, data
+    unsigned int delay
+
+
+cdef class PlaybackInputs:
+    cdef dict keys, buttons
+    cdef object lock
+    cdef bint released
+    
+    cpdef void send(self, list inputs)
+    
+    cpdef void release(self)
+
+
+cdef class Macro:
+    cdef str name
+    cdef bytes data
+    cdef long long count, inputCount
+    cdef double duration
+    
+    cdef inline const MacroStep * stepAt(self, long long index)
+    
+    cpdef tuple getStep(self, long long index)
+    
+    cdef tuple stepInput(self, const MacroStep * step, tuple screen)
+    
+    cpdef list toBatches(self, double speed=*)
+    
+    cpdef object play(self, double speed=*)
+    
+    cpdef void save(self, str filePath)
+
+
+cdef class MacroRecorder:
+    cdef bint recording
+    cdef double maxIdleGap, moveInterval
+    cdef long long recordedEvents, mergedEvents, shortenedGaps
+    cdef Macro lastMacro
+    cdef bytearray buffer
+    cdef double lastTime, repeatStartedAt
+    
+    cpdef void start(self)
+    
+    cdef inline MacroStep * lastStep(self)
+    
+    cdef MacroStep * append(self, double now, unsigned char kind, unsigned short code, int data, int x, int y, bint extended)
+    
+    cdef void recordKeyboard(self, int wParam, int vkCode, int scanCode, int flags)
+    
+    cdef void recordMouse(self, int wParam, int x, int y, unsigned int mouseData)
+    
+    cpdef Macro stop(self, str name=*)
+    
+    cpdef dict getStats(self)
@@ -0,0 +1,166 @@
+"""
+This module records the keyboard and mouse input of the user into macros, and plays them back with `SendInput`.
+
+A macro is a compact array of fixed-size 24-byte steps, each one holding an input and its delay from the previous step.
+While recording, the idle gaps are shortened to `maxIdleGap`, the auto-repeated key downs of a held key are merged into one step,
+and the mouse moves are coalesced to one step per `moveInterval`. A macro is played as a timeline of the shared scheduler
+(`timelineHelper`) at any speed from `MIN_PLAYBACK_SPEED`, or injected at once, in batches of `SendInput` calls, at the maximum speed.
+
+A macro file starts with a 16-byte header (`MACRO_MAGIC`, the format version, and the step size), followed by the steps.
+
+Warning: a macro contains every recorded keystroke, including typed passwords.
+"""
+
+from cythonExtensions.timelineHelper.timelineHelper import Timeline
+
+
+MACRO_MAGIC: bytes
+"""The first 8 bytes of every macro file."""
+
+MACRO_VERSION: int
+"""The version of the macro format."""
+
+MIN_PLAYBACK_SPEED: float
+"""The slowest playback speed. A speed of `0` plays a macro at the maximum speed."""
+
+MAX_BATCH_SIZE: int
+"""The maximum number of inputs injected by one `SendInput` call when a macro is played at the maximum speed."""
+
+
+def validateHeader(header: bytes, filePath: str) -> None:
+    """Raises a `ValueError` if the given bytes are not a valid macro header."""
+    ...
+
+
+class PlaybackInputs:
+    """
+    Description:
+        Injects the batches of a played macro, and keeps the keys and mouse buttons they leave pressed, so `release` can release them when
+        the playback is finished or cancelled. The batches run on the scheduler thread, while a cancelled playback is released by the
+        cancelling thread, so both are serialized by a lock.
+    """
+    
+    released: bool
+    
+    def __init__(self) -> None:
+        ...
+    
+    def send(self, inputs: list[tuple]) -> None:
+        """Injects the given inputs, unless the playback was released, and tracks the keys and buttons they press and release."""
+        ...
+    
+    def release(self) -> None:
+        """Releases the keys and buttons left pressed by the injected inputs, and stops injecting the next batches."""
+        ...
+
+
+class Macro:
+    """
+    Description:
+        A recorded macro. Its steps are stored in one immutable `bytes` object, and are decoded only when the macro is played.
+        Created by `MacroRecorder.stop`, or loaded with `loadMacro`.
+    ---
+    Attributes:
+        `count -> int`: The number of steps.
+        
+        `duration -> float`: The playback time in seconds at the normal speed.
+        
+        `inputCount -> int`: The number of inputs the macro injects, including the key repeats.
+    """
+    
+    name: str
+    data: bytes
+    count: int
+    inputCount: int
+    duration: float
+    
+    def __init__(self, name: str, data: bytes):
+        ...
+    
+    def __len__(self) -> int:
+        ...
+    
+    def getStep(self, index: int) -> tuple[int, int, int, int, int, int, int, int, int]:
+        """Decodes the step at the given index as `(kind, code, data, x, y, extended, repeats, repeatInterval, delay)`, e.g., for inspecting a macro."""
+        ...
+    
+    def toBatches(self, speed=1.0) -> list[tuple[float, list[tuple]]]:
+        """
+        Description:
+            Converts the steps to `(offset, inputs)` batches, where `offset` is the time in seconds from the start of the playback.
+            The inputs that are due within a millisecond of each other are put in the same batch.
+        ---
+        Parameters:
+            `speed -> float`: `1` keeps the recorded timing, `2` is twice as fast, and so on. `0` puts all the inputs at offset `0`.
+        """
+        ...
+    
+    def play(self, speed=1.0) -> Timeline | None:
+        """
+        Description:
+            Plays the macro.
+        ---
+        Parameters:
+            `speed -> float`: The playback speed, from `MIN_PLAYBACK_SPEED` up. `0` injects all the inputs at once, in batches of `MAX_BATCH_SIZE`.
+        ---
+        Returns:
+            `Timeline | None`: The scheduled timeline, which can be waited on or cancelled. `None` if the macro was played at the maximum speed.
+        """
+        ...
+    
+    def save(self, filePath: str) -> None:
+        """Writes the macro to the given file, replacing it if it exists."""
+        ...
+
+
+def loadMacro(filePath: str) -> Macro:
+    """Reads the macro saved at the given path. The macro is named after the file."""
+    ...
+
+
+class MacroRecorder:
+    """
+    Description:
+        Records the input of the user into a macro, between `start` and `stop`. The injected input (e.g., a played macro) is not recorded.
+        
+        Assign it to the `recorder` attribute of `KeyboardHookManager`/`MouseHookManager`, which call it with the events that reach the applications.
+        The steps are written into a growing `bytearray` by the hook thread, and are only read after recording, so no locking is needed.
+    ---
+    Parameters:
+        `maxIdleGap -> float`: The longest delay in seconds kept between two steps. Longer idle gaps are shortened to it.
+        
+        `moveInterval -> float`: The mouse moves within this many seconds of the last recorded move only update its position.
+    """
+    
+    recording: bool
+    maxIdleGap: float
+    moveInterval: float
+    recordedEvents: int
+    mergedEvents: int
+    shortenedGaps: int
+    lastMacro: Macro | None
+    
+    def __init__(self, maxIdleGap=1.0, moveInterval=0.015):
+        ...
+    
+    def start(self) -> None:
+        """Starts recording a new macro."""
+        ...
+    
+    def stop(self, name="macro") -> Macro:
+        """
+        Description:
+            Stops recording, and returns the recorded macro, which is also kept in `lastMacro`.
+            
+            The unpaired key and button events are dropped, so the keys of the hotkeys that start and stop the recording
+            are not played (e.g., the releases of the start hotkey, and the presses of the stop hotkey).
+        """
+        ...
+    
+    def getStats(self) -> dict[str, int | bool]:
+        """Returns the number of recorded and merged events and shortened idle gaps of the current (or last) recording."""
+        ...
+
+
+macroRecorder: MacroRecorder
+"""The macro recorder of the script."""
@@ -0,0 +1,526 @@
+# cython: language_level = 3str
+
+"""
+This extension module records the keyboard and mouse input of the user into macros, and plays them back with `SendInput`.
+
+A macro is a compact array of fixed-size 24-byte steps (`MacroStep`), each one holding an input and its delay from the previous step.
+While recording, the idle gaps are shortened to `maxIdleGap`, the auto-repeated key downs of a held key are merged into one step,
+and the mouse moves are coalesced to one step per `moveInterval`. A macro is played as a timeline of the shared scheduler
+(`timelineHelper`) at any speed from `MIN_PLAYBACK_SPEED`, or injected at once, in batches of `SendInput` calls, at the maximum speed.
+
+A macro file starts with a 16-byte header (`MACRO_MAGIC`, the format version, and the step size), followed by the steps.
+
+Warning: a macro contains every recorded keystroke, including typed passwords.
+"""
+
+from cpython.bytearray cimport PyByteArray_AS_STRING, PyByteArray_GET_SIZE, PyByteArray_Resize
+from cpython.bytes cimport PyBytes_FromStringAndSize
+from libc.string cimport memcpy
+from cythonExtensions.timelineHelper.timelineHelper cimport Timeline
+
+import os, struct, threading
+from time import perf_counter
+
+from cythonExtensions.platformBackend import platformBackend as pfBackend
+from cythonExtensions.platformBackend.platformBackend import win32con, MOUSE_INPUT
+from cythonExtensions.timelineHelper.timelineHelper import scheduler
+
+
+MACRO_MAGIC = b"MACROPYM"
+"""The first 8 bytes of every macro file."""
+
+MACRO_VERSION = 1
+"""The version of the macro format."""
+
+MIN_PLAYBACK_SPEED = 0.25
+"""The slowest playback speed. A speed of `0` plays a macro at the maximum speed."""
+
+MAX_BATCH_SIZE = 512
+"""The maximum number of inputs injected by one `SendInput` call when a macro is played at the maximum speed."""
+
+cdef enum StepKinds:
+    KEY_DOWN     = 1
+    KEY_UP       = 2
+    MOUSE_MOVE   = 3
+    MOUSE_BUTTON = 4
+    MOUSE_WHEEL  = 5
+
+
+# `code` holds the virtual key code of the key steps, and the `MOUSEEVENTF_*` flag of the mouse button and wheel steps.
+# `data` holds the scan code of the key steps, the X button of the mouse button steps, and the wheel delta of the wheel steps.
+# `delay` is the time in microseconds since the previous step (or since its last repeat), after shortening the idle gaps.
+ctypedef packed struct MacroStep:
+    unsigned char kind, extended
+    unsigned short code
+    unsigned short repeats, repeatInterval
+    int x, y, data
+    unsigned int delay
+
+
+cdef int HEADER_SIZE = 16
+cdef int STEP_SIZE = sizeof(MacroStep)
+
+# The steps played within this many seconds of each other are injected by one `SendInput` call.
+cdef double BATCH_WINDOW = 0.001
+
+# The `(down, up)` messages of the mouse buttons, and their `MOUSEEVENTF_*` flags.
+cdef dict mouseButtonFlags = {
+    win32con.WM_LBUTTONDOWN: win32con.MOUSEEVENTF_LEFTDOWN,   win32con.WM_LBUTTONUP: win32con.MOUSEEVENTF_LEFTUP,
+    win32con.WM_RBUTTONDOWN: win32con.MOUSEEVENTF_RIGHTDOWN,  win32con.WM_RBUTTONUP: win32con.MOUSEEVENTF_RIGHTUP,
+    win32con.WM_MBUTTONDOWN: win32con.MOUSEEVENTF_MIDDLEDOWN, win32con.WM_MBUTTONUP: win32con.MOUSEEVENTF_MIDDLEUP,
+    win32con.WM_XBUTTONDOWN: win32con.MOUSEEVENTF_XDOWN,      win32con.WM_XBUTTONUP: win32con.MOUSEEVENTF_XUP,
+}
+
+# The flags of the button downs, used to pair them with their ups when a macro is compiled.
+cdef int BUTTON_DOWN_FLAGS = win32con.MOUSEEVENTF_LEFTDOWN | win32con.MOUSEEVENTF_RIGHTDOWN | win32con.MOUSEEVENTF_MIDDLEDOWN | win32con.MOUSEEVENTF_XDOWN
+
+
+def validateHeader(header: bytes, filePath: str) -> None:
+    """Raises a `ValueError` if the given bytes are not a valid macro header."""
+    
+    if len(header) < HEADER_SIZE or header[:8] != MACRO_MAGIC:
+        raise ValueError(f"'{filePath}' is not a macro file.")
+    
+    version, stepSize = struct.unpack("<II", header[8:HEADER_SIZE])
+    
+    if version != MACRO_VERSION or stepSize != STEP_SIZE:
+        raise ValueError(f"'{filePath}' uses an unsupported macro format (version {version}, step size {stepSize}).")
+
+
+cdef tuple screenMapping():
+    """Returns the `(left, top, width, height, flags)` used to convert the cursor positions to the absolute `SendInput` coordinates."""
+    
+    backend = pfBackend.backend
+    cdef int width = backend.getSystemMetrics(win32con.SM_CXVIRTUALSCREEN), height = backend.getSystemMetrics(win32con.SM_CYVIRTUALSCREEN)
+    
+    if width and height:
+        return (backend.getSystemMetrics(win32con.SM_XVIRTUALSCREEN), backend.getSystemMetrics(win32con.SM_YVIRTUALSCREEN), width, height,
+                win32con.MOUSEEVENTF_MOVE | win32con.MOUSEEVENTF_ABSOLUTE | win32con.MOUSEEVENTF_VIRTUALDESK)
+    
+    # Only the primary monitor is known.
+    return (0, 0, max(backend.getSystemMetrics(win32con.SM_CXSCREEN), 1), max(backend.getSystemMetrics(win32con.SM_CYSCREEN), 1),
+            win32con.MOUSEEVENTF_MOVE | win32con.MOUSEEVENTF_ABSOLUTE)
+
+
+cdef class PlaybackInputs:
+    """
+    Description:
+        Injects the batches of a played macro, and keeps the keys and mouse buttons they leave pressed, so `release` can release them when
+        the playback is finished or cancelled. The batches run on the scheduler thread, while a cancelled playback is released by the
+        cancelling thread, so both are serialized by a lock.
+    """
+    
+    cdef dict keys, buttons
+    cdef object lock
+    cdef public bint released
+    
+    def __init__(self):
+        self.keys = {}
+        self.buttons = {}
+        self.lock = threading.Lock()
+        self.released = False
+    
+    cpdef void send(self, list inputs):
+        """Injects the given inputs, unless the playback was released, and tracks the keys and buttons they press and release."""
+        
+        cdef int flags
+        
+        with self.lock:
+            if self.released:
+                return
+            
+            pfBackend.backend.sendInputs(inputs)
+            
+            for entry in inputs:
+                if entry[0] == MOUSE_INPUT:
+                    flags = entry[1]
+                    
+                    # The up flag of each button is its down flag shifted by one bit.
+                    if flags & BUTTON_DOWN_FLAGS:
+                        self.buttons[(flags & BUTTON_DOWN_FLAGS, entry[4])] = (MOUSE_INPUT, (flags & BUTTON_DOWN_FLAGS) << 1, 0, 0, entry[4])
+                    
+                    elif flags & BUTTON_DOWN_FLAGS << 1:
+                        self.buttons.pop(((flags >> 1) & BUTTON_DOWN_FLAGS, entry[4]), None)
+                
+                elif entry[2] & win32con.KEYEVENTF_KEYUP:
+                    self.keys.pop(entry[0], None)
+                
+                else:
+                    self.keys[entry[0]] = (entry[0], entry[1], entry[2] | win32con.KEYEVENTF_KEYUP)
+    
+    cpdef void release(self):
+        """Releases the keys and buttons left pressed by the injected inputs, and stops injecting the next batches."""
+        
+        cdef list inputs
+        
+        with self.lock:
+            self.released = True
+            inputs = list(self.keys.values()) + list(self.buttons.values())
+            self.keys.clear()
+            self.buttons.clear()
+            
+            if inputs:
+                pfBackend.backend.sendInputs(inputs)
+
+
+cdef class Macro:
+    """
+    Description:
+        A recorded macro. Its steps are stored in one immutable `bytes` object, and are decoded only when the macro is played.
+        Created by `MacroRecorder.stop`, or loaded with `loadMacro`.
+    ---
+    Attributes:
+        `count -> int`: The number of steps.
+        
+        `duration -> float`: The playback time in seconds at the normal speed.
+        
+        `inputCount -> int`: The number of inputs the macro injects, including the key repeats.
+    """
+    
+    cdef public str name
+    cdef public bytes data
+    cdef public long long count, inputCount
+    cdef public double duration
+    
+    def __init__(self, str name, bytes data):
+        cdef const MacroStep * step
+        cdef long long index
+        
+        if len(data) % STEP_SIZE:
+            raise ValueError(f'The data of the macro "{name}" is not a whole number of steps.')
+        
+        self.name = name
+        self.data = data
+        self.count = len(data) // STEP_SIZE
+        self.duration = 0.0
+        self.inputCount = 0
+        
+        for index in range(self.count):
+            step = self.stepAt(index)
+            self.duration += step.delay / 1e6 + step.repeats * step.repeatInterval / 1000.0
+            self.inputCount += 1 + step.repeats
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    cdef inline const MacroStep * stepAt(self, long long index):
+        return <const MacroStep *> (<const char *> self.data + index * STEP_SIZE)
+    
+    cpdef tuple getStep(self, long long index):
+        """Decodes the step at the given index as `(kind, code, data, x, y, extended, repeats, repeatInterval, delay)`, e.g., for inspecting a macro."""
+        
+        if not 0 <= index < self.count:
+            raise IndexError("Macro step index out of range.")
+        
+        cdef const MacroStep * step = self.stepAt(index)
+        
+        return (step.kind, step.code, step.data, step.x, step.y, step.extended, step.repeats, step.repeatInterval, step.delay)
+    
+    cdef tuple stepInput(self, const MacroStep * step, tuple screen):
+        """Returns the `sendInputs` input of the given step. `screen` is the result of `screenMapping`."""
+        
+        cdef int left = screen[0], top = screen[1], width = screen[2], height = screen[3]
+        cdef int flags = step.extended * win32con.KEYEVENTF_EXTENDEDKEY
+        
+        if step.kind == KEY_DOWN:
+            return (step.code, step.data, flags)
+        
+        if step.kind == KEY_UP:
+            return (step.code, step.data, flags | win32con.KEYEVENTF_KEYUP)
+        
+        # The absolute coordinates map the screen to the range [0, 65536). Rounding them up keeps the cursor on the recorded pixel.
+        flags = screen[4] | (step.code if step.kind != MOUSE_MOVE else 0)
+        
+        return (MOUSE_INPUT, flags, ((step.x - left) * 65536 + width - 1) // width, ((step.y - top) * 65536 + height - 1) // height, step.data)
+    
+    cpdef list toBatches(self, double speed=1.0):
+        """
+        Description:
+            Converts the steps to `(offset, inputs)` batches, where `offset` is the time in seconds from the start of the playback.
+            The inputs that are due within a millisecond of each other are put in the same batch.
+        ---
+        Parameters:
+            `speed -> float`: `1` keeps the recorded timing, `2` is twice as fast, and so on. `0` puts all the inputs at offset `0`.
+        """
+        
+        cdef const MacroStep * step
+        cdef long long index
+        cdef int repeat
+        cdef double offset = 0.0, batchOffset = -1.0
+        cdef tuple screen = screenMapping()
+        cdef list batches = [], inputs = None
+        
+        for index in range(self.count):
+            step = self.stepAt(index)
+            entry = self.stepInput(step, screen)
+            
+            for repeat in range(step.repeats + 1):
+                if speed > 0:
+                    offset += (step.delay / 1e6 if not repeat else step.repeatInterval / 1000.0) / speed
+                
+                if inputs is None or offset - batchOffset >= BATCH_WINDOW:
+                    inputs = []
+                    batchOffset = offset
+                    batches.append((offset, inputs))
+                
+                inputs.append(entry)
+        
+        return batches
+    
+    cpdef object play(self, double speed=1.0):
+        """
+        Description:
+            Plays the macro.
+        ---
+        Parameters:
+            `speed -> float`: The playback speed, from `MIN_PLAYBACK_SPEED` up. `0` injects all the inputs at once, in batches of `MAX_BATCH_SIZE`.
+        ---
+        Returns:
+            `Timeline | None`: The scheduled timeline, which can be waited on or cancelled. `None` if the macro was played at the maximum speed.
+        """
+        
+        cdef list inputs
+        cdef long long start
+        cdef Timeline timeline
+        
+        if speed and speed < MIN_PLAYBACK_SPEED:
+            raise ValueError(f"The playback speed must be {MIN_PLAYBACK_SPEED} or more, or 0 for the maximum speed.")
+        
+        # No key or button is left pressed, whether the playback is finished or cancelled halfway.
+        playback = PlaybackInputs()
+        
+        if not speed:
+            inputs = [entry for _, batch in self.toBatches(0.0) for entry in batch]
+            
+            for start in range(0, len(inputs), MAX_BATCH_SIZE):
+                playback.send(inputs[start:start + MAX_BATCH_SIZE])
+            
+            playback.release()
+            
+            return None
+        
+        timeline = Timeline(f"macro {self.name}")
+        timeline.onCancel = playback.release
+        
+        for offset, batch in self.toBatches(speed):
+            timeline.at(offset, playback.send, (batch,))
+        
+        timeline.after(0.0, playback.release)
+        
+        return scheduler.schedule(timeline)
+    
+    cpdef void save(self, str filePath):
+        """Writes the macro to the given file, replacing it if it exists."""
+        
+        with open(filePath, "wb") as macroFile:
+            macroFile.write(MACRO_MAGIC + struct.pack("<II", MACRO_VERSION, STEP_SIZE))
+            macroFile.write(self.data)
+    
+    def __repr__(self) -> str:
+        return f"Macro({self.name!r}, {self.count} steps, {self.inputCount} inputs, {self.duration:.2f} s)"
+
+
+def loadMacro(str filePath) -> Macro:
+    """Reads the macro saved at the given path. The macro is named after the file."""
+    
+    with open(filePath, "rb") as macroFile:
+        validateHeader(macroFile.read(HEADER_SIZE), filePath)
+        data = macroFile.read()
+    
+    # A partially written last step (e.g., after a crash) is ignored.
+    return Macro(os.path.splitext(os.path.basename(filePath))[0], data[:len(data) - len(data) % STEP_SIZE])
+
+
+cdef class MacroRecorder:
+    """
+    Description:
+        Records the input of the user into a macro, between `start` and `stop`. The injected input (e.g., a played macro) is not recorded.
+        
+        Assign it to the `recorder` attribute of `KeyboardHookManager`/`MouseHookManager`, which call it with the events that reach the applications.
+        The steps are written into a growing `bytearray` by the hook thread, and are only read after recording, so no locking is needed.
+    ---
+    Parameters:
+        `maxIdleGap -> float`: The longest delay in seconds kept between two steps. Longer idle gaps are shortened to it.
+        
+        `moveInterval -> float`: The mouse moves within this many seconds of the last recorded move only update its position.
+    """
+    
+    cdef public bint recording
+    cdef public double maxIdleGap, moveInterval
+    cdef public long long recordedEvents, mergedEvents, shortenedGaps
+    cdef public Macro lastMacro
+    cdef bytearray buffer
+    cdef double lastTime, repeatStartedAt
+    
+    def __init__(self, double maxIdleGap=1.0, double moveInterval=0.015):
+        self.recording = False
+        self.maxIdleGap = maxIdleGap
+        self.moveInterval = moveInterval
+        self.recordedEvents = self.mergedEvents = self.shortenedGaps = 0
+        self.lastMacro = None
+        self.buffer = bytearray()
+        self.lastTime = self.repeatStartedAt = 0.0
+    
+    cpdef void start(self):
+        """Starts recording a new macro."""
+        
+        self.buffer = bytearray()
+        self.recordedEvents = self.mergedEvents = self.shortenedGaps = 0
+        self.lastTime = perf_counter()
+        self.recording = True
+    
+    cdef inline MacroStep * lastStep(self):
+        """Returns the last recorded step, or `NULL` if nothing was recorded yet."""
+        
+        cdef Py_ssize_t size = PyByteArray_GET_SIZE(self.buffer)
+        
+        return <MacroStep *> (PyByteArray_AS_STRING(self.buffer) + size - STEP_SIZE) if size else NULL
+    
+    cdef MacroStep * append(self, double now, unsigned char kind, unsigned short code, int data, int x, int y, bint extended):
+        """Appends a step, with its delay from the previous one, and returns it."""
+        
+        cdef double gap = now - self.lastTime
+        cdef Py_ssize_t size = PyByteArray_GET_SIZE(self.buffer)
+        cdef MacroStep * step
+        
+        if gap > self.maxIdleGap:
+            gap = self.maxIdleGap
+            self.shortenedGaps += 1
+        
+        PyByteArray_Resize(self.buffer, size + STEP_SIZE)
+        step = <MacroStep *> (PyByteArray_AS_STRING(self.buffer) + size)
+        
+        step.kind = kind
+        step.extended = extended
+        step.code = code
+        step.repeats = step.repeatInterval = 0
+        step.x, step.y, step.data = x, y, data
+        step.delay = <unsigned int> (max(gap, 0.0) * 1e6)
+        
+        self.lastTime = now
+        self.recordedEvents += 1
+        
+        return step
+    
+    cdef void recordKeyboard(self, int wParam, int vkCode, int scanCode, int flags):
+        """Records a key down or up. The auto-repeated key downs of the last pressed key are merged into its step."""
+        
+        cdef double now = perf_counter()
+        cdef bint isKeyDown = wParam in (win32con.WM_KEYDOWN, win32con.WM_SYSKEYDOWN)
+        cdef MacroStep * step = self.lastStep()
+        
+        if isKeyDown and step != NULL and step.kind == KEY_DOWN and step.code == vkCode and step.repeats < 0xFFFF:
+            step.repeats += 1
+            step.repeatInterval = <unsigned short> min((now - self.repeatStartedAt) * 1000 / step.repeats, 0xFFFF)
+            self.lastTime = now
+            self.recordedEvents += 1
+            self.mergedEvents += 1
+            
+            return
+        
+        self.append(now, KEY_DOWN if isKeyDown else KEY_UP, vkCode, scanCode, 0, 0, flags & 1)
+        
+        if isKeyDown:
+            self.repeatStartedAt = now
+    
+    cdef void recordMouse(self, int wParam, int x, int y, unsigned int mouseData):
+        """Records a mouse move, button down or up, or wheel rotation. Moves closer than `moveInterval` to the last recorded one only update its position."""
+        
+        cdef double now = perf_counter()
+        cdef MacroStep * step
+        
+        if wParam == win32con.WM_MOUSEMOVE:
+            step = self.lastStep()
+            
+            if step != NULL and step.kind == MOUSE_MOVE and now - self.lastTime < self.moveInterval:
+                step.x, step.y = x, y
+                self.recordedEvents += 1
+                self.mergedEvents += 1
+            
+            else:
+                self.append(now, MOUSE_MOVE, 0, 0, x, y, False)
+        
+        elif wParam in (win32con.WM_MOUSEWHEEL, win32con.WM_MOUSEHWHEEL):
+            self.append(now, MOUSE_WHEEL, win32con.MOUSEEVENTF_WHEEL if wParam == win32con.WM_MOUSEWHEEL else win32con.MOUSEEVENTF_HWHEEL,
+                        <short> ((mouseData >> 16) & 0xFFFF), x, y, False)
+        
+        elif wParam in mouseButtonFlags:
+            self.append(now, MOUSE_BUTTON, mouseButtonFlags[wParam], mouseData >> 16, x, y, False)
+    
+    cpdef Macro stop(self, str name="macro"):
+        """
+        Description:
+            Stops recording, and returns the recorded macro, which is also kept in `lastMacro`.
+            
+            The unpaired key and button events are dropped, so the keys of the hotkeys that start and stop the recording
+            are not played (e.g., the releases of the start hotkey, and the presses of the stop hotkey).
+        """
+        
+        cdef bytes data
+        cdef const char * steps
+        cdef const MacroStep * step
+        cdef MacroStep kept
+        cdef long long index, count
+        cdef unsigned int carriedDelay = 0
+        cdef dict pressedAt = {}
+        cdef list keptSteps = []
+        cdef set dropped = set()
+        
+        self.recording = False
+        data = bytes(self.buffer)
+        self.buffer = bytearray()
+        steps = data
+        count = len(data) // STEP_SIZE
+        
+        # Pairing the downs and the ups of each key (by its `vkCode`) and mouse button (by its down flag and X button).
+        for index in range(count):
+            step = <const MacroStep *> (steps + index * STEP_SIZE)
+            
+            if step.kind == KEY_DOWN:
+                pressedAt.setdefault(step.code, index)
+            
+            elif step.kind == KEY_UP:
+                if pressedAt.pop(step.code, None) is None:
+                    dropped.add(index)
+            
+            elif step.kind == MOUSE_BUTTON:
+                if step.code & BUTTON_DOWN_FLAGS:
+                    pressedAt.setdefault((step.code, step.data), index)
+                
+                # The up flag of each button is the one after its down flag.
+                elif pressedAt.pop((step.code >> 1, step.data), None) is None:
+                    dropped.add(index)
+        
+        dropped.update(pressedAt.values())
+        
+        # The delays of the dropped steps are added to the next kept step, so the timing of the macro does not change.
+        for index in range(count):
+            step = <const MacroStep *> (steps + index * STEP_SIZE)
+            
+            if index in dropped:
+                carriedDelay += step.delay + step.repeats * step.repeatInterval * 1000
+                continue
+            
+            memcpy(&kept, step, STEP_SIZE)
+            kept.delay += carriedDelay
+            carriedDelay = 0
+            keptSteps.append(PyBytes_FromStringAndSize(<char *> &kept, STEP_SIZE))
+        
+        self.lastMacro = Macro(name, b"".join(keptSteps))
+        
+        return self.lastMacro
+    
+    cpdef dict getStats(self):
+        """Returns the number of recorded and merged events and shortened idle gaps of the current (or last) recording."""
+        
+        return {
+            "recording":      self.recording,
+            "recordedEvents": self.recordedEvents,
+            "recordedSteps":  PyByteArray_GET_SIZE(self.buffer) // STEP_SIZE if self.recording else (self.lastMacro.count if self.lastMacro is not None else 0),
+            "mergedEvents":   self.mergedEvents,
+            "shortenedGaps":  self.shortenedGaps,
+        }
+
+
+macroRecorder = MacroRecorder()
+"""The macro recorder of the script."""
@@ -0,0 +1,184 @@
+"""This module implements hot zones: screen regions (corners, edges, and rectangles) that trigger actions when the cursor enters, leaves, or dwells in them."""
+
+from typing import Any, Callable
+from cythonExtensions.hookManager.hookManager import MoveRingBuffer
+
+
+class HotZone:
+    """
+    Description:
+        A rectangular screen region with optional actions. The rectangle includes its left/top edges and excludes its right/bottom edges.
+    ---
+    Parameters:
+        `name -> str`: The name of the zone, used when reporting it.
+        
+        `left, top, right, bottom -> int`: The bounds of the zone in screen coordinates.
+        
+        `onEnter, onLeave, onDwell -> tuple[Callable, tuple] | None`:
+            The actions to run, as `(function, arguments)`, when the cursor enters the zone, leaves it, or stays in it for `dwellMs`.
+        
+        `dwellMs -> float`: How long, in milliseconds, the cursor must stay in the zone before `onDwell` is triggered (once per visit).
+    """
+    
+    name: str
+    left: int
+    top: int
+    right: int
+    bottom: int
+    onEnter: tuple[Callable, tuple] | None
+    onLeave: tuple[Callable, tuple] | None
+    onDwell: tuple[Callable, tuple] | None
+    dwellTime: float
+    enteredAt: float
+    inside: bool
+    dwellFired: bool
+    
+    def __init__(self, name: str, left: int, top: int, right: int, bottom: int, onEnter: tuple[Callable, tuple] | None=None,
+                 onLeave: tuple[Callable, tuple] | None=None, onDwell: tuple[Callable, tuple] | None=None, dwellMs=400.0):
+        ...
+
+
+class ZoneGrid:
+    """
+    Description:
+        A uniform grid that maps each cell of the screen to the zones overlapping it.
+        Finding the zones under the cursor costs a single dictionary lookup plus checking the few zones of that cell,
+        regardless of the total number of zones.
+    ---
+    Parameters:
+        `cellSize -> int`: The width and height of each cell in pixels.
+    """
+    
+    cellSize: int
+    
+    def __init__(self, cellSize=64):
+        ...
+    
+    def add(self, zone: HotZone) -> None:
+        """Adds the zone to all the cells it overlaps."""
+        ...
+    
+    def remove(self, zone: HotZone) -> None:
+        """Removes the zone from all the cells it overlaps."""
+        ...
+    
+    def clear(self) -> None:
+        """Removes all the zones."""
+        ...
+    
+    def candidates(self, x: int, y: int) -> list[HotZone]:
+        """Returns the zones of the cell that contains the given point. Some of them may not contain the point itself."""
+        ...
+
+
+class HotZoneEngine:
+    """
+    Description:
+        Tracks the cursor against a set of hot zones and runs their actions.
+        
+        - The mouse hook records the move events into a `MoveRingBuffer` and returns immediately, so the cursor stays smooth.
+        - A sampler thread drains the buffer `sampleRate` times per second and tests the drained positions against a `ZoneGrid`.
+        - The actions run in the sampler thread. Long running actions should start their own threads.
+    ---
+    Parameters:
+        `moveBuffer -> MoveRingBuffer`: The buffer written by the mouse hook (`MouseHookManager(trackMoves=True).moveBuffer`).
+        
+        `sampleRate -> float`: How many times per second the buffer is sampled.
+        
+        `cellSize -> int`: The cell size of the zone grid in pixels.
+    """
+    
+    grid: ZoneGrid
+    zones: list[HotZone]
+    activeZones: list[HotZone]
+    sampleInterval: float
+    samples: int
+    checkedPositions: int
+    triggeredActions: int
+    failedActions: int
+    
+    def __init__(self, moveBuffer: MoveRingBuffer, sampleRate=60.0, cellSize=64):
+        ...
+    
+    def addZone(self, zone: HotZone) -> None:
+        """Registers a new hot zone."""
+        ...
+    
+    def addZones(self, zones: list[HotZone]) -> None:
+        """Registers the given hot zones."""
+        ...
+    
+    def removeZone(self, zone: HotZone) -> None:
+        """Unregisters a hot zone. Its `onLeave` action is not triggered."""
+        ...
+    
+    def processPosition(self, x: int, y: int, now: float) -> None:
+        """Triggers the `onLeave` and `onEnter` actions of the zones the cursor left or entered when moving to the given position."""
+        ...
+    
+    def checkDwell(self, now: float) -> None:
+        """Triggers the `onDwell` actions of the zones the cursor has stayed in for long enough."""
+        ...
+    
+    def sample(self) -> int:
+        """Processes the positions recorded since the last sample. Returns the number of processed positions."""
+        ...
+    
+    def samplerLoop(self) -> None:
+        """The loop of the sampler thread."""
+        ...
+    
+    def start(self) -> None:
+        """Starts the sampler thread."""
+        ...
+    
+    def stop(self) -> None:
+        """Stops the sampler thread."""
+        ...
+    
+    def getStats(self) -> dict[str, Any]:
+        """Returns a snapshot of the engine statistics."""
+        ...
+
+
+def getPrimaryScreenRect() -> tuple[int, int, int, int]:
+    """Returns the `(left, top, right, bottom)` bounds of the primary screen."""
+    ...
+
+
+def cornerZone(name: str, corner: str, size=2, screenRect: tuple[int, int, int, int] | None=None, onEnter: tuple[Callable, tuple] | None=None,
+               onLeave: tuple[Callable, tuple] | None=None, onDwell: tuple[Callable, tuple] | None=None, dwellMs=400.0) -> HotZone:
+    """
+    Description:
+        Creates a square hot zone at one of the corners of a screen.
+    ---
+    Parameters:
+        `corner -> str`: One of `"top-left"`, `"top-right"`, `"bottom-left"`, `"bottom-right"`.
+        
+        `size -> int`: The width and height of the zone in pixels.
+        
+        `screenRect -> tuple[int, int, int, int] | None`: The bounds of the screen. Defaults to the primary screen.
+        
+        The rest of the parameters are passed to `HotZone`.
+    """
+    ...
+
+
+def edgeZone(name: str, edge: str, thickness=2, margin=0, screenRect: tuple[int, int, int, int] | None=None, onEnter: tuple[Callable, tuple] | None=None,
+             onLeave: tuple[Callable, tuple] | None=None, onDwell: tuple[Callable, tuple] | None=None, dwellMs=400.0) -> HotZone:
+    """
+    Description:
+        Creates a hot zone along one of the edges of a screen.
+    ---
+    Parameters:
+        `edge -> str`: One of `"left"`, `"top"`, `"right"`, `"bottom"`.
+        
+        `thickness -> int`: The thickness of the zone in pixels.
+        
+        `margin -> int`: The number of pixels left out at both ends of the edge, useful for not overlapping the corner zones.
+        
+        `screenRect -> tuple[int, int, int, int] | None`: The bounds of the screen. Defaults to the primary screen.
+        
+        The rest of the parameters are passed to `HotZone`.
+    """
+    ...
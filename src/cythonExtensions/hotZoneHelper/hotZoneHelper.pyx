@@ -0,0 +1,372 @@
+# cython: language_level = 3str
+
+"""This extension module implements hot zones: screen regions (corners, edges, and rectangles) that trigger actions when the cursor enters, leaves, or dwells in them."""
+
+from cythonExtensions.hookManager.hookManager cimport MoveRingBuffer
+
+import threading
+from time import perf_counter, sleep
+from traceback import format_exc
+from cythonExtensions.commonUtils.commonUtils import PThread
+from cythonExtensions.platformBackend import platformBackend as pfBackend
+from cythonExtensions.platformBackend.platformBackend import win32con
+
+
+cdef class HotZone:
+    """
+    Description:
+        A rectangular screen region with optional actions. The rectangle includes its left/top edges and excludes its right/bottom edges.
+    ---
+    Parameters:
+        `name -> str`: The name of the zone, used when reporting it.
+        
+        `left, top, right, bottom -> int`: The bounds of the zone in screen coordinates.
+        
+        `onEnter, onLeave, onDwell -> tuple[Callable, tuple] | None`:
+            The actions to run, as `(function, arguments)`, when the cursor enters the zone, leaves it, or stays in it for `dwellMs`.
+        
+        `dwellMs -> float`: How long, in milliseconds, the cursor must stay in the zone before `onDwell` is triggered (once per visit).
+    """
+    
+    cdef public str name
+    cdef public int left, top, right, bottom
+    cdef public object onEnter, onLeave, onDwell
+    cdef public double dwellTime, enteredAt
+    cdef public bint inside, dwellFired
+    
+    def __init__(self, str name, int left, int top, int right, int bottom, onEnter=None, onLeave=None, onDwell=None, double dwellMs=400.0):
+        self.name = name
+        self.left, self.top, self.right, self.bottom = left, top, right, bottom
+        self.onEnter, self.onLeave, self.onDwell = onEnter, onLeave, onDwell
+        self.dwellTime = dwellMs / 1000
+        self.enteredAt = 0.0
+        self.inside = False
+        self.dwellFired = False
+    
+    cdef inline bint contains(self, int x, int y):
+        return self.left <= x < self.right and self.top <= y < self.bottom
+    
+    def __repr__(self) -> str:
+        return f"HotZone({self.name!r}, ({self.left}, {self.top}, {self.right}, {self.bottom}))"
+
+
+cdef inline long long cellKey(int cellX, int cellY):
+    """Packs the coordinates of a grid cell into a single integer key."""
+    
+    return (<long long> cellX << 32) ^ (cellY & 0xFFFFFFFF)
+
+
+cdef class ZoneGrid:
+    """
+    Description:
+        A uniform grid that maps each cell of the screen to the zones overlapping it.
+        Finding the zones under the cursor costs a single dictionary lookup plus checking the few zones of that cell,
+        regardless of the total number of zones.
+    ---
+    Parameters:
+        `cellSize -> int`: The width and height of each cell in pixels.
+    """
+    
+    cdef public int cellSize
+    cdef dict cells
+    
+    def __init__(self, int cellSize=64):
+        self.cellSize = max(cellSize, 1)
+        self.cells = {}
+    
+    cpdef void add(self, HotZone zone):
+        """Adds the zone to all the cells it overlaps."""
+        
+        cdef int cellX, cellY
+        cdef long long key
+        
+        for cellX in range(zone.left // self.cellSize, (zone.right - 1) // self.cellSize + 1):
+            for cellY in range(zone.top // self.cellSize, (zone.bottom - 1) // self.cellSize + 1):
+                key = cellKey(cellX, cellY)
+                
+                if key in self.cells:
+                    self.cells[key].append(zone)
+                else:
+                    self.cells[key] = [zone]
+    
+    cpdef void remove(self, HotZone zone):
+        """Removes the zone from all the cells it overlaps."""
+        
+        cdef list emptyCells = []
+        
+        for key, zones in self.cells.items():
+            if zone in zones:
+                zones.remove(zone)
+                
+                if not zones:
+                    emptyCells.append(key)
+        
+        for key in emptyCells:
+            del self.cells[key]
+    
+    cpdef void clear(self):
+        """Removes all the zones."""
+        
+        self.cells.clear()
+    
+    cpdef list candidates(self, int x, int y):
+        """Returns the zones of the cell that contains the given point. Some of them may not contain the point itself."""
+        
+        return self.cells.get(cellKey(x // self.cellSize, y // self.cellSize), [])
+
+
+cdef class HotZoneEngine:
+    """
+    Description:
+        Tracks the cursor against a set of hot zones and runs their actions.
+        
+        - The mouse hook records the move events into a `MoveRingBuffer` and returns immediately, so the cursor stays smooth.
+        - A sampler thread drains the buffer `sampleRate` times per second and tests the drained positions against a `ZoneGrid`.
+        - The actions run in the sampler thread. Long running actions should start their own threads.
+    ---
+    Parameters:
+        `moveBuffer -> MoveRingBuffer`: The buffer written by the mouse hook (`MouseHookManager(trackMoves=True).moveBuffer`).
+        
+        `sampleRate -> float`: How many times per second the buffer is sampled.
+        
+        `cellSize -> int`: The cell size of the zone grid in pixels.
+    """
+    
+    cdef public ZoneGrid grid
+    cdef public list zones, activeZones
+    cdef public double sampleInterval
+    cdef public long long samples, checkedPositions, triggeredActions, failedActions
+    cdef MoveRingBuffer moveBuffer
+    cdef int lastX, lastY
+    cdef bint running
+    cdef object thread, lock
+    
+    def __init__(self, MoveRingBuffer moveBuffer, double sampleRate=60.0, int cellSize=64):
+        self.moveBuffer = moveBuffer
+        self.sampleInterval = 1 / max(sampleRate, 1.0)
+        self.grid = ZoneGrid(cellSize)
+        self.zones = []
+        self.activeZones = []
+        self.samples = 0
+        self.checkedPositions = 0
+        self.triggeredActions = 0
+        self.failedActions = 0
+        self.lastX, self.lastY = -1 << 30, -1 << 30
+        self.running = False
+        self.thread = None
+        self.lock = threading.Lock()
+    
+    cpdef void addZone(self, HotZone zone):
+        """Registers a new hot zone."""
+        
+        with self.lock:
+            self.zones.append(zone)
+            self.grid.add(zone)
+    
+    cpdef void addZones(self, list zones):
+        """Registers the given hot zones."""
+        
+        for zone in zones:
+            self.addZone(zone)
+    
+    cpdef void removeZone(self, HotZone zone):
+        """Unregisters a hot zone. Its `onLeave` action is not triggered."""
+        
+        with self.lock:
+            if zone in self.zones:
+                self.zones.remove(zone)
+                self.grid.remove(zone)
+            
+            if zone in self.activeZones:
+                self.activeZones.remove(zone)
+                zone.inside = False
+    
+    cdef void runAction(self, HotZone zone, action):
+        """Runs an action of the form `(function, arguments)`. Errors are reported without stopping the sampler."""
+        
+        if action is None:
+            return
+        
+        self.triggeredActions += 1
+        
+        try:
+            action[0](*action[1])
+        
+        except Exception as e:
+            self.failedActions += 1
+            print(f'➤ Warning! An error occurred in an action of the hot zone "{zone.name}".\n\n→ Error message: {e}\n\n→ {format_exc()}\n{"="*50}\n')
+    
+    cpdef void processPosition(self, int x, int y, double now):
+        """Triggers the `onLeave` and `onEnter` actions of the zones the cursor left or entered when moving to the given position."""
+        
+        cdef HotZone zone
+        cdef int i
+        
+        # Only the zones the cursor is currently in need to be checked for leaving.
+        for i in range(len(self.activeZones) - 1, -1, -1):
+            zone = self.activeZones[i]
+            
+            if not zone.contains(x, y):
+                zone.inside = False
+                del self.activeZones[i]
+                self.runAction(zone, zone.onLeave)
+        
+        for zone in self.grid.candidates(x, y):
+            if not zone.inside and zone.contains(x, y):
+                zone.inside = True
+                zone.enteredAt = now
+                zone.dwellFired = False
+                self.activeZones.append(zone)
+                self.runAction(zone, zone.onEnter)
+    
+    cpdef void checkDwell(self, double now):
+        """Triggers the `onDwell` actions of the zones the cursor has stayed in for long enough."""
+        
+        cdef HotZone zone
+        
+        for zone in self.activeZones:
+            if zone.onDwell is not None and not zone.dwellFired and now - zone.enteredAt >= zone.dwellTime:
+                zone.dwellFired = True
+                self.runAction(zone, zone.onDwell)
+    
+    cpdef int sample(self):
+        """Processes the positions recorded since the last sample. Returns the number of processed positions."""
+        
+        cdef double now = perf_counter()
+        cdef list positions = self.moveBuffer.drain()
+        cdef int x, y
+        
+        self.samples += 1
+        
+        with self.lock:
+            for position in positions:
+                x, y = position[0], position[1]
+                
+                # Skipping the repeated positions (e.g., when the cursor is pushed against a screen edge).
+                if x == self.lastX and y == self.lastY:
+                    continue
+                
+                self.lastX, self.lastY = x, y
+                self.checkedPositions += 1
+                self.processPosition(x, y, now)
+            
+            if self.activeZones:
+                self.checkDwell(now)
+        
+        return len(positions)
+    
+    def samplerLoop(self) -> None:
+        """The loop of the sampler thread."""
+        
+        while self.running:
+            self.sample()
+            sleep(self.sampleInterval)
+    
+    cpdef void start(self):
+        """Starts the sampler thread."""
+        
+        if self.running:
+            return
+        
+        self.running = True
+        self.thread = PThread(target=self.samplerLoop, name="hotZonesSampler", daemon=True)
+        self.thread.start()
+    
+    cpdef void stop(self):
+        """Stops the sampler thread."""
+        
+        self.running = False
+        
+        if self.thread is not None:
+            self.thread.join(1)
+            self.thread = None
+    
+    cpdef dict getStats(self):
+        """Returns a snapshot of the engine statistics."""
+        
+        return {
+            "zones":            len(self.zones),
+            "samples":          self.samples,
+            "checkedPositions": self.checkedPositions,
+            "coalescedMoves":   self.moveBuffer.coalescedMoves,
+            "triggeredActions": self.triggeredActions,
+            "failedActions":    self.failedActions,
+        }
+
+
+def getPrimaryScreenRect() -> tuple[int, int, int, int]:
+    """Returns the `(left, top, right, bottom)` bounds of the primary screen."""
+    
+    return (0, 0, pfBackend.backend.getSystemMetrics(win32con.SM_CXSCREEN), pfBackend.backend.getSystemMetrics(win32con.SM_CYSCREEN))
+
+
+def cornerZone(name: str, corner: str, size=2, screenRect=None, onEnter=None, onLeave=None, onDwell=None, dwellMs=400.0) -> HotZone:
+    """
+    Description:
+        Creates a square hot zone at one of the corners of a screen.
+    ---
+    Parameters:
+        `corner -> str`: One of `"top-left"`, `"top-right"`, `"bottom-left"`, `"bottom-right"`.
+        
+        `size -> int`: The width and height of the zone in pixels.
+        
+        `screenRect -> tuple[int, int, int, int] | None`: The bounds of the screen. Defaults to the primary screen.
+        
+        The rest of the parameters are passed to `HotZone`.
+    """
+    
+    cdef int left, top, right, bottom
+    left, top, right, bottom = screenRect or getPrimaryScreenRect()
+    
+    vertical, horizontal = corner.split("-")
+    
+    if horizontal == "right":
+        left = right - size
+    else:
+        right = left + size
+    
+    if vertical == "bottom":
+        top = bottom - size
+    else:
+        bottom = top + size
+    
+    return HotZone(name, left, top, right, bottom, onEnter, onLeave, onDwell, dwellMs)
+
+
+def edgeZone(name: str, edge: str, thickness=2, margin=0, screenRect=None, onEnter=None, onLeave=None, onDwell=None, dwellMs=400.0) -> HotZone:
+    """
+    Description:
+        Creates a hot zone along one of the edges of a screen.
+    ---
+    Parameters:
+        `edge -> str`: One of `"left"`, `"top"`, `"right"`, `"bottom"`.
+        
+        `thickness -> int`: The thickness of the zone in pixels.
+        
+        `margin -> int`: The number of pixels left out at both ends of the edge, useful for not overlapping the corner zones.
+        
+        `screenRect -> tuple[int, int, int, int] | None`: The bounds of the screen. Defaults to the primary screen.
+        
+        The rest of the parameters are passed to `HotZone`.
+    """
+    
+    cdef int left, top, right, bottom
+    left, top, right, bottom = screenRect or getPrimaryScreenRect()
+    
+    if edge in ("left", "right"):
+        top, bottom = top + margin, bottom - margin
+        
+        if edge == "left":
+            right = left + thickness
+        else:
+            left = right - thickness
+    
+    else:
+        left, right = left + margin, right - margin
+        
+        if edge == "top":
+            bottom = top + thickness
+        else:
+            top = bottom - thickness
+    
+    return HotZone(name, left, top, right, bottom, onEnter, onLeave, onDwell, dwellMs)
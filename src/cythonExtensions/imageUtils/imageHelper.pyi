@@ -1,3 +1,13 @@
+def getSelectedImages(hwnd: int) -> list[str] | None:
+    """Returns the paths of the selected images in the given explorer window, or `None` if it is not an explorer window. Runs on `comWorker`, which owns the window objects."""
+    ...
+
+
+def selectImageItem(hwnd: int, path: str) -> None:
+    """Selects the given item in the given explorer window. Runs on `comWorker`."""
+    ...
+
+
 def iconize() -> None:
     """Converts the selected image files from the active explorer window into icons."""
     ...
@@ -1,11 +1,12 @@
 # cython: language_level = 3str
 
-import win32gui, os, winsound, pythoncom
+import win32gui, os, winsound
 import PIL.Image
-from win32com.client import Dispatch
 from natsort import natsorted
 
 from cythonExtensions.guiHelper.inputWindow import SimpleWindow
+from cythonExtensions.commonUtils.comWorker import comWorker
+from cythonExtensions.explorerHelper.explorerWindows import explorerWindows
 
 cdef getUniqueName(directory, filename="New File", sequence_pattern=" (%s)", extension=".txt"):
     """
@@ -49,14 +50,30 @@ cdef getUniqueName(directory, filename="New File", sequence_pattern=" (%s)", ext
     return filename % b
 
 
-def iconize():
-    """Converts the selected image files from the active explorer window into icons."""
+@comWorker.wrap
+def getSelectedImages(int hwnd):
+    """Returns the paths of the selected images in the given explorer window, or `None` if it is not an explorer window. Runs on `comWorker`, which owns the window objects."""
+    
+    active_explorer = explorerWindows.window(hwnd)
+    
+    if not active_explorer:
+        return None
     
-    pythoncom.CoInitialize()
+    return [selected_item.Path for selected_item in active_explorer.Document.SelectedItems() if selected_item.Path.endswith(('.png', '.jpg', '.jpeg'))]
+
+
+@comWorker.wrap
+def selectImageItem(int hwnd, path) -> None:
+    """Selects the given item in the given explorer window. Runs on `comWorker`."""
     
-    explorer = Dispatch("Shell.Application")
+    active_explorer = explorerWindows.window(hwnd)
     
-    explorer_windows = explorer.Windows()
+    if active_explorer:
+        active_explorer.Document.SelectItem(path, 1|4|8|16)
+
+
+def iconize():
+    """Converts the selected image files from the active explorer window into icons."""
     
     cdef int fg_hwnd = win32gui.GetForegroundWindow()
     
@@ -67,14 +84,10 @@ def iconize():
         return
     
     
-    # Check other explorer windows if any.
-    cdef active_explorer
-    for explorer_window in explorer_windows:
-        if explorer_window.HWND == fg_hwnd:
-            active_explorer = explorer_window
-            break
+    # Reading the selected images of the active explorer window.
+    cdef list image_locations = getSelectedImages(fg_hwnd)
     
-    if not active_explorer:
+    if image_locations is None:
         print("Error: Did not find any opened windows explorer.\n")
         winsound.PlaySound(r"SFX\wrong.swf.wav", winsound.SND_FILENAME)
         
@@ -82,11 +95,6 @@ def iconize():
     
     winsound.PlaySound(r"SFX\connection-sound.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
     
-    cdef list image_locations = []
-    for selected_item in active_explorer.Document.SelectedItems():
-        if selected_item.Path.endswith(('.png', '.jpg', '.jpeg')):
-            image_locations.append(selected_item.Path)
-    
     os.makedirs("Images/Icons", exist_ok=True)
     
     for image_loc in image_locations:
@@ -96,8 +104,6 @@ def iconize():
     
     winsound.PlaySound(r"SFX\coins-497.wav", winsound.SND_FILENAME)
     os.startfile(os.path.join(os.getcwd(), "Images", "Icons"))
-    
-    pythoncom.CoUninitialize()
 
 
 def imagesToPDF(mode=1, targetWidth=690, widthThreshold=1200, minWidth=100, minHeight=100) -> None:
@@ -124,12 +130,6 @@ def imagesToPDF(mode=1, targetWidth=690, widthThreshold=1200, minWidth=100, minH
     
     import img2pdf
     
-    pythoncom.CoInitialize()
-    
-    explorer = Dispatch("Shell.Application")
-    
-    explorer_windows = explorer.Windows()
-    
     cdef int fg_hwnd = win32gui.GetForegroundWindow()
     
     if not fg_hwnd:
@@ -138,14 +138,10 @@ def imagesToPDF(mode=1, targetWidth=690, widthThreshold=1200, minWidth=100, minH
         
         return
     
-    # Check other explorer windows if any.
-    cdef active_explorer = None
-    for explorer_window in explorer_windows:
-        if explorer_window.HWND == fg_hwnd:
-            active_explorer = explorer_window
-            break
+    # Reading the selected images of the active explorer window.
+    cdef list imageFiles = getSelectedImages(fg_hwnd)
     
-    if not active_explorer:
+    if imageFiles is None:
         print("Error: Did not find any opened windows explorer.\n")
         winsound.PlaySound(r"SFX\wrong.swf.wav", winsound.SND_FILENAME)
         
@@ -153,11 +149,6 @@ def imagesToPDF(mode=1, targetWidth=690, widthThreshold=1200, minWidth=100, minH
     
     winsound.PlaySound(r"SFX\connection-sound.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
     
-    cdef list imageFiles = []
-    for selected_item in active_explorer.Document.SelectedItems():
-        if selected_item.Path.endswith(('.png', '.jpg', '.jpeg')):
-            imageFiles.append(selected_item.Path)
-    
     outputDirectory = os.path.dirname(imageFiles[0])
     filteredImages = []
 
@@ -210,7 +201,7 @@ def imagesToPDF(mode=1, targetWidth=690, widthThreshold=1200, minWidth=100, minH
         pdf_output_file.write(img2pdf.convert(filteredImages))
         
         if len(filteredImages) <= 20:
-            active_explorer.Document.SelectItem(fileFullPath, 1|4|8|16)
+            selectImageItem(fg_hwnd, fileFullPath)
     
     print(f"PDF file created at: {fileFullPath}")
     
@@ -221,8 +212,6 @@ def imagesToPDF(mode=1, targetWidth=690, widthThreshold=1200, minWidth=100, minH
         os.rmdir(temp_dir)
     
     winsound.PlaySound(r"SFX\coins-497.wav", winsound.SND_FILENAME)
-    
-    pythoncom.CoUninitialize()
 
 
 cdef void invertClipboardImage():
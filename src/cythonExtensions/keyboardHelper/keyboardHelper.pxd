@@ -1,5 +1,18 @@
+cdef class KeyInputBatch:
+    cdef list inputs
+    
+    cpdef KeyInputBatch down(self, int key_id, int key_scancode=*)
+    
+    cpdef KeyInputBatch up(self, int key_id, int key_scancode=*)
+    
+    cpdef KeyInputBatch press(self, int key_id, int key_scancode=*, int times=*)
+    
+    cpdef KeyInputBatch text(self, str text)
+    
+    cpdef int send(self)
+
 cdef void simulateKeyPress(int key_id, int key_scancode=*, int times=*)
 
-cdef void simulateKeyPressSequence(tuple keys_list, float delay=*)
+cdef object simulateKeyPressSequence(tuple keys_list, float delay=*)
 
 cdef int getCaretPosition(text, caret=*)
\ No newline at end of file
@@ -2,6 +2,7 @@
 
 import win32con
 from typing import Callable, Any
+from cythonExtensions.timelineHelper.timelineHelper import Timeline
 
 # We must check before sending keys using keybd_event: https://stackoverflow.com/questions/21197257/keybd-event-keyeventf-extendedkey-explanation-required
 extended_keys = {
@@ -26,6 +27,48 @@ extended_keys = {
 }
 
 
+class KeyInputBatch:
+    """
+    Description:
+        Collects keyboard inputs (key presses and Unicode text), then injects them all with a single `SendInput` call (`send`).
+        The inputs of a batch are not interleaved with the user input, and sending a long text takes one system call instead of one per key.
+    ---
+    Example:
+    >>> KeyInputBatch().press(win32con.VK_BACK, kbcon.SC_BACK, 3).text("python").send()
+    """
+    
+    inputs: list[tuple[int, int, int]]
+    
+    def __init__(self) -> None:
+        ...
+    
+    def down(self, key_id: int, key_scancode=0) -> "KeyInputBatch":
+        """Adds a keyDown event of the given key."""
+        ...
+    
+    def up(self, key_id: int, key_scancode=0) -> "KeyInputBatch":
+        """Adds a keyUp event of the given key."""
+        ...
+    
+    def press(self, key_id: int, key_scancode=0, times=1) -> "KeyInputBatch":
+        """Adds a keyDown and a keyUp events of the given key for the specified number of times."""
+        ...
+    
+    def text(self, text: str) -> "KeyInputBatch":
+        """
+        Description:
+            Adds the events for typing the given text. The characters are typed as Unicode input (`KEYEVENTF_UNICODE`), so they do not
+            depend on the keyboard layout or the pressed modifiers. The new lines and tabs are typed with the `Enter` and `Tab` keys.
+        """
+        ...
+    
+    def send(self) -> int:
+        """Injects the collected inputs at once, and clears them. Returns the number of injected events."""
+        ...
+    
+    def __len__(self) -> int:
+        ...
+
 def simulateKeyPress(key_id: int, key_scancode=0, times=1) -> None:
     """
     Description:
@@ -39,7 +82,7 @@ def simulateKeyPress(key_id: int, key_scancode=0, times=1) -> None:
     ...
 
 
-def simulateKeyPressSequence(keys_list: tuple[tuple[int, int] | tuple[Any, Callable[[Any], None]]], delay=0.2) -> None:
+def simulateKeyPressSequence(keys_list: tuple[tuple[int, int] | tuple[Any, Callable[[Any], None]]], delay=0.2) -> Timeline | None:
     """
     Description:
         Simulating a sequence of key presses.
@@ -49,7 +92,10 @@ def simulateKeyPressSequence(keys_list: tuple[tuple[int, int] | tuple[Any, Calla
             - Two numbers representing the keyID and the scancode, or
             - A key and a function that is used to simulate this key.
         
-        - `delay -> float`: The delay between key presses.
+        - `delay -> float`: The delay between key presses. If it is `0`, the consecutive `(keyID, scancode)` presses are injected at once.
+    ---
+    Returns:
+        `Timeline | None`: The timeline of the key presses, run by the timeline scheduler. `None` if `delay` is `0`, as the keys are sent before returning.
     """
     ...
 
@@ -103,17 +149,41 @@ def sendTextWithCaret(text: str, caret="{!}") -> None:
         - If the string contains one or more carets:
             - The first caret will be removed, and
             - The keyboard cursor will be placed where the removed caret was.
+        - With the default caret, the string is a snippet template (see `snippetTemplate`), so its placeholders are evaluated too.
     """
     ...
 
 
-def expandText() -> None:
-    """Replacing an abbreviated text with its respective substitution text."""
+def findExpansion(abbreviation: str) -> str | None:
+    """
+    Description:
+        Returns the expansion of the given abbreviation, or `None` if it is not defined. The abbreviations of the focused
+        application (`ctrlHouse.application_abbreviations`) take priority over the global ones, and the snippet library
+        (`snippetLibrary`) is checked last.
+    """
+    ...
+
+def restoreClipboard(data, text: str, delay: float) -> None:
+    """Puts back the clipboard text saved by `expandText` after `delay` seconds, unless the clipboard was changed after pasting `text`."""
+    ...
+
+
+def expandText(alias: str | None = None) -> None:
+    """
+    Description:
+        Replacing an abbreviated text with its respective substitution text. The substitution is a snippet template, so its placeholders
+        are evaluated now, and the caret is placed at its `{!}` marker (see `snippetTemplate`). All the keys are injected at once. The expansions
+        longer than `scriptConfigs.PASTE_EXPANSION_THRESHOLD` characters are pasted from the clipboard, and the previous clipboard text is restored afterwards.
+    ---
+    Parameters:
+        `alias -> str | None`: The typed abbreviation. Defaults to `ctrlHouse.pressed_chars`, which is then reset. The callers that run
+        the expansion in another thread pass the abbreviation, and reset the pressed characters themselves.
+    """
     ...
 
 
-def openLocation() -> None:
-    """Opens a file or a directory specified by the pressed characters `ctrlHouse.pressed_chars`."""
+def openLocation(alias: str | None = None) -> None:
+    """Opens a file or a directory specified by the given alias, or by the pressed characters `ctrlHouse.pressed_chars` (which are then reset)."""
     ...
 
 
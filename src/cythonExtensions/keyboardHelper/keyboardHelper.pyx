@@ -2,13 +2,21 @@
 
 """This extension module provides functions for manipulating keyboard presses and text expansion."""
 
+from cythonExtensions.keyboardHelper.snippetTemplate cimport SnippetTemplate
+from cythonExtensions.timelineHelper.timelineHelper cimport Timeline
 
-import win32gui, win32ui, win32api, win32con, winsound, pywintypes
-import keyboard, os
+import os
 from time import sleep
 
-from cythonExtensions.commonUtils.commonUtils import KB_Con as kbcon, WindowHouse as winHouse, ControllerHouse as ctrlHouse
-from cythonExtensions.guiHelper.inputWindow import SimpleWindow
+import scriptConfigs as configs
+from cythonExtensions.commonUtils.commonUtils import KB_Con as kbcon, WindowHouse as winHouse, ControllerHouse as ctrlHouse, PThread
+from cythonExtensions.platformBackend import platformBackend as pfBackend
+from cythonExtensions.platformBackend.platformBackend import win32con, KEYEVENTF_UNICODE
+from cythonExtensions.windowHelper.foregroundContext import foregroundContext
+from cythonExtensions.keyboardHelper.snippetTemplate import getTemplate
+from cythonExtensions.keyboardHelper.snippetLibrary import snippetLibrary
+from cythonExtensions.timelineHelper.timelineHelper import scheduler
+from cythonExtensions.timelineHelper.burstEngine import burstEngine, keyBurst
 
 # We must check before sending keys using keybd_event: https://stackoverflow.com/questions/21197257/keybd-event-keyeventf-extendedkey-explanation-required
 cdef set extended_keys = {
@@ -32,6 +40,83 @@ cdef set extended_keys = {
     win32con.VK_RIGHT       # "RIGHT"
 }
 
+cdef class KeyInputBatch:
+    """
+    Description:
+        Collects keyboard inputs (key presses and Unicode text), then injects them all with a single `SendInput` call (`send`).
+        The inputs of a batch are not interleaved with the user input, and sending a long text takes one system call instead of one per key.
+    ---
+    Example:
+    >>> KeyInputBatch().press(win32con.VK_BACK, kbcon.SC_BACK, 3).text("python").send()
+    """
+    
+    cdef public list inputs
+    
+    def __init__(self):
+        self.inputs = []
+    
+    cpdef KeyInputBatch down(self, int key_id, int key_scancode=0):
+        """Adds a keyDown event of the given key."""
+        
+        self.inputs.append((key_id, key_scancode, (key_id in extended_keys) * win32con.KEYEVENTF_EXTENDEDKEY))
+        
+        return self
+    
+    cpdef KeyInputBatch up(self, int key_id, int key_scancode=0):
+        """Adds a keyUp event of the given key."""
+        
+        self.inputs.append((key_id, key_scancode, (key_id in extended_keys) * win32con.KEYEVENTF_EXTENDEDKEY | win32con.KEYEVENTF_KEYUP))
+        
+        return self
+    
+    cpdef KeyInputBatch press(self, int key_id, int key_scancode=0, int times=1):
+        """Adds a keyDown and a keyUp events of the given key for the specified number of times."""
+        
+        cdef int flags = (key_id in extended_keys) * win32con.KEYEVENTF_EXTENDEDKEY
+        
+        self.inputs.extend(((key_id, key_scancode, flags), (key_id, key_scancode, flags | win32con.KEYEVENTF_KEYUP)) * times)
+        
+        return self
+    
+    cpdef KeyInputBatch text(self, str text):
+        """
+        Description:
+            Adds the events for typing the given text. The characters are typed as Unicode input (`KEYEVENTF_UNICODE`), so they do not
+            depend on the keyboard layout or the pressed modifiers. The new lines and tabs are typed with the `Enter` and `Tab` keys.
+        """
+        
+        cdef int index
+        
+        # The characters beyond the BMP are typed as two UTF-16 code units (a surrogate pair).
+        cdef bytes encoded = text.replace("\r\n", "\n").encode("utf-16-le")
+        
+        for index in range(0, len(encoded), 2):
+            codeUnit = encoded[index] | encoded[index + 1] << 8
+            
+            if codeUnit == 0x0A: # "\n"
+                self.press(win32con.VK_RETURN, kbcon.SC_RETURN)
+            
+            elif codeUnit == 0x09: # "\t"
+                self.press(win32con.VK_TAB, kbcon.SC_TAB)
+            
+            else:
+                self.inputs.append((0, codeUnit, KEYEVENTF_UNICODE))
+                self.inputs.append((0, codeUnit, KEYEVENTF_UNICODE | win32con.KEYEVENTF_KEYUP))
+        
+        return self
+    
+    cpdef int send(self):
+        """Injects the collected inputs at once, and clears them. Returns the number of injected events."""
+        
+        cdef list inputs = self.inputs
+        
+        self.inputs = []
+        
+        return pfBackend.backend.sendInputs(inputs)
+    
+    def __len__(self) -> int:
+        return len(self.inputs)
+
 cpdef void simulateKeyPress(int key_id, int key_scancode=0, int times=1):
     """
     Description:
@@ -43,15 +128,10 @@ cpdef void simulateKeyPress(int key_id, int key_scancode=0, int times=1):
         `times -> int`: the number of times the key should be pressed.
     """
     
-    # Check if the key is one of the extended keys.
-    cdef int flags = (key_id in extended_keys) * win32con.KEYEVENTF_EXTENDEDKEY
-    
-    # Simulating keypress.
-    for _ in range(times):
-        win32api.keybd_event(key_id, key_scancode, flags, 0) # Simulate KeyDown event.
-        win32api.keybd_event(key_id, key_scancode, flags | win32con.KEYEVENTF_KEYUP, 0) # Simulate KeyUp event.
+    # Simulating all the keypresses with a single injection.
+    KeyInputBatch().press(key_id, key_scancode, times).send()
 
-cpdef void simulateKeyPressSequence(tuple keys_list, float delay=0.2):
+cpdef object simulateKeyPressSequence(tuple keys_list, float delay=0.2):
     """
     Description:
         Simulating a sequence of key presses.
@@ -61,24 +141,44 @@ cpdef void simulateKeyPressSequence(tuple keys_list, float delay=0.2):
             - Two numbers representing the keyID and the scancode, or
             - A key and a function that is used to simulate this key.
         
-        - `delay -> float`: The delay between key presses.
+        - `delay -> float`: The delay between key presses. If it is `0`, the consecutive `(keyID, scancode)` presses are injected at once.
+    ---
+    Returns:
+        `Timeline | None`: The timeline of the key presses, run by the timeline scheduler. `None` if `delay` is `0`, as the keys are sent before returning.
     """
     
     # Possible alternative: keyboard.send('alt, 4, down, down, down')
     cdef key
-    cdef int flags
-    
-    for key, scancode in keys_list:
-        flags = (key in extended_keys) * win32con.KEYEVENTF_EXTENDEDKEY
+    cdef KeyInputBatch batch = KeyInputBatch()
+    cdef Timeline timeline
+    cdef int index
+    
+    if not delay:
+        for key, scancode in keys_list:
+            # scancode can be either int or Callable.
+            if isinstance(scancode, int):
+                batch.press(key, scancode)
+            
+            else:
+                # If `scancode` is not a number, then it is a callable. The keys before it are sent first to keep the order.
+                batch.send()
+                scancode(key)
+        
+        batch.send()
         
-        # scancode can be either int or Callable.
+        return None
+    
+    # Each key is pressed at a fixed offset from the start, so the delays do not add up the timer drift, and no thread sleeps between them.
+    timeline = Timeline("keyPressSequence")
+    
+    for index, (key, scancode) in enumerate(keys_list):
         if isinstance(scancode, int):
-            win32api.keybd_event(key, scancode, flags, 0) # Simulate KeyDown event.
-            win32api.keybd_event(key, scancode, flags | win32con.KEYEVENTF_KEYUP, 0) # Simulate KeyUp event.
+            timeline.at(index * delay, KeyInputBatch().press(key, scancode).send)
+        
         else:
-            # If `scancode` is not a number, then it is a callable.
-            scancode(key)
-        sleep(delay)
+            timeline.at(index * delay, scancode, (key,))
+    
+    return scheduler.schedule(timeline)
 
 def findAndSendKeyToWindow(target_className: str, key, send_function=None) -> int:
     """
@@ -103,7 +203,7 @@ def findAndSendKeyToWindow(target_className: str, key, send_function=None) -> in
     cdef int hwnd = winHouse.getHandleByClassName(target_className)
     
     # Checking if the window associated with `hwnd` does exist. If not, try searching for one.
-    if not hwnd or not win32gui.IsWindowVisible(hwnd):
+    if not hwnd or not pfBackend.backend.isWindowVisible(hwnd):
         ## Method(1) for searching for a window handle given a class name.
         # winHouse.setHandleByClassName(target_className, win32Helper.HandleByClassName(target_className))
         # If `None`, then there is no such window.
@@ -111,16 +211,16 @@ def findAndSendKeyToWindow(target_className: str, key, send_function=None) -> in
         #     return
         
         ## Method(2) for searching for a window handle given a class name.
-        try:
-            target_window = win32ui.FindWindow(target_className, None)
-        except win32ui.error: # Window not found.
+        hwnd = pfBackend.backend.findWindow(target_className, None)
+        
+        if not hwnd: # Window not found.
             print(f"Window with class name '{target_className}' not found.")
             
             winHouse.setHandleByClassName(target_className, 0)
             
             return 0
         
-        winHouse.setHandleByClassName(target_className, target_window.GetSafeHwnd())
+        winHouse.setHandleByClassName(target_className, hwnd)
     
     hwnd = winHouse.getHandleByClassName(target_className)
     
@@ -134,28 +234,28 @@ def findAndSendKeyToWindow(target_className: str, key, send_function=None) -> in
     ## ShowWindow(hwnd, 1)
     
     ## Method (No.2) for setting focus to a specific window. Works if the window is minimized or visible: https://learn.microsoft.com/en-us/windows/win32/api/winuser/nf-winuser-showwindow
-    win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+    pfBackend.backend.showWindow(hwnd, win32con.SW_RESTORE)
     
     if send_function:
         
         # Sometimes SetForegroundWindow seems to fail but then work after another call.
         try:
-            win32gui.SetForegroundWindow(hwnd)
-            
-        except pywintypes.error:
+            pfBackend.backend.setForegroundWindow(hwnd)
+        
+        except pfBackend.PlatformError:
             sleep(0.5)
             
             try:
-                win32gui.SetForegroundWindow(hwnd)
+                pfBackend.backend.setForegroundWindow(hwnd)
             
-            except pywintypes.error:
-                print(f"Exception occurred while trying set {win32gui.GetWindowText(hwnd)} as the forground process.")
+            except pfBackend.PlatformError:
+                print(f"Exception occurred while trying set {pfBackend.backend.getWindowText(hwnd)} as the forground process.")
                 return 0
-    
+        
         send_function(key)
     
     else:
-        win32api.PostMessage(hwnd, win32con.WM_KEYDOWN, key, 0)
+        pfBackend.backend.postMessage(hwnd, win32con.WM_KEYDOWN, key, 0)
     
     return 1
 
@@ -168,19 +268,29 @@ def simulateHotKeyPress(keys_id_dict: dict[int, int]) -> None:
         `keys_id_dict -> dict[int, int]`:
             Holds the `keyID` and `scancode` of the specified keys.
     """
-    cdef int key_id, key_scancode, flags
+    cdef int key_id, key_scancode
+    cdef KeyInputBatch batch = KeyInputBatch()
     
     for key_id, key_scancode in keys_id_dict.items():
-        flags = (key_id in extended_keys) * win32con.KEYEVENTF_EXTENDEDKEY
-        win32api.keybd_event(key_id, key_scancode, flags, 0) # Simulate KeyDown event.
+        batch.down(key_id, key_scancode) # Simulate KeyDown event.
     
     for key_id, key_scancode in keys_id_dict.items():
-        flags = (key_id in extended_keys) * win32con.KEYEVENTF_EXTENDEDKEY
-        win32api.keybd_event(key_id, key_scancode, flags | win32con.KEYEVENTF_KEYUP, 0) # Simulate KeyUp event.
+        batch.up(key_id, key_scancode) # Simulate KeyUp event.
+    
+    # Injected at once, so the user input can not land between the keyDown and keyUp events.
+    batch.send()
 
 def simulateBurstClicks():
-    cdef int flags
-    cdef float delay
+    """
+    Description:
+        Asks for a key and a delay, then presses the key repeatedly with the burst engine until `Esc` is pressed.
+        Each call adds another burst, which runs alongside the ones already started.
+    """
+    
+    cdef double delay
+    
+    # Imported here as the GUI windows are only available on Windows.
+    from cythonExtensions.guiHelper.inputWindow import SimpleWindow
     
     window = SimpleWindow("Key & Delay Input", itemsHeight=30)
     # window.createDynamicInputWindow(["Key", "Delay (ms)"])
@@ -192,16 +302,13 @@ def simulateBurstClicks():
     
     # If the user didn't provide any input, for example, by closing the window.
     if not window.userInputs or not window.capturedKeyVK:
+        ctrlHouse.burstClicksActive = bool(burstEngine.running())
         return
     
-    flags = (window.capturedKeyVK in extended_keys) * win32con.KEYEVENTF_EXTENDEDKEY
-    
-    delay = int(window.userInputs[0]) / 1000
+    # The presses are sent at absolute deadlines by the burst engine, so the rate does not drift below the requested one.
+    delay = max(float(window.userInputs[0] or 100), 1) / 1000
     
-    while ctrlHouse.burstClicksActive:
-        win32api.keybd_event(window.capturedKeyVK, 0, flags, 0) # Simulate KeyDown event.
-        win32api.keybd_event(window.capturedKeyVK, 0, flags | win32con.KEYEVENTF_KEYUP, 0) # Simulate KeyUp event.
-        sleep(delay)
+    burstEngine.start(keyBurst(window.capturedKeyVK, window.capturedKeyScanCode or 0, delay, window.capturedKeyVK in extended_keys, name="!bst"))
 
 def resetModifierKeys() -> None:
     """Reset the modifer keys bey sending keyUp events."""
@@ -215,9 +322,12 @@ def resetModifierKeys() -> None:
         (kbcon.VK_BACKTICK, 41)
     ]
     
+    cdef KeyInputBatch batch = KeyInputBatch()
+    
     for key_id, key_scancode in modifiers:
-        flags = (key_id in extended_keys) * win32con.KEYEVENTF_EXTENDEDKEY
-        win32api.keybd_event(key_id, key_scancode, win32con.KEYEVENTF_KEYUP | flags, 0)
+        batch.up(key_id, key_scancode)
+    
+    batch.send()
 
 cdef int getCaretPosition(text, caret="{!}"):
     """Returns the position of the caret in the given text."""
@@ -234,15 +344,19 @@ def sendTextWithCaret(text: str, caret="{!}") -> None:
         - If the string contains one or more carets:
             - The first caret will be removed, and
             - The keyboard cursor will be placed where the removed caret was.
+        - With the default caret, the string is a snippet template (see `snippetTemplate`), so its placeholders are evaluated too.
     """
     
-    cdef int caret_pos = getCaretPosition(text, caret)
+    cdef int caret_offset
     
-    text = text[:caret_pos] + text[caret_pos+len(caret):]
-    keyboard.write(text)
+    # The templates are compiled once, so the text is not scanned for the caret again each time it is sent.
+    if caret == "{!}":
+        text, caret_offset = getTemplate(text).render()
     
-    if caret_pos == len(text):
-        return
+    else:
+        caret_pos = getCaretPosition(text, caret)
+        text = text[:caret_pos] + text[caret_pos+len(caret):]
+        caret_offset = len(text) - caret_pos
     
     # This doesn't work properly if the caret is not at the beggining (`HOME`) before inserting the text.
     # mid_pos = len(text) // 2
@@ -250,48 +364,113 @@ def sendTextWithCaret(text: str, caret="{!}") -> None:
     #     simulateKeyPress(win32con.VK_HOME,  kbcon.SC_HOME)
     #     simulateKeyPress(win32con.VK_RIGHT, kbcon.SC_RIGHT, caret_pos)
     # else:
-    simulateKeyPress(win32con.VK_LEFT, kbcon.SC_LEFT, len(text) - caret_pos)
+    # The text and the caret movement are injected at once, so no typed key lands between them.
+    KeyInputBatch().text(text).press(win32con.VK_LEFT, kbcon.SC_LEFT, caret_offset).send()
 
-def expandText() -> None:
-    """Replacing an abbreviated text with its respective substitution text."""
+def findExpansion(abbreviation: str) -> str | None:
+    """
+    Description:
+        Returns the expansion of the given abbreviation, or `None` if it is not defined. The abbreviations of the focused
+        application (`ctrlHouse.application_abbreviations`) take priority over the global ones, and the snippet library
+        (`snippetLibrary`) is checked last.
+    """
+    
+    applicationAbbreviations = foregroundContext.current().select(ctrlHouse.application_abbreviations)
+    
+    if applicationAbbreviations and abbreviation in applicationAbbreviations:
+        return applicationAbbreviations[abbreviation]
+    
+    expansion = ctrlHouse.abbreviations.get(abbreviation, ctrlHouse.non_prefixed_abbreviations.get(abbreviation))
+    
+    # The snippet library is the last one checked, as its expansions are read from the disk.
+    return expansion if expansion is not None else snippetLibrary.get(abbreviation)
+
+def restoreClipboard(data, text: str, delay: float) -> None:
+    """Puts back the clipboard text saved by `expandText` after `delay` seconds, unless the clipboard was changed after pasting `text`."""
+    
+    sleep(delay)
+    
+    if pfBackend.backend.readClipboard(win32con.CF_UNICODETEXT) != text:
+        return
+    
+    if data is None:
+        pfBackend.backend.emptyClipboard()
+    
+    else:
+        pfBackend.backend.writeClipboard(data, win32con.CF_UNICODETEXT)
+
+def expandText(str alias=None) -> None:
+    """
+    Description:
+        Replacing an abbreviated text with its respective substitution text. The substitution is a snippet template, so its placeholders
+        are evaluated now, and the caret is placed at its `{!}` marker (see `snippetTemplate`). All the keys are injected at once. The expansions
+        longer than `scriptConfigs.PASTE_EXPANSION_THRESHOLD` characters are pasted from the clipboard, and the previous clipboard text is restored afterwards.
+    ---
+    Parameters:
+        `alias -> str | None`: The typed abbreviation. Defaults to `ctrlHouse.pressed_chars`, which is then reset. The callers that run
+        the expansion in another thread pass the abbreviation, and reset the pressed characters themselves.
+    """
+    
+    cdef str abbreviation = ctrlHouse.pressed_chars if alias is None else alias
+    cdef SnippetTemplate template = getTemplate(findExpansion(abbreviation))
+    cdef int caret_offset
+    
+    text, caret_offset = template.render()
+    
+    # Kept for `undoTextExpansion`, as the placeholders may render differently next time.
+    ctrlHouse.expanded_text = text
+    ctrlHouse.expanded_caret_offset = caret_offset
     
     # Sending ('`' => "Oem_3") then delete it before expansion to silence any suggestions like in the browser address bar.
-    simulateKeyPress(kbcon.VK_BACKTICK, kbcon.SC_BACKTICK)
+    # Then deleting the abbreviation and the '`' character.
+    cdef KeyInputBatch batch = KeyInputBatch().press(kbcon.VK_BACKTICK, kbcon.SC_BACKTICK).press(win32con.VK_BACK, kbcon.SC_BACK, len(abbreviation) + 1)
     
-    # Deleting the abbreviation and the '`' character.
-    simulateKeyPress(win32con.VK_BACK, kbcon.SC_BACK, len(ctrlHouse.pressed_chars) + 1)
+    cdef bint paste = 0 < configs.PASTE_EXPANSION_THRESHOLD < len(text)
     
     # Substituting the abbreviation with its respective text.
-    keyboard.write(ctrlHouse.abbreviations.get(ctrlHouse.pressed_chars, ctrlHouse.non_prefixed_abbreviations.get(ctrlHouse.pressed_chars)))
+    if paste:
+        clipboardData = pfBackend.backend.readClipboard(win32con.CF_UNICODETEXT)
+        pfBackend.backend.writeClipboard(text, win32con.CF_UNICODETEXT)
+        
+        batch.down(win32con.VK_LCONTROL, kbcon.SC_CONTROL).press(kbcon.VK_V, kbcon.SC_V).up(win32con.VK_LCONTROL, kbcon.SC_CONTROL)
+    
+    else:
+        batch.text(text)
+    
+    # Placing the caret.
+    batch.press(win32con.VK_LEFT, kbcon.SC_LEFT, caret_offset).send()
+    
+    # The target window reads the clipboard while handling the paste, so it is restored later.
+    if paste:
+        PThread(target=restoreClipboard, args=(clipboardData, text, configs.CLIPBOARD_RESTORE_DELAY)).start()
     
     # Resetting the stored pressed keys.
-    ctrlHouse.pressed_chars = ""
+    if alias is None:
+        ctrlHouse.pressed_chars = ""
     
-    winsound.PlaySound(r"SFX\knob-458.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
+    pfBackend.backend.playSound(r"SFX\knob-458.wav")
 
 def undoTextExpansion() -> None:
     """Undoes text expansion by replacing it with its abbreviation."""
     
-    text = ctrlHouse.abbreviations.get(ctrlHouse.pressed_chars, ctrlHouse.non_prefixed_abbreviations.get(ctrlHouse.pressed_chars))
-    
-    # Deleting the expansion.
-    simulateKeyPress(win32con.VK_BACK, kbcon.SC_BACK, len(text))
+    # Moving the caret back to the end of the expansion, then deleting it, and replacing it with the abbreviation.
+    # The new lines are one character when typed (see `KeyInputBatch.text`).
+    KeyInputBatch().press(win32con.VK_RIGHT, kbcon.SC_RIGHT, ctrlHouse.expanded_caret_offset) \
+        .press(win32con.VK_BACK, kbcon.SC_BACK, len(ctrlHouse.expanded_text.replace("\r\n", "\n"))).text(ctrlHouse.pressed_chars).send()
     
-    # Replacing the expansion with the abbreviation.
-    keyboard.write(ctrlHouse.pressed_chars)
-    
-    winsound.PlaySound(r"SFX\undo.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
+    pfBackend.backend.playSound(r"SFX\undo.wav")
 
-def openLocation() -> None:
-    """Opens a file or a directory specified by the pressed characters `ctrlHouse.pressed_chars`."""
+def openLocation(str alias=None) -> None:
+    """Opens a file or a directory specified by the given alias, or by the pressed characters `ctrlHouse.pressed_chars` (which are then reset)."""
     
     # Opening the file/folder.
-    os.startfile(ctrlHouse.locations.get(ctrlHouse.pressed_chars))
+    os.startfile(ctrlHouse.locations.get(ctrlHouse.pressed_chars if alias is None else alias))
     
     # Resetting the stored pressed keys.
-    ctrlHouse.pressed_chars = ""
+    if alias is None:
+        ctrlHouse.pressed_chars = ""
     
-    winsound.PlaySound(r"C:\Windows\Media\Windows Navigation Start.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
+    pfBackend.backend.playSound(r"C:\Windows\Media\Windows Navigation Start.wav")
 
 def crudeOpenWith(tool_number=4, prog_index=0) -> None:
     """
@@ -308,9 +487,9 @@ def crudeOpenWith(tool_number=4, prog_index=0) -> None:
     """
     
     # In my case, the `open` tool is the forth item in the Quick Access Toolbar.
-    simulateKeyPressSequence(((f"alt+{tool_number}", keyboard.send), *((win32con.VK_DOWN, kbcon.SC_DOWN), ) * prog_index, (win32con.VK_RETURN, kbcon.SC_RETURN)))
+    simulateKeyPressSequence(((f"alt+{tool_number}", pfBackend.backend.sendHotkey), *((win32con.VK_DOWN, kbcon.SC_DOWN), ) * prog_index, (win32con.VK_RETURN, kbcon.SC_RETURN)))
     
     # Resetting the stored pressed keys.
     ctrlHouse.pressed_chars = ""
     
-    winsound.PlaySound(r"SFX\knob-458.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
+    pfBackend.backend.playSound(r"SFX\knob-458.wav")
@@ -0,0 +1,16 @@
+cdef class SnippetLibrary:
+    cdef str filePath
+    cdef int cacheSize
+    cdef frozenset aliases
+    cdef long long hits, misses
+    cdef object connection
+    cdef object cache
+    cdef object lock
+    
+    cpdef void open(self)
+    
+    cpdef void close(self)
+    
+    cpdef object get(self, str alias, default=*)
+    
+    cpdef int importSnippets(self, snippets, bint replace=*)
@@ -0,0 +1,97 @@
+"""
+This module stores large snippet libraries on disk, in an SQLite database (`scriptConfigs.SNIPPET_LIBRARY_PATH`).
+
+Only the aliases of the library stay in memory, as the text expansion must match them on each keystroke. The bodies (expansions)
+are read when they are expanded, and the most recently used ones are kept in a small LRU cache. The long bodies are stored compressed
+with `zlib`, and the database is read through `mmap`, so a lookup costs an index search and, for the long bodies, a decompression.
+
+The library is filled with `importFile` (e.g., `python src/__main__.py --import-snippets snippets.json`), and is read-only while the
+script runs. Its aliases are expanded like `ControllerHouse.abbreviations`, after them.
+"""
+
+from typing import Any, Iterable
+
+
+COMPRESSION_THRESHOLD: int
+"""The bodies longer than this number of bytes (in UTF-8) are stored compressed."""
+
+
+class SnippetLibrary:
+    """
+    Description:
+        A disk-backed table of aliases and their expansions, with the same lookups as a `dict` (`get`, `in`, `len`).
+
+        - `aliases` is loaded when the library is opened, and is kept in memory.
+        - `get` reads a body from the database, unless it is in the LRU cache. It can be called from any thread.
+        - The database is opened read-only. `importSnippets` writes to it with a separate connection, then reopens it.
+    ---
+    Parameters:
+        `filePath -> str`: The path of the database. A missing file is the same as an empty library.
+
+        `cacheSize -> int`: The number of bodies kept in the LRU cache.
+    ---
+    Attributes:
+        `aliases -> frozenset[str]`: The aliases of the library.
+
+        `hits -> int` / `misses -> int`: The number of `get` calls served from the cache, and from the database.
+    """
+
+    filePath: str
+    cacheSize: int
+    aliases: frozenset[str]
+    hits: int
+    misses: int
+
+    def __init__(self, filePath: str, cacheSize: int = 256) -> None:
+        ...
+
+    def open(self) -> None:
+        """(Re)opens the database, and loads its aliases. The cached bodies are dropped."""
+        ...
+
+    def close(self) -> None:
+        """Closes the database. The library is empty until it is opened again."""
+        ...
+
+    def get(self, alias: str, default: Any = None) -> str | Any:
+        """Returns the expansion of the given alias, or `default` if it is not in the library."""
+        ...
+
+    def importSnippets(self, snippets: dict[str, str] | Iterable[tuple[str, str]], replace: bool = False) -> int:
+        """
+        Description:
+            Writes the given snippets to the database (creating it if needed), then reopens it. The aliases are lowercased,
+            and the empty ones and the ones longer than `scriptConfigs.MAX_ALIAS_LENGTH` are skipped with a warning.
+        ---
+        Parameters:
+            `snippets -> dict[str, str] | Iterable[tuple[str, str]]`: The aliases and their expansions.
+
+            `replace -> bool`: Whether to remove the snippets that are already in the library first. Otherwise, the existing aliases are overwritten.
+        ---
+        Returns:
+            `int`: The number of imported snippets.
+        """
+        ...
+
+    def importFile(self, filePath: str, replace: bool = False) -> int:
+        """
+        Description:
+            Imports the snippets of a file into the database (see `importSnippets`). The supported formats are:
+
+            - `.json`: An object that maps the aliases to their expansions.
+            - `.csv` / `.tsv`: Rows of two columns, the alias and its expansion.
+        ---
+        Returns:
+            `int`: The number of imported snippets.
+        """
+        ...
+
+    def __contains__(self, alias: str) -> bool:
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+
+snippetLibrary: SnippetLibrary
+"""The snippet library of the script."""
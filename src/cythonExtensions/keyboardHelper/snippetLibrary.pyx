@@ -0,0 +1,247 @@
+# cython: language_level = 3str
+
+"""
+This extension module stores large snippet libraries on disk, in an SQLite database (`scriptConfigs.SNIPPET_LIBRARY_PATH`).
+
+Only the aliases of the library stay in memory, as the text expansion must match them on each keystroke. The bodies (expansions)
+are read when they are expanded, and the most recently used ones are kept in a small LRU cache. The long bodies are stored compressed
+with `zlib`, and the database is read through `mmap`, so a lookup costs an index search and, for the long bodies, a decompression.
+
+The library is filled with `importFile` (e.g., `python src/__main__.py --import-snippets snippets.json`), and is read-only while the
+script runs. Its aliases are expanded like `ControllerHouse.abbreviations`, after them.
+"""
+
+import os, csv, json, sqlite3, threading, zlib
+from collections import OrderedDict
+from pathlib import Path
+
+import scriptConfigs as configs
+
+
+COMPRESSION_THRESHOLD = 128
+"""The bodies longer than this number of bytes (in UTF-8) are stored compressed."""
+
+cdef str SCHEMA = """
+CREATE TABLE IF NOT EXISTS snippets (
+    alias      TEXT PRIMARY KEY,
+    body       BLOB NOT NULL,
+    compressed INTEGER NOT NULL
+) WITHOUT ROWID
+"""
+
+
+cdef tuple encodeBody(str body):
+    """Returns the stored form of a body, and whether it is compressed."""
+    
+    cdef bytes data = body.encode("utf-8")
+    cdef bytes compressed
+    
+    if len(data) > COMPRESSION_THRESHOLD:
+        compressed = zlib.compress(data, 6)
+        
+        if len(compressed) < len(data):
+            return compressed, True
+    
+    return data, False
+
+
+cdef class SnippetLibrary:
+    """
+    Description:
+        A disk-backed table of aliases and their expansions, with the same lookups as a `dict` (`get`, `in`, `len`).
+        
+        - `aliases` is loaded when the library is opened, and is kept in memory.
+        - `get` reads a body from the database, unless it is in the LRU cache. It can be called from any thread.
+        - The database is opened read-only. `importSnippets` writes to it with a separate connection, then reopens it.
+    ---
+    Parameters:
+        `filePath -> str`: The path of the database. A missing file is the same as an empty library.
+        
+        `cacheSize -> int`: The number of bodies kept in the LRU cache.
+    ---
+    Attributes:
+        `aliases -> frozenset[str]`: The aliases of the library.
+        
+        `hits -> int` / `misses -> int`: The number of `get` calls served from the cache, and from the database.
+    """
+    
+    cdef public str filePath
+    cdef public int cacheSize
+    cdef public frozenset aliases
+    cdef public long long hits, misses
+    cdef object connection
+    cdef object cache
+    cdef object lock
+    
+    def __init__(self, str filePath, int cacheSize=256):
+        self.filePath = filePath
+        self.cacheSize = cacheSize
+        self.aliases = frozenset()
+        self.hits = self.misses = 0
+        self.connection = None
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+    
+    cpdef void open(self):
+        """(Re)opens the database, and loads its aliases. The cached bodies are dropped."""
+        
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+            
+            self.cache.clear()
+            self.aliases = frozenset()
+            
+            if not self.filePath or not os.path.isfile(self.filePath):
+                return
+            
+            try:
+                connection = sqlite3.connect(Path(self.filePath).resolve().as_uri() + "?mode=ro", uri=True, check_same_thread=False)
+                
+                # Reading the pages through `mmap` instead of copying them into the SQLite page cache.
+                connection.execute("PRAGMA mmap_size = 268435456")
+                self.aliases = frozenset([row[0] for row in connection.execute("SELECT alias FROM snippets")])
+            
+            except sqlite3.Error as error:
+                print(f"➤ Warning! The snippet library '{self.filePath}' could not be opened: {error}")
+                return
+            
+            self.connection = connection
+    
+    cpdef void close(self):
+        """Closes the database. The library is empty until it is opened again."""
+        
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+            
+            self.cache.clear()
+            self.aliases = frozenset()
+    
+    cpdef object get(self, str alias, default=None):
+        """Returns the expansion of the given alias, or `default` if it is not in the library."""
+        
+        if alias not in self.aliases:
+            return default
+        
+        with self.lock:
+            body = self.cache.get(alias)
+            
+            if body is not None:
+                self.cache.move_to_end(alias)
+                self.hits += 1
+                
+                return body
+            
+            if self.connection is None:
+                return default
+            
+            row = self.connection.execute("SELECT body, compressed FROM snippets WHERE alias = ?", (alias,)).fetchone()
+            
+            if row is None:
+                return default
+            
+            self.misses += 1
+            body = (zlib.decompress(row[0]) if row[1] else bytes(row[0])).decode("utf-8")
+            
+            self.cache[alias] = body
+            
+            if len(self.cache) > self.cacheSize:
+                self.cache.popitem(last=False)
+            
+            return body
+    
+    cpdef int importSnippets(self, snippets, bint replace=False):
+        """
+        Description:
+            Writes the given snippets to the database (creating it if needed), then reopens it. The aliases are lowercased,
+            and the empty ones and the ones longer than `scriptConfigs.MAX_ALIAS_LENGTH` are skipped with a warning.
+        ---
+        Parameters:
+            `snippets -> dict[str, str] | Iterable[tuple[str, str]]`: The aliases and their expansions.
+            
+            `replace -> bool`: Whether to remove the snippets that are already in the library first. Otherwise, the existing aliases are overwritten.
+        ---
+        Returns:
+            `int`: The number of imported snippets.
+        """
+        
+        cdef list rows = []
+        cdef int skipped = 0
+        
+        if isinstance(snippets, dict):
+            snippets = snippets.items()
+        
+        for alias, body in snippets:
+            alias = str(alias).strip().lower()
+            
+            if not alias or len(alias) > configs.MAX_ALIAS_LENGTH:
+                skipped += 1
+                continue
+            
+            data, compressed = encodeBody(str(body))
+            rows.append((alias, data, compressed))
+        
+        if skipped:
+            print(f"➤ Warning! {skipped} snippets were skipped. Their aliases are empty or longer than {configs.MAX_ALIAS_LENGTH} characters.")
+        
+        connection = sqlite3.connect(self.filePath)
+        
+        try:
+            with connection:
+                connection.execute(SCHEMA)
+                
+                if replace:
+                    connection.execute("DELETE FROM snippets")
+                
+                connection.executemany("INSERT OR REPLACE INTO snippets VALUES (?, ?, ?)", rows)
+        
+        finally:
+            connection.close()
+        
+        self.open()
+        
+        return len(rows)
+    
+    def importFile(self, str filePath, bint replace=False) -> int:
+        """
+        Description:
+            Imports the snippets of a file into the database (see `importSnippets`). The supported formats are:
+            
+            - `.json`: An object that maps the aliases to their expansions.
+            - `.csv` / `.tsv`: Rows of two columns, the alias and its expansion.
+        ---
+        Returns:
+            `int`: The number of imported snippets.
+        """
+        
+        extension = os.path.splitext(filePath)[1].lower()
+        
+        if extension not in (".json", ".csv", ".tsv"):
+            raise ValueError(f"{os.path.basename(filePath)}: unsupported file type '{extension}'. Expected a `.json`, `.csv`, or `.tsv` file.")
+        
+        with open(filePath, encoding="utf-8", newline="") as file:
+            if extension == ".json":
+                snippets = json.load(file)
+                
+                if not isinstance(snippets, dict):
+                    raise ValueError(f"{os.path.basename(filePath)}: expected an object that maps the aliases to their expansions.")
+            
+            else:
+                snippets = [row[:2] for row in csv.reader(file, delimiter="\t" if extension == ".tsv" else ",") if len(row) >= 2]
+        
+        return self.importSnippets(snippets, replace)
+    
+    def __contains__(self, alias) -> bool:
+        return alias in self.aliases
+    
+    def __len__(self) -> int:
+        return len(self.aliases)
+
+
+snippetLibrary = SnippetLibrary(configs.SNIPPET_LIBRARY_PATH, configs.SNIPPET_LIBRARY_CACHE_SIZE)
+"""The snippet library of the script."""
+
+snippetLibrary.open()
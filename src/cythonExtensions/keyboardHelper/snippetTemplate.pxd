@@ -0,0 +1,23 @@
+cdef class CachedSource:
+    cdef object source
+    cdef double ttl
+    cdef bint perWindow
+    cdef dict values
+    
+    cpdef void clear(self)
+
+cdef class SnippetTemplate:
+    cdef str text
+    cdef bint isStatic
+    cdef list segments
+    cdef list placeholders
+    cdef int caretSegment
+    cdef tuple rendered
+    
+    cdef tuple join(self, list segments)
+    
+    cpdef tuple render(self)
+
+cpdef void compileTemplates(expansions)
+
+cpdef SnippetTemplate getTemplate(str text)
@@ -0,0 +1,128 @@
+"""
+This module compiles the expansions of the text expansion aliases into snippet templates.
+
+An expansion can contain placeholders that are evaluated each time it is expanded, e.g., `"Date: {date:%d/%m/%Y}{!}"`:
+
+- `{date}` / `{date:format}`: The current date (`%Y-%m-%d` by default), formatted with `strftime`.
+- `{time}` / `{time:format}`: The current time (`%H:%M` by default), formatted with `strftime`.
+- `{clipboard}`: The text in the clipboard.
+- `{explorer}`: The path of the focused explorer window.
+- `{counter}` / `{counter:name}`: A counter that is incremented each time it is expanded, starting from `1`.
+- `{!}`: Where the caret is placed after the expansion. Only the first one is used.
+
+An expansion is parsed once into a list of segments (`compileTemplates` is called each time the alias tables are replaced), and each
+placeholder is evaluated only when its snippet is expanded, so rendering a snippet is a single join. The unknown placeholders are kept
+as they are, so the expansions that contain braces (e.g., code) are not affected.
+"""
+
+from typing import Callable, Iterable
+
+
+class CachedSource:
+    """
+    Description:
+        Wraps an expensive placeholder source (e.g., one that uses COM), and reuses its value for `ttl` seconds.
+    ---
+    Parameters:
+        `source -> Callable[[str], str]`: The wrapped source, called with the argument of the placeholder.
+        
+        `ttl -> float`: The time in seconds that a value is reused.
+        
+        `perWindow -> bool`: Whether the value depends on the foreground window, i.e., it is not reused after the foreground window changes.
+    """
+    
+    source: Callable[[str], str]
+    ttl: float
+    perWindow: bool
+    
+    def __init__(self, source: Callable[[str], str], ttl: float = 2.0, perWindow: bool = False) -> None:
+        ...
+    
+    def __call__(self, arg: str) -> str:
+        ...
+    
+    def clear(self) -> None:
+        """Forgets the cached values."""
+        ...
+
+
+def getDate(arg: str) -> str:
+    """Returns the current date, formatted with `arg` (`%Y-%m-%d` by default)."""
+    ...
+
+
+def getTime(arg: str) -> str:
+    """Returns the current time, formatted with `arg` (`%H:%M` by default)."""
+    ...
+
+
+def getClipboardText(arg: str) -> str:
+    """Returns the text in the clipboard, or an empty string."""
+    ...
+
+
+def getExplorerPath(arg: str) -> str:
+    """Returns the path of the focused explorer window, or an empty string."""
+    ...
+
+
+counters: dict[str, int]
+"""The values of the `{counter}` placeholders, by name."""
+
+
+def getCounter(arg: str) -> str:
+    """Increments the counter with the given name, and returns its new value."""
+    ...
+
+
+placeholderSources: dict[str, Callable[[str], str]]
+"""Maps the name of each placeholder to a function that returns its text, given the argument after `:` (or an empty string)."""
+
+
+class SnippetTemplate:
+    """
+    Description:
+        A compiled expansion. The literal parts are stored as they are, and the placeholders are stored as the indexes of the segments
+        that are replaced with their values by `render`.
+    ---
+    Parameters:
+        `text -> str`: The expansion to compile.
+    ---
+    Attributes:
+        `text -> str`: The compiled expansion.
+        
+        `isStatic -> bool`: Whether the expansion has no placeholders, i.e., it always renders to the same text.
+    """
+    
+    text: str
+    isStatic: bool
+    
+    def __init__(self, text: str) -> None:
+        ...
+    
+    def render(self) -> tuple[str, int]:
+        """
+        Description:
+            Evaluates the placeholders, and returns the text of the snippet.
+        ---
+        Returns:
+            `tuple[str, int]`: The text, and the number of characters after the caret (i.e., how many times `Left` is pressed after typing it).
+        """
+        ...
+
+
+templates: dict[str, SnippetTemplate]
+"""The compiled expansions, by their text."""
+
+
+def compileTemplates(expansions: Iterable[str]) -> None:
+    """Compiles the given expansions, reusing the already compiled ones. The templates of the expansions that are no longer used are dropped."""
+    ...
+
+
+def getTemplate(text: str) -> SnippetTemplate:
+    """
+    Returns the compiled template of the given expansion. The expansions that were not passed to `compileTemplates` (e.g., the ones of
+    the snippet library) are compiled on each call, so the table does not keep their texts in memory.
+    """
+    ...
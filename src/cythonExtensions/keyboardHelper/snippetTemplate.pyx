@@ -0,0 +1,252 @@
+# cython: language_level = 3str
+
+"""
+This extension module compiles the expansions of the text expansion aliases into snippet templates.
+
+An expansion can contain placeholders that are evaluated each time it is expanded, e.g., `"Date: {date:%d/%m/%Y}{!}"`:
+
+- `{date}` / `{date:format}`: The current date (`%Y-%m-%d` by default), formatted with `strftime`.
+- `{time}` / `{time:format}`: The current time (`%H:%M` by default), formatted with `strftime`.
+- `{clipboard}`: The text in the clipboard.
+- `{explorer}`: The path of the focused explorer window.
+- `{counter}` / `{counter:name}`: A counter that is incremented each time it is expanded, starting from `1`.
+- `{!}`: Where the caret is placed after the expansion. Only the first one is used.
+
+An expansion is parsed once into a list of segments (`compileTemplates` is called each time the alias tables are replaced), and each
+placeholder is evaluated only when its snippet is expanded, so rendering a snippet is a single join. The unknown placeholders are kept
+as they are, so the expansions that contain braces (e.g., code) are not affected.
+"""
+
+import re
+from datetime import datetime
+from time import monotonic
+
+from cythonExtensions.platformBackend import platformBackend as pfBackend
+from cythonExtensions.platformBackend.platformBackend import win32con
+from cythonExtensions.windowHelper.foregroundContext import foregroundContext
+
+
+cdef object placeholderPattern = re.compile(r"\{(!|[a-z_]+)(?::([^{}]*))?\}")
+
+cdef str CARET = "!"
+
+
+cdef class CachedSource:
+    """
+    Description:
+        Wraps an expensive placeholder source (e.g., one that uses COM), and reuses its value for `ttl` seconds.
+    ---
+    Parameters:
+        `source -> Callable[[str], str]`: The wrapped source, called with the argument of the placeholder.
+        
+        `ttl -> float`: The time in seconds that a value is reused.
+        
+        `perWindow -> bool`: Whether the value depends on the foreground window, i.e., it is not reused after the foreground window changes.
+    """
+    
+    cdef public object source
+    cdef public double ttl
+    cdef public bint perWindow
+    cdef dict values
+    
+    def __init__(self, source, double ttl=2.0, bint perWindow=False):
+        self.source = source
+        self.ttl = ttl
+        self.perWindow = perWindow
+        self.values = {}
+    
+    def __call__(self, str arg):
+        cdef double now = monotonic()
+        
+        key = (arg, foregroundContext.current().hwnd) if self.perWindow else arg
+        cached = self.values.get(key)
+        
+        if cached is not None and now - <double> cached[0] < self.ttl:
+            return cached[1]
+        
+        value = self.source(arg)
+        
+        # Only the latest value of each window is useful, so the table is not left growing.
+        if len(self.values) > 64:
+            self.values.clear()
+        
+        self.values[key] = (now, value)
+        
+        return value
+    
+    cpdef void clear(self):
+        """Forgets the cached values."""
+        
+        self.values.clear()
+
+
+def getDate(str arg) -> str:
+    """Returns the current date, formatted with `arg` (`%Y-%m-%d` by default)."""
+    
+    return datetime.now().strftime(arg or "%Y-%m-%d")
+
+
+def getTime(str arg) -> str:
+    """Returns the current time, formatted with `arg` (`%H:%M` by default)."""
+    
+    return datetime.now().strftime(arg or "%H:%M")
+
+
+def getClipboardText(str arg) -> str:
+    """Returns the text in the clipboard, or an empty string."""
+    
+    return pfBackend.backend.readClipboard(win32con.CF_UNICODETEXT) or ""
+
+
+def getExplorerPath(str arg) -> str:
+    """Returns the path of the focused explorer window, or an empty string."""
+    
+    # Imported here to avoid importing the COM automation objects unless the placeholder is used.
+    from cythonExtensions.explorerHelper.explorerHelper import getActiveExplorerPath
+    
+    return getActiveExplorerPath()
+
+
+counters = {}
+"""The values of the `{counter}` placeholders, by name."""
+
+
+def getCounter(str arg) -> str:
+    """Increments the counter with the given name, and returns its new value."""
+    
+    counters[arg] = counters.get(arg, 0) + 1
+    
+    return str(counters[arg])
+
+
+placeholderSources = {
+    "date":      getDate,
+    "time":      getTime,
+    "clipboard": getClipboardText,
+    "explorer":  CachedSource(getExplorerPath, 2.0, True),
+    "counter":   getCounter,
+}
+"""Maps the name of each placeholder to a function that returns its text, given the argument after `:` (or an empty string)."""
+
+
+cdef class SnippetTemplate:
+    """
+    Description:
+        A compiled expansion. The literal parts are stored as they are, and the placeholders are stored as the indexes of the segments
+        that are replaced with their values by `render`.
+    ---
+    Parameters:
+        `text -> str`: The expansion to compile.
+    ---
+    Attributes:
+        `text -> str`: The compiled expansion.
+        
+        `isStatic -> bool`: Whether the expansion has no placeholders, i.e., it always renders to the same text.
+    """
+    
+    cdef public str text
+    cdef public bint isStatic
+    cdef list segments
+    cdef list placeholders
+    cdef int caretSegment
+    cdef tuple rendered
+    
+    def __init__(self, str text):
+        cdef int start = 0
+        
+        self.text = text
+        self.segments = []
+        self.placeholders = []
+        self.caretSegment = -1
+        
+        for match in placeholderPattern.finditer(text):
+            name = match.group(1)
+            
+            # The unknown placeholders and the carets after the first one are literal text.
+            if name == CARET:
+                if self.caretSegment >= 0:
+                    continue
+            
+            elif name not in placeholderSources:
+                continue
+            
+            if match.start() > start:
+                self.segments.append(text[start:match.start()])
+            
+            if name == CARET:
+                self.caretSegment = len(self.segments)
+                self.segments.append("")
+            
+            else:
+                self.placeholders.append((len(self.segments), name, match.group(2) or ""))
+                self.segments.append("")
+            
+            start = match.end()
+        
+        if start < len(text):
+            self.segments.append(text[start:])
+        
+        self.isStatic = not self.placeholders
+        self.rendered = self.join(self.segments) if self.isStatic else None
+    
+    cdef tuple join(self, list segments):
+        """Returns the text of the given segments, and the number of characters after the caret."""
+        
+        if self.caretSegment < 0:
+            return "".join(segments), 0
+        
+        # The new lines are a single character (see `KeyInputBatch.text`).
+        return "".join(segments), len("".join(segments[self.caretSegment:]).replace("\r\n", "\n"))
+    
+    cpdef tuple render(self):
+        """
+        Description:
+            Evaluates the placeholders, and returns the text of the snippet.
+        ---
+        Returns:
+            `tuple[str, int]`: The text, and the number of characters after the caret (i.e., how many times `Left` is pressed after typing it).
+        """
+        
+        if self.isStatic:
+            return self.rendered
+        
+        cdef list segments = self.segments.copy()
+        cdef int index
+        
+        for index, name, arg in self.placeholders:
+            try:
+                segments[index] = str(placeholderSources[name](arg))
+            
+            except Exception as error:
+                print(f"➤ Warning! The placeholder '{name}' of the snippet {self.text!r} failed: {error}")
+        
+        return self.join(segments)
+
+
+templates = {}
+"""The compiled expansions, by their text."""
+
+
+cpdef void compileTemplates(expansions):
+    """Compiles the given expansions, reusing the already compiled ones. The templates of the expansions that are no longer used are dropped."""
+    
+    global templates
+    
+    cdef dict compiled = {}
+    
+    for text in expansions:
+        compiled[text] = templates.get(text) or SnippetTemplate(text)
+    
+    # Replaced as a whole, so the text expansion never sees a partially built table.
+    templates = compiled
+
+
+cpdef SnippetTemplate getTemplate(str text):
+    """
+    Returns the compiled template of the given expansion. The expansions that were not passed to `compileTemplates` (e.g., the ones of
+    the snippet library) are compiled on each call, so the table does not keep their texts in memory.
+    """
+    
+    template = templates.get(text)
+    
+    return template if template is not None else SnippetTemplate(text)
@@ -0,0 +1,22 @@
+cdef enum:
+    SUB_BUCKET_BITS  = 4
+    SUB_BUCKET_COUNT = 16
+    BUCKET_COUNT     = 560
+
+
+cdef class LatencyHistogram:
+    cdef str name
+    cdef long long counts[BUCKET_COUNT]
+    cdef long long count, minValue, maxValue, totalValue
+    
+    cdef void recordMicros(self, long long micros)
+    
+    cpdef void record(self, double seconds)
+    
+    cpdef long long percentile(self, double percent)
+    
+    cpdef dict summary(self)
+    
+    cpdef list buckets(self)
+    
+    cpdef void reset(self)
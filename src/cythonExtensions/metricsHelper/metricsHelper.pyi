@@ -0,0 +1,77 @@
+"""This module contains low overhead latency histograms used to measure the stages of handling the hook events."""
+
+
+class LatencyHistogram:
+    """
+    Description:
+        An HDR-style histogram of durations with a fixed memory footprint. Recording a value is a few integer operations,
+        so the histograms can stay enabled in the hook threads.
+        
+        Values are recorded in microseconds. The reported percentiles are the upper bounds of their buckets.
+    ---
+    Parameters:
+        `name -> str`: The name of the measured stage.
+    """
+    
+    name: str
+    count: int
+    minValue: int
+    maxValue: int
+    totalValue: int
+    
+    def __init__(self, name: str):
+        ...
+    
+    def record(self, seconds: float) -> None:
+        """Records a duration given in seconds."""
+        ...
+    
+    def percentile(self, percent: float) -> int:
+        """Returns the value in microseconds below which the given percentage of the recorded values fall."""
+        ...
+    
+    def summary(self) -> dict[str, int | float]:
+        """Returns the count, mean, percentiles, and maximum of the recorded values. The durations are in milliseconds."""
+        ...
+    
+    def buckets(self) -> list[tuple[int, int]]:
+        """Returns the non-empty buckets as `(upperBoundMicros, count)` tuples."""
+        ...
+    
+    def reset(self) -> None:
+        """Clears the recorded values."""
+        ...
+
+
+def getHistogram(name: str) -> LatencyHistogram:
+    """Returns the histogram with the given name, creating it if it does not exist."""
+    ...
+
+
+def getHistogramsSummary() -> dict[str, dict]:
+    """Returns the summaries of all the non-empty histograms, sorted by their names."""
+    ...
+
+
+def formatHistograms() -> str:
+    """Returns the summaries of all the non-empty histograms as a text table."""
+    ...
+
+
+def dumpHistograms(filePath="") -> str:
+    """
+    Description:
+        Writes the summaries and the raw buckets of all the non-empty histograms to a JSON file.
+    ---
+    Parameters:
+        `filePath -> str`: The output file. Defaults to `dumpfiles/latency (Y-m-d (Ip-M-S)).json` in the current working directory.
+    ---
+    Returns:
+        `str`: The path of the written file.
+    """
+    ...
+
+
+def resetHistograms() -> None:
+    """Clears the recorded values of all the histograms."""
+    ...
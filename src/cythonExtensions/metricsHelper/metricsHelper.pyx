@@ -0,0 +1,203 @@
+# cython: language_level = 3str
+
+"""This extension module contains low overhead latency histograms used to measure the stages of handling the hook events."""
+
+import os, json
+from datetime import datetime as dt
+
+
+# The histograms keep exact counts for values below 32 microseconds, and 16 log-linear sub-buckets (~6% precision)
+# for each power of two above that, up to `MAX_TRACKED_MICROS` (~19 hours).
+cdef enum:
+    SUB_BUCKET_BITS  = 4
+    SUB_BUCKET_COUNT = 16
+    BUCKET_COUNT     = 560
+
+cdef long long MAX_TRACKED_MICROS = (1LL << 36) - 1
+
+
+cdef inline int bucketIndex(long long micros):
+    """Returns the index of the bucket that holds the given value."""
+    
+    cdef int shift = 0
+    
+    if micros < 2 * SUB_BUCKET_COUNT:
+        return <int> micros
+    
+    while micros >> (shift + SUB_BUCKET_BITS + 1):
+        shift += 1
+    
+    return shift * SUB_BUCKET_COUNT + <int> (micros >> shift)
+
+
+cdef inline long long bucketUpperBound(int index):
+    """Returns the highest value that falls in the bucket of the given index."""
+    
+    cdef int shift
+    
+    if index < 2 * SUB_BUCKET_COUNT:
+        return index
+    
+    shift = index // SUB_BUCKET_COUNT - 1
+    
+    return (<long long> (index % SUB_BUCKET_COUNT + SUB_BUCKET_COUNT + 1) << shift) - 1
+
+
+cdef class LatencyHistogram:
+    """
+    Description:
+        An HDR-style histogram of durations with a fixed memory footprint. Recording a value is a few integer operations,
+        so the histograms can stay enabled in the hook threads.
+        
+        Values are recorded in microseconds. The reported percentiles are the upper bounds of their buckets.
+    ---
+    Parameters:
+        `name -> str`: The name of the measured stage.
+    """
+    
+    cdef public str name
+    cdef long long counts[BUCKET_COUNT]
+    cdef public long long count, minValue, maxValue, totalValue
+    
+    def __init__(self, str name):
+        self.name = name
+        self.reset()
+    
+    cdef void recordMicros(self, long long micros):
+        """Records a duration given in microseconds. Negative values (e.g., caused by clock adjustments) are ignored."""
+        
+        if micros < 0:
+            return
+        
+        if micros > MAX_TRACKED_MICROS:
+            micros = MAX_TRACKED_MICROS
+        
+        self.counts[bucketIndex(micros)] += 1
+        self.count += 1
+        self.totalValue += micros
+        
+        if micros > self.maxValue:
+            self.maxValue = micros
+        
+        if micros < self.minValue:
+            self.minValue = micros
+    
+    cpdef void record(self, double seconds):
+        """Records a duration given in seconds."""
+        
+        self.recordMicros(<long long> (seconds * 1e6))
+    
+    cpdef long long percentile(self, double percent):
+        """Returns the value in microseconds below which the given percentage of the recorded values fall."""
+        
+        cdef long long target, seen = 0
+        cdef int index
+        
+        if not self.count:
+            return 0
+        
+        target = max(<long long> (self.count * percent / 100 + 0.5), 1)
+        
+        for index in range(BUCKET_COUNT):
+            seen += self.counts[index]
+            
+            if seen >= target:
+                return min(bucketUpperBound(index), self.maxValue)
+        
+        return self.maxValue
+    
+    cpdef dict summary(self):
+        """Returns the count, mean, percentiles, and maximum of the recorded values. The durations are in milliseconds."""
+        
+        return {
+            "count":  self.count,
+            "meanMs": self.totalValue / self.count / 1000 if self.count else 0.0,
+            "p50Ms":  self.percentile(50) / 1000,
+            "p90Ms":  self.percentile(90) / 1000,
+            "p99Ms":  self.percentile(99) / 1000,
+            "p999Ms": self.percentile(99.9) / 1000,
+            "maxMs":  self.maxValue / 1000,
+        }
+    
+    cpdef list buckets(self):
+        """Returns the non-empty buckets as `(upperBoundMicros, count)` tuples."""
+        
+        cdef int index
+        
+        return [(bucketUpperBound(index), self.counts[index]) for index in range(BUCKET_COUNT) if self.counts[index]]
+    
+    cpdef void reset(self):
+        """Clears the recorded values."""
+        
+        cdef int index
+        
+        for index in range(BUCKET_COUNT):
+            self.counts[index] = 0
+        
+        self.count = 0
+        self.minValue = MAX_TRACKED_MICROS
+        self.maxValue = 0
+        self.totalValue = 0
+
+
+cdef dict histograms = {}
+"""Holds all the created histograms keyed by their names."""
+
+
+cpdef LatencyHistogram getHistogram(str name):
+    """Returns the histogram with the given name, creating it if it does not exist."""
+    
+    cdef LatencyHistogram histogram = histograms.get(name)
+    
+    if histogram is None:
+        histogram = histograms.setdefault(name, LatencyHistogram(name))
+    
+    return histogram
+
+
+def getHistogramsSummary() -> dict[str, dict]:
+    """Returns the summaries of all the non-empty histograms, sorted by their names."""
+    
+    return {name: histograms[name].summary() for name in sorted(histograms) if histograms[name].count}
+
+
+def formatHistograms() -> str:
+    """Returns the summaries of all the non-empty histograms as a text table."""
+    
+    cdef list lines = [f"{'Stage':<40} {'Count':>8} {'Mean':>9} {'P50':>9} {'P90':>9} {'P99':>9} {'P99.9':>9} {'Max':>9}"]
+    
+    for name, summary in getHistogramsSummary().items():
+        lines.append(f"{name:<40} {summary['count']:>8} {summary['meanMs']:>9.3f} {summary['p50Ms']:>9.3f} {summary['p90Ms']:>9.3f} "
+                     f"{summary['p99Ms']:>9.3f} {summary['p999Ms']:>9.3f} {summary['maxMs']:>9.3f}")
+    
+    return "\n".join(lines) + "\n(All durations are in milliseconds.)"
+
+
+def dumpHistograms(filePath="") -> str:
+    """
+    Description:
+        Writes the summaries and the raw buckets of all the non-empty histograms to a JSON file.
+    ---
+    Parameters:
+        `filePath -> str`: The output file. Defaults to `dumpfiles/latency (Y-m-d (Ip-M-S)).json` in the current working directory.
+    ---
+    Returns:
+        `str`: The path of the written file.
+    """
+    
+    if not filePath:
+        os.makedirs(os.path.join(os.getcwd(), "dumpfiles"), exist_ok=True)
+        filePath = os.path.join(os.getcwd(), "dumpfiles", f"latency {dt.now().strftime('%Y-%m-%d (%I%p-%M-%S)')}.json")
+    
+    with open(filePath, "w", encoding="utf-8") as dumpFile:
+        json.dump({name: {"summary": histograms[name].summary(), "bucketsMicros": histograms[name].buckets()}
+                   for name in sorted(histograms) if histograms[name].count}, dumpFile, indent=4)
+    
+    return filePath
+
+
+def resetHistograms() -> None:
+    """Clears the recorded values of all the histograms."""
+    
+    for histogram in histograms.values():
+        histogram.reset()
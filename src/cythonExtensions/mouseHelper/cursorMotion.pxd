@@ -0,0 +1,28 @@
+cdef class CursorMotionEngine:
+    cdef double rate, frameRate, spinMargin, maxLateness
+    cdef long long frames, lateFrames, movedPixels
+    cdef int heldMask, profile, frame
+    cdef double remainderX, remainderY
+    cdef int keyDirections[256]
+    cdef double unitX[16]
+    cdef double unitY[16]
+    cdef double *steps[3]
+    cdef int stepCounts[3]
+    cdef list heldKeys
+    cdef object condition, thread
+    
+    cpdef void buildProfiles(self, double frameRate)
+    
+    cpdef void press(self, int vkey, int direction, int profile=*)
+    
+    cpdef void release(self, int vkey)
+    
+    cpdef void stop(self)
+    
+    cdef void updateMask(self)
+    
+    cdef void moveFrame(self, int mask, int profile)
+    
+    cdef void waitUntil(self, double deadline)
+    
+    cpdef dict getStats(self)
@@ -0,0 +1,81 @@
+"""
+This module moves the mouse cursor smoothly while the mouse-control direction keys are held, instead of a fixed jump per key repeat.
+
+The step lengths of each frame are computed ahead of time from an acceleration curve (a table per speed profile), and the unit vectors
+of all the combinations of the held directions are computed once, so a frame only looks up its step and its direction. The frames run
+at the display refresh rate on one thread, which waits on a condition while no direction key is held. The hotkeys only mark the keys
+as held, and their release stops the motion.
+"""
+
+
+UP: int
+RIGHT: int
+DOWN: int
+LEFT: int
+"""The direction bits. The directions of the held keys are combined, e.g., `UP | RIGHT` moves diagonally."""
+
+PRECISE: int
+NORMAL: int
+FAST: int
+"""The speed profiles."""
+
+MOTION_PROFILES: tuple[tuple[float, float, float], ...]
+"""The `(startSpeed, topSpeed, rampTime)` of each speed profile, in pixels per second and seconds: the speed eases from the start to the top one over the ramp time."""
+
+DEFAULT_FRAME_RATE: float
+"""The frame rate used when the display refresh rate is unknown."""
+
+
+class CursorMotionEngine:
+    """
+    Description:
+        Moves the cursor in the combined direction of the held keys, one frame at a time, with the speed of the last pressed key's profile.
+        The speed starts from the profile start speed when the first key is pressed, and keeps its progress while keys are added or released.
+    ---
+    Parameters:
+        `rate -> float`: The frames per second. `0` uses the display refresh rate, read when the motion thread starts.
+    ---
+    Attributes:
+        `frames -> int`: The number of the run frames.
+        
+        `lateFrames -> int`: The frames that started more than a frame period after their due time. The frames after them are resynchronized.
+    """
+    
+    rate: float
+    frameRate: float
+    spinMargin: float
+    maxLateness: float
+    frames: int
+    lateFrames: int
+    movedPixels: int
+    
+    def __init__(self, rate: float = 0.0) -> None:
+        ...
+    
+    def buildProfiles(self, frameRate: float) -> None:
+        """Computes the step lengths (in pixels) of each frame of the speed ramps, for the given frame rate. The last step of a ramp is its top speed."""
+        ...
+    
+    def press(self, vkey: int, direction: int, profile: int = 1) -> None:
+        """Starts moving the cursor in the given direction (`UP`, `RIGHT`, `DOWN`, `LEFT`, or a combination of them) until the key is released."""
+        ...
+    
+    def release(self, vkey: int) -> None:
+        """Stops the motion of the given key. Does nothing for the other keys."""
+        ...
+    
+    def stop(self) -> None:
+        """Releases all the held keys."""
+        ...
+    
+    def motionLoop(self) -> None:
+        """The loop of the motion thread."""
+        ...
+    
+    def getStats(self) -> dict:
+        """Returns the frame rate, the run and late frames, the maximum lateness in milliseconds, and the moved distance in pixels."""
+        ...
+
+
+cursorMotion: CursorMotionEngine
+"""The cursor motion engine of the script."""
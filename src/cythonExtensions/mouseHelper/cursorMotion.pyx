@@ -0,0 +1,280 @@
+# cython: language_level = 3str
+
+"""
+This extension module moves the mouse cursor smoothly while the mouse-control direction keys are held, instead of a fixed jump per key repeat.
+
+The step lengths of each frame are computed ahead of time from an acceleration curve (a table per speed profile), and the unit vectors
+of all the combinations of the held directions are computed once, so a frame only looks up its step and its direction. The frames run
+at the display refresh rate on one thread, which waits on a condition while no direction key is held. The hotkeys only mark the keys
+as held, and their release stops the motion.
+"""
+
+from cpython.mem cimport PyMem_Malloc, PyMem_Free
+from libc.math cimport sqrt
+
+import threading
+from time import perf_counter, sleep
+
+from cythonExtensions.commonUtils.commonUtils import PThread, Management as mgmt
+from cythonExtensions.platformBackend import platformBackend as pfBackend
+
+
+UP, RIGHT, DOWN, LEFT = 1, 2, 4, 8
+"""The direction bits. The directions of the held keys are combined, e.g., `UP | RIGHT` moves diagonally."""
+
+PRECISE, NORMAL, FAST = 0, 1, 2
+"""The speed profiles."""
+
+MOTION_PROFILES = (
+    (60.0,  300.0,  0.6),
+    (300.0, 1600.0, 0.5),
+    (800.0, 3500.0, 0.4),
+)
+"""The `(startSpeed, topSpeed, rampTime)` of each speed profile, in pixels per second and seconds: the speed eases from the start to the top one over the ramp time."""
+
+DEFAULT_FRAME_RATE = 60.0
+"""The frame rate used when the display refresh rate is unknown."""
+
+
+cdef class CursorMotionEngine:
+    """
+    Description:
+        Moves the cursor in the combined direction of the held keys, one frame at a time, with the speed of the last pressed key's profile.
+        The speed starts from the profile start speed when the first key is pressed, and keeps its progress while keys are added or released.
+    ---
+    Parameters:
+        `rate -> float`: The frames per second. `0` uses the display refresh rate, read when the motion thread starts.
+    ---
+    Attributes:
+        `frames -> int`: The number of the run frames.
+        
+        `lateFrames -> int`: The frames that started more than a frame period after their due time. The frames after them are resynchronized.
+    """
+    
+    cdef public double rate, frameRate, spinMargin, maxLateness
+    cdef public long long frames, lateFrames, movedPixels
+    cdef int heldMask, profile, frame
+    cdef double remainderX, remainderY
+    cdef int keyDirections[256]
+    cdef double unitX[16]
+    cdef double unitY[16]
+    cdef double *steps[3]
+    cdef int stepCounts[3]
+    cdef list heldKeys
+    cdef object condition, thread
+    
+    def __init__(self, double rate=0.0):
+        cdef int index
+        cdef double x, y, length
+        
+        self.rate = rate
+        self.frameRate = 0.0
+        self.spinMargin = 0.0005
+        self.frames = self.lateFrames = self.movedPixels = 0
+        self.maxLateness = 0.0
+        self.heldMask = self.profile = self.frame = 0
+        self.remainderX = self.remainderY = 0.0
+        self.heldKeys = []
+        self.condition = threading.Condition()
+        self.thread = None
+        
+        for index in range(256):
+            self.keyDirections[index] = 0
+        
+        for index in range(3):
+            self.steps[index] = NULL
+            self.stepCounts[index] = 0
+        
+        # The unit vectors of all the direction masks. The opposite directions cancel each other, and the diagonals have the same speed as the straight moves.
+        for index in range(16):
+            x = ((index & RIGHT) != 0) - ((index & LEFT) != 0)
+            y = ((index & DOWN) != 0) - ((index & UP) != 0)
+            length = sqrt(x * x + y * y)
+            self.unitX[index] = x / length if length else 0.0
+            self.unitY[index] = y / length if length else 0.0
+    
+    def __dealloc__(self):
+        cdef int index
+        
+        for index in range(3):
+            PyMem_Free(self.steps[index])
+    
+    cpdef void buildProfiles(self, double frameRate):
+        """Computes the step lengths (in pixels) of each frame of the speed ramps, for the given frame rate. The last step of a ramp is its top speed."""
+        
+        cdef int profile, frame, count
+        cdef double startSpeed, topSpeed, rampTime, progress
+        cdef double *steps
+        
+        if frameRate <= 0:
+            raise ValueError("The frame rate of the cursor motion must be positive.")
+        
+        with self.condition:
+            for profile in range(3):
+                startSpeed, topSpeed, rampTime = MOTION_PROFILES[profile]
+                count = max(<int> (rampTime * frameRate), 1) + 1
+                steps = <double *> PyMem_Malloc(count * sizeof(double))
+                
+                if steps == NULL:
+                    raise MemoryError()
+                
+                for frame in range(count):
+                    # A smoothstep easing, so the cursor starts slowly for small adjustments, and does not jerk when it reaches the top speed.
+                    progress = frame / <double> (count - 1)
+                    steps[frame] = (startSpeed + (topSpeed - startSpeed) * progress * progress * (3 - 2 * progress)) / frameRate
+                
+                PyMem_Free(self.steps[profile])
+                self.steps[profile] = steps
+                self.stepCounts[profile] = count
+            
+            self.frameRate = frameRate
+    
+    cpdef void press(self, int vkey, int direction, int profile=1):
+        """Starts moving the cursor in the given direction (`UP`, `RIGHT`, `DOWN`, `LEFT`, or a combination of them) until the key is released."""
+        
+        if not 0 <= vkey < 256 or not 0 < direction < 16 or not 0 <= profile < 3:
+            raise ValueError(f"Invalid cursor motion: key {vkey}, direction {direction}, profile {profile}.")
+        
+        # The auto-repeated presses of a held key.
+        if self.keyDirections[vkey] == direction and self.profile == profile:
+            return
+        
+        with self.condition:
+            if not self.keyDirections[vkey]:
+                self.heldKeys.append(vkey)
+            
+            self.keyDirections[vkey] = direction
+            self.profile = profile
+            self.updateMask()
+            
+            if self.thread is None:
+                self.thread = PThread(target=self.motionLoop, name="cursorMotion", daemon=True)
+                self.thread.start()
+            
+            self.condition.notify()
+    
+    cpdef void release(self, int vkey):
+        """Stops the motion of the given key. Does nothing for the other keys."""
+        
+        if not 0 <= vkey < 256 or not self.keyDirections[vkey]:
+            return
+        
+        with self.condition:
+            if self.keyDirections[vkey]:
+                self.keyDirections[vkey] = 0
+                self.heldKeys.remove(vkey)
+                self.updateMask()
+    
+    cpdef void stop(self):
+        """Releases all the held keys."""
+        
+        with self.condition:
+            for vkey in self.heldKeys:
+                self.keyDirections[<int> vkey] = 0
+            
+            self.heldKeys.clear()
+            self.updateMask()
+    
+    cdef void updateMask(self):
+        """Combines the directions of the held keys. Must be called with the condition held."""
+        
+        cdef int mask = 0
+        
+        for vkey in self.heldKeys:
+            mask |= self.keyDirections[<int> vkey]
+        
+        self.heldMask = mask
+        
+        # The speed ramp restarts after all the keys are released.
+        if not mask:
+            self.frame = 0
+            self.remainderX = self.remainderY = 0.0
+    
+    cdef void moveFrame(self, int mask, int profile):
+        """Moves the cursor by the step of the current frame. The fractions of a pixel are carried over to the next frames."""
+        
+        cdef int frame = min(self.frame, self.stepCounts[profile] - 1)
+        cdef double step = self.steps[profile][frame]
+        cdef double moveX = self.remainderX + step * self.unitX[mask]
+        cdef double moveY = self.remainderY + step * self.unitY[mask]
+        cdef int dx = <int> moveX, dy = <int> moveY
+        cdef int x, y
+        
+        self.remainderX = moveX - dx
+        self.remainderY = moveY - dy
+        self.frame += 1
+        self.frames += 1
+        
+        if dx or dy:
+            x, y = pfBackend.backend.getCursorPos()
+            pfBackend.backend.setCursorPos(x + dx, y + dy)
+            self.movedPixels += abs(dx) + abs(dy)
+    
+    cdef void waitUntil(self, double deadline):
+        """Sleeps in short slices until shortly before the given deadline, then spins until it."""
+        
+        while deadline - perf_counter() > self.spinMargin + 0.001:
+            sleep(0.001)
+        
+        while perf_counter() < deadline:
+            pass
+    
+    def motionLoop(self) -> None:
+        """The loop of the motion thread."""
+        
+        cdef double period, deadline = 0.0, lateness
+        cdef int mask, profile
+        
+        if not self.frameRate:
+            self.buildProfiles(self.rate or pfBackend.backend.getDisplayFrequency() or DEFAULT_FRAME_RATE)
+        
+        period = 1.0 / self.frameRate
+        
+        while not mgmt.terminateEvent.is_set():
+            with self.condition:
+                if not self.heldMask:
+                    deadline = 0.0
+                    self.condition.wait(0.5)
+                    continue
+                
+                mask, profile = self.heldMask, self.profile
+                
+                # The opposite held directions (e.g., up and down) cancel each other.
+                if mask and not (self.unitX[mask] or self.unitY[mask]):
+                    mask = 0
+                
+                if mask:
+                    self.moveFrame(mask, profile)
+            
+            # The first frame runs as soon as a key is pressed. A late frame moves the next deadlines instead of running the missed frames at once.
+            lateness = perf_counter() - deadline if deadline else 0.0
+            
+            if lateness > self.maxLateness:
+                self.maxLateness = lateness
+            
+            if not deadline or lateness > period:
+                if deadline:
+                    self.lateFrames += 1
+                
+                deadline = perf_counter()
+            
+            deadline += period
+            self.waitUntil(deadline)
+        
+        self.stop()
+    
+    cpdef dict getStats(self):
+        """Returns the frame rate, the run and late frames, the maximum lateness in milliseconds, and the moved distance in pixels."""
+        
+        return {
+            "frameRate":      self.frameRate,
+            "frames":         self.frames,
+            "lateFrames":     self.lateFrames,
+            "maxLatenessMs":  self.maxLateness * 1000,
+            "movedPixels":    self.movedPixels,
+            "heldKeys":       len(self.heldKeys),
+        }
+
+
+cursorMotion = CursorMotionEngine()
+"""The cursor motion engine of the script."""
@@ -2,7 +2,8 @@
 
 """This extension module contains functions for controlling the mouse."""
 
-import win32gui, win32api, win32con
+from cythonExtensions.platformBackend import platformBackend as pfBackend
+from cythonExtensions.platformBackend.platformBackend import win32con
 
 def sendMouseClick(x=0, y=0, button=1, op=1) -> None:
     """
@@ -29,35 +30,35 @@ def sendMouseClick(x=0, y=0, button=1, op=1) -> None:
     
     # Use current cursor position if (x, y) are not specified.
     if not x | y:
-        x, y = win32api.GetCursorPos()
+        x, y = pfBackend.backend.getCursorPos()
     
     # Mouse down event.
     if op in (1, 2):
         clickDown = [win32con.MOUSEEVENTF_LEFTDOWN, win32con.MOUSEEVENTF_RIGHTDOWN, win32con.MOUSEEVENTF_MIDDLEDOWN][button - 1]
-        win32api.mouse_event(clickDown, x, y, 0, 0)
+        pfBackend.backend.mouseEvent(clickDown, x, y, 0)
     
     # Mouse up event.
     if op in (1, 3):
         clickUp = [win32con.MOUSEEVENTF_LEFTUP, win32con.MOUSEEVENTF_RIGHTUP, win32con.MOUSEEVENTF_MIDDLEUP][button - 1]
-        win32api.mouse_event(clickUp, x, y, 0, 0)
+        pfBackend.backend.mouseEvent(clickUp, x, y, 0)
 
 # Source: https://stackoverflow.com/questions/34012543/mouse-click-without-moving-cursor?answertab=scoredesc#tab-top
 def sendMouseClickToWindow(hwnd: int, x: int, y: int, button=1) -> None:
     """Sends a mouse click (`button` -> `1: left`, `2: right`, `3: middle`) to the given location in the specified window without moving the mouse cursor."""
     
-    cdef int l_param = win32api.MAKELONG(x, y)
+    cdef int l_param = (y & 0xFFFF) << 16 | (x & 0xFFFF) # MAKELONG(x, y)
     
     if button == 1:
-        win32gui.PostMessage(hwnd, win32con.WM_LBUTTONDOWN, win32con.MK_LBUTTON, l_param)
-        win32gui.PostMessage(hwnd, win32con.WM_LBUTTONUP, win32con.MK_LBUTTON, l_param)
+        pfBackend.backend.postMessage(hwnd, win32con.WM_LBUTTONDOWN, win32con.MK_LBUTTON, l_param)
+        pfBackend.backend.postMessage(hwnd, win32con.WM_LBUTTONUP, win32con.MK_LBUTTON, l_param)
     
     elif button == 2:
-        win32gui.PostMessage(hwnd, win32con.WM_RBUTTONDOWN, 0, l_param)
-        win32gui.PostMessage(hwnd, win32con.WM_RBUTTONUP, 0, l_param)
+        pfBackend.backend.postMessage(hwnd, win32con.WM_RBUTTONDOWN, 0, l_param)
+        pfBackend.backend.postMessage(hwnd, win32con.WM_RBUTTONUP, 0, l_param)
     
     elif button == 3:
-        win32gui.PostMessage(hwnd, win32con.WM_MBUTTONDOWN, 0, l_param)
-        win32gui.PostMessage(hwnd, win32con.WM_MBUTTONUP, 0, l_param)
+        pfBackend.backend.postMessage(hwnd, win32con.WM_MBUTTONDOWN, 0, l_param)
+        pfBackend.backend.postMessage(hwnd, win32con.WM_MBUTTONUP, 0, l_param)
 
 # API: https://learn.microsoft.com/en-us/windows/win32/api/winuser/nf-winuser-mouse_event
 def moveCursor(dx=0, dy=0) -> None:
@@ -65,8 +66,8 @@ def moveCursor(dx=0, dy=0) -> None:
     
     cdef int x, y
     
-    x, y= win32api.GetCursorPos()
-    win32api.SetCursorPos((x + dx, y + dy))
+    x, y= pfBackend.backend.getCursorPos()
+    pfBackend.backend.setCursorPos(x + dx, y + dy)
 
 
 def sendMouseScroll(steps=1, direction=1, wheelDelta=40) -> None:
@@ -90,4 +91,4 @@ def sendMouseScroll(steps=1, direction=1, wheelDelta=40) -> None:
     # keyboard.release("ctrl")
     
     # API doc: https://learn.microsoft.com/en-us/windows/win32/api/winuser/nf-winuser-mouse_event
-    win32api.mouse_event((win32con.MOUSEEVENTF_HWHEEL, win32con.MOUSEEVENTF_WHEEL)[direction], 0, 0, steps * wheelDelta, 0) # win32con.WHEEL_DELTA
\ No newline at end of file
+    pfBackend.backend.mouseEvent((win32con.MOUSEEVENTF_HWHEEL, win32con.MOUSEEVENTF_WHEEL)[direction], 0, 0, steps * wheelDelta) # win32con.WHEEL_DELTA
\ No newline at end of file
@@ -0,0 +1,454 @@
+"""
+This module routes the operating system calls of the event and action pipeline (key states, hooks, input injection,
+window queries, the clipboard, sounds, and shell automation) through a swappable backend.
+
+- `Win32Backend` forwards the calls to the Windows API (pywin32, ctypes, and the `keyboard` package).
+- `FakeBackend` keeps all the state in memory, so the hooks, the event handlers, and the helpers can run headless (e.g., in CI or on Linux),
+and lets the caller feed input events and inspect the injected input, the windows, and the played sounds.
+
+The modules use the active backend through the module attribute `backend` (`platformBackend.backend.getForegroundWindow()`),
+so replacing it with `setBackend` affects all the later calls. `FakeBackend` is the default when pywin32 is not available,
+or when the `MACROPY_BACKEND` environment variable is set to `fake`.
+"""
+
+import queue, threading
+from collections import deque
+from types import ModuleType
+from typing import Any, Callable
+
+import win32con
+
+
+IS_WIN32_AVAILABLE: bool
+"""Whether pywin32 could be imported. If not, `win32con` is the `win32conFallback` module."""
+
+
+class PlatformUnavailableError(OSError):
+    """Raised when a Windows only module or function is used on a platform (or with a backend) that does not provide it."""
+
+
+PlatformError: type[Exception]
+"""The exception raised by the failing window operations (`pywintypes.error` when pywin32 is available)."""
+
+
+class UnavailableModule:
+    """
+    Description:
+        Stands in for a module that cannot be imported on the current platform, so the modules importing it can still be imported.
+        Its attributes are also unavailable modules, and calling any of them raises `PlatformUnavailableError`.
+        The `error` attribute is `PlatformUnavailableError`, so `except module.error` clauses keep working.
+    ---
+    Parameters:
+        `name -> str`: The name of the missing module.
+    """
+    
+    def __init__(self, name: str):
+        ...
+    
+    def __getattr__(self, name: str) -> Any:
+        ...
+    
+    def __call__(self, *args, **kwargs):
+        ...
+
+
+def importPlatformModule(name: str) -> ModuleType | UnavailableModule:
+    """Imports and returns the module with the given name, or an `UnavailableModule` if it cannot be imported (e.g., pywin32 modules on Linux)."""
+    ...
+
+
+class PlatformBackend:
+    """
+    Description:
+        The interface of the operating system calls used by the script. The method names follow the Windows API functions they stand for.
+        The window handles are ints and `0` means no window.
+    """
+    
+    name: str
+    
+    # Key states and time.
+    def getKeyState(self, vkey: int) -> int:
+        """Returns the state of the key when the current input message was generated. The low bit is set if the key is toggled on, and the result is negative if it is pressed."""
+        ...
+    
+    def getAsyncKeyState(self, vkey: int) -> int:
+        """Returns the current state of the key. The `0x8000` bit is set if the key is pressed."""
+        ...
+    
+    def getTickCount(self) -> int:
+        """Returns the number of milliseconds since the system was started, wrapping around at 2^32. Hook events are timestamped with the same clock."""
+        ...
+    
+    def getKeyboardLayout(self):
+        """Returns the keyboard layout handle of the foreground window, or `None` if it is not known."""
+        ...
+    
+    # Hooks.
+    def installHook(self, hookType: int, callback) -> int:
+        """Installs a low level hook calling `callback(nCode, wParam, lParam)` for each event. Returns the hook id, or `0` on failure."""
+        ...
+    
+    def uninstallHook(self, hookId: int) -> bool:
+        """Removes the hook with the given id."""
+        ...
+    
+    def callNextHook(self, nCode: int, wParam: int, lParam) -> int:
+        """Passes the hook event to the next hook in the chain."""
+        ...
+    
+    def runMessageLoop(self) -> None:
+        """Dispatches the messages (and thus the hook events) of the calling thread until `quitMessageLoop` is called."""
+        ...
+    
+    def quitMessageLoop(self, threadId: int) -> None:
+        """Stops the message loop of the given thread."""
+        ...
+    
+    def installForegroundHook(self, callback: Callable[[int], Any]) -> int:
+        """
+        Installs a hook calling `callback(hwnd)` each time the foreground window changes. Like the low level hooks, the
+        notifications are delivered by the message loop of the calling thread. Returns the hook id, or `0` on failure.
+        """
+        ...
+    
+    def uninstallForegroundHook(self, hookId: int) -> bool:
+        """Removes the foreground hook with the given id."""
+        ...
+    
+    def installWindowEventHook(self, callback: Callable[[int, int], Any]) -> int:
+        """
+        Installs a hook calling `callback(event, hwnd)` each time a window is created (`EVENT_OBJECT_CREATE`), destroyed (`EVENT_OBJECT_DESTROY`),
+        or has its title changed (`EVENT_OBJECT_NAMECHANGE`). Like the foreground hook, the notifications are delivered by the message loop
+        of the calling thread. Returns the hook id, or `0` on failure.
+        """
+        ...
+    
+    def uninstallWindowEventHook(self, hookId: int) -> bool:
+        """Removes the window event hook with the given id."""
+        ...
+    
+    # Input injection.
+    def keybdEvent(self, vkey: int, scanCode=0, flags=0) -> None:
+        """Injects a keyboard event. `flags` can hold `KEYEVENTF_KEYUP` and `KEYEVENTF_EXTENDEDKEY`."""
+        ...
+    
+    def mouseEvent(self, flags: int, dx=0, dy=0, data=0) -> None:
+        """Injects a mouse event. `flags` is a combination of the `MOUSEEVENTF_*` values."""
+        ...
+    
+    def sendInputs(self, inputs: list[tuple]) -> int:
+        """
+        Injects a batch of keyboard and mouse events with a single `SendInput` call, so they are not interleaved with the user input. A keyboard
+        input is a `(vkey, scanCode, flags)` tuple like the arguments of `keybdEvent`; with `KEYEVENTF_UNICODE`, `vkey` is `0` and `scanCode` is
+        a UTF-16 code unit of the typed character. A mouse input is a `(MOUSE_INPUT, flags, dx, dy, data)` tuple, where the rest are the arguments
+        of `mouseEvent`. Returns the number of injected events.
+        """
+        ...
+    
+    def sendHotkey(self, hotkey: str) -> None:
+        """Sends a hotkey described by its key names (e.g., `"ctrl+shift+z"`)."""
+        ...
+    
+    def writeText(self, text: str) -> None:
+        """Types the given text into the focused window."""
+        ...
+    
+    def pressKey(self, key: str) -> None:
+        """Presses (without releasing) the key with the given name."""
+        ...
+    
+    def releaseKey(self, key: str) -> None:
+        """Releases the key with the given name."""
+        ...
+    
+    def getCursorPos(self) -> tuple[int, int]:
+        """Returns the position of the cursor in screen coordinates."""
+        ...
+    
+    def setCursorPos(self, x: int, y: int) -> None:
+        """Moves the cursor to the given screen coordinates."""
+        ...
+    
+    def getSystemMetrics(self, index: int) -> int:
+        """Returns the system metric with the given `SM_*` index (e.g., the screen size)."""
+        ...
+    
+    def getDisplayFrequency(self) -> int:
+        """Returns the refresh rate of the primary display in hertz, or `0` if it is unknown."""
+        ...
+    
+    # Windows.
+    def getForegroundWindow(self) -> int:
+        ...
+    
+    def setForegroundWindow(self, hwnd: int) -> None:
+        """Brings the window to the foreground. Raises `PlatformError` on failure."""
+        ...
+    
+    def getClassName(self, hwnd: int) -> str:
+        ...
+    
+    def getWindowText(self, hwnd: int) -> str:
+        ...
+    
+    def getWindowProcess(self, hwnd: int) -> tuple[int, str, bool]:
+        """
+        Returns the `(processId, processName, elevated)` of the process that owns the window. The process name is the lowercase
+        file name of its executable (e.g., `explorer.exe`), or an empty string if it can not be queried.
+        """
+        ...
+    
+    def findWindow(self, className: str | None, title: str | None) -> int:
+        """Returns the top window matching the given class name and title (`None` matches any), or `0` if none is found."""
+        ...
+    
+    def getTopWindow(self) -> int:
+        """Returns the top level window at the top of the z-order."""
+        ...
+    
+    def getWindow(self, hwnd: int, command: int) -> int:
+        """Returns the window with the given relationship (`GW_*`) to the given window, or `0`."""
+        ...
+    
+    def isWindowVisible(self, hwnd: int) -> bool:
+        ...
+    
+    def showWindow(self, hwnd: int, command: int) -> None:
+        ...
+    
+    def getWindowRect(self, hwnd: int) -> tuple[int, int, int, int]:
+        """Returns the `(left, top, right, bottom)` of the window in screen coordinates."""
+        ...
+    
+    def setWindowPos(self, hwnd: int, insertAfter: int, x: int, y: int, cx: int, cy: int, flags: int) -> None:
+        ...
+    
+    def getWindowLong(self, hwnd: int, index: int) -> int:
+        ...
+    
+    def setWindowLong(self, hwnd: int, index: int, value: int) -> None:
+        ...
+    
+    def getLayeredWindowAttributes(self, hwnd: int) -> tuple[int, int, int]:
+        """Returns the `(colorKey, alpha, flags)` of a layered window. Raises `PlatformError` if the window is not layered."""
+        ...
+    
+    def setLayeredWindowAttributes(self, hwnd: int, colorKey: int, alpha: int, flags: int) -> None:
+        ...
+    
+    def sendMessage(self, hwnd: int, message: int, wParam=0, lParam=0) -> int:
+        ...
+    
+    def postMessage(self, hwnd: int, message: int, wParam=0, lParam=0) -> None:
+        ...
+    
+    def getLastError(self) -> int:
+        """Returns the error code of the last failed call."""
+        ...
+    
+    def messageBox(self, text: str, title: str, style: int) -> int:
+        """Shows a message box and returns the id (`IDOK`, `IDYES`, ...) of the clicked button."""
+        ...
+    
+    # Clipboard.
+    def readClipboard(self, clipboardFormat: int):
+        """Returns the clipboard data in the given format, or `None` if the clipboard has no data in that format."""
+        ...
+    
+    def writeClipboard(self, data, clipboardFormat: int) -> None:
+        """Replaces the clipboard content with the given data."""
+        ...
+    
+    def emptyClipboard(self) -> None:
+        ...
+    
+    # Sound and shell automation.
+    def playSound(self, soundPath: str, wait=False) -> None:
+        """Plays a wave file. Returns immediately unless `wait` is `True`."""
+        ...
+    
+    def shellApplication(self):
+        """Returns a `Shell.Application` automation object."""
+        ...
+    
+    def coInitialize(self) -> None:
+        """Initializes the COM library for the calling thread."""
+        ...
+    
+    def coUninitialize(self) -> None:
+        ...
+
+
+KEYEVENTF_UNICODE: int
+"""The `keybdEvent`/`sendInputs` flag for typing a UTF-16 code unit (passed as the scan code) instead of a key."""
+
+VK_PACKET: int
+"""The virtual key reported to the hooks for the `KEYEVENTF_UNICODE` inputs."""
+
+MOUSE_INPUT: str
+"""The first item of the mouse inputs of `sendInputs`, e.g., `(MOUSE_INPUT, MOUSEEVENTF_LEFTDOWN, 0, 0, 0)`."""
+
+
+class Win32Backend(PlatformBackend):
+    """Forwards the calls to the Windows API. Requires pywin32."""
+    
+    def __init__(self):
+        ...
+
+
+class FakeWindow:
+    """A top level window of `FakeBackend`."""
+    
+    __slots__ = ("hwnd", "className", "title", "rect", "visible", "exStyle", "alpha", "layeredFlags", "showCommand", "processId", "processName", "elevated")
+    
+    hwnd: int
+    className: str
+    title: str
+    rect: tuple[int, int, int, int]
+    visible: bool
+    exStyle: int
+    alpha: int
+    layeredFlags: int
+    showCommand: int
+    processId: int
+    processName: str
+    elevated: bool
+    
+    def __init__(self, hwnd: int, className: str, title: str, rect: tuple[int, int, int, int], visible=True, processName="", elevated=False):
+        ...
+
+
+class FakeShellApplication:
+    """A stand-in for the `Shell.Application` automation object. `Windows()` returns the objects in the `windows` list."""
+    
+    windows: list
+    
+    def Windows(self) -> list:
+        ...
+
+
+class FakeBackend(PlatformBackend):
+    """
+    Description:
+        An in-memory backend for running the pipeline headless.
+        
+        - The input fed with `simulateKey`/`simulateMouse` (user input) and injected with `keybdEvent`/`mouseEvent` (flagged as injected)
+        is queued and delivered to the installed hooks by `runMessageLoop` (in the thread that calls it, like Windows does), or by `pumpMessages`.
+        The key states and the cursor position are only updated for the events that are not suppressed by the hooks.
+        - The injected input, the sent hotkeys, and the written text are recorded in `injectedInputs`.
+        - Windows are added with `addWindow`, and the played sounds, the sent/posted messages, and the shown message boxes are recorded.
+    ---
+    Parameters:
+        `screenSize -> tuple[int, int]`: The width and height of the fake screen.
+    """
+    
+    lock: threading.RLock
+    tickOffset: int
+    """Added to the tick count (e.g., to test the wrap around)."""
+    
+    keyStates: bytearray
+    screenSize: tuple[int, int]
+    cursor: tuple[int, int]
+    queuedCursor: tuple[int, int]
+    """The cursor position after the queued mouse events, used as the position of the next injected mouse event."""
+    
+    hooks: dict[int, tuple[int, Any]]
+    foregroundHooks: dict[int, Callable[[int], Any]]
+    windowEventHooks: dict[int, Callable[[int, int], Any]]
+    pendingInputs: queue.SimpleQueue
+    deliveredInputs: int
+    suppressedInputs: int
+    windows: dict[int, FakeWindow]
+    zOrder: list[int]
+    """The handles of the windows, from the top of the z-order (the foreground window) to the bottom."""
+    
+    lastError: int
+    messageBoxResult: int
+    """The button id returned by `messageBox`."""
+    
+    clipboard: dict[int, Any]
+    shell: FakeShellApplication
+    
+    injectedInputs: deque[tuple]
+    """The injected input in order: `("key", vkey, scanCode, flags)`, `("mouse", flags, dx, dy, data)`, `("hotkey", hotkey)`, `("text", text)`, `("press", key)`, and `("release", key)`."""
+    
+    playedSounds: deque[str]
+    messages: deque[tuple[int, int, Any, Any]]
+    """The sent and posted messages as `(hwnd, message, wParam, lParam)` tuples."""
+    
+    messageBoxes: deque[tuple[str, str, int]]
+    """The shown message boxes as `(text, title, style)` tuples."""
+    
+    def __init__(self, screenSize=(1920, 1080)):
+        ...
+    
+    def setKeyState(self, vkey: int, pressed=False, toggled=False) -> None:
+        """Sets the state of a key directly, without generating an event (e.g., turning caps lock on before a test)."""
+        ...
+    
+    def updateKeyState(self, vkey: int, isKeyDown: bool) -> None:
+        """Updates the pressed and toggled bits of a key as Windows does when a key event is not suppressed."""
+        ...
+    
+    def callHooks(self, hookType: int, wParam: int, data) -> bool:
+        """Calls the hooks of the given type, most recently installed first, until one of them suppresses the event."""
+        ...
+    
+    def pumpMessages(self) -> int:
+        """Delivers the queued input to the hooks in the calling thread. Returns the number of delivered events."""
+        ...
+    
+    def deliver(self, event: tuple) -> None:
+        """Delivers a queued input event to the hooks, then updates the key states or the cursor if the event was not suppressed."""
+        ...
+    
+    def simulateKey(self, vkey: int, isKeyDown=True, scanCode=0, extended=False) -> None:
+        """Queues a (physical) key event for the hooks."""
+        ...
+    
+    def simulateKeyPress(self, vkey: int, scanCode=0, extended=False) -> None:
+        """Queues a key down and a key up event for the hooks."""
+        ...
+    
+    def simulateMouse(self, message: int, x: int | None=None, y: int | None=None, mouseData=0) -> None:
+        """Queues a (physical) mouse event with the given `WM_*` message for the hooks. The position defaults to the position after the queued events."""
+        ...
+    
+    def addWindow(self, className: str, title="", rect=(0, 0, 800, 600), foreground=True, visible=True, processName="", elevated=False) -> int:
+        """
+        Creates a top level window and returns its handle. The window is placed at the top of the z-order if `foreground` is `True`, otherwise at the bottom.
+        The foreground hooks are notified of the foreground changes through the input queue, in order with the queued input.
+        """
+        ...
+    
+    def closeWindow(self, hwnd: int) -> None:
+        """Destroys the given window."""
+        ...
+    
+    def setWindowText(self, hwnd: int, title: str) -> None:
+        """Changes the title of the given window (e.g., an explorer window navigating to another folder)."""
+        ...
+
+
+def createDefaultBackend() -> PlatformBackend:
+    """Returns a `FakeBackend` if pywin32 is not available or the `MACROPY_BACKEND` environment variable is `fake`, otherwise a `Win32Backend`."""
+    ...
+
+
+backend: PlatformBackend
+"""The active backend. Always access it as `platformBackend.backend`, so replacing it with `setBackend` takes effect."""
+
+
+def getBackend() -> PlatformBackend:
+    """Returns the active backend."""
+    ...
+
+
+def setBackend(newBackend: PlatformBackend) -> PlatformBackend:
+    """
+    Description:
+        Replaces the active backend, and returns the previous one. The hooks installed through the previous backend are not moved.
+        Objects created from the previous backend at import time (e.g., the `Shell.Application` object of `comWorker`) are kept,
+        so the backend should be set before the other modules are imported.
+    """
+    ...
@@ -0,0 +1,1341 @@
+# cython: language_level = 3str
+
+"""
+This extension module routes the operating system calls of the event and action pipeline (key states, hooks, input injection,
+window queries, the clipboard, sounds, and shell automation) through a swappable backend.
+
+- `Win32Backend` forwards the calls to the Windows API (pywin32, ctypes, and the `keyboard` package).
+- `FakeBackend` keeps all the state in memory, so the hooks, the event handlers, and the helpers can run headless (e.g., in CI or on Linux),
+and lets the caller feed input events and inspect the injected input, the windows, and the played sounds.
+
+The modules use the active backend through the module attribute `backend` (`platformBackend.backend.getForegroundWindow()`),
+so replacing it with `setBackend` affects all the later calls. `FakeBackend` is the default when pywin32 is not available,
+or when the `MACROPY_BACKEND` environment variable is set to `fake`.
+"""
+
+import os, ctypes, importlib, threading, queue
+import ctypes.wintypes
+from collections import deque
+from time import perf_counter
+
+try:
+    import win32api, win32gui, win32con, win32clipboard, pywintypes
+    IS_WIN32_AVAILABLE = True
+
+except ImportError:
+    from cythonExtensions.platformBackend import win32conFallback as win32con
+    IS_WIN32_AVAILABLE = False
+
+
+class PlatformUnavailableError(OSError):
+    """Raised when a Windows only module or function is used on a platform (or with a backend) that does not provide it."""
+
+
+PlatformError = pywintypes.error if IS_WIN32_AVAILABLE else PlatformUnavailableError
+"""The exception raised by the failing window operations (`pywintypes.error` when pywin32 is available)."""
+
+
+class UnavailableModule:
+    """
+    Description:
+        Stands in for a module that cannot be imported on the current platform, so the modules importing it can still be imported.
+        Its attributes are also unavailable modules, and calling any of them raises `PlatformUnavailableError`.
+        The `error` attribute is `PlatformUnavailableError`, so `except module.error` clauses keep working.
+    ---
+    Parameters:
+        `name -> str`: The name of the missing module.
+    """
+    
+    def __init__(self, name: str):
+        self.__name__ = name
+    
+    def __getattr__(self, name: str):
+        if name == "error":
+            return PlatformUnavailableError
+        
+        if name.startswith("__"):
+            raise AttributeError(name)
+        
+        return UnavailableModule(f"{self.__name__}.{name}")
+    
+    def __call__(self, *args, **kwargs):
+        raise PlatformUnavailableError(f"`{self.__name__}` is not available on this platform.")
+    
+    def __bool__(self):
+        return False
+    
+    def __repr__(self):
+        return f"<unavailable module '{self.__name__}'>"
+
+
+def importPlatformModule(name: str):
+    """Imports and returns the module with the given name, or an `UnavailableModule` if it cannot be imported (e.g., pywin32 modules on Linux)."""
+    
+    try:
+        return importlib.import_module(name)
+    
+    except ImportError:
+        return UnavailableModule(name)
+
+
+class PlatformBackend:
+    """
+    Description:
+        The interface of the operating system calls used by the script. The method names follow the Windows API functions they stand for.
+        The window handles are ints and `0` means no window.
+    """
+    
+    name = "base"
+    
+    # Key states and time.
+    def getKeyState(self, vkey: int) -> int:
+        """Returns the state of the key when the current input message was generated. The low bit is set if the key is toggled on, and the result is negative if it is pressed."""
+        raise NotImplementedError
+    
+    def getAsyncKeyState(self, vkey: int) -> int:
+        """Returns the current state of the key. The `0x8000` bit is set if the key is pressed."""
+        raise NotImplementedError
+    
+    def getTickCount(self) -> int:
+        """Returns the number of milliseconds since the system was started, wrapping around at 2^32. Hook events are timestamped with the same clock."""
+        raise NotImplementedError
+    
+    def getKeyboardLayout(self):
+        """Returns the keyboard layout handle of the foreground window, or `None` if it is not known."""
+        raise NotImplementedError
+    
+    # Hooks.
+    def installHook(self, hookType: int, callback) -> int:
+        """Installs a low level hook calling `callback(nCode, wParam, lParam)` for each event. Returns the hook id, or `0` on failure."""
+        raise NotImplementedError
+    
+    def uninstallHook(self, hookId: int) -> bool:
+        """Removes the hook with the given id."""
+        raise NotImplementedError
+    
+    def callNextHook(self, nCode: int, wParam: int, lParam) -> int:
+        """Passes the hook event to the next hook in the chain."""
+        raise NotImplementedError
+    
+    def runMessageLoop(self) -> None:
+        """Dispatches the messages (and thus the hook events) of the calling thread until `quitMessageLoop` is called."""
+        raise NotImplementedError
+    
+    def quitMessageLoop(self, threadId: int) -> None:
+        """Stops the message loop of the given thread."""
+        raise NotImplementedError
+    
+    def installForegroundHook(self, callback) -> int:
+        """
+        Installs a hook calling `callback(hwnd)` each time the foreground window changes. Like the low level hooks, the
+        notifications are delivered by the message loop of the calling thread. Returns the hook id, or `0` on failure.
+        """
+        raise NotImplementedError
+    
+    def uninstallForegroundHook(self, hookId: int) -> bool:
+        """Removes the foreground hook with the given id."""
+        raise NotImplementedError
+    
+    def installWindowEventHook(self, callback) -> int:
+        """
+        Installs a hook calling `callback(event, hwnd)` each time a window is created (`EVENT_OBJECT_CREATE`), destroyed (`EVENT_OBJECT_DESTROY`),
+        or has its title changed (`EVENT_OBJECT_NAMECHANGE`). Like the foreground hook, the notifications are delivered by the message loop
+        of the calling thread. Returns the hook id, or `0` on failure.
+        """
+        raise NotImplementedError
+    
+    def uninstallWindowEventHook(self, hookId: int) -> bool:
+        """Removes the window event hook with the given id."""
+        raise NotImplementedError
+    
+    # Input injection.
+    def keybdEvent(self, vkey: int, scanCode=0, flags=0) -> None:
+        """Injects a keyboard event. `flags` can hold `KEYEVENTF_KEYUP` and `KEYEVENTF_EXTENDEDKEY`."""
+        raise NotImplementedError
+    
+    def mouseEvent(self, flags: int, dx=0, dy=0, data=0) -> None:
+        """Injects a mouse event. `flags` is a combination of the `MOUSEEVENTF_*` values."""
+        raise NotImplementedError
+    
+    def sendInputs(self, inputs: list[tuple]) -> int:
+        """
+        Injects a batch of keyboard and mouse events with a single `SendInput` call, so they are not interleaved with the user input. A keyboard
+        input is a `(vkey, scanCode, flags)` tuple like the arguments of `keybdEvent`; with `KEYEVENTF_UNICODE`, `vkey` is `0` and `scanCode` is
+        a UTF-16 code unit of the typed character. A mouse input is a `(MOUSE_INPUT, flags, dx, dy, data)` tuple, where the rest are the arguments
+        of `mouseEvent`. Returns the number of injected events.
+        """
+        raise NotImplementedError
+    
+    def sendHotkey(self, hotkey: str) -> None:
+        """Sends a hotkey described by its key names (e.g., `"ctrl+shift+z"`)."""
+        raise NotImplementedError
+    
+    def writeText(self, text: str) -> None:
+        """Types the given text into the focused window."""
+        raise NotImplementedError
+    
+    def pressKey(self, key: str) -> None:
+        """Presses (without releasing) the key with the given name."""
+        raise NotImplementedError
+    
+    def releaseKey(self, key: str) -> None:
+        """Releases the key with the given name."""
+        raise NotImplementedError
+    
+    def getCursorPos(self) -> tuple[int, int]:
+        """Returns the position of the cursor in screen coordinates."""
+        raise NotImplementedError
+    
+    def setCursorPos(self, x: int, y: int) -> None:
+        """Moves the cursor to the given screen coordinates."""
+        raise NotImplementedError
+    
+    def getSystemMetrics(self, index: int) -> int:
+        """Returns the system metric with the given `SM_*` index (e.g., the screen size)."""
+        raise NotImplementedError
+    
+    def getDisplayFrequency(self) -> int:
+        """Returns the refresh rate of the primary display in hertz, or `0` if it is unknown."""
+        raise NotImplementedError
+    
+    # Windows.
+    def getForegroundWindow(self) -> int:
+        raise NotImplementedError
+    
+    def setForegroundWindow(self, hwnd: int) -> None:
+        """Brings the window to the foreground. Raises `PlatformError` on failure."""
+        raise NotImplementedError
+    
+    def getClassName(self, hwnd: int) -> str:
+        raise NotImplementedError
+    
+    def getWindowText(self, hwnd: int) -> str:
+        raise NotImplementedError
+    
+    def getWindowProcess(self, hwnd: int) -> tuple[int, str, bool]:
+        """
+        Returns the `(processId, processName, elevated)` of the process that owns the window. The process name is the lowercase
+        file name of its executable (e.g., `explorer.exe`), or an empty string if it can not be queried.
+        """
+        raise NotImplementedError
+    
+    def findWindow(self, className: str | None, title: str | None) -> int:
+        """Returns the top window matching the given class name and title (`None` matches any), or `0` if none is found."""
+        raise NotImplementedError
+    
+    def getTopWindow(self) -> int:
+        """Returns the top level window at the top of the z-order."""
+        raise NotImplementedError
+    
+    def getWindow(self, hwnd: int, command: int) -> int:
+        """Returns the window with the given relationship (`GW_*`) to the given window, or `0`."""
+        raise NotImplementedError
+    
+    def isWindowVisible(self, hwnd: int) -> bool:
+        raise NotImplementedError
+    
+    def showWindow(self, hwnd: int, command: int) -> None:
+        raise NotImplementedError
+    
+    def getWindowRect(self, hwnd: int) -> tuple[int, int, int, int]:
+        """Returns the `(left, top, right, bottom)` of the window in screen coordinates."""
+        raise NotImplementedError
+    
+    def setWindowPos(self, hwnd: int, insertAfter: int, x: int, y: int, cx: int, cy: int, flags: int) -> None:
+        raise NotImplementedError
+    
+    def getWindowLong(self, hwnd: int, index: int) -> int:
+        raise NotImplementedError
+    
+    def setWindowLong(self, hwnd: int, index: int, value: int) -> None:
+        raise NotImplementedError
+    
+    def getLayeredWindowAttributes(self, hwnd: int) -> tuple[int, int, int]:
+        """Returns the `(colorKey, alpha, flags)` of a layered window. Raises `PlatformError` if the window is not layered."""
+        raise NotImplementedError
+    
+    def setLayeredWindowAttributes(self, hwnd: int, colorKey: int, alpha: int, flags: int) -> None:
+        raise NotImplementedError
+    
+    def sendMessage(self, hwnd: int, message: int, wParam=0, lParam=0) -> int:
+        raise NotImplementedError
+    
+    def postMessage(self, hwnd: int, message: int, wParam=0, lParam=0) -> None:
+        raise NotImplementedError
+    
+    def getLastError(self) -> int:
+        """Returns the error code of the last failed call."""
+        raise NotImplementedError
+    
+    def messageBox(self, text: str, title: str, style: int) -> int:
+        """Shows a message box and returns the id (`IDOK`, `IDYES`, ...) of the clicked button."""
+        raise NotImplementedError
+    
+    # Clipboard.
+    def readClipboard(self, clipboardFormat: int):
+        """Returns the clipboard data in the given format, or `None` if the clipboard has no data in that format."""
+        raise NotImplementedError
+    
+    def writeClipboard(self, data, clipboardFormat: int) -> None:
+        """Replaces the clipboard content with the given data."""
+        raise NotImplementedError
+    
+    def emptyClipboard(self) -> None:
+        raise NotImplementedError
+    
+    # Sound and shell automation.
+    def playSound(self, soundPath: str, wait=False) -> None:
+        """Plays a wave file. Returns immediately unless `wait` is `True`."""
+        raise NotImplementedError
+    
+    def shellApplication(self):
+        """Returns a `Shell.Application` automation object."""
+        raise NotImplementedError
+    
+    def coInitialize(self) -> None:
+        """Initializes the COM library for the calling thread."""
+        raise NotImplementedError
+    
+    def coUninitialize(self) -> None:
+        raise NotImplementedError
+
+
+# The process and token access rights, and the token information class used by `Win32Backend.getWindowProcess`.
+cdef int PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+cdef int TOKEN_QUERY = 0x0008
+cdef int TOKEN_ELEVATION = 20
+
+KEYEVENTF_UNICODE = 0x0004
+"""The `keybdEvent`/`sendInputs` flag for typing a UTF-16 code unit (passed as the scan code) instead of a key."""
+
+VK_PACKET = 0xE7
+"""The virtual key reported to the hooks for the `KEYEVENTF_UNICODE` inputs."""
+
+MOUSE_INPUT = "mouse"
+"""The first item of the mouse inputs of `sendInputs`, e.g., `(MOUSE_INPUT, MOUSEEVENTF_LEFTDOWN, 0, 0, 0)`."""
+
+cdef int INPUT_MOUSE = 0
+cdef int INPUT_KEYBOARD = 1
+
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [("wVk", ctypes.c_ushort), ("wScan", ctypes.c_ushort), ("dwFlags", ctypes.c_uint), ("time", ctypes.c_uint), ("dwExtraInfo", ctypes.c_size_t)]
+
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [("dx", ctypes.c_long), ("dy", ctypes.c_long), ("mouseData", ctypes.c_uint), ("dwFlags", ctypes.c_uint), ("time", ctypes.c_uint),
+                ("dwExtraInfo", ctypes.c_size_t)]
+
+
+class INPUT(ctypes.Structure):
+    """The `INPUT` structure of `SendInput`, holding either a keyboard or a mouse input."""
+    
+    class _INPUT(ctypes.Union):
+        _fields_ = [("ki", KEYBDINPUT), ("mi", MOUSEINPUT)]
+    
+    _anonymous_ = ("_input",)
+    _fields_ = [("type", ctypes.c_uint), ("_input", _INPUT)]
+
+
+class Win32Backend(PlatformBackend):
+    """Forwards the calls to the Windows API. Requires pywin32."""
+    
+    name = "win32"
+    
+    def __init__(self):
+        if not IS_WIN32_AVAILABLE:
+            raise PlatformUnavailableError("The Win32 backend requires pywin32.")
+        
+        self.user32 = ctypes.windll.user32
+        
+        # Configuring the argtypes for 64-bit Python compatibility.
+        self.user32.SetWindowsHookExW.argtypes = (ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint)
+        
+        # Defining a type signature for the low level hooks/handlers.
+        self.hookProcType = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.POINTER(ctypes.c_void_p))
+        
+        self.hookPointers = {}
+        """Keeps the C pointers of the installed hooks alive."""
+        
+        self.user32.SetWinEventHook.restype = ctypes.c_void_p
+        self.user32.SetWinEventHook.argtypes = (ctypes.wintypes.DWORD, ctypes.wintypes.DWORD, ctypes.c_void_p, ctypes.c_void_p,
+                                                ctypes.wintypes.DWORD, ctypes.wintypes.DWORD, ctypes.wintypes.DWORD)
+        self.user32.UnhookWinEvent.argtypes = (ctypes.c_void_p,)
+        
+        # The signature of the `WinEventProc` callbacks: (hWinEventHook, event, hwnd, idObject, idChild, idEventThread, dwmsEventTime).
+        self.winEventProcType = ctypes.WINFUNCTYPE(None, ctypes.c_void_p, ctypes.wintypes.DWORD, ctypes.wintypes.HWND, ctypes.wintypes.LONG,
+                                                   ctypes.wintypes.LONG, ctypes.wintypes.DWORD, ctypes.wintypes.DWORD)
+        
+        self.winEventPointers = {}
+        """Keeps the C pointers of the installed foreground and window event hooks alive."""
+        
+        self.nameChangeHooks = {}
+        """The second hook (`EVENT_OBJECT_NAMECHANGE`) of each window event hook."""
+        
+        self.kernel32 = ctypes.windll.kernel32
+        self.kernel32.OpenProcess.restype = ctypes.c_void_p
+        self.kernel32.QueryFullProcessImageNameW.argtypes = (ctypes.c_void_p, ctypes.wintypes.DWORD, ctypes.wintypes.LPWSTR, ctypes.POINTER(ctypes.wintypes.DWORD))
+        self.kernel32.CloseHandle.argtypes = (ctypes.c_void_p,)
+        self.advapi32 = ctypes.windll.advapi32
+        self.advapi32.OpenProcessToken.argtypes = (ctypes.c_void_p, ctypes.wintypes.DWORD, ctypes.POINTER(ctypes.c_void_p))
+        self.advapi32.GetTokenInformation.argtypes = (ctypes.c_void_p, ctypes.c_int, ctypes.c_void_p, ctypes.wintypes.DWORD, ctypes.POINTER(ctypes.wintypes.DWORD))
+        
+        self.user32.SendInput.argtypes = (ctypes.c_uint, ctypes.POINTER(INPUT), ctypes.c_int)
+        self.user32.SendInput.restype = ctypes.c_uint
+        
+        self.keyboard = None
+    
+    def getKeyState(self, vkey):
+        return win32api.GetKeyState(vkey)
+    
+    def getAsyncKeyState(self, vkey):
+        return win32api.GetAsyncKeyState(vkey)
+    
+    def getTickCount(self):
+        return win32api.GetTickCount()
+    
+    def getKeyboardLayout(self):
+        self.user32.GetKeyboardLayout.restype = ctypes.c_void_p
+        
+        return self.user32.GetKeyboardLayout(self.user32.GetWindowThreadProcessId(self.user32.GetForegroundWindow(), None))
+    
+    def installHook(self, hookType, callback):
+        # Converting the Python hook into a C pointer.
+        callbackPtr = self.hookProcType(callback)
+        
+        hookId = self.user32.SetWindowsHookExW( # SetWindowsHookExA
+            hookType,                       # Hook type.
+            callbackPtr,                    # Callback pointer.
+            win32gui.GetModuleHandle(None), # Handle to the current process.
+            0)                              # Thread id (0 = current/main thread).
+        
+        if hookId:
+            self.hookPointers[hookId] = callbackPtr
+        
+        return hookId
+    
+    def uninstallHook(self, hookId):
+        self.hookPointers.pop(hookId, None)
+        
+        return bool(self.user32.UnhookWindowsHookEx(hookId))
+    
+    def callNextHook(self, nCode, wParam, lParam):
+        return self.user32.CallNextHookEx(None, nCode, wParam, lParam)
+    
+    def runMessageLoop(self):
+        msg = ctypes.wintypes.MSG()
+        
+        # If wMsgFilterMin and wMsgFilterMax are both zero, GetMessage returns all available messages (that is, no range filtering is performed).
+        # Keep in mind that any application that wishes to receive notifications of windows events must have a message queue.
+        # Docs: https://learn.microsoft.com/en-us/windows/win32/api/winuser/nf-winuser-getmessagew
+        while self.user32.GetMessageW(ctypes.byref(msg), None, 0, 0) != 0:
+            self.user32.TranslateMessage(ctypes.byref(msg))
+            self.user32.DispatchMessageW(ctypes.byref(msg))
+    
+    def quitMessageLoop(self, threadId):
+        self.user32.PostThreadMessageW(threadId, win32con.WM_QUIT, 0, 0)
+    
+    def installForegroundHook(self, callback):
+        def winEventProc(hWinEventHook, event, hwnd, idObject, idChild, idEventThread, eventTime):
+            callback(hwnd or 0)
+        
+        callbackPtr = self.winEventProcType(winEventProc)
+        
+        # Out of context hooks are not injected into the other processes; their events are posted to the message queue of this thread.
+        # Docs: https://learn.microsoft.com/en-us/windows/win32/api/winuser/nf-winuser-setwineventhook
+        hookId = self.user32.SetWinEventHook(win32con.EVENT_SYSTEM_FOREGROUND, win32con.EVENT_SYSTEM_FOREGROUND, None, callbackPtr, 0, 0, win32con.WINEVENT_OUTOFCONTEXT)
+        
+        if hookId:
+            self.winEventPointers[hookId] = callbackPtr
+        
+        return hookId or 0
+    
+    def uninstallForegroundHook(self, hookId):
+        self.winEventPointers.pop(hookId, None)
+        
+        return bool(self.user32.UnhookWinEvent(hookId))
+    
+    def installWindowEventHook(self, callback):
+        def winEventProc(hWinEventHook, event, hwnd, idObject, idChild, idEventThread, eventTime):
+            # The events of the child objects (e.g., the controls, the caret, and the cursor) are skipped.
+            if idObject == win32con.OBJID_WINDOW and idChild == win32con.CHILDID_SELF and hwnd:
+                callback(event, hwnd)
+        
+        callbackPtr = self.winEventProcType(winEventProc)
+        
+        # Two hooks, as the events between `EVENT_OBJECT_DESTROY` and `EVENT_OBJECT_NAMECHANGE` (e.g., `EVENT_OBJECT_LOCATIONCHANGE`) are frequent.
+        hookId = self.user32.SetWinEventHook(win32con.EVENT_OBJECT_CREATE, win32con.EVENT_OBJECT_DESTROY, None, callbackPtr, 0, 0, win32con.WINEVENT_OUTOFCONTEXT)
+        
+        if not hookId:
+            return 0
+        
+        nameChangeHookId = self.user32.SetWinEventHook(win32con.EVENT_OBJECT_NAMECHANGE, win32con.EVENT_OBJECT_NAMECHANGE, None, callbackPtr, 0, 0, win32con.WINEVENT_OUTOFCONTEXT)
+        
+        if not nameChangeHookId:
+            self.user32.UnhookWinEvent(hookId)
+            
+            return 0
+        
+        self.winEventPointers[hookId] = callbackPtr
+        self.nameChangeHooks[hookId] = nameChangeHookId
+        
+        return hookId
+    
+    def uninstallWindowEventHook(self, hookId):
+        nameChangeHookId = self.nameChangeHooks.pop(hookId, None)
+        
+        if nameChangeHookId:
+            self.user32.UnhookWinEvent(nameChangeHookId)
+        
+        return self.uninstallForegroundHook(hookId)
+    
+    def keybdEvent(self, vkey, scanCode=0, flags=0):
+        win32api.keybd_event(vkey, scanCode, flags, 0)
+    
+    def mouseEvent(self, flags, dx=0, dy=0, data=0):
+        win32api.mouse_event(flags, dx, dy, data, 0)
+    
+    def sendInputs(self, inputs):
+        cdef int index
+        
+        if not inputs:
+            return 0
+        
+        inputArray = (INPUT * len(inputs))()
+        
+        for index, entry in enumerate(inputs):
+            if entry[0] == MOUSE_INPUT:
+                inputArray[index].type = INPUT_MOUSE
+                _, inputArray[index].mi.dwFlags, inputArray[index].mi.dx, inputArray[index].mi.dy, inputArray[index].mi.mouseData = entry
+                continue
+            
+            inputArray[index].type = INPUT_KEYBOARD
+            inputArray[index].ki.wVk, inputArray[index].ki.wScan, inputArray[index].ki.dwFlags = entry
+        
+        # Docs: https://learn.microsoft.com/en-us/windows/win32/api/winuser/nf-winuser-sendinput
+        return self.user32.SendInput(len(inputs), inputArray, ctypes.sizeof(INPUT))
+    
+    def keyboardModule(self):
+        """Imports the `keyboard` package on first use."""
+        
+        if self.keyboard is None:
+            import keyboard
+            self.keyboard = keyboard
+        
+        return self.keyboard
+    
+    def sendHotkey(self, hotkey):
+        self.keyboardModule().send(hotkey)
+    
+    def writeText(self, text):
+        self.keyboardModule().write(text)
+    
+    def pressKey(self, key):
+        self.keyboardModule().press(key)
+    
+    def releaseKey(self, key):
+        self.keyboardModule().release(key)
+    
+    def getCursorPos(self):
+        return win32api.GetCursorPos()
+    
+    def setCursorPos(self, x, y):
+        win32api.SetCursorPos((x, y))
+    
+    def getSystemMetrics(self, index):
+        return win32api.GetSystemMetrics(index)
+    
+    def getDisplayFrequency(self):
+        cdef int frequency = win32api.EnumDisplaySettings(None, win32con.ENUM_CURRENT_SETTINGS).DisplayFrequency
+        
+        # `0` and `1` stand for the default rate of the display hardware.
+        return frequency if frequency > 1 else 0
+    
+    def getForegroundWindow(self):
+        return win32gui.GetForegroundWindow()
+    
+    def setForegroundWindow(self, hwnd):
+        win32gui.SetForegroundWindow(hwnd)
+    
+    def getClassName(self, hwnd):
+        return win32gui.GetClassName(hwnd)
+    
+    def getWindowText(self, hwnd):
+        return win32gui.GetWindowText(hwnd)
+    
+    def getWindowProcess(self, hwnd):
+        processId = ctypes.wintypes.DWORD()
+        self.user32.GetWindowThreadProcessId(hwnd, ctypes.byref(processId))
+        
+        processHandle = self.kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, processId.value)
+        
+        if not processHandle:
+            return processId.value, "", False
+        
+        processName, elevated = "", False
+        
+        try:
+            size = ctypes.wintypes.DWORD(260)
+            path = ctypes.create_unicode_buffer(size.value)
+            
+            if self.kernel32.QueryFullProcessImageNameW(processHandle, 0, path, ctypes.byref(size)):
+                processName = os.path.basename(path.value).lower()
+            
+            # A non elevated process can not open the token of an elevated one, which is itself a sign of elevation.
+            token = ctypes.c_void_p()
+            
+            if self.advapi32.OpenProcessToken(processHandle, TOKEN_QUERY, ctypes.byref(token)):
+                isElevated, returnLength = ctypes.wintypes.DWORD(), ctypes.wintypes.DWORD()
+                
+                if self.advapi32.GetTokenInformation(token, TOKEN_ELEVATION, ctypes.byref(isElevated), ctypes.sizeof(isElevated), ctypes.byref(returnLength)):
+                    elevated = bool(isElevated.value)
+                
+                self.kernel32.CloseHandle(token)
+            
+            else:
+                elevated = True
+        
+        finally:
+            self.kernel32.CloseHandle(processHandle)
+        
+        return processId.value, processName, elevated
+    
+    def findWindow(self, className, title):
+        try:
+            return win32gui.FindWindow(className, title)
+        
+        except pywintypes.error:
+            return 0
+    
+    def getTopWindow(self):
+        return win32gui.GetTopWindow(0)
+    
+    def getWindow(self, hwnd, command):
+        return win32gui.GetWindow(hwnd, command)
+    
+    def isWindowVisible(self, hwnd):
+        return bool(win32gui.IsWindowVisible(hwnd))
+    
+    def showWindow(self, hwnd, command):
+        win32gui.ShowWindow(hwnd, command)
+    
+    def getWindowRect(self, hwnd):
+        return win32gui.GetWindowRect(hwnd)
+    
+    def setWindowPos(self, hwnd, insertAfter, x, y, cx, cy, flags):
+        win32gui.SetWindowPos(hwnd, insertAfter, x, y, cx, cy, flags)
+    
+    def getWindowLong(self, hwnd, index):
+        return win32gui.GetWindowLong(hwnd, index)
+    
+    def setWindowLong(self, hwnd, index, value):
+        win32gui.SetWindowLong(hwnd, index, value)
+    
+    def getLayeredWindowAttributes(self, hwnd):
+        return win32gui.GetLayeredWindowAttributes(hwnd)
+    
+    def setLayeredWindowAttributes(self, hwnd, colorKey, alpha, flags):
+        win32gui.SetLayeredWindowAttributes(hwnd, colorKey, alpha, flags)
+    
+    def sendMessage(self, hwnd, message, wParam=0, lParam=0):
+        return self.user32.SendMessageW(hwnd, message, wParam, lParam)
+    
+    def postMessage(self, hwnd, message, wParam=0, lParam=0):
+        win32gui.PostMessage(hwnd, message, wParam, lParam)
+    
+    def getLastError(self):
+        return ctypes.get_last_error()
+    
+    def messageBox(self, text, title, style):
+        # https://learn.microsoft.com/en-us/windows/win32/api/winuser/nf-winuser-messageboxw
+        return self.user32.MessageBoxW(None, text, title, style)
+    
+    def readClipboard(self, clipboardFormat):
+        win32clipboard.OpenClipboard()
+        
+        try:
+            if win32clipboard.IsClipboardFormatAvailable(clipboardFormat):
+                return win32clipboard.GetClipboardData(clipboardFormat)
+            
+            return None
+        
+        finally:
+            win32clipboard.CloseClipboard()
+    
+    def writeClipboard(self, data, clipboardFormat):
+        win32clipboard.OpenClipboard()
+        
+        try:
+            win32clipboard.EmptyClipboard()
+            win32clipboard.SetClipboardData(clipboardFormat, data)
+        
+        finally:
+            win32clipboard.CloseClipboard()
+    
+    def emptyClipboard(self):
+        win32clipboard.OpenClipboard()
+        
+        try:
+            win32clipboard.EmptyClipboard()
+        
+        finally:
+            win32clipboard.CloseClipboard()
+    
+    def playSound(self, soundPath, wait=False):
+        import winsound
+        
+        winsound.PlaySound(soundPath, winsound.SND_FILENAME if wait else winsound.SND_FILENAME | winsound.SND_ASYNC)
+    
+    def shellApplication(self):
+        from win32com.client import Dispatch
+        
+        return Dispatch("Shell.Application")
+    
+    def coInitialize(self):
+        import pythoncom
+        
+        pythoncom.CoInitialize()
+    
+    def coUninitialize(self):
+        import pythoncom
+        
+        pythoncom.CoUninitialize()
+
+
+class FakeWindow:
+    """A top level window of `FakeBackend`."""
+    
+    __slots__ = ("hwnd", "className", "title", "rect", "visible", "exStyle", "alpha", "layeredFlags", "showCommand", "processId", "processName", "elevated")
+    
+    def __init__(self, hwnd: int, className: str, title: str, rect: tuple[int, int, int, int], visible=True, processName="", elevated=False):
+        self.hwnd = hwnd
+        self.className = className
+        self.title = title
+        self.rect = rect
+        self.visible = visible
+        self.processId = 1000 + (hwnd & 0xFFFF)
+        self.processName = processName.lower()
+        self.elevated = elevated
+        self.exStyle = 0
+        self.alpha = 255
+        self.layeredFlags = 0
+        self.showCommand = win32con.SW_SHOWNORMAL
+    
+    def __repr__(self):
+        return f"FakeWindow(hwnd={self.hwnd}, className={self.className!r}, title={self.title!r})"
+
+
+class FakeShellApplication:
+    """A stand-in for the `Shell.Application` automation object. `Windows()` returns the objects in the `windows` list."""
+    
+    def __init__(self):
+        self.windows = []
+    
+    def Windows(self):
+        return self.windows
+
+
+# The `flags` of the low level hook structures.
+cdef enum HookFlags:
+    LLKHF_EXTENDED = 0x01
+    LLKHF_INJECTED = 0x10
+    LLKHF_ALTDOWN  = 0x20
+    LLKHF_UP       = 0x80
+    LLMHF_INJECTED = 0x01
+
+# The mouse messages generated by the button flags of `mouse_event`.
+cdef list mouseButtonMessages = [
+    (win32con.MOUSEEVENTF_LEFTDOWN,   win32con.WM_LBUTTONDOWN),
+    (win32con.MOUSEEVENTF_LEFTUP,     win32con.WM_LBUTTONUP),
+    (win32con.MOUSEEVENTF_RIGHTDOWN,  win32con.WM_RBUTTONDOWN),
+    (win32con.MOUSEEVENTF_RIGHTUP,    win32con.WM_RBUTTONUP),
+    (win32con.MOUSEEVENTF_MIDDLEDOWN, win32con.WM_MBUTTONDOWN),
+    (win32con.MOUSEEVENTF_MIDDLEUP,   win32con.WM_MBUTTONUP),
+]
+
+# Maps the sided modifier keys to their generic key (reported as pressed when either side is pressed) and their other side.
+cdef dict genericModifiers = {
+    win32con.VK_LSHIFT:   (win32con.VK_SHIFT,   win32con.VK_RSHIFT),
+    win32con.VK_RSHIFT:   (win32con.VK_SHIFT,   win32con.VK_LSHIFT),
+    win32con.VK_LCONTROL: (win32con.VK_CONTROL, win32con.VK_RCONTROL),
+    win32con.VK_RCONTROL: (win32con.VK_CONTROL, win32con.VK_LCONTROL),
+    win32con.VK_LMENU:    (win32con.VK_MENU,    win32con.VK_RMENU),
+    win32con.VK_RMENU:    (win32con.VK_MENU,    win32con.VK_LMENU),
+}
+
+
+class FakeBackend(PlatformBackend):
+    """
+    Description:
+        An in-memory backend for running the pipeline headless.
+        
+        - The input fed with `simulateKey`/`simulateMouse` (user input) and injected with `keybdEvent`/`mouseEvent` (flagged as injected)
+        is queued and delivered to the installed hooks by `runMessageLoop` (in the thread that calls it, like Windows does), or by `pumpMessages`.
+        The key states and the cursor position are only updated for the events that are not suppressed by the hooks.
+        - The injected input, the sent hotkeys, and the written text are recorded in `injectedInputs`.
+        - Windows are added with `addWindow`, and the played sounds, the sent/posted messages, and the shown message boxes are recorded.
+    ---
+    Parameters:
+        `screenSize -> tuple[int, int]`: The width and height of the fake screen.
+    """
+    
+    name = "fake"
+    
+    def __init__(self, screenSize=(1920, 1080)):
+        self.lock = threading.RLock()
+        self.startedAt = perf_counter()
+        self.tickOffset = 0
+        """Added to the tick count (e.g., to test the wrap around)."""
+        
+        self.keyStates = bytearray(256)
+        self.screenSize = screenSize
+        self.cursor = (screenSize[0] // 2, screenSize[1] // 2)
+        self.queuedCursor = self.cursor
+        """The cursor position after the queued mouse events, used as the position of the next injected mouse event."""
+        
+        
+        self.hooks = {}
+        self.foregroundHooks = {}
+        self.windowEventHooks = {}
+        self.nextHookId = 1
+        self.pendingInputs = queue.SimpleQueue()
+        self.quitRequested = threading.Event()
+        self.deliveredInputs = 0
+        self.suppressedInputs = 0
+        
+        self.windows = {}
+        self.zOrder = []
+        """The handles of the windows, from the top of the z-order (the foreground window) to the bottom."""
+        
+        self.nextHwnd = 0x10010
+        self.lastError = 0
+        self.messageBoxResult = win32con.IDOK
+        
+        self.clipboard = {}
+        self.shell = FakeShellApplication()
+        
+        self.injectedInputs = deque(maxlen=100000)
+        """The injected input in order: `("key", vkey, scanCode, flags)`, `("mouse", flags, dx, dy, data)`, `("hotkey", hotkey)`, `("text", text)`, `("press", key)`, and `("release", key)`."""
+        
+        self.playedSounds = deque(maxlen=1000)
+        self.messages = deque(maxlen=1000)
+        """The sent and posted messages as `(hwnd, message, wParam, lParam)` tuples."""
+        
+        self.messageBoxes = deque(maxlen=100)
+        """The shown message boxes as `(text, title, style)` tuples."""
+    
+    # Key states and time.
+    def getKeyState(self, vkey):
+        cdef int state = self.keyStates[vkey & 0xFF]
+        
+        return (-32768 if state & 0x80 else 0) | (state & 1)
+    
+    def getAsyncKeyState(self, vkey):
+        return -32768 if self.keyStates[vkey & 0xFF] & 0x80 else 0
+    
+    def getTickCount(self):
+        return (int((perf_counter() - self.startedAt) * 1000) + self.tickOffset) & 0xFFFFFFFF
+    
+    def getKeyboardLayout(self):
+        return None
+    
+    def setKeyState(self, vkey: int, pressed=False, toggled=False) -> None:
+        """Sets the state of a key directly, without generating an event (e.g., turning caps lock on before a test)."""
+        
+        self.keyStates[vkey & 0xFF] = (0x80 if pressed else 0) | (1 if toggled else 0)
+    
+    def updateKeyState(self, int vkey, bint isKeyDown):
+        """Updates the pressed and toggled bits of a key as Windows does when a key event is not suppressed."""
+        
+        cdef int state = self.keyStates[vkey & 0xFF]
+        
+        if isKeyDown:
+            # The toggle bit flips on every press, not on the auto repeated key down events.
+            self.keyStates[vkey & 0xFF] = 0x80 | ((state ^ 1) & 1 if not state & 0x80 else state & 1)
+        
+        else:
+            self.keyStates[vkey & 0xFF] = state & 1
+        
+        if vkey in genericModifiers:
+            generic, otherSide = genericModifiers[vkey]
+            self.keyStates[generic] = (self.keyStates[generic] & 1) | ((self.keyStates[vkey] | self.keyStates[otherSide]) & 0x80)
+    
+    # Hooks.
+    def installHook(self, hookType, callback):
+        with self.lock:
+            hookId = self.nextHookId
+            self.nextHookId += 1
+            self.hooks[hookId] = (hookType, callback)
+        
+        return hookId
+    
+    def uninstallHook(self, hookId):
+        with self.lock:
+            return self.hooks.pop(hookId, None) is not None
+    
+    def callNextHook(self, nCode, wParam, lParam):
+        return 0
+    
+    def callHooks(self, int hookType, int wParam, data) -> bool:
+        """Calls the hooks of the given type, most recently installed first, until one of them suppresses the event."""
+        
+        lParam = ctypes.addressof(data)
+        
+        for installedType, callback in reversed(list(self.hooks.values())):
+            if installedType == hookType and callback(win32con.HC_ACTION, wParam, lParam):
+                return True
+        
+        return False
+    
+    def runMessageLoop(self):
+        self.quitRequested.clear()
+        
+        while not self.quitRequested.is_set():
+            try:
+                event = self.pendingInputs.get(timeout=0.05)
+            
+            except queue.Empty:
+                continue
+            
+            self.deliver(event)
+    
+    def quitMessageLoop(self, threadId=0):
+        self.quitRequested.set()
+    
+    def installForegroundHook(self, callback):
+        with self.lock:
+            hookId = self.nextHookId
+            self.nextHookId += 1
+            self.foregroundHooks[hookId] = callback
+        
+        return hookId
+    
+    def uninstallForegroundHook(self, hookId):
+        with self.lock:
+            return self.foregroundHooks.pop(hookId, None) is not None
+    
+    def installWindowEventHook(self, callback):
+        with self.lock:
+            hookId = self.nextHookId
+            self.nextHookId += 1
+            self.windowEventHooks[hookId] = callback
+        
+        return hookId
+    
+    def uninstallWindowEventHook(self, hookId):
+        with self.lock:
+            return self.windowEventHooks.pop(hookId, None) is not None
+    
+    def queueWindowEvent(self, int event, int hwnd):
+        """Queues a window event for the window event hooks. Called with the lock held."""
+        
+        if self.windowEventHooks:
+            self.pendingInputs.put(("window", event, hwnd))
+    
+    def queueForegroundChange(self, int previousForeground):
+        """Queues a foreground notification for the foreground hooks if the foreground window has changed. Called with the lock held."""
+        
+        if self.foregroundHooks and self.getForegroundWindow() != previousForeground:
+            self.pendingInputs.put(("foreground", self.getForegroundWindow()))
+    
+    def pumpMessages(self) -> int:
+        """Delivers the queued input to the hooks in the calling thread. Returns the number of delivered events."""
+        
+        cdef int count = 0
+        
+        while True:
+            try:
+                event = self.pendingInputs.get_nowait()
+            
+            except queue.Empty:
+                return count
+            
+            self.deliver(event)
+            count += 1
+    
+    def deliver(self, tuple event):
+        """Delivers a queued input event to the hooks, then updates the key states or the cursor if the event was not suppressed."""
+        
+        from cythonExtensions.hookManager.hookManager import KBDLLHOOKSTRUCT, MSLLHOOKSTRUCT
+        
+        cdef bint suppressed
+        
+        # The hooks are called without holding the lock, as they may call the other methods from their worker threads.
+        if event[0] == "foreground":
+            for callback in list(self.foregroundHooks.values()):
+                callback(event[1])
+            
+            return
+        
+        if event[0] == "window":
+            for callback in list(self.windowEventHooks.values()):
+                callback(event[1], event[2])
+            
+            return
+        
+        if event[0] == "key":
+            _, vkey, scanCode, flags, isKeyDown = event
+            
+            altDown = self.keyStates[win32con.VK_MENU] & 0x80 or (isKeyDown and vkey in (win32con.VK_LMENU, win32con.VK_RMENU))
+            isSystemKey = altDown and not self.keyStates[win32con.VK_CONTROL] & 0x80
+            
+            if isKeyDown:
+                wParam = win32con.WM_SYSKEYDOWN if isSystemKey else win32con.WM_KEYDOWN
+            else:
+                wParam = win32con.WM_SYSKEYUP if isSystemKey else win32con.WM_KEYUP
+                flags |= LLKHF_UP
+            
+            if altDown:
+                flags |= LLKHF_ALTDOWN
+            
+            suppressed = self.callHooks(win32con.WH_KEYBOARD_LL, wParam, KBDLLHOOKSTRUCT(vkey, scanCode, flags, self.getTickCount(), None))
+            
+            with self.lock:
+                if not suppressed:
+                    self.updateKeyState(vkey, isKeyDown)
+        
+        else:
+            _, wParam, x, y, mouseData, flags = event
+            
+            suppressed = self.callHooks(win32con.WH_MOUSE_LL, wParam, MSLLHOOKSTRUCT((x, y), mouseData, flags, self.getTickCount(), None))
+            
+            if not suppressed:
+                self.cursor = (x, y)
+            
+            elif self.pendingInputs.empty():
+                self.queuedCursor = self.cursor
+        
+        self.deliveredInputs += 1
+        self.suppressedInputs += suppressed
+    
+    # Input.
+    def simulateKey(self, vkey: int, isKeyDown=True, scanCode=0, extended=False) -> None:
+        """Queues a (physical) key event for the hooks."""
+        
+        self.pendingInputs.put(("key", vkey, scanCode, LLKHF_EXTENDED if extended else 0, isKeyDown))
+    
+    def simulateKeyPress(self, vkey: int, scanCode=0, extended=False) -> None:
+        """Queues a key down and a key up event for the hooks."""
+        
+        self.simulateKey(vkey, True, scanCode, extended)
+        self.simulateKey(vkey, False, scanCode, extended)
+    
+    def simulateMouse(self, message: int, x=None, y=None, mouseData=0) -> None:
+        """Queues a (physical) mouse event with the given `WM_*` message for the hooks. The position defaults to the position after the queued events."""
+        
+        if x is None or y is None:
+            x, y = self.queuedCursor
+        
+        self.queuedCursor = (x, y)
+        self.pendingInputs.put(("mouse", message, x, y, mouseData & 0xFFFFFFFF, 0))
+    
+    def keybdEvent(self, vkey, scanCode=0, flags=0):
+        self.injectedInputs.append(("key", vkey, scanCode, flags))
+        self.pendingInputs.put(("key", VK_PACKET if flags & KEYEVENTF_UNICODE else vkey, scanCode, (flags & win32con.KEYEVENTF_EXTENDEDKEY) | LLKHF_INJECTED,
+                                not flags & win32con.KEYEVENTF_KEYUP))
+    
+    def sendInputs(self, inputs):
+        for entry in inputs:
+            if entry[0] == MOUSE_INPUT:
+                self.mouseEvent(*entry[1:])
+            
+            else:
+                self.keybdEvent(*entry)
+        
+        return len(inputs)
+    
+    def mouseEvent(self, flags, dx=0, dy=0, data=0):
+        self.injectedInputs.append(("mouse", flags, dx, dy, data))
+        
+        x, y = self.queuedCursor
+        
+        if flags & win32con.MOUSEEVENTF_MOVE:
+            if flags & win32con.MOUSEEVENTF_ABSOLUTE:
+                x, y = dx * self.screenSize[0] // 65536, dy * self.screenSize[1] // 65536
+            else:
+                x, y = x + dx, y + dy
+            
+            self.queuedCursor = (x, y)
+            self.pendingInputs.put(("mouse", win32con.WM_MOUSEMOVE, x, y, 0, LLMHF_INJECTED))
+        
+        for flag, message in mouseButtonMessages:
+            if flags & flag:
+                self.pendingInputs.put(("mouse", message, x, y, 0, LLMHF_INJECTED))
+        
+        # The wheel delta is held in the high word of `mouseData`.
+        if flags & win32con.MOUSEEVENTF_WHEEL:
+            self.pendingInputs.put(("mouse", win32con.WM_MOUSEWHEEL, x, y, (data & 0xFFFF) << 16, LLMHF_INJECTED))
+        
+        if flags & win32con.MOUSEEVENTF_HWHEEL:
+            self.pendingInputs.put(("mouse", win32con.WM_MOUSEHWHEEL, x, y, (data & 0xFFFF) << 16, LLMHF_INJECTED))
+    
+    def sendHotkey(self, hotkey):
+        self.injectedInputs.append(("hotkey", hotkey))
+    
+    def writeText(self, text):
+        self.injectedInputs.append(("text", text))
+    
+    def pressKey(self, key):
+        self.injectedInputs.append(("press", key))
+    
+    def releaseKey(self, key):
+        self.injectedInputs.append(("release", key))
+    
+    def getCursorPos(self):
+        return self.cursor
+    
+    def setCursorPos(self, x, y):
+        self.cursor = self.queuedCursor = (x, y)
+    
+    def getSystemMetrics(self, index):
+        if index == win32con.SM_CXSCREEN:
+            return self.screenSize[0]
+        
+        if index == win32con.SM_CYSCREEN:
+            return self.screenSize[1]
+        
+        return 0
+    
+    def getDisplayFrequency(self):
+        return 60
+    
+    # Windows.
+    def addWindow(self, className: str, title="", rect=(0, 0, 800, 600), foreground=True, visible=True, processName="", elevated=False) -> int:
+        """
+        Creates a top level window and returns its handle. The window is placed at the top of the z-order if `foreground` is `True`, otherwise at the bottom.
+        The foreground hooks are notified of the foreground changes through the input queue, in order with the queued input.
+        """
+        
+        with self.lock:
+            previousForeground = self.getForegroundWindow()
+            hwnd = self.nextHwnd
+            self.nextHwnd += 2
+            self.windows[hwnd] = FakeWindow(hwnd, className, title, tuple(rect), visible, processName, elevated)
+            
+            if foreground:
+                self.zOrder.insert(0, hwnd)
+            else:
+                self.zOrder.append(hwnd)
+            
+            self.queueWindowEvent(win32con.EVENT_OBJECT_CREATE, hwnd)
+            self.queueForegroundChange(previousForeground)
+        
+        return hwnd
+    
+    def closeWindow(self, hwnd: int) -> None:
+        """Destroys the given window."""
+        
+        with self.lock:
+            previousForeground = self.getForegroundWindow()
+            
+            if self.windows.pop(hwnd, None) is not None:
+                self.zOrder.remove(hwnd)
+                self.queueWindowEvent(win32con.EVENT_OBJECT_DESTROY, hwnd)
+                self.queueForegroundChange(previousForeground)
+    
+    def setWindowText(self, hwnd: int, title: str) -> None:
+        """Changes the title of the given window (e.g., an explorer window navigating to another folder)."""
+        
+        with self.lock:
+            window = self.windows.get(hwnd)
+            
+            if window is not None:
+                window.title = title
+                self.queueWindowEvent(win32con.EVENT_OBJECT_NAMECHANGE, hwnd)
+    
+    def getForegroundWindow(self):
+        return self.zOrder[0] if self.zOrder else 0
+    
+    def setForegroundWindow(self, hwnd):
+        with self.lock:
+            if hwnd not in self.windows:
+                self.lastError = 1400 # ERROR_INVALID_WINDOW_HANDLE
+                raise PlatformError(self.lastError, "SetForegroundWindow", "Invalid window handle.")
+            
+            previousForeground = self.getForegroundWindow()
+            self.zOrder.remove(hwnd)
+            self.zOrder.insert(0, hwnd)
+            self.queueForegroundChange(previousForeground)
+    
+    def getClassName(self, hwnd):
+        window = self.windows.get(hwnd)
+        
+        return window.className if window is not None else ""
+    
+    def getWindowText(self, hwnd):
+        window = self.windows.get(hwnd)
+        
+        return window.title if window is not None else ""
+    
+    def getWindowProcess(self, hwnd):
+        window = self.windows.get(hwnd)
+        
+        return (window.processId, window.processName, window.elevated) if window is not None else (0, "", False)
+    
+    def findWindow(self, className, title):
+        for hwnd in list(self.zOrder):
+            window = self.windows.get(hwnd)
+            
+            if window is not None and className in (None, window.className) and title in (None, window.title):
+                return hwnd
+        
+        return 0
+    
+    def getTopWindow(self):
+        return self.zOrder[0] if self.zOrder else 0
+    
+    def getWindow(self, hwnd, command):
+        if command != win32con.GW_HWNDNEXT:
+            return 0
+        
+        with self.lock:
+            if hwnd not in self.windows:
+                return 0
+            
+            index = self.zOrder.index(hwnd) + 1
+            
+            return self.zOrder[index] if index < len(self.zOrder) else 0
+    
+    def isWindowVisible(self, hwnd):
+        window = self.windows.get(hwnd)
+        
+        return window is not None and window.visible
+    
+    def showWindow(self, hwnd, command):
+        window = self.windows.get(hwnd)
+        
+        if window is not None:
+            window.showCommand = command
+            window.visible = command != win32con.SW_HIDE
+    
+    def getWindowRect(self, hwnd):
+        window = self.windows.get(hwnd)
+        
+        return window.rect if window is not None else (0, 0, 0, 0)
+    
+    def setWindowPos(self, hwnd, insertAfter, x, y, cx, cy, flags):
+        window = self.windows.get(hwnd)
+        
+        if window is None:
+            return
+        
+        left, top, right, bottom = window.rect
+        
+        if not flags & win32con.SWP_NOMOVE:
+            right, bottom = x + right - left, y + bottom - top
+            left, top = x, y
+        
+        if not flags & win32con.SWP_NOSIZE:
+            right, bottom = left + cx, top + cy
+        
+        window.rect = (left, top, right, bottom)
+        
+        if not flags & win32con.SWP_NOZORDER:
+            if insertAfter == win32con.HWND_TOPMOST:
+                window.exStyle |= win32con.WS_EX_TOPMOST
+            
+            elif insertAfter == win32con.HWND_NOTOPMOST:
+                window.exStyle &= ~win32con.WS_EX_TOPMOST
+    
+    def getWindowLong(self, hwnd, index):
+        window = self.windows.get(hwnd)
+        
+        return window.exStyle if window is not None and index == win32con.GWL_EXSTYLE else 0
+    
+    def setWindowLong(self, hwnd, index, value):
+        window = self.windows.get(hwnd)
+        
+        if window is not None and index == win32con.GWL_EXSTYLE:
+            window.exStyle = value
+    
+    def getLayeredWindowAttributes(self, hwnd):
+        window = self.windows.get(hwnd)
+        
+        if window is None or not window.exStyle & win32con.WS_EX_LAYERED:
+            self.lastError = 87 # ERROR_INVALID_PARAMETER
+            raise PlatformError(self.lastError, "GetLayeredWindowAttributes", "The window is not a layered window.")
+        
+        return (0, window.alpha, window.layeredFlags)
+    
+    def setLayeredWindowAttributes(self, hwnd, colorKey, alpha, flags):
+        window = self.windows.get(hwnd)
+        
+        if window is not None:
+            window.alpha = alpha
+            window.layeredFlags = flags
+    
+    def sendMessage(self, hwnd, message, wParam=0, lParam=0):
+        self.messages.append((hwnd, message, wParam, lParam))
+        
+        if message == win32con.WM_CLOSE:
+            self.closeWindow(hwnd)
+        
+        return 0
+    
+    def postMessage(self, hwnd, message, wParam=0, lParam=0):
+        self.sendMessage(hwnd, message, wParam, lParam)
+    
+    def getLastError(self):
+        return self.lastError
+    
+    def messageBox(self, text, title, style):
+        self.messageBoxes.append((text, title, style))
+        
+        return self.messageBoxResult
+    
+    # Clipboard.
+    def readClipboard(self, clipboardFormat):
+        return self.clipboard.get(clipboardFormat)
+    
+    def writeClipboard(self, data, clipboardFormat):
+        self.clipboard = {clipboardFormat: data}
+    
+    def emptyClipboard(self):
+        self.clipboard = {}
+    
+    # Sound and shell automation.
+    def playSound(self, soundPath, wait=False):
+        self.playedSounds.append(soundPath)
+    
+    def shellApplication(self):
+        return self.shell
+    
+    def coInitialize(self):
+        pass
+    
+    def coUninitialize(self):
+        pass
+
+
+def createDefaultBackend() -> PlatformBackend:
+    """Returns a `FakeBackend` if pywin32 is not available or the `MACROPY_BACKEND` environment variable is `fake`, otherwise a `Win32Backend`."""
+    
+    if not IS_WIN32_AVAILABLE or os.environ.get("MACROPY_BACKEND", "").lower() == "fake":
+        return FakeBackend()
+    
+    return Win32Backend()
+
+
+backend = createDefaultBackend()
+"""The active backend. Always access it as `platformBackend.backend`, so replacing it with `setBackend` takes effect."""
+
+
+def getBackend() -> PlatformBackend:
+    """Returns the active backend."""
+    
+    return backend
+
+
+def setBackend(newBackend: PlatformBackend) -> PlatformBackend:
+    """
+    Description:
+        Replaces the active backend, and returns the previous one. The hooks installed through the previous backend are not moved.
+        Objects created from the previous backend at import time (e.g., the `Shell.Application` object of `comWorker`) are kept,
+        so the backend should be set before the other modules are imported.
+    """
+    
+    global backend
+    
+    previousBackend, backend = backend, newBackend
+    
+    return previousBackend
@@ -0,0 +1,162 @@
+"""
+The subset of the `win32con` constants used by the script, with their standard Windows values.
+
+`platformBackend` exposes this module as `win32con` when pywin32 is not installed, so the modules that use the constants can be imported on any platform.
+"""
+
+# Hooks.
+HC_ACTION       = 0
+WH_KEYBOARD_LL  = 13
+WH_MOUSE_LL     = 14
+
+# Window messages.
+WM_NULL         = 0x0000
+WM_CLOSE        = 0x0010
+WM_QUIT         = 0x0012
+WM_KEYDOWN      = 0x0100
+WM_KEYUP        = 0x0101
+WM_SYSKEYDOWN   = 0x0104
+WM_SYSKEYUP     = 0x0105
+WM_COMMAND      = 0x0111
+WM_SYSCOMMAND   = 0x0112
+WM_MOUSEMOVE    = 0x0200
+WM_LBUTTONDOWN  = 0x0201
+WM_LBUTTONUP    = 0x0202
+WM_RBUTTONDOWN  = 0x0204
+WM_RBUTTONUP    = 0x0205
+WM_MBUTTONDOWN  = 0x0207
+WM_MBUTTONUP    = 0x0208
+WM_MOUSEWHEEL   = 0x020A
+WM_XBUTTONDOWN  = 0x020B
+WM_XBUTTONUP    = 0x020C
+WM_MOUSEHWHEEL  = 0x020E
+WM_USER         = 0x0400
+WM_APP          = 0x8000
+
+SC_MONITORPOWER = 0xF170
+MK_LBUTTON      = 0x0001
+WHEEL_DELTA     = 120
+
+# Virtual key codes.
+VK_CANCEL       = 0x03
+VK_BACK         = 0x08
+VK_TAB          = 0x09
+VK_RETURN       = 0x0D
+VK_SHIFT        = 0x10
+VK_CONTROL      = 0x11
+VK_MENU         = 0x12
+VK_PAUSE        = 0x13
+VK_CAPITAL      = 0x14
+VK_ESCAPE       = 0x1B
+VK_SPACE        = 0x20
+VK_PRIOR        = 0x21
+VK_NEXT         = 0x22
+VK_END          = 0x23
+VK_HOME         = 0x24
+VK_LEFT         = 0x25
+VK_UP           = 0x26
+VK_RIGHT        = 0x27
+VK_DOWN         = 0x28
+VK_SNAPSHOT     = 0x2C
+VK_INSERT       = 0x2D
+VK_DELETE       = 0x2E
+VK_LWIN         = 0x5B
+VK_RWIN         = 0x5C
+VK_APPS         = 0x5D
+VK_ADD          = 0x6B
+VK_SUBTRACT     = 0x6D
+VK_F1           = 0x70
+VK_F2           = 0x71
+VK_F3           = 0x72
+VK_F4           = 0x73
+VK_NUMLOCK      = 0x90
+VK_SCROLL       = 0x91
+VK_LSHIFT       = 0xA0
+VK_RSHIFT       = 0xA1
+VK_LCONTROL     = 0xA2
+VK_RCONTROL     = 0xA3
+VK_LMENU        = 0xA4
+VK_RMENU        = 0xA5
+VK_VOLUME_DOWN  = 0xAE
+VK_VOLUME_UP    = 0xAF
+
+# Input injection.
+KEYEVENTF_EXTENDEDKEY  = 0x0001
+KEYEVENTF_KEYUP        = 0x0002
+MOUSEEVENTF_MOVE       = 0x0001
+MOUSEEVENTF_LEFTDOWN   = 0x0002
+MOUSEEVENTF_LEFTUP     = 0x0004
+MOUSEEVENTF_RIGHTDOWN  = 0x0008
+MOUSEEVENTF_RIGHTUP    = 0x0010
+MOUSEEVENTF_MIDDLEDOWN = 0x0020
+MOUSEEVENTF_MIDDLEUP   = 0x0040
+MOUSEEVENTF_XDOWN      = 0x0080
+MOUSEEVENTF_XUP        = 0x0100
+MOUSEEVENTF_WHEEL      = 0x0800
+MOUSEEVENTF_HWHEEL     = 0x1000
+MOUSEEVENTF_VIRTUALDESK = 0x4000
+MOUSEEVENTF_ABSOLUTE   = 0x8000
+
+# Windows.
+GW_HWNDNEXT      = 2
+GWL_EXSTYLE      = -20
+HWND_BROADCAST   = 0xFFFF
+HWND_TOP         = 0
+HWND_TOPMOST     = -1
+HWND_NOTOPMOST   = -2
+SWP_NOSIZE       = 0x0001
+SWP_NOMOVE       = 0x0002
+SWP_NOZORDER     = 0x0004
+SWP_NOACTIVATE   = 0x0010
+SWP_FRAMECHANGED = 0x0020
+SWP_DRAWFRAME    = 0x0020
+SW_HIDE          = 0
+SW_SHOWNORMAL    = 1
+SW_RESTORE       = 9
+SW_FORCEMINIMIZE = 11
+WS_EX_TOPMOST    = 0x00000008
+WS_EX_LAYERED    = 0x00080000
+LWA_ALPHA        = 0x00000002
+SM_CXSCREEN      = 0
+SM_CYSCREEN      = 1
+SM_XVIRTUALSCREEN  = 76
+SM_YVIRTUALSCREEN  = 77
+SM_CXVIRTUALSCREEN = 78
+SM_CYVIRTUALSCREEN = 79
+
+# Window events.
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_OBJECT_CREATE     = 0x8000
+EVENT_OBJECT_DESTROY    = 0x8001
+EVENT_OBJECT_NAMECHANGE = 0x800C
+WINEVENT_OUTOFCONTEXT   = 0x0000
+OBJID_WINDOW            = 0
+CHILDID_SELF            = 0
+
+# Message boxes.
+IDOK               = 1
+MB_OK              = 0x00000000
+MB_OKCANCEL        = 0x00000001
+MB_YESNOCANCEL     = 0x00000003
+MB_YESNO           = 0x00000004
+MB_RETRYCANCEL     = 0x00000005
+MB_ICONERROR       = 0x00000010
+MB_ICONQUESTION    = 0x00000020
+MB_ICONINFORMATION = 0x00000040
+MB_SETFOREGROUND   = 0x00010000
+MB_TOPMOST         = 0x00040000
+
+# Clipboard formats.
+CF_TEXT          = 1
+CF_UNICODETEXT   = 13
+
+# Miscellaneous.
+EWX_SHUTDOWN     = 0x00000001
+EWX_POWEROFF     = 0x00000008
+OFN_ALLOWMULTISELECT = 0x00000200
+OFN_OVERWRITEPROMPT  = 0x00000002
+OFN_FILEMUSTEXIST    = 0x00001000
+OFN_EXPLORER         = 0x00080000
+PATINVERT        = 0x005A0049
+PROCESS_SUSPEND_RESUME = 0x0800
+PROCESS_ALL_ACCESS     = 0x001FFFFF
@@ -47,9 +47,15 @@ def beginScript() -> None:
     import scriptConfigs as configs
     from cythonExtensions.systemHelper import systemHelper as sysHelper
     from cythonExtensions.commonUtils.commonUtils import Management as mgmt, PThread
-    from cythonExtensions.eventHandlers.eventHandlers import keyPress, keyRelease, textExpansion, buttonPress
+    from cythonExtensions.eventHandlers.eventHandlers import keyDownFilter, keyPress, keyRelease, textExpansion, applyHotkeyConfig
+    from cythonExtensions.eventHandlers.hotkeyConfig import hotkeyConfig
     from cythonExtensions.hookManager.hookManager import KeyboardHookManager, MouseHookManager
+    from cythonExtensions.hookManager.macroRecorder import macroRecorder, loadMacro
+    from cythonExtensions.mouseHelper.cursorMotion import cursorMotion
     from cythonExtensions.trayIconHelper.trayIconHelper import createTrayIcon
+    from cythonExtensions.windowHelper.foregroundContext import foregroundContext
+    from cythonExtensions.explorerHelper.explorerWindows import explorerWindows
+    from cythonExtensions.commonUtils.comWorker import comWorker, officeWorker
     
     print("Loading core components...")
     
@@ -77,18 +83,72 @@ def beginScript() -> None:
         print("Starting the system tray icon...")
         createTrayIcon()
     
+    #+ Watching the declarative hotkey file, so its edits are applied without restarting the script.
+    if configs.HOTKEYS_CONFIG_PATH:
+        print("Watching the hotkey file for changes...")
+        PThread(target=hotkeyConfig.watch, args=(applyHotkeyConfig,)).start()
+    
     hookManager = HookManager()
     
     print("Initializing keyboard listeners...")
-    kbHook = KeyboardHookManager()
+    kbHook = KeyboardHookManager(configs.LISTENER_WORKER_COUNT, configs.LISTENER_QUEUE_SIZE, configs.HOOK_TIME_BUDGET_MS)
+    kbHook.keyDownFilter.callback = keyDownFilter
     kbHook.keyDownListeners.extend((textExpansion, keyPress))
     kbHook.keyUpListeners.append(keyRelease)
     
+    # `keyRelease` depends on the state set by `keyPress`, so both must be called in order by the same worker.
+    kbHook.dispatcher.pinListener(textExpansion, 0)
+    kbHook.dispatcher.pinListener(keyPress, 1)
+    kbHook.dispatcher.pinListener(keyRelease, 1)
+    
     # print("Initializing mouse listeners...")
-    # msHook = MouseHookManager()
+    # msHook = MouseHookManager(timeBudgetMs=configs.HOOK_TIME_BUDGET_MS)
+    # msHook.buttonDownFilter.callback = buttonDownFilter
     # msHook.mouseButtonDownListeners.append(buttonPress)
     # # msHook.mouseButtonUpListeners.append()
     
+    #+ The mouse hook is only installed for the hot zones and the macros that record the mouse. It has no listeners.
+    msHook = None
+    if configs.ENABLE_HOT_ZONES or configs.MACRO_RECORD_MOUSE:
+        msHook = MouseHookManager(timeBudgetMs=configs.HOOK_TIME_BUDGET_MS, trackMoves=configs.ENABLE_HOT_ZONES)
+    
+    #+ The hot zones only need the mouse move events, which the mouse hook records in its move buffer.
+    if configs.ENABLE_HOT_ZONES:
+        from cythonExtensions.hotZoneHelper.hotZoneHelper import HotZoneEngine
+        from cythonExtensions.eventHandlers.callbacks import createHotZones
+        
+        print("Initializing the hot zones...")
+        hotZones = HotZoneEngine(msHook.moveBuffer, configs.HOT_ZONES_SAMPLE_RATE, configs.HOT_ZONES_CELL_SIZE)
+        hotZones.addZones(createHotZones())
+    
+    #+ The frame rate of the keyboard cursor motion (the display refresh rate by default).
+    cursorMotion.rate = configs.CURSOR_MOTION_RATE
+    
+    #+ Letting the hooks record the user input into macros, and loading the last recorded macro.
+    macroRecorder.maxIdleGap = configs.MACRO_MAX_IDLE_GAP
+    kbHook.recorder = macroRecorder
+    
+    if configs.MACRO_RECORD_MOUSE:
+        msHook.recorder = macroRecorder
+    
+    if configs.MACRO_FILE_PATH and os.path.exists(configs.MACRO_FILE_PATH):
+        try:
+            macroRecorder.lastMacro = loadMacro(configs.MACRO_FILE_PATH)
+        
+        except (OSError, ValueError) as e:
+            print(f"\nWarning! The last macro could not be loaded: {e}")
+    
+    #+ Recording the raw hook events, so they can be replayed later with `eventJournal.replayJournal`.
+    if configs.EVENT_JOURNAL_PATH:
+        from cythonExtensions.hookManager.eventJournal import EventJournalWriter
+        
+        print(f"Recording the hook events to '{configs.EVENT_JOURNAL_PATH}'...")
+        eventJournal = EventJournalWriter(configs.EVENT_JOURNAL_PATH)
+        kbHook.journal = eventJournal
+        
+        if msHook is not None:
+            msHook.journal = eventJournal
+    
     print("Activating keyboard listeners...")
     #+ Installing the low level hooks.
     if not hookManager.installHook(kbHook.keyboardCallback,  HookTypes.WH_KEYBOARD_LL):
@@ -100,6 +160,23 @@ def beginScript() -> None:
     #     print("Failed to install the mouse hook!")
     #     os._exit(1)
     
+    #+ Tracking the foreground window, so the hotkeys and the text expansion do not query it on each keystroke.
+    #? The foreground notifications are delivered by the message loop of this thread, in order with the keyboard events.
+    if not foregroundContext.start():
+        print("\nWarning! Failed to install the foreground hook! The foreground window will be queried when needed.")
+    
+    #+ Keeping the explorer windows and their paths cached, so the explorer hotkeys do not enumerate the open windows over COM on each call.
+    if not explorerWindows.start():
+        print("\nWarning! Failed to install the window event hook! The paths of the explorer windows will not be cached.")
+    
+    if msHook is not None:
+        print("Activating the mouse hook...")
+        if not hookManager.installHook(msHook.mouseCallback, HookTypes.WH_MOUSE_LL):
+            print("\nWarning! Failed to install the mouse hook! The hot zones and the mouse recording are disabled.")
+        
+        elif configs.ENABLE_HOT_ZONES:
+            hotZones.start()
+    
     #+ Playing a sound to notify that the script is ready.
     winsound.PlaySound(r"SFX\achievement-message-tone.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
     
@@ -116,6 +193,24 @@ def beginScript() -> None:
     hookManager.uninstallHook(HookTypes.WH_KEYBOARD_LL)
     # hookManager.uninstallHook(HookTypes.WH_MOUSE_LL)
     
+    kbHook.dispatcher.stop()
+    foregroundContext.stop()
+    explorerWindows.stop()
+    
+    # Releases the automation objects (e.g., quits the office applications kept open by `officeWorker`).
+    comWorker.shutdown()
+    officeWorker.shutdown()
+    
+    if msHook is not None:
+        hookManager.uninstallHook(HookTypes.WH_MOUSE_LL)
+    
+    if configs.ENABLE_HOT_ZONES:
+        hotZones.stop()
+    
+    if configs.EVENT_JOURNAL_PATH:
+        eventJournal.close()
+        print(f"Recorded {eventJournal.recordedEvents} hook events.")
+    
     # Get a list of all running threads
     cdef list alive_threads = threading.enumerate()
     
@@ -1,6 +1,7 @@
 """This module provides system/script-specific functions."""
 
 import win32con
+from cythonExtensions.timelineHelper.timelineHelper import Timeline
 
 
 def reloadConfigs() -> None:
@@ -63,7 +64,7 @@ def sendScriptWorkingNotification(near_module=True) -> None:
 
 
 def changeBrightness(opcode=1, increment=5) -> None:
-    """Increments (`opcode=any non-zero value`) or decrements (`opcode=0`) the screen brightness by an (`increment`) percent."""
+    """Increments (`opcode=any non-zero value`) or decrements (`opcode=0`) the screen brightness by an (`increment`) percent. Runs on `comWorker`, which keeps the WMI connection."""
     ...
 
 
@@ -75,8 +76,8 @@ def toggleMonitorMode(mode: int):
     """Toggles the monitor mode between internal, external, extended, and clone."""
     ...
 
-def flashScreen(delay=0.15) -> None:
-    """Inverts the color of the screen for the specified number of seconds."""
+def flashScreen(delay=0.15) -> Timeline:
+    """Inverts the color of the screen for the specified number of seconds. Returns the `Timeline` that inverts it back."""
     ...
 
 
@@ -2,15 +2,20 @@
 
 """This extension module provides system/script-specific functions."""
 
-import wmi, ctypes, os, sys, psutil, subprocess, importlib
-import win32gui, win32api, win32process, win32con, winsound, win32security
-from time import sleep
-from win11toast import toast
+import ctypes, os, sys, subprocess, importlib
 
 import scriptConfigs as configs
 from cythonExtensions.commonUtils.commonUtils import ControllerHouse as ctrlHouse, PThread, Management as mgmt
+from cythonExtensions.commonUtils.comWorker import comWorker
 from cythonExtensions.windowHelper import windowHelper as winHelper
 from cythonExtensions.keyboardHelper import keyboardHelper as kbHelper
+from cythonExtensions.platformBackend import platformBackend as pfBackend
+from cythonExtensions.platformBackend.platformBackend import win32con, importPlatformModule
+from cythonExtensions.timelineHelper.timelineHelper import Timeline, scheduler
+
+# The functions of this module need Windows, but it can still be imported without these modules (e.g., with the fake platform backend).
+wmi, psutil, win32gui, win32api, win32process, win32security = map(importPlatformModule, ("wmi", "psutil", "win32gui", "win32api", "win32process", "win32security"))
+toast = importPlatformModule("win11toast").toast
 
 cpdef void reloadConfigs():
     """Re-imports the `scriptConfigs` module and reloads the defined configurations."""
@@ -19,8 +24,19 @@ cpdef void reloadConfigs():
     
     ctrlHouse.abbreviations = configs.ABBREVIATIONS
     ctrlHouse.non_prefixed_abbreviations = configs.NON_PERFIXED_ABBREVIATIONS
+    ctrlHouse.application_abbreviations = configs.APPLICATION_ABBREVIATIONS
     ctrlHouse.locations = configs.LOCATIONS
     mgmt.silent = configs.SUPPRESS_TERMINAL_OUTPUT
+    
+    # The aliases of the declarative hotkey file extend the reloaded ones, and the snippet library is reopened (it may have been re-imported).
+    from cythonExtensions.eventHandlers.hotkeyConfig import hotkeyConfig
+    from cythonExtensions.eventHandlers.eventHandlers import compileTextMatcher
+    from cythonExtensions.keyboardHelper.snippetLibrary import snippetLibrary
+    hotkeyConfig.applyTexts(True)
+    snippetLibrary.filePath = configs.SNIPPET_LIBRARY_PATH
+    snippetLibrary.cacheSize = configs.SNIPPET_LIBRARY_CACHE_SIZE
+    snippetLibrary.open()
+    compileTextMatcher()
 
 @PThread.throttle(10)
 def terminateScript(graceful=False) -> None:
@@ -36,13 +52,13 @@ def terminateScript(graceful=False) -> None:
     
     if graceful:
         print('Exitting...')
-        winsound.PlaySound(r"SFX\crack_the_whip.wav", winsound.SND_FILENAME)
+        pfBackend.backend.playSound(r"SFX\crack_the_whip.wav", wait=True)
         
         # Set the global Event variable `Management.terminateEvent` to signal the other threads to terminate.
         mgmt.terminateEvent.set()
         
         # Post the quit message to the thread's message queue so that the `GetMessage` function returns `False` and the thread terminates.
-        ctypes.windll.user32.PostThreadMessageW(PThread.mainThreadId, win32con.WM_QUIT, 0, 0)
+        pfBackend.backend.quitMessageLoop(PThread.mainThreadId)
     
     elif not len(sys.argv) > 1 or sys.argv[1] not in ("-p", "--profile", "--prof"): # else:
         print("Forcefully terminating the script...", end="")
@@ -69,7 +85,7 @@ cpdef bint isProcessElevated(int hwnd=0):
     if hwnd == -1:
         return ctypes.windll.shell32.IsUserAnAdmin()
     
-    hwnd = hwnd or win32gui.GetForegroundWindow()
+    hwnd = hwnd or pfBackend.backend.getForegroundWindow()
     
     try:
         if psutil.Process(win32process.GetWindowThreadProcessId(hwnd)[-1]).cwd() is None:
@@ -121,9 +137,9 @@ def scheduleElevatedProcessChecker(delay=10.0) -> None:
                 print("The script has elevated privileges. No need for further checks.")
                 return
             
-            winsound.PlaySound(r"C:\Windows\Media\Windows Exclamation.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
+            pfBackend.backend.playSound(r"C:\Windows\Media\Windows Exclamation.wav")
             
-            windowTitle = win32gui.GetWindowText(win32gui.GetForegroundWindow())
+            windowTitle = pfBackend.backend.getWindowText(pfBackend.backend.getForegroundWindow())
             if windowTitle.endswith("(Not Responding)"):
                 print(f"Attention: the active process '{windowTitle}' is not responding and no keyboard events can be received.")
             
@@ -215,13 +231,12 @@ def sendScriptWorkingNotification(near_module=True) -> None:
 
 
 @PThread.throttle(0.05)
+@comWorker.wrap
 def changeBrightness(opcode=1, increment=5) -> None:
-    """Increments (`opcode=any non-zero value`) or decrements (`opcode=0`) the screen brightness by an (`increment`) percent."""
-    
-    PThread.coInitialize()
+    """Increments (`opcode=any non-zero value`) or decrements (`opcode=0`) the screen brightness by an (`increment`) percent. Runs on `comWorker`, which keeps the WMI connection."""
     
-    # Connectting to WMI.
-    c = wmi.WMI(namespace="wmi")
+    # Connectting to WMI (once, the connection is reused by the next calls).
+    c = comWorker.getObject("wmi", lambda: wmi.WMI(namespace="wmi"))
     
     # Getting the current brightness value.
     current_brightness = c.WmiMonitorBrightness()[0].CurrentBrightness
@@ -236,13 +251,11 @@ def changeBrightness(opcode=1, increment=5) -> None:
     c.WmiMonitorBrightnessMethods()[0].WmiSetBrightness(Brightness=brightness, Timeout=0)
     
     print(f"Current & New Brightness: {current_brightness} -> {brightness}")
-    
-    PThread.coUninitialize()
 
 
 def screenOff() -> None:
     """Turns off the screen."""
-    win32gui.SendMessage(win32con.HWND_BROADCAST, win32con.WM_SYSCOMMAND, win32con.SC_MONITORPOWER, 2)
+    pfBackend.backend.sendMessage(win32con.HWND_BROADCAST, win32con.WM_SYSCOMMAND, win32con.SC_MONITORPOWER, 2)
 
 
 def toggleMonitorMode(mode: int):
@@ -257,7 +270,7 @@ def toggleMonitorMode(mode: int):
     
     if mode not in modes:
         print("Invalid mode. Please choose a valid mode number.")
-        winsound.PlaySound(r"SFX\error.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
+        pfBackend.backend.playSound(r"SFX\error.wav")
         
         return
     
@@ -268,23 +281,27 @@ def toggleMonitorMode(mode: int):
         subprocess.run(cmd_args, check=True)
         
         print(f"Successfully switched to mode {mode}.")
-        winsound.PlaySound(r"SFX\success.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
+        pfBackend.backend.playSound(r"SFX\success.wav")
     
     except subprocess.CalledProcessError as e:
         print(f"Error: {e}")
-        winsound.PlaySound(r"SFX\error.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
+        pfBackend.backend.playSound(r"SFX\error.wav")
 
 
-def flashScreen(delay=0.15) -> None:
-    """Inverts the color of the screen for the specified number of seconds."""
+def flashScreen(delay=0.15):
+    """Inverts the color of the screen for the specified number of seconds. Returns the `Timeline` that inverts it back."""
     cdef int x, y
     
     hdc = win32gui.GetDC(0) # Get the screen as a Device Context object
-    x, y = win32api.GetSystemMetrics(0), win32api.GetSystemMetrics(1) # Retrieve monitor size, e.g., (1920, 1080).
+    x, y = pfBackend.backend.getSystemMetrics(0), pfBackend.backend.getSystemMetrics(1) # Retrieve monitor size, e.g., (1920, 1080).
     win32gui.PatBlt(hdc, 0, 0, x, y, win32con.PATINVERT) # Invert the device context.
-    sleep(delay)
-    win32gui.PatBlt(hdc, 0, 0, x, y, win32con.PATINVERT) # Invert back to normal.
-    win32gui.DeleteDC(hdc) # Clean up memory.
+    
+    # The screen is inverted back by the timeline scheduler, so no thread sleeps in between.
+    timeline = Timeline("flashScreen")
+    timeline.at(delay, win32gui.PatBlt, (hdc, 0, 0, x, y, win32con.PATINVERT)) # Invert back to normal.
+    timeline.at(delay, win32gui.DeleteDC, (hdc,)) # Clean up memory.
+    
+    return scheduler.schedule(timeline)
 
 
 @PThread.throttle(15)
@@ -294,7 +311,7 @@ def goToSleep() -> None:
     # Source: https://learn.microsoft.com/en-us/sysinternals/downloads/psshutdown
     # For a list of available options, run (make sure to write correct path to the executable): c:\Utilities\PSTools\psshutdown
     
-    winsound.PlaySound(r"C:\Windows\Media\Windows Logoff Sound.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
+    pfBackend.backend.playSound(r"C:\Windows\Media\Windows Logoff Sound.wav")
     print("Putting the device to sleep...")
     
     # os.system(r'"C:\Program Files\Applications\PSTools\psshutdown64.exe" -d -t 0 -nobanner')  # Doesn't work for some reason with windows 11: https://superuser.com/questions/42124/how-can-i-put-the-computer-to-sleep-from-command-prompt-run-menu
@@ -358,7 +375,7 @@ def suspendProcess(hwnd=0) -> int:
     """Suspends a process given its window handle. Uses the handle of the active window if no handle is passed."""
     
     if not hwnd:
-        hwnd = win32gui.GetForegroundWindow()
+        hwnd = pfBackend.backend.getForegroundWindow()
     
     _thread_id, process_id = win32process.GetWindowThreadProcessId(hwnd)
     if isProcessSuspended(process_id):
@@ -378,7 +395,7 @@ def suspendProcess(hwnd=0) -> int:
         try:
             process_name = psutil.Process(process_id).name()
             
-            winsound.PlaySound(r"SFX\no-trespassing-368.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
+            pfBackend.backend.playSound(r"SFX\no-trespassing-368.wav")
             
             print(f"Successfully suspended the '{process_name}' process with hwnd={hwnd} and pid={process_id}.")
         
@@ -402,7 +419,7 @@ def resumeProcess(hwnd=0) -> int:
     """Resumes a suspended process given its window handle. Uses the handle of the active window if no handle is passed."""
     
     if not hwnd:
-        hwnd = win32gui.GetForegroundWindow()
+        hwnd = pfBackend.backend.getForegroundWindow()
     
     if ctypes.windll.user32.IsHungAppWindow(hwnd):
         hwnd = ctypes.windll.user32.HungWindowFromGhostWindow(hwnd)
@@ -426,7 +443,7 @@ def resumeProcess(hwnd=0) -> int:
         try:
             process_name = psutil.Process(process_id).name()
             
-            winsound.PlaySound(r"SFX\pedantic-490.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
+            pfBackend.backend.playSound(r"SFX\pedantic-490.wav")
             
             print(f"Successfully resumed the '{process_name}' process with hwnd={hwnd} and pid={process_id}.")
         
@@ -450,7 +467,7 @@ def getHungwindowHandle(hwnd=0) -> int:
     """Returns the actual hwnd of a hung window given its ghost window handle. Uses the handle of the active window if no handle is passed."""
     
     if not hwnd:
-        hwnd = win32gui.GetForegroundWindow()
+        hwnd = pfBackend.backend.getForegroundWindow()
     
     if ctypes.windll.user32.IsHungAppWindow(hwnd):
         real_hwnd = ctypes.windll.user32.HungWindowFromGhostWindow(hwnd)
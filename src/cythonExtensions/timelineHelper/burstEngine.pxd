@@ -0,0 +1,36 @@
+cdef class Burst:
+    cdef str name
+    cdef tuple inputs, pattern
+    cdef double interval, jitter, startedAt, firstAt, lastAt, deadline, maxLateness, totalLateness
+    cdef long long limit, count, missedDeadlines
+    cdef bint active
+    cdef int patternIndex
+    cdef object rng
+    
+    cpdef double nextInterval(self)
+    
+    cpdef double achievedRate(self)
+    
+    cpdef void stop(self)
+    
+    cpdef dict getStats(self)
+
+
+cdef class BurstEngine:
+    cdef int maxCatchUp
+    cdef double coarseMargin, spinMargin
+    cdef long long sentEvents, sentBatches, failedBatches
+    cdef list bursts
+    cdef object condition, thread
+    
+    cpdef Burst start(self, Burst burst, double delay=*)
+    
+    cpdef void stopAll(self)
+    
+    cpdef list running(self)
+    
+    cdef double collect(self, double now, list inputs)
+    
+    cdef double waitUntil(self, double deadline)
+    
+    cpdef dict getStats(self)
@@ -0,0 +1,140 @@
+"""
+This module repeats key presses and mouse clicks (bursts) at fixed rates, for several keys and buttons at once, on one thread.
+
+Each burst has an absolute deadline for its next event, advanced by its interval after each event, so the achieved rate does not fall
+below the requested one when an event is late. All the events that are due at a wakeup are injected with a single `SendInput` call.
+The waiting uses the same coarse wait, sleep slices, and final spin as the timeline scheduler (`timelineHelper`).
+"""
+
+from typing import Any, Iterable
+
+
+MOUSE_BUTTON_FLAGS: dict[str, tuple[int, int]]
+"""The `(down, up)` flags of the mouse buttons that can be repeated."""
+
+
+class Burst:
+    """
+    Description:
+        A key or a mouse button that is pressed repeatedly, every `interval` seconds, until it is stopped or has been pressed `limit` times.
+        Created with `keyBurst` or `mouseBurst`, and run with `BurstEngine.start`.
+    ---
+    Parameters:
+        `name -> str`: The name of the burst, used when reporting it.
+        
+        `inputs -> tuple`: The `sendInputs` inputs of one press (e.g., the keyDown and keyUp events).
+        
+        `interval -> float`: The time in seconds between two presses.
+        
+        `pattern -> Iterable[float] | None`: Multipliers of the interval that are applied in turn, e.g., `(1.0, 0.5, 1.5)` for an uneven rhythm.
+        
+        `jitter -> float`: A random change of each interval, as a fraction of it (`0.1` is up to ±10%).
+        
+        `limit -> int`: The number of presses after which the burst stops. `0` repeats until it is stopped.
+        
+        `seed -> int | None`: The seed of the random jitter, to repeat the same intervals.
+    ---
+    Attributes:
+        `count -> int`: The number of presses sent so far.
+        
+        `missedDeadlines -> int`: The presses skipped because the burst was too far behind its deadlines (e.g., the system was suspended).
+    """
+    
+    name: str
+    inputs: tuple
+    pattern: tuple[float, ...]
+    interval: float
+    jitter: float
+    startedAt: float
+    firstAt: float
+    lastAt: float
+    deadline: float
+    maxLateness: float
+    totalLateness: float
+    limit: int
+    count: int
+    missedDeadlines: int
+    active: bool
+    
+    def __init__(self, name: str, inputs: tuple, interval: float, pattern: Iterable[float] | None = None, jitter: float = 0.0, limit: int = 0,
+                 seed: int | None = None) -> None:
+        ...
+    
+    def nextInterval(self) -> float:
+        """Returns the time until the next press, after applying the pattern and the jitter."""
+        ...
+    
+    def achievedRate(self) -> float:
+        """Returns the measured number of presses per second, from the first press to the last one."""
+        ...
+    
+    def stop(self) -> None:
+        """Stops the burst. It is removed from the engine at its next deadline."""
+        ...
+    
+    def getStats(self) -> dict:
+        """Returns the requested and the achieved rates (presses per second), and the mean and maximum lateness in milliseconds."""
+        ...
+
+
+def keyBurst(keyId: int, scanCode: int = 0, interval: float = 0.1, extended: bool = False, **kwargs: Any) -> Burst:
+    """
+    Description:
+        Returns a burst that presses the given key. The other arguments are the ones of `Burst`.
+    ---
+    Parameters:
+        `extended -> bool`: Whether the key is an extended key (e.g., the arrows or `Insert`), as listed in `keyboardHelper.extended_keys`.
+    """
+    ...
+
+
+def mouseBurst(button: str = "left", interval: float = 0.1, **kwargs: Any) -> Burst:
+    """Returns a burst that clicks the given mouse button (`"left"`, `"right"`, or `"middle"`) at the cursor position. The other arguments are the ones of `Burst`."""
+    ...
+
+
+class BurstEngine:
+    """
+    Description:
+        Runs the started bursts on one thread, which is started with the first burst and stops when `Management.terminateEvent` is set.
+    ---
+    Parameters:
+        `maxCatchUp -> int`: The maximum number of presses of a burst that are sent at once when it is behind its deadlines.
+        The deadlines that are still missed after them are skipped, and counted in `Burst.missedDeadlines`.
+        
+        `coarseMargin, spinMargin -> float`: Like the ones of `TimelineScheduler`.
+    """
+    
+    maxCatchUp: int
+    coarseMargin: float
+    spinMargin: float
+    sentEvents: int
+    sentBatches: int
+    failedBatches: int
+    
+    def __init__(self, maxCatchUp: int = 4, coarseMargin: float = 0.016, spinMargin: float = 0.0005) -> None:
+        ...
+    
+    def start(self, burst: Burst, delay: float = 0.0) -> Burst:
+        """Starts repeating the given burst after `delay` seconds, and returns it."""
+        ...
+    
+    def stopAll(self) -> None:
+        """Stops all the running bursts."""
+        ...
+    
+    def running(self) -> list[Burst]:
+        """Returns the running bursts."""
+        ...
+    
+    def engineLoop(self) -> None:
+        """The loop of the engine thread."""
+        ...
+    
+    def getStats(self) -> dict:
+        """Returns a snapshot of the engine statistics, and the ones of each running burst."""
+        ...
+
+
+burstEngine: BurstEngine
+"""The burst engine of the script."""
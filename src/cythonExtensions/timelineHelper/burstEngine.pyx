@@ -0,0 +1,318 @@
+# cython: language_level = 3str
+
+"""
+This extension module repeats key presses and mouse clicks (bursts) at fixed rates, for several keys and buttons at once, on one thread.
+
+Each burst has an absolute deadline for its next event, advanced by its interval after each event, so the achieved rate does not fall
+below the requested one when an event is late. All the events that are due at a wakeup are injected with a single `SendInput` call.
+The waiting uses the same coarse wait, sleep slices, and final spin as the timeline scheduler (`timelineHelper`).
+"""
+
+import random, threading
+from time import perf_counter, sleep
+from traceback import format_exc
+
+from cythonExtensions.commonUtils.commonUtils import PThread, Management as mgmt
+from cythonExtensions.platformBackend import platformBackend as pfBackend
+from cythonExtensions.platformBackend.platformBackend import win32con, MOUSE_INPUT
+
+
+MOUSE_BUTTON_FLAGS = {
+    "left":   (win32con.MOUSEEVENTF_LEFTDOWN, win32con.MOUSEEVENTF_LEFTUP),
+    "right":  (win32con.MOUSEEVENTF_RIGHTDOWN, win32con.MOUSEEVENTF_RIGHTUP),
+    "middle": (win32con.MOUSEEVENTF_MIDDLEDOWN, win32con.MOUSEEVENTF_MIDDLEUP),
+}
+"""The `(down, up)` flags of the mouse buttons that can be repeated."""
+
+
+cdef class Burst:
+    """
+    Description:
+        A key or a mouse button that is pressed repeatedly, every `interval` seconds, until it is stopped or has been pressed `limit` times.
+        Created with `keyBurst` or `mouseBurst`, and run with `BurstEngine.start`.
+    ---
+    Parameters:
+        `name -> str`: The name of the burst, used when reporting it.
+        
+        `inputs -> tuple`: The `sendInputs` inputs of one press (e.g., the keyDown and keyUp events).
+        
+        `interval -> float`: The time in seconds between two presses.
+        
+        `pattern -> Iterable[float] | None`: Multipliers of the interval that are applied in turn, e.g., `(1.0, 0.5, 1.5)` for an uneven rhythm.
+        
+        `jitter -> float`: A random change of each interval, as a fraction of it (`0.1` is up to ±10%).
+        
+        `limit -> int`: The number of presses after which the burst stops. `0` repeats until it is stopped.
+        
+        `seed -> int | None`: The seed of the random jitter, to repeat the same intervals.
+    ---
+    Attributes:
+        `count -> int`: The number of presses sent so far.
+        
+        `missedDeadlines -> int`: The presses skipped because the burst was too far behind its deadlines (e.g., the system was suspended).
+    """
+    
+    cdef public str name
+    cdef public tuple inputs, pattern
+    cdef public double interval, jitter, startedAt, firstAt, lastAt, deadline, maxLateness, totalLateness
+    cdef public long long limit, count, missedDeadlines
+    cdef public bint active
+    cdef int patternIndex
+    cdef object rng
+    
+    def __init__(self, str name, tuple inputs, double interval, pattern=None, double jitter=0.0, long long limit=0, seed=None):
+        if interval <= 0:
+            raise ValueError(f'The interval of the burst "{name}" must be positive.')
+        
+        self.name = name
+        self.inputs = inputs
+        self.interval = interval
+        self.pattern = tuple(pattern) if pattern else ()
+        self.jitter = jitter
+        self.limit = limit
+        self.count = self.missedDeadlines = 0
+        self.startedAt = self.firstAt = self.lastAt = self.deadline = 0.0
+        self.maxLateness = self.totalLateness = 0.0
+        self.active = False
+        self.patternIndex = 0
+        self.rng = random.Random(seed)
+    
+    cpdef double nextInterval(self):
+        """Returns the time until the next press, after applying the pattern and the jitter."""
+        
+        cdef double interval = self.interval
+        
+        if self.pattern:
+            interval *= <double> self.pattern[self.patternIndex]
+            self.patternIndex = (self.patternIndex + 1) % len(self.pattern)
+        
+        if self.jitter:
+            interval *= 1.0 + self.rng.uniform(-self.jitter, self.jitter)
+        
+        # A zero interval would never move the deadline forward.
+        return max(interval, 0.0001)
+    
+    cpdef double achievedRate(self):
+        """Returns the measured number of presses per second, from the first press to the last one."""
+        
+        return (self.count - 1) / (self.lastAt - self.firstAt) if self.count > 1 and self.lastAt > self.firstAt else 0.0
+    
+    cpdef void stop(self):
+        """Stops the burst. It is removed from the engine at its next deadline."""
+        
+        self.active = False
+    
+    cpdef dict getStats(self):
+        """Returns the requested and the achieved rates (presses per second), and the mean and maximum lateness in milliseconds."""
+        
+        return {
+            "name":            self.name,
+            "count":           self.count,
+            "requestedRate":   1 / self.interval,
+            "achievedRate":    self.achievedRate(),
+            "meanLatenessMs":  self.totalLateness / self.count * 1000 if self.count else 0.0,
+            "maxLatenessMs":   self.maxLateness * 1000,
+            "missedDeadlines": self.missedDeadlines,
+        }
+    
+    def __repr__(self) -> str:
+        return f"Burst({self.name!r}, every {self.interval * 1000:g} ms, {self.count} presses)"
+
+
+def keyBurst(int keyId, int scanCode=0, double interval=0.1, bint extended=False, **kwargs) -> Burst:
+    """
+    Description:
+        Returns a burst that presses the given key. The other arguments are the ones of `Burst`.
+    ---
+    Parameters:
+        `extended -> bool`: Whether the key is an extended key (e.g., the arrows or `Insert`), as listed in `keyboardHelper.extended_keys`.
+    """
+    
+    cdef int flags = extended * win32con.KEYEVENTF_EXTENDEDKEY
+    
+    return Burst(kwargs.pop("name", f"key {keyId}"), ((keyId, scanCode, flags), (keyId, scanCode, flags | win32con.KEYEVENTF_KEYUP)), interval, **kwargs)
+
+
+def mouseBurst(str button="left", double interval=0.1, **kwargs) -> Burst:
+    """Returns a burst that clicks the given mouse button (`"left"`, `"right"`, or `"middle"`) at the cursor position. The other arguments are the ones of `Burst`."""
+    
+    if button not in MOUSE_BUTTON_FLAGS:
+        raise ValueError(f'Unknown mouse button "{button}". Expected one of: {", ".join(MOUSE_BUTTON_FLAGS)}.')
+    
+    down, up = MOUSE_BUTTON_FLAGS[button]
+    
+    return Burst(kwargs.pop("name", f"{button} button"), ((MOUSE_INPUT, down, 0, 0, 0), (MOUSE_INPUT, up, 0, 0, 0)), interval, **kwargs)
+
+
+cdef class BurstEngine:
+    """
+    Description:
+        Runs the started bursts on one thread, which is started with the first burst and stops when `Management.terminateEvent` is set.
+    ---
+    Parameters:
+        `maxCatchUp -> int`: The maximum number of presses of a burst that are sent at once when it is behind its deadlines.
+        The deadlines that are still missed after them are skipped, and counted in `Burst.missedDeadlines`.
+        
+        `coarseMargin, spinMargin -> float`: Like the ones of `TimelineScheduler`.
+    """
+    
+    cdef public int maxCatchUp
+    cdef public double coarseMargin, spinMargin
+    cdef public long long sentEvents, sentBatches, failedBatches
+    cdef list bursts
+    cdef object condition, thread
+    
+    def __init__(self, int maxCatchUp=4, double coarseMargin=0.016, double spinMargin=0.0005):
+        self.maxCatchUp = maxCatchUp
+        self.coarseMargin = coarseMargin
+        self.spinMargin = spinMargin
+        self.sentEvents = self.sentBatches = self.failedBatches = 0
+        self.bursts = []
+        self.condition = threading.Condition()
+        self.thread = None
+    
+    cpdef Burst start(self, Burst burst, double delay=0.0):
+        """Starts repeating the given burst after `delay` seconds, and returns it."""
+        
+        if burst.active:
+            raise RuntimeError(f'The burst "{burst.name}" is already running.')
+        
+        burst.active = True
+        burst.startedAt = burst.deadline = perf_counter() + delay
+        
+        with self.condition:
+            self.bursts.append(burst)
+            
+            if self.thread is None:
+                self.thread = PThread(target=self.engineLoop, name="burstEngine", daemon=True)
+                self.thread.start()
+            
+            self.condition.notify()
+        
+        return burst
+    
+    cpdef void stopAll(self):
+        """Stops all the running bursts."""
+        
+        cdef Burst burst
+        
+        with self.condition:
+            for burst in self.bursts:
+                burst.active = False
+            
+            self.bursts.clear()
+            self.condition.notify()
+    
+    cpdef list running(self):
+        """Returns the running bursts."""
+        
+        with self.condition:
+            return [burst for burst in self.bursts if (<Burst> burst).active]
+    
+    cdef double collect(self, double now, list inputs):
+        """Adds the inputs of the due presses of all the bursts to `inputs`, and returns the earliest deadline after them (or `0` if no burst is left)."""
+        
+        cdef Burst burst
+        cdef double earliest = 0.0, lateness
+        cdef int index, presses
+        
+        for index in range(len(self.bursts) - 1, -1, -1):
+            burst = self.bursts[index]
+            presses = 0
+            
+            while burst.active and burst.deadline <= now and presses < self.maxCatchUp:
+                lateness = now - burst.deadline
+                burst.totalLateness += lateness
+                
+                if lateness > burst.maxLateness:
+                    burst.maxLateness = lateness
+                
+                if not burst.count:
+                    burst.firstAt = now
+                
+                inputs.extend(burst.inputs)
+                burst.count += 1
+                burst.lastAt = now
+                burst.deadline += burst.nextInterval()
+                presses += 1
+                
+                if burst.limit and burst.count >= burst.limit:
+                    burst.active = False
+            
+            # Too far behind (e.g., after the system was suspended): the missed deadlines are skipped instead of sent all at once.
+            while burst.active and burst.deadline <= now:
+                burst.missedDeadlines += 1
+                burst.deadline += burst.nextInterval()
+            
+            if not burst.active:
+                del self.bursts[index]
+                continue
+            
+            if not earliest or burst.deadline < earliest:
+                earliest = burst.deadline
+        
+        return earliest
+    
+    cdef double waitUntil(self, double deadline):
+        """Waits until the given deadline, or until a burst is started or stopped. Returns the time after waiting."""
+        
+        cdef double remaining = deadline - perf_counter()
+        
+        if remaining > self.coarseMargin:
+            with self.condition:
+                self.condition.wait(min(remaining - self.coarseMargin, 0.5))
+            
+            return perf_counter()
+        
+        while remaining > self.spinMargin + 0.001:
+            sleep(0.001)
+            remaining = deadline - perf_counter()
+        
+        while perf_counter() < deadline:
+            pass
+        
+        return perf_counter()
+    
+    def engineLoop(self) -> None:
+        """The loop of the engine thread."""
+        
+        cdef list inputs = []
+        cdef double deadline
+        
+        while not mgmt.terminateEvent.is_set():
+            with self.condition:
+                deadline = self.collect(perf_counter(), inputs)
+                
+                if not deadline:
+                    self.condition.wait(0.5)
+                    continue
+            
+            if inputs:
+                try:
+                    pfBackend.backend.sendInputs(inputs)
+                
+                except Exception as e:
+                    self.failedBatches += 1
+                    print(f'➤ Warning! The inputs of the bursts could not be sent.\n\n→ Error message: {e}\n\n→ {format_exc()}\n{"="*50}\n')
+                
+                self.sentEvents += len(inputs)
+                self.sentBatches += 1
+                inputs = []
+            
+            self.waitUntil(deadline)
+        
+        self.stopAll()
+    
+    cpdef dict getStats(self):
+        """Returns a snapshot of the engine statistics, and the ones of each running burst."""
+        
+        return {
+            "sentEvents":    self.sentEvents,
+            "sentBatches":   self.sentBatches,
+            "failedBatches": self.failedBatches,
+            "bursts":        [burst.getStats() for burst in self.running()],
+        }
+
+
+burstEngine = BurstEngine()
+"""The burst engine of the script."""
@@ -0,0 +1,44 @@
+from cythonExtensions.metricsHelper.metricsHelper cimport LatencyHistogram
+
+
+cdef class Timeline:
+    cdef str name
+    cdef list steps
+    cdef int position
+    cdef double startedAt, maxLateness, totalLateness
+    cdef bint scheduled, cancelled
+    cdef object onCancel
+    cdef object doneEvent
+    
+    cpdef Timeline at(self, double offset, function, tuple args=*)
+    
+    cpdef Timeline after(self, double delay, function, tuple args=*)
+    
+    cpdef double duration(self)
+    
+    cpdef void cancel(self)
+    
+    cpdef dict getStats(self)
+
+
+cdef class TimelineScheduler:
+    cdef double coarseMargin, spinMargin
+    cdef long long executedSteps, failedSteps, completedTimelines, cancelledTimelines
+    cdef LatencyHistogram lateness
+    cdef list queue
+    cdef long long sequence
+    cdef object condition, thread
+    
+    cpdef Timeline schedule(self, Timeline timeline, double delay=*)
+    
+    cdef void push(self, Timeline timeline)
+    
+    cdef void runStep(self, Timeline timeline, double due)
+    
+    cdef tuple nextDue(self)
+    
+    cpdef void cancelAll(self)
+    
+    cpdef int pending(self)
+    
+    cpdef dict getStats(self)
@@ -0,0 +1,122 @@
+"""
+This module runs timed input sequences (timelines) on a single scheduler thread, instead of one sleeping thread per sequence.
+
+Each step of a timeline has an offset from the start of the timeline, so it is due at an absolute time. A late step does not push back
+the steps after it, which keeps the timer drift from accumulating. The scheduler waits on a condition until shortly before the next due
+step, sleeps in short slices for the rest (`time.sleep` uses a high-resolution timer on Windows), then spins for the last fraction of a
+millisecond. The lateness of each step is recorded in the `timeline.lateness` histogram of `metricsHelper`.
+"""
+
+from typing import Any, Callable
+
+
+class Timeline:
+    """
+    Description:
+        A list of steps, each one a function called at a fixed offset (in seconds) from the start of the timeline.
+        The steps run on the scheduler thread, so they must be short, e.g., injecting inputs or moving a window.
+        
+        >>> timeline = Timeline("shake").at(0.0, moveWindow, (hwnd, 10)).after(0.1, moveWindow, (hwnd, -10))
+        >>> scheduler.schedule(timeline).wait()
+    ---
+    Parameters:
+        `name -> str`: The name of the timeline, used when reporting it.
+    ---
+    Attributes:
+        `steps -> list[tuple[float, Callable, tuple]]`: The `(offset, function, args)` of the steps, sorted by their offsets.
+        
+        `position -> int`: The index of the next step to run.
+        
+        `maxLateness -> float` / `totalLateness -> float`: The largest and the summed delays (in seconds) between the due and the actual times of the run steps.
+        
+        `onCancel -> Callable[[], Any] | None`: Called by `cancel` on the cancelling thread, e.g., to release the keys pressed by the run steps.
+    """
+    
+    name: str
+    steps: list[tuple[float, Callable, tuple]]
+    position: int
+    startedAt: float
+    maxLateness: float
+    totalLateness: float
+    scheduled: bool
+    cancelled: bool
+    onCancel: Callable[[], Any] | None
+    
+    def __init__(self, name: str = "timeline") -> None:
+        ...
+    
+    def at(self, offset: float, function: Callable, args: tuple = ()) -> Timeline:
+        """Adds a step that calls `function(*args)` at `offset` seconds from the start. Returns the timeline, so the calls can be chained."""
+        ...
+    
+    def after(self, delay: float, function: Callable, args: tuple = ()) -> Timeline:
+        """Adds a step `delay` seconds after the last one."""
+        ...
+    
+    def duration(self) -> float:
+        """Returns the offset of the last step."""
+        ...
+    
+    def cancel(self) -> None:
+        """Stops the timeline. Its remaining steps are skipped, and `onCancel` is called. A finished timeline is left as it is."""
+        ...
+    
+    def wait(self, timeout: float | None = None) -> bool:
+        """Blocks until the timeline is finished or cancelled, and returns whether it is."""
+        ...
+    
+    @property
+    def done(self) -> bool:
+        """Whether the timeline is finished or cancelled."""
+        ...
+    
+    def getStats(self) -> dict:
+        """Returns the number of run steps, and their mean and maximum lateness in milliseconds."""
+        ...
+
+
+class TimelineScheduler:
+    """
+    Description:
+        Runs the steps of all the scheduled timelines, in the order of their due times, on one thread. The thread is started
+        with the first scheduled timeline, and stops (cancelling the pending timelines) when `Management.terminateEvent` is set.
+    ---
+    Parameters:
+        `coarseMargin -> float`: How long before a due step the waiting on the condition (whose timeout has the resolution of the system tick) stops.
+        
+        `spinMargin -> float`: How long before a due step the sleeping stops, and the spinning starts.
+    """
+    
+    coarseMargin: float
+    spinMargin: float
+    executedSteps: int
+    failedSteps: int
+    completedTimelines: int
+    cancelledTimelines: int
+    
+    def __init__(self, coarseMargin: float = 0.016, spinMargin: float = 0.0005) -> None:
+        ...
+    
+    def schedule(self, timeline: Timeline, delay: float = 0.0) -> Timeline:
+        """Starts the given timeline after `delay` seconds, and returns it. A timeline can only be scheduled once."""
+        ...
+    
+    def schedulerLoop(self) -> None:
+        """The loop of the scheduler thread."""
+        ...
+    
+    def cancelAll(self) -> None:
+        """Cancels all the scheduled timelines."""
+        ...
+    
+    def pending(self) -> int:
+        """Returns the number of the running timelines."""
+        ...
+    
+    def getStats(self) -> dict:
+        """Returns a snapshot of the scheduler statistics, including the achieved lateness (jitter) of the steps in milliseconds."""
+        ...
+
+
+scheduler: TimelineScheduler
+"""The scheduler shared by all the timelines of the script."""
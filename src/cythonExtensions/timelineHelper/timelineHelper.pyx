@@ -0,0 +1,311 @@
+# cython: language_level = 3str
+
+"""
+This extension module runs timed input sequences (timelines) on a single scheduler thread, instead of one sleeping thread per sequence.
+
+Each step of a timeline has an offset from the start of the timeline, so it is due at an absolute time. A late step does not push back
+the steps after it, which keeps the timer drift from accumulating. The scheduler waits on a condition until shortly before the next due
+step, sleeps in short slices for the rest (`time.sleep` uses a high-resolution timer on Windows), then spins for the last fraction of a
+millisecond. The lateness of each step is recorded in the `timeline.lateness` histogram of `metricsHelper`.
+"""
+
+from cythonExtensions.metricsHelper.metricsHelper cimport LatencyHistogram
+
+import heapq, threading
+from time import perf_counter, sleep
+from traceback import format_exc
+
+from cythonExtensions.commonUtils.commonUtils import PThread, Management as mgmt
+from cythonExtensions.metricsHelper.metricsHelper import getHistogram
+
+
+cdef class Timeline:
+    """
+    Description:
+        A list of steps, each one a function called at a fixed offset (in seconds) from the start of the timeline.
+        The steps run on the scheduler thread, so they must be short, e.g., injecting inputs or moving a window.
+        
+        >>> timeline = Timeline("shake").at(0.0, moveWindow, (hwnd, 10)).after(0.1, moveWindow, (hwnd, -10))
+        >>> scheduler.schedule(timeline).wait()
+    ---
+    Parameters:
+        `name -> str`: The name of the timeline, used when reporting it.
+    ---
+    Attributes:
+        `steps -> list[tuple[float, Callable, tuple]]`: The `(offset, function, args)` of the steps, sorted by their offsets.
+        
+        `position -> int`: The index of the next step to run.
+        
+        `maxLateness -> float` / `totalLateness -> float`: The largest and the summed delays (in seconds) between the due and the actual times of the run steps.
+        
+        `onCancel -> Callable[[], Any] | None`: Called by `cancel` on the cancelling thread, e.g., to release the keys pressed by the run steps.
+    """
+    
+    cdef public str name
+    cdef public list steps
+    cdef public int position
+    cdef public double startedAt, maxLateness, totalLateness
+    cdef public bint scheduled, cancelled
+    cdef public object onCancel
+    cdef object doneEvent
+    
+    def __init__(self, str name="timeline"):
+        self.name = name
+        self.steps = []
+        self.position = 0
+        self.startedAt = self.maxLateness = self.totalLateness = 0.0
+        self.scheduled = self.cancelled = False
+        self.onCancel = None
+        self.doneEvent = threading.Event()
+    
+    cpdef Timeline at(self, double offset, function, tuple args=()):
+        """Adds a step that calls `function(*args)` at `offset` seconds from the start. Returns the timeline, so the calls can be chained."""
+        
+        if self.scheduled:
+            raise RuntimeError(f'The timeline "{self.name}" can not be changed after it is scheduled.')
+        
+        cdef int index = len(self.steps)
+        
+        # The steps are kept sorted, and the ones with the same offset keep the order they were added in.
+        while index and (<tuple> self.steps[index - 1])[0] > offset:
+            index -= 1
+        
+        self.steps.insert(index, (max(offset, 0.0), function, args))
+        
+        return self
+    
+    cpdef Timeline after(self, double delay, function, tuple args=()):
+        """Adds a step `delay` seconds after the last one."""
+        
+        return self.at(((<tuple> self.steps[-1])[0] if self.steps else 0.0) + delay, function, args)
+    
+    cpdef double duration(self):
+        """Returns the offset of the last step."""
+        
+        return (<tuple> self.steps[-1])[0] if self.steps else 0.0
+    
+    cpdef void cancel(self):
+        """Stops the timeline. Its remaining steps are skipped, and `onCancel` is called. A finished timeline is left as it is."""
+        
+        if self.doneEvent.is_set():
+            return
+        
+        self.cancelled = True
+        self.doneEvent.set()
+        
+        if self.onCancel is not None:
+            try:
+                self.onCancel()
+            
+            except Exception as e:
+                print(f'➤ Warning! An error occurred while cancelling the timeline "{self.name}".\n\n→ Error message: {e}\n\n→ {format_exc()}\n{"="*50}\n')
+    
+    def wait(self, timeout=None) -> bool:
+        """Blocks until the timeline is finished or cancelled, and returns whether it is."""
+        
+        return self.doneEvent.wait(timeout)
+    
+    @property
+    def done(self) -> bool:
+        """Whether the timeline is finished or cancelled."""
+        
+        return self.doneEvent.is_set()
+    
+    cpdef dict getStats(self):
+        """Returns the number of run steps, and their mean and maximum lateness in milliseconds."""
+        
+        return {
+            "steps":          len(self.steps),
+            "runSteps":       self.position,
+            "cancelled":      self.cancelled,
+            "meanLatenessMs": self.totalLateness / self.position * 1000 if self.position else 0.0,
+            "maxLatenessMs":  self.maxLateness * 1000,
+        }
+    
+    def __repr__(self) -> str:
+        return f"Timeline({self.name!r}, {len(self.steps)} steps, {self.duration():.3f} s)"
+
+
+cdef class TimelineScheduler:
+    """
+    Description:
+        Runs the steps of all the scheduled timelines, in the order of their due times, on one thread. The thread is started
+        with the first scheduled timeline, and stops (cancelling the pending timelines) when `Management.terminateEvent` is set.
+    ---
+    Parameters:
+        `coarseMargin -> float`: How long before a due step the waiting on the condition (whose timeout has the resolution of the system tick) stops.
+        
+        `spinMargin -> float`: How long before a due step the sleeping stops, and the spinning starts.
+    """
+    
+    cdef public double coarseMargin, spinMargin
+    cdef public long long executedSteps, failedSteps, completedTimelines, cancelledTimelines
+    cdef LatencyHistogram lateness
+    cdef list queue
+    cdef long long sequence
+    cdef object condition, thread
+    
+    def __init__(self, double coarseMargin=0.016, double spinMargin=0.0005):
+        self.coarseMargin = coarseMargin
+        self.spinMargin = spinMargin
+        self.executedSteps = self.failedSteps = self.completedTimelines = self.cancelledTimelines = 0
+        self.lateness = getHistogram("timeline.lateness")
+        self.queue = []
+        self.sequence = 0
+        self.condition = threading.Condition()
+        self.thread = None
+    
+    cpdef Timeline schedule(self, Timeline timeline, double delay=0.0):
+        """Starts the given timeline after `delay` seconds, and returns it. A timeline can only be scheduled once."""
+        
+        if timeline.scheduled:
+            raise RuntimeError(f'The timeline "{timeline.name}" is already scheduled.')
+        
+        timeline.scheduled = True
+        timeline.startedAt = perf_counter() + delay
+        
+        if not timeline.steps:
+            timeline.doneEvent.set()
+            return timeline
+        
+        with self.condition:
+            self.push(timeline)
+            
+            if self.thread is None:
+                self.thread = PThread(target=self.schedulerLoop, name="timelineScheduler", daemon=True)
+                self.thread.start()
+            
+            # Waking up the thread, as the new step may be due before the one it is waiting for.
+            self.condition.notify()
+        
+        return timeline
+    
+    cdef void push(self, Timeline timeline):
+        """Queues the next step of the given timeline. Must be called with the condition held."""
+        
+        self.sequence += 1
+        heapq.heappush(self.queue, (timeline.startedAt + (<tuple> timeline.steps[timeline.position])[0], self.sequence, timeline))
+    
+    cdef void runStep(self, Timeline timeline, double due):
+        """Runs the next step of the given timeline, then queues the one after it. Errors are reported without stopping the timeline."""
+        
+        cdef double lateness = perf_counter() - due
+        cdef tuple step = timeline.steps[timeline.position]
+        
+        self.lateness.record(lateness)
+        timeline.totalLateness += lateness
+        
+        if lateness > timeline.maxLateness:
+            timeline.maxLateness = lateness
+        
+        try:
+            step[1](*step[2])
+        
+        except Exception as e:
+            self.failedSteps += 1
+            print(f'➤ Warning! An error occurred in a step of the timeline "{timeline.name}".\n\n→ Error message: {e}\n\n→ {format_exc()}\n{"="*50}\n')
+        
+        self.executedSteps += 1
+        timeline.position += 1
+        
+        with self.condition:
+            if timeline.position < len(timeline.steps) and not timeline.cancelled:
+                self.push(timeline)
+                return
+        
+        if timeline.cancelled:
+            self.cancelledTimelines += 1
+        
+        else:
+            self.completedTimelines += 1
+            timeline.doneEvent.set()
+    
+    cdef tuple nextDue(self):
+        """Waits until the first queued step is due, and pops it. Returns `None` if the scheduler is terminating."""
+        
+        cdef double remaining
+        cdef tuple entry
+        
+        while not mgmt.terminateEvent.is_set():
+            with self.condition:
+                # The cancelled timelines are dropped when their next step reaches the head of the queue.
+                while self.queue and (<Timeline> (<tuple> self.queue[0])[2]).cancelled:
+                    heapq.heappop(self.queue)
+                    self.cancelledTimelines += 1
+                
+                if not self.queue:
+                    self.condition.wait(0.5)
+                    continue
+                
+                entry = self.queue[0]
+                remaining = <double> entry[0] - perf_counter()
+                
+                if remaining > self.coarseMargin:
+                    # Rechecking the termination at least every 0.5 seconds.
+                    self.condition.wait(min(remaining - self.coarseMargin, 0.5))
+                    continue
+                
+                if remaining <= self.spinMargin:
+                    return heapq.heappop(self.queue)
+            
+            # Close to the due time, the thread sleeps in short slices without the condition, then spins.
+            if remaining > self.spinMargin + 0.001:
+                sleep(0.001)
+            
+            else:
+                while perf_counter() < <double> entry[0] - self.spinMargin:
+                    sleep(0)
+        
+        return None
+    
+    def schedulerLoop(self) -> None:
+        """The loop of the scheduler thread."""
+        
+        cdef tuple entry
+        
+        while True:
+            entry = self.nextDue()
+            
+            if entry is None:
+                break
+            
+            # Spinning until the exact due time.
+            while perf_counter() < <double> entry[0]:
+                pass
+            
+            self.runStep(<Timeline> entry[2], <double> entry[0])
+        
+        self.cancelAll()
+    
+    cpdef void cancelAll(self):
+        """Cancels all the scheduled timelines."""
+        
+        with self.condition:
+            for entry in self.queue:
+                (<Timeline> entry[2]).cancel()
+            
+            self.cancelledTimelines += len(self.queue)
+            self.queue.clear()
+            self.condition.notify()
+    
+    cpdef int pending(self):
+        """Returns the number of the running timelines."""
+        
+        with self.condition:
+            return len(self.queue)
+    
+    cpdef dict getStats(self):
+        """Returns a snapshot of the scheduler statistics, including the achieved lateness (jitter) of the steps in milliseconds."""
+        
+        return {
+            "pendingTimelines":   self.pending(),
+            "executedSteps":      self.executedSteps,
+            "failedSteps":        self.failedSteps,
+            "completedTimelines": self.completedTimelines,
+            "cancelledTimelines": self.cancelledTimelines,
+            "lateness":           self.lateness.summary(),
+        }
+
+
+scheduler = TimelineScheduler()
+"""The scheduler shared by all the timelines of the script."""
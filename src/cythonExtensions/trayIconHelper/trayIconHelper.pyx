@@ -2,13 +2,15 @@
 
 from cythonExtensions.trayIconHelper cimport trayIconHelper
 
-import win32api, win32con, win32gui_struct,  win32gui, os, importlib, glob, itertools, time, atexit, threading
+import win32api, win32con, win32gui_struct,  win32gui, os, glob, itertools, time, atexit, threading
 from traceback import print_exc
 from typing import Callable
 
 import scriptConfigs as configs
 from cythonExtensions.commonUtils.commonUtils import PThread, Management as mgmt
 from cythonExtensions.systemHelper import systemHelper as sysHelper
+from cythonExtensions.windowHelper import windowHelper as winHelper
+from cythonExtensions.metricsHelper import metricsHelper
 from cythonExtensions.eventHandlers import eventHandlers
 
 cdef class TrayIcon:
@@ -509,7 +511,7 @@ cdef int showNotification(TrayIcon trayIcon):
 
 
 cdef int reloadHotkeys(TrayIcon trayIcon):
-    importlib.reload(eventHandlers.cbs)
+    eventHandlers.reloadHotkeys()
     
     return 0
 
@@ -538,6 +540,30 @@ cdef int toggleSilentMode(TrayIcon trayIcon):
     return 0
 
 
+cdef int showLatencyStats(TrayIcon trayIcon):
+    print(metricsHelper.formatHistograms())
+    
+    summaries = metricsHelper.getHistogramsSummary()
+    message = "\n".join(f"{name}:  p50 {summary['p50Ms']:.2f}  |  p99 {summary['p99Ms']:.2f}  |  max {summary['maxMs']:.2f} ms  (n={summary['count']})"
+                        for name, summary in summaries.items())
+    
+    winHelper.showMessageBox(message or "No latencies were recorded yet.", "Latency Stats", 1, win32con.MB_ICONINFORMATION)
+    
+    return 0
+
+
+cdef int dumpLatencyStats(TrayIcon trayIcon):
+    print(f"Latency histograms dumped to: {metricsHelper.dumpHistograms()}")
+    
+    return 0
+
+
+cdef int resetLatencyStats(TrayIcon trayIcon):
+    metricsHelper.resetHistograms()
+    
+    return 0
+
+
 # cdef void createTrayIcon(int default_sc_menu_action=2, int default_dc_menu_action=0, hover_text="Macropy", on_quit=None):
 def createTrayIcon(default_sc_menu_action=2, default_dc_menu_action=0, hover_text="Macropy", on_quit=None) -> None:
     """
@@ -573,6 +599,11 @@ def createTrayIcon(default_sc_menu_action=2, default_dc_menu_action=0, hover_tex
         )),
         ('Clear Console Logs', "", clearConsoleLogs),
         ('Toggle Silent Mode', "", toggleSilentMode),
+        ('Latency Stats', "", (
+            ('Show', "", showLatencyStats),
+            ('Dump to File', "", dumpLatencyStats),
+            ('Reset', "", resetLatencyStats),
+        )),
     )
     
     TrayIcon(icons, hover_text, menu_options, on_quit=on_quit, default_sc_menu_action=default_sc_menu_action, default_dc_menu_action=default_dc_menu_action)
@@ -0,0 +1,19 @@
+cdef class ForegroundContext:
+    cdef int hwnd
+    cdef str className, processName
+    cdef bint elevated
+    cdef long long changes
+    cdef int hookId
+    cdef list listeners
+    
+    cpdef bint start(self)
+    
+    cpdef void stop(self)
+    
+    cpdef void update(self, int hwnd)
+    
+    cpdef ForegroundContext current(self)
+    
+    cpdef bint isIn(self, names)
+    
+    cpdef object select(self, dict layers)
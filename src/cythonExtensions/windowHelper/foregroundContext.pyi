@@ -0,0 +1,84 @@
+"""
+This module keeps the foreground window context (its handle, class name, process name, and elevation status) in memory.
+
+The context is updated by a foreground hook (`SetWinEventHook(EVENT_SYSTEM_FOREGROUND)`), so the hotkeys and the text expansion
+can check the focused application without querying the window on each keystroke.
+"""
+
+from typing import Any, Callable, Container
+
+
+class ForegroundContext:
+    """
+    Description:
+        The context of the foreground window, updated each time the foreground window changes.
+        
+        - `start` must be called from the thread that runs the message loop (the hook thread), as the notifications are delivered by it.
+        - Until `start` succeeds, `current` reads the foreground window on each call, so the context is never stale.
+        - The attributes are replaced together while holding the GIL, so the readers never see the fields of two different windows.
+    ---
+    Attributes:
+        `hwnd -> int`: The handle of the foreground window, or `0`.
+        
+        `className -> str`: The class name of the foreground window, e.g., `CabinetWClass` for the explorer windows.
+        
+        `processName -> str`: The lowercase file name of the executable of the foreground window, e.g., `explorer.exe`.
+        
+        `elevated -> bool`: Whether the process of the foreground window has elevated privileges.
+        
+        `changes -> int`: The number of foreground changes received.
+    """
+    
+    hwnd: int
+    className: str
+    processName: str
+    elevated: bool
+    changes: int
+    
+    def __init__(self) -> None:
+        ...
+    
+    @property
+    def live(self) -> bool:
+        """Whether the context is updated by the foreground hook."""
+        ...
+    
+    def start(self) -> bool:
+        """Installs the foreground hook and reads the current foreground window. Returns whether the hook was installed."""
+        ...
+    
+    def stop(self) -> None:
+        """Removes the foreground hook. The context is then read on demand by `current`."""
+        ...
+    
+    def onForegroundChanged(self, hwnd: int) -> None:
+        """The callback of the foreground hook."""
+        ...
+    
+    def update(self, hwnd: int) -> None:
+        """Reads the context of the given window, then calls the listeners."""
+        ...
+    
+    def current(self) -> "ForegroundContext":
+        """Returns the context, after reading the foreground window if the hook is not installed."""
+        ...
+    
+    def isIn(self, names: Container[str]) -> bool:
+        """Returns whether the class name or the process name of the foreground window is one of `names`."""
+        ...
+    
+    def select(self, layers: dict[str, Any]) -> Any | None:
+        """Returns the value of `layers` keyed by the class name of the foreground window, or else by its process name, or `None`."""
+        ...
+    
+    def addListener(self, listener: Callable[["ForegroundContext"], Any]) -> None:
+        """Adds a function called with the context each time the foreground window changes. It is called in the hook thread, so it must return quickly."""
+        ...
+    
+    def removeListener(self, listener: Callable[["ForegroundContext"], Any]) -> None:
+        """Removes a listener added with `addListener`."""
+        ...
+
+
+foregroundContext: ForegroundContext
+"""The shared foreground context, started by the script runner."""
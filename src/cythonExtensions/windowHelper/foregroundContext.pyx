@@ -0,0 +1,146 @@
+# cython: language_level = 3str
+
+"""
+This extension module keeps the foreground window context (its handle, class name, process name, and elevation status) in memory.
+
+The context is updated by a foreground hook (`SetWinEventHook(EVENT_SYSTEM_FOREGROUND)`), so the hotkeys and the text expansion
+can check the focused application without querying the window on each keystroke.
+"""
+
+from cythonExtensions.platformBackend import platformBackend as pfBackend
+
+
+cdef class ForegroundContext:
+    """
+    Description:
+        The context of the foreground window, updated each time the foreground window changes.
+        
+        - `start` must be called from the thread that runs the message loop (the hook thread), as the notifications are delivered by it.
+        - Until `start` succeeds, `current` reads the foreground window on each call, so the context is never stale.
+        - The attributes are replaced together while holding the GIL, so the readers never see the fields of two different windows.
+    ---
+    Attributes:
+        `hwnd -> int`: The handle of the foreground window, or `0`.
+        
+        `className -> str`: The class name of the foreground window, e.g., `CabinetWClass` for the explorer windows.
+        
+        `processName -> str`: The lowercase file name of the executable of the foreground window, e.g., `explorer.exe`.
+        
+        `elevated -> bool`: Whether the process of the foreground window has elevated privileges.
+        
+        `changes -> int`: The number of foreground changes received.
+    """
+    
+    cdef public int hwnd
+    cdef public str className, processName
+    cdef public bint elevated
+    cdef public long long changes
+    cdef int hookId
+    cdef list listeners
+    
+    def __init__(self):
+        self.hwnd = 0
+        self.className = ""
+        self.processName = ""
+        self.elevated = False
+        self.changes = 0
+        self.hookId = 0
+        self.listeners = []
+    
+    @property
+    def live(self) -> bool:
+        """Whether the context is updated by the foreground hook."""
+        
+        return self.hookId != 0
+    
+    cpdef bint start(self):
+        """Installs the foreground hook and reads the current foreground window. Returns whether the hook was installed."""
+        
+        if not self.hookId:
+            self.hookId = pfBackend.backend.installForegroundHook(self.onForegroundChanged)
+        
+        self.update(pfBackend.backend.getForegroundWindow())
+        
+        return self.hookId != 0
+    
+    cpdef void stop(self):
+        """Removes the foreground hook. The context is then read on demand by `current`."""
+        
+        if self.hookId:
+            pfBackend.backend.uninstallForegroundHook(self.hookId)
+            self.hookId = 0
+    
+    def onForegroundChanged(self, hwnd: int) -> None:
+        """The callback of the foreground hook."""
+        
+        self.update(hwnd)
+    
+    cpdef void update(self, int hwnd):
+        """Reads the context of the given window, then calls the listeners."""
+        
+        cdef str className = "", processName = ""
+        cdef bint elevated = False
+        
+        # The window may be destroyed before it is queried.
+        try:
+            if hwnd:
+                className = pfBackend.backend.getClassName(hwnd)
+                _, processName, elevated = pfBackend.backend.getWindowProcess(hwnd)
+        
+        except Exception as e:
+            print(f"Error: {e}\nA problem occurred while retrieving the context of the foreground window.\n")
+        
+        self.hwnd = hwnd
+        self.className = className
+        self.processName = processName
+        self.elevated = elevated
+        self.changes += 1
+        
+        for listener in self.listeners:
+            listener(self)
+    
+    cpdef ForegroundContext current(self):
+        """Returns the context, after reading the foreground window if the hook is not installed."""
+        
+        cdef int hwnd
+        
+        if not self.hookId:
+            hwnd = pfBackend.backend.getForegroundWindow()
+            
+            if hwnd != self.hwnd or not hwnd:
+                self.update(hwnd)
+        
+        return self
+    
+    cpdef bint isIn(self, names):
+        """Returns whether the class name or the process name of the foreground window is one of `names`."""
+        
+        return self.className in names or self.processName in names
+    
+    cpdef object select(self, dict layers):
+        """Returns the value of `layers` keyed by the class name of the foreground window, or else by its process name, or `None`."""
+        
+        if not layers:
+            return None
+        
+        layer = layers.get(self.className)
+        
+        return layer if layer is not None else layers.get(self.processName)
+    
+    def addListener(self, listener) -> None:
+        """Adds a function called with the context each time the foreground window changes. It is called in the hook thread, so it must return quickly."""
+        
+        self.listeners.append(listener)
+    
+    def removeListener(self, listener) -> None:
+        """Removes a listener added with `addListener`."""
+        
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+    
+    def __repr__(self) -> str:
+        return f"ForegroundContext(hwnd={self.hwnd}, className={self.className!r}, processName={self.processName!r}, elevated={self.elevated})"
+
+
+foregroundContext = ForegroundContext()
+"""The shared foreground context, started by the script runner."""
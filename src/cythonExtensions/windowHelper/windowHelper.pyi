@@ -1,6 +1,7 @@
 """This module provides functions for dealing with windows."""
 
 import win32con
+from cythonExtensions.timelineHelper.timelineHelper import Timeline
 
 
 def setWindowProperty(hwnd: int, property: str, value: int) -> None:
@@ -102,8 +103,8 @@ def alwaysOnTop() -> None:
 
 
 # Shake window - Doesn't work if the window is fullscreen
-def shakeActiveWindow(cycles=5) -> None:
-    """Simulates shake effect on the active window for the specified number of times."""
+def shakeActiveWindow(cycles=5) -> Timeline:
+    """Simulates shake effect on the active window for the specified number of times. Returns the `Timeline` of the moves."""
     ...
 
 
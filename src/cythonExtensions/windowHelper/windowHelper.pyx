@@ -2,8 +2,10 @@
 
 """This extension module provides functions for dealing with windows."""
 
-import win32gui, win32con, winsound, pywintypes, ctypes
-from time import sleep
+import ctypes
+
+from cythonExtensions.platformBackend import platformBackend as pfBackend
+from cythonExtensions.platformBackend.platformBackend import win32con
 
 def sendWindowsMessage(hwnd: int, message: int, wParam: int, lParam: str) -> int:
     """
@@ -12,9 +14,9 @@ def sendWindowsMessage(hwnd: int, message: int, wParam: int, lParam: str) -> int
     """
     
     encoded_path = lParam.encode('utf-16-le') + b'\0\0'  # Add null terminator
-    result = ctypes.windll.user32.SendMessageW(hwnd, message, wParam, ctypes.c_void_p(ctypes.cast(encoded_path, ctypes.c_void_p).value))
+    result = pfBackend.backend.sendMessage(hwnd, message, wParam, ctypes.c_void_p(ctypes.cast(encoded_path, ctypes.c_void_p).value))
     
-    return ctypes.get_last_error() if not result else 0
+    return pfBackend.backend.getLastError() if not result else 0
 
 def findHandleByClassName(className: str, check_all=False) -> list[int] | int:
     """
@@ -36,17 +38,17 @@ def findHandleByClassName(className: str, check_all=False) -> list[int] | int:
         `list[int]`: The handle to the window(s) with the specified class name if any exists, otherwise an empty list.
     """
     
-    cdef int hwnd = win32gui.GetTopWindow(0)
+    cdef int hwnd = pfBackend.backend.getTopWindow()
     cdef list[int] output = []
     
     while hwnd:
-        if win32gui.GetClassName(hwnd) == className:
+        if pfBackend.backend.getClassName(hwnd) == className:
             if check_all:
                 output.append(hwnd)
             else:
                 return hwnd
         
-        hwnd = win32gui.GetWindow(hwnd, win32con.GW_HWNDNEXT)
+        hwnd = pfBackend.backend.getWindow(hwnd, win32con.GW_HWNDNEXT)
     
     return output
 
@@ -54,13 +56,13 @@ def findHandleByClassName(className: str, check_all=False) -> list[int] | int:
 def getHandleByTitle(title: str) -> int:
     """searches for a window with the specified title and returns its handle if found. Otherwise, returns `0`."""
     
-    cdef int hwnd = win32gui.GetTopWindow(0)
+    cdef int hwnd = pfBackend.backend.getTopWindow()
     
     while hwnd:
-        if win32gui.GetWindowText(hwnd) == title:
+        if pfBackend.backend.getWindowText(hwnd) == title:
             return hwnd
         
-        hwnd = win32gui.GetWindow(hwnd, win32con.GW_HWNDNEXT)
+        hwnd = pfBackend.backend.getWindow(hwnd, win32con.GW_HWNDNEXT)
     
     return 0
 
@@ -112,48 +114,53 @@ def showMessageBox(msg: str, title="Warning", msgbox_type=1, int icon=win32con.M
                      4: win32con.MB_RETRYCANCEL, 5: win32con.MB_YESNOCANCEL}.get(msgbox_type)
     
     # https://learn.microsoft.com/en-us/windows/win32/api/winuser/nf-winuser-messageboxw
-    return ctypes.windll.user32.MessageBoxW(None, msg, title, type | icon | win32con.MB_TOPMOST | win32con.MB_SETFOREGROUND)
+    return pfBackend.backend.messageBox(msg, title, type | icon | win32con.MB_TOPMOST | win32con.MB_SETFOREGROUND)
 
 
 def alwaysOnTop() -> None:
     """Toggles the alwaysOnTop feature for the active window."""
     
-    cdef int hwnd = win32gui.GetForegroundWindow()
+    cdef int hwnd = pfBackend.backend.getForegroundWindow()
     
     # Check if the window is already topmost.
-    cdef int is_topmost = (win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE) & win32con.WS_EX_TOPMOST) >> 3
+    cdef int is_topmost = (pfBackend.backend.getWindowLong(hwnd, win32con.GWL_EXSTYLE) & win32con.WS_EX_TOPMOST) >> 3
     
     # Toggle the always on top property of the active window.
-    win32gui.SetWindowPos(hwnd, (win32con.HWND_TOPMOST, win32con.HWND_NOTOPMOST)[is_topmost], 0, 0, 0, 0, win32con.SWP_NOMOVE | win32con.SWP_NOSIZE)
+    pfBackend.backend.setWindowPos(hwnd, (win32con.HWND_TOPMOST, win32con.HWND_NOTOPMOST)[is_topmost], 0, 0, 0, 0, win32con.SWP_NOMOVE | win32con.SWP_NOSIZE)
     
     if is_topmost:
-        winsound.PlaySound(r"SFX\no-trespassing-368.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
+        pfBackend.backend.playSound(r"SFX\no-trespassing-368.wav")
     else:
-        winsound.PlaySound(r"SFX\pedantic-490.wav", winsound.SND_FILENAME|winsound.SND_ASYNC)
+        pfBackend.backend.playSound(r"SFX\pedantic-490.wav")
 
 
 # Shake window - Doesn't work if the window is fullscreen
-def shakeActiveWindow(cycles=5) -> None:
-    """Simulates shake effect on the active window for the specified number of times."""
+def shakeActiveWindow(cycles=5):
+    """Simulates shake effect on the active window for the specified number of times. Returns the `Timeline` of the moves."""
+    
+    # Imported here, as the timeline scheduler depends on `commonUtils`, which imports this module.
+    from cythonExtensions.timelineHelper.timelineHelper import Timeline, scheduler
     
     # Get the handle of the window
-    cdef int hwnd = win32gui.GetForegroundWindow()
+    cdef int hwnd = pfBackend.backend.getForegroundWindow()
     
     # Get the original position of the window
     cdef int x, y, width, height
-    x, y, width, height = win32gui.GetWindowRect(hwnd)
+    x, y, width, height = pfBackend.backend.getWindowRect(hwnd)
+    
+    cdef int flags = win32con.SWP_NOACTIVATE | win32con.SWP_NOSIZE
+    timeline = Timeline("shakeActiveWindow")
     
-    # Shake the window for a few seconds
+    # Shake the window for a few seconds. The moves are run by the timeline scheduler, 0.1 seconds apart.
     for i in range(cycles):
         # Move the window to a new position. You could also use `ctypes.windll.user32.SetWindowPos`,
-        win32gui.SetWindowPos(hwnd, win32con.HWND_TOP, x + i, y + i, width, height, win32con.SWP_NOACTIVATE | win32con.SWP_NOSIZE)
-        sleep(0.1)
-        
-        win32gui.SetWindowPos(hwnd, win32con.HWND_TOP, x - i, y - i, width, height, win32con.SWP_NOACTIVATE | win32con.SWP_NOSIZE)
-        sleep(0.1)
+        timeline.at(0.2 * i, pfBackend.backend.setWindowPos, (hwnd, win32con.HWND_TOP, x + i, y + i, width, height, flags))
+        timeline.at(0.2 * i + 0.1, pfBackend.backend.setWindowPos, (hwnd, win32con.HWND_TOP, x - i, y - i, width, height, flags))
     
     # Restore the original position of the window
-    win32gui.SetWindowPos(hwnd, win32con.HWND_TOP, x, y, width, height, win32con.SWP_NOACTIVATE | win32con.SWP_NOSIZE)
+    timeline.at(0.2 * cycles, pfBackend.backend.setWindowPos, (hwnd, win32con.HWND_TOP, x, y, width, height, flags))
+    
+    return scheduler.schedule(timeline)
 
 
 def moveActiveWindow(hwnd=0, delta_x=0, delta_y=0, width=0, height=0) -> None:
@@ -182,18 +189,18 @@ def moveActiveWindow(hwnd=0, delta_x=0, delta_y=0, width=0, height=0) -> None:
     
     # Get the handle of the window.
     if not hwnd:
-        hwnd = win32gui.GetForegroundWindow()
+        hwnd = pfBackend.backend.getForegroundWindow()
     else:
         # Make sure the window is visible.
-        win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+        pfBackend.backend.showWindow(hwnd, win32con.SW_RESTORE)
     
     # Get the original position of the window.
     cdef int curr_x, curr_y, curr_width, curr_height
-    curr_x, curr_y, curr_width, curr_height = win32gui.GetWindowRect(hwnd)
+    curr_x, curr_y, curr_width, curr_height = pfBackend.backend.getWindowRect(hwnd)
     
     # Change the position of the window.
     # win32gui.MoveWindow(hwnd, curr_x + x, curr_y + y, curr_width + width, curr_height + height, True)
-    win32gui.SetWindowPos(hwnd, win32con.HWND_TOP, curr_x + delta_x, curr_y + delta_y,
+    pfBackend.backend.setWindowPos(hwnd, win32con.HWND_TOP, curr_x + delta_x, curr_y + delta_y,
                           curr_width + width, curr_height + height, win32con.SWP_NOACTIVATE | flags)
 
 
@@ -210,21 +217,21 @@ def changeWindowOpacity(hwnd=0, opcode=1, increment=5) -> int:
     """
     
     if not hwnd:
-        hwnd = win32gui.GetForegroundWindow()
+        hwnd = pfBackend.backend.getForegroundWindow()
     
     # Get the extended window style of the specified window.
     # The specific extended style that controls whether a window is layered or not is WS_EX_LAYERED.
     # To change the opacity of a window, it is necessary to set the WS_EX_LAYERED style so that the window becomes a layered window.
-    cdef int exstyle = win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE)
+    cdef int exstyle = pfBackend.backend.getWindowLong(hwnd, win32con.GWL_EXSTYLE)
     cdef int alpha
     
     # Check if the specified window is a layered window or not.
     if exstyle & win32con.WS_EX_LAYERED == win32con.WS_EX_LAYERED:
         # The `GetLayeredWindowAttributes` method can only retrieve the opacity value of a layered window. Passing a non-layered window raises an exception.
         try:
-            alpha = win32gui.GetLayeredWindowAttributes(hwnd)[1] + (-increment if not opcode else increment)
+            alpha = pfBackend.backend.getLayeredWindowAttributes(hwnd)[1] + (-increment if not opcode else increment)
         
-        except pywintypes.error as e:
+        except pfBackend.PlatformError as e:
             print("Warning! This window does not support changing the opacity")
             return -1
     
@@ -244,10 +251,10 @@ def changeWindowOpacity(hwnd=0, opcode=1, increment=5) -> int:
         exstyle |= win32con.WS_EX_LAYERED
     
     # Modifying the extended window style of the specified window.
-    win32gui.SetWindowLong(hwnd, win32con.GWL_EXSTYLE, exstyle)
+    pfBackend.backend.setWindowLong(hwnd, win32con.GWL_EXSTYLE, exstyle)
     
     # Setting the window's alpha value to the new value. Note that the `SetLayeredWindowAttributes` method Can only be used on a layered window.
     if exstyle & win32con.WS_EX_LAYERED == win32con.WS_EX_LAYERED:
-        win32gui.SetLayeredWindowAttributes(hwnd, 0, alpha, win32con.LWA_ALPHA)
+        pfBackend.backend.setLayeredWindowAttributes(hwnd, 0, alpha, win32con.LWA_ALPHA)
     
     return alpha
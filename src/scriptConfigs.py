@@ -4,6 +4,18 @@ import os
 MAX_ALIAS_LENGTH = 40
 """The maximum length of an alias."""
 
+PASTE_EXPANSION_THRESHOLD = 200
+"""The expansions longer than this number of characters are pasted from the clipboard instead of being typed. Set to `0` to always type them."""
+
+CLIPBOARD_RESTORE_DELAY = 0.5
+"""The time in seconds after pasting an expansion before the previous clipboard text is restored. The target window must read the clipboard first."""
+
+TEXT_EXPANSION_WORD_BOUNDARY = True
+"""Whether an alias is only expanded when it is typed at the start of a word (i.e., not right after a letter or a digit). Otherwise, it is expanded wherever it is typed."""
+
+SUGGESTION_POPUP_LIMIT = 8
+"""The maximum number of aliases suggested in the autocomplete popup while a prefixed alias (`:` or `!`) is typed. Set to `0` to disable the popup."""
+
 # If you want to use a prefix other than '!' and ':', to be able to use key expansion when 'suppressKbInputs' is set,
 # you need to add an extra check in the 'eventHandlers.textExpansion' function.
 LOCATIONS = {
@@ -16,9 +28,11 @@ LOCATIONS = {
 ABBREVIATIONS = {
             ":py"    : "python",
             ":name" : "Ahmed Tarek",
-            ":gmail" : "AhmedTarek37@gmail.com"
+            ":gmail" : "AhmedTarek37@gmail.com",
+            ":date"  : "{date:%d/%m/%Y}",
 }
-"""A dictionary of aliases and their corresponding expansion. The aliases must be in lowercase characters."""
+"""A dictionary of aliases and their corresponding expansion. The aliases must be in lowercase characters. The expansions can contain
+placeholders like `{date}`, `{clipboard}`, `{explorer}`, and `{!}` (the caret position), see `keyboardHelper/snippetTemplate.pyx`."""
 
 NON_PERFIXED_ABBREVIATIONS= {
     "404err" : "We are doomed!",
@@ -26,6 +40,14 @@ NON_PERFIXED_ABBREVIATIONS= {
     "nt": "Nice try",
 }
 
+APPLICATION_ABBREVIATIONS = {
+    "code.exe": {
+        ":main": 'if __name__ == "__main__":',
+    },
+}
+"""Maps a window class name (e.g., `CabinetWClass`) or a lowercase process name (e.g., `code.exe`) to the aliases that are only expanded
+while that application is focused. They take priority over the global aliases."""
+
 SUPPRESS_TERMINAL_OUTPUT = True
 """A boolean value that determines whether the script should suppress all terminal output (except error messages) or not."""
 
@@ -43,3 +65,55 @@ MAIN_MODULE_LOCATION = os.path.dirname(__file__)
 
 ENABLE_SYSTEM_TRAY_ICON = True
 """A boolean value that determines whether the script should show a system tray icon or not."""
+
+LISTENER_WORKER_COUNT = 2
+"""The number of long-lived worker threads that deliver the keyboard events to their listeners."""
+
+LISTENER_QUEUE_SIZE = 256
+"""The maximum number of pending events for each listener worker thread. Events are dropped when a queue is full."""
+
+HOOK_TIME_BUDGET_MS = 20.0
+"""The maximum time in milliseconds the hooks may spend deciding whether to suppress an input. Slower decisions pass the input through."""
+
+CHORD_STEP_TIMEOUT_MS = 1500
+"""The time in milliseconds allowed between two steps of a chord sequence (`callbacks.kbChordSequences`) before it is cancelled."""
+
+HOTKEYS_CONFIG_PATH = os.path.join(MAIN_MODULE_LOCATION, "hotkeys.json")
+"""The path of the declarative hotkey file, which defines hotkeys, abbreviations, and locations on top of the `callbacks` and `scriptConfigs` ones. Its edits are applied while the script runs. Set to an empty string to disable it."""
+
+HOTKEYS_CONFIG_POLL_INTERVAL = 1.0
+"""How often in seconds the declarative hotkey file is checked for changes."""
+
+SNIPPET_LIBRARY_PATH = os.path.join(MAIN_MODULE_LOCATION, "snippets.db")
+"""The path of the snippet library, a database of aliases and their expansions that are read from the disk when they are expanded. Fill it with
+`python src/__main__.py --import-snippets <file>`. It is skipped if it does not exist."""
+
+SNIPPET_LIBRARY_CACHE_SIZE = 256
+"""The number of expansions of the snippet library that are kept in memory after they are read."""
+
+ENABLE_HOT_ZONES = False
+"""A boolean value that determines whether the screen hot zones (defined in `callbacks.createHotZones`) are enabled or not. Enabling them installs the mouse hook."""
+
+HOT_ZONES_SAMPLE_RATE = 60
+"""How many times per second the cursor position is checked against the hot zones."""
+
+HOT_ZONES_CELL_SIZE = 64
+"""The size in pixels of the grid cells used to look up the hot zones under the cursor."""
+
+CURSOR_MOTION_RATE = 0
+"""How many times per second the cursor is moved while the mouse-control direction keys are held. `0` uses the refresh rate of the display."""
+
+EVENT_JOURNAL_PATH = ""
+"""If set, the raw keyboard (and mouse) hook events are recorded to this file, to be replayed later with `eventJournal.replayJournal`. Warning: the journal contains every typed key."""
+
+MACRO_FILE_PATH = os.path.join(MAIN_MODULE_LOCATION, "macro.mcr")
+"""The file the last recorded macro is saved to, and loaded from when the script starts. Set to `""` to keep it in memory only. Warning: a macro contains every typed key."""
+
+MACRO_RECORD_MOUSE = False
+"""Whether the macros also record the mouse moves, clicks, and wheel rotations. Enabling it installs the mouse hook."""
+
+MACRO_MAX_IDLE_GAP = 1.0
+"""The longest pause in seconds kept between two recorded inputs of a macro. Longer pauses are shortened to it."""
+
+MACRO_PLAYBACK_SPEED = 1.0
+"""The speed of the normal macro playback: `1` keeps the recorded timing, `2` is twice as fast, and so on (from `0.25`)."""